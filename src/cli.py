@@ -0,0 +1,667 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import signal
+import asyncio
+import argparse
+
+# 确保能够引用项目内模块（作为脚本运行或以src.cli导入时都可以）
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from utils.command_errors import (CommandError, EXIT_OK, EXIT_FAILED, EXIT_USAGE, EXIT_NO_FILES,
+                                  EXIT_ANALYSIS_FAILED, EXIT_PROBLEMS, EXIT_UNAVAILABLE, EXIT_NO_RULE)
+
+# 每次AI请求最多包含的文件数
+DEFAULT_BATCH_SIZE = 200
+
+# 使用这个扩展名保存的映射为列式会话文件，读取时直接映射各列，适合百万级文件
+COLUMNAR_MAP_SUFFIX = ".cols"
+
+def build_parser():
+    """
+    构建命令行参数解析器
+
+    Returns:
+        argparse.ArgumentParser: 参数解析器
+    """
+    parser = argparse.ArgumentParser(
+        prog="gy-rename",
+        description="GY_Rename 命令行模式：根据命名示例批量重命名文件，不启动图形界面")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # plan和apply共用的参数
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("paths", nargs="+", help="文件或文件夹路径，文件夹默认递归导入")
+    common.add_argument("-e", "--example", nargs=2, action="append", default=[], metavar=("ORIGINAL", "NEW"),
+                        help="命名示例，可重复指定")
+    common.add_argument("--examples", metavar="FILE",
+                        help="示例文件：JSON对象/列表，或每行一个以制表符分隔的“原文件名\\t新文件名”")
+    common.add_argument("--map", metavar="FILE", help="使用plan --save-map保存的映射，不再调用AI")
+    common.add_argument("--no-recursive", action="store_true", help="文件夹作为单个条目，不导入其内容")
+    common.add_argument("--include", action="append", default=[], metavar="PATTERN", help="只包含匹配的文件")
+    common.add_argument("--exclude", action="append", default=[], metavar="PATTERN", help="排除匹配的文件和文件夹")
+    common.add_argument("-j", "--jobs", type=int, default=4, help="同时进行的AI请求数量（默认4）")
+    common.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"每次AI请求最多包含的文件数（默认{DEFAULT_BATCH_SIZE}）")
+    common.add_argument("--json", action="store_true", help="以JSON格式输出结果")
+
+    plan_parser = subparsers.add_parser("plan", parents=[common], help="生成重命名计划，不修改磁盘")
+    plan_parser.add_argument("--save-map", metavar="FILE",
+                             help=f"保存路径到新文件名的映射，供apply --map使用；扩展名为{COLUMNAR_MAP_SUFFIX}时保存为列式文件")
+    plan_parser.add_argument("--export", metavar="FILE", help="导出计划（.csv或.jsonl）")
+    plan_parser.add_argument("--limit", type=int, default=500, help="最多列出的操作数量（默认500）")
+
+    apply_parser = subparsers.add_parser("apply", parents=[common], help="生成计划并执行重命名")
+    apply_parser.add_argument("--backup", choices=["journal", "auto", "hardlink", "reflink", "copy", "none"],
+                              help="备份模式，默认使用设置中的值")
+    apply_parser.add_argument("--backup-dir", help="快照目录，默认使用设置中的值")
+    apply_parser.add_argument("--journal-dir", help="重命名日志目录，默认保存在配置目录中")
+
+    # 守护进程地址参数
+    address = argparse.ArgumentParser(add_help=False)
+    address.add_argument("--host", default="127.0.0.1", help="守护进程地址（默认127.0.0.1）")
+    address.add_argument("--port", type=int, default=8770, help="守护进程端口（默认8770）")
+    address.add_argument("--socket", metavar="PATH", help="使用Unix套接字代替TCP端口")
+    address.add_argument("--token-file", metavar="FILE", help="访问令牌文件，默认保存在配置目录中")
+
+    serve_parser = subparsers.add_parser("serve", parents=[address], help="以守护进程方式运行，接收JSON任务")
+    serve_parser.add_argument("--workers", type=int, default=2, help="同时执行的任务数量（默认2）")
+    serve_parser.add_argument("--max-requests", type=int, default=8, help="同时进行的AI请求总数上限（默认8）")
+    serve_parser.add_argument("--db", metavar="FILE", help="任务数据库，默认保存在配置目录中")
+    serve_parser.add_argument("--journal-dir", help="重命名日志目录，默认保存在配置目录中")
+
+    submit_parser = subparsers.add_parser("submit", parents=[common, address], help="向守护进程提交任务")
+    submit_parser.add_argument("--apply", action="store_true", help="生成计划后执行重命名")
+    submit_parser.add_argument("--backup", choices=["journal", "auto", "hardlink", "reflink", "copy", "none"],
+                               help="备份模式，默认使用守护进程设置中的值")
+    submit_parser.add_argument("--wait", action="store_true", help="等待任务结束，退出码与任务结果一致")
+
+    status_parser = subparsers.add_parser("status", parents=[address], help="查看守护进程或任务的状态")
+    status_parser.add_argument("job_id", nargs="?", type=int, help="任务ID，省略时显示最近的任务")
+    status_parser.add_argument("--json", action="store_true", help="以JSON格式输出结果")
+
+    # 规则来源参数
+    rule_source = argparse.ArgumentParser(add_help=False)
+    rule_source.add_argument("-e", "--example", nargs=2, action="append", default=[], metavar=("ORIGINAL", "NEW"),
+                             help="命名示例，可重复指定")
+    rule_source.add_argument("--examples", metavar="FILE", help="示例文件，格式同plan")
+    rule_source.add_argument("--history", nargs="?", type=int, const=-1, metavar="ID",
+                             help="使用图形界面会话中的分析结果作为示例，省略ID时使用当前显示的结果")
+
+    learn_parser = subparsers.add_parser("learn", parents=[rule_source], help="从示例归纳本地重命名规则")
+    learn_parser.add_argument("-o", "--output", metavar="FILE", help="保存规则，供watch --rule使用")
+    learn_parser.add_argument("--json", action="store_true", help="以JSON格式输出规则")
+
+    watch_parser = subparsers.add_parser("watch", parents=[rule_source],
+                                         help="监视收件文件夹，按规则重命名新到达的文件")
+    watch_parser.add_argument("inbox", help="收件文件夹")
+    watch_parser.add_argument("--rule", metavar="FILE", help="learn -o保存的规则")
+    watch_parser.add_argument("--window", type=float, default=1.0, help="合并新文件的时间窗口（秒，默认1）")
+    watch_parser.add_argument("--stable", type=float, default=2.0,
+                              help="文件保持不变多久视为已写完（秒，默认2）")
+    watch_parser.add_argument("--no-ai", action="store_true", help="规则无法应用时不调用AI，保留原名")
+    watch_parser.add_argument("--existing", action="store_true", help="同时处理启动时已有的文件")
+    watch_parser.add_argument("--backend", choices=["auto", "inotify", "polling"], default="auto",
+                              help="文件夹监视后端（默认auto）")
+    watch_parser.add_argument("--journal-dir", help="重命名日志目录，默认保存在配置目录中")
+
+    undo_parser = subparsers.add_parser("undo", help="根据重命名日志撤销最近一次重命名")
+    undo_parser.add_argument("--journal-dir", help="重命名日志目录，默认保存在配置目录中")
+    undo_parser.add_argument("--json", action="store_true", help="以JSON格式输出结果")
+
+    return parser
+
+def load_examples(inline_examples, examples_file=None):
+    """
+    读取命名示例
+
+    Args:
+        inline_examples (list): 命令行给出的 [原文件名, 新文件名] 列表
+        examples_file (str, optional): 示例文件路径
+
+    Returns:
+        list: 示例列表，每个元素是包含original_name和new_name的字典
+    """
+    from models.rename_model import RenameModel
+
+    model = RenameModel()
+    if examples_file:
+        try:
+            with open(examples_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except OSError as e:
+            raise CommandError(f"无法读取示例文件: {str(e)}", EXIT_USAGE)
+
+        try:
+            data = json.loads(content)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            pairs = data.items()
+        elif isinstance(data, list):
+            pairs = [(item.get('original_name'), item.get('new_name')) for item in data if isinstance(item, dict)]
+        else:
+            pairs = [line.split('\t', 1) for line in content.splitlines() if '\t' in line]
+        for original_name, new_name in pairs:
+            model.add_example(str(original_name or '').strip(), str(new_name or '').strip(), emit_signal=False)
+
+    for original_name, new_name in inline_examples:
+        model.add_example(original_name, new_name, emit_signal=False)
+
+    return model.get_example_list()
+
+def collect_files(paths, recursive=True, include_patterns=None, exclude_patterns=None):
+    """
+    扫描路径，收集需要重命名的文件
+
+    Args:
+        paths (list): 文件或文件夹路径列表
+        recursive (bool): 是否递归导入文件夹内容
+        include_patterns (list): 包含的通配符列表
+        exclude_patterns (list): 排除的通配符列表
+
+    Returns:
+        list: 文件条目列表，每个元素是包含name、path和is_folder的字典
+    """
+    from utils.file_scanner import FileScanner, ScanOptions
+
+    options = ScanOptions(recursive=recursive, include_patterns=include_patterns, exclude_patterns=exclude_patterns)
+    paths = [os.path.abspath(path) for path in paths]
+    return [entry for entry in FileScanner(options).scan(paths)
+            if recursive is False or not entry['is_folder']]
+
+def group_files(files, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    按所在文件夹分组，每组最多batch_size个文件
+
+    同一文件夹内文件名唯一，AI按文件名返回的结果可以直接对应到路径。
+
+    Args:
+        files (list): 文件条目列表
+        batch_size (int): 每组最多包含的文件数
+
+    Returns:
+        list: 文件条目列表的列表
+    """
+    by_dir = {}
+    for entry in files:
+        by_dir.setdefault(os.path.dirname(entry['path']), []).append(entry)
+
+    batch_size = max(1, batch_size)
+    batches = []
+    for entries in by_dir.values():
+        for start in range(0, len(entries), batch_size):
+            batches.append(entries[start:start + batch_size])
+    return batches
+
+async def analyze_batches(ai_client, batches, examples, jobs=4, progress=None):
+    """
+    并发分析所有分组，同时进行的请求不超过jobs个，共用AI客户端的连接池
+
+    Args:
+        ai_client (AIClient): AI客户端
+        batches (list): group_files()的结果
+        examples (list): 示例列表
+        jobs (int): 最多同时进行的请求数量
+        progress (callable, optional): 每完成一组调用一次，参数为(已完成组数, 总组数)
+
+    Returns:
+        tuple: (重命名对列表 [(源路径, 新文件名)], 错误消息列表)
+    """
+    semaphore = asyncio.Semaphore(max(1, jobs))
+    done = 0
+
+    async def analyze_one(batch):
+        nonlocal done
+        async with semaphore:
+            result = await ai_client.analyze_naming_pattern(batch, examples)
+        done += 1
+        if progress:
+            progress(done, len(batches))
+        return batch, result
+
+    rename_pairs = []
+    errors = []
+    for batch, result in await asyncio.gather(*(analyze_one(batch) for batch in batches)):
+        if 'rename_map' not in result:
+            errors.append(result.get('error') or "分析失败")
+            continue
+        paths = {entry['name']: entry['path'] for entry in batch}
+        for original_name, new_name in result['rename_map'].items():
+            if original_name in paths:
+                rename_pairs.append((paths[original_name], new_name))
+    return rename_pairs, errors
+
+def load_map(map_file):
+    """
+    读取保存的映射
+
+    Args:
+        map_file (str): 映射文件路径，内容为路径到新文件名的JSON对象，或save_map()保存的列式文件
+
+    Returns:
+        list: 重命名对列表 [(源路径, 新文件名)]
+    """
+    from utils.columnar_store import ColumnarFileStore
+
+    try:
+        with open(map_file, 'rb') as f:
+            is_columnar = f.read(len(ColumnarFileStore.MAGIC)) == ColumnarFileStore.MAGIC
+        if is_columnar:
+            # 各列直接映射，只在遍历时读取需要的部分
+            store = ColumnarFileStore.load(map_file)
+            return list(store.iter_rename_pairs())
+        with open(map_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise CommandError(f"无法读取映射文件: {str(e)}", EXIT_USAGE)
+    if not isinstance(data, dict):
+        raise CommandError("映射文件格式错误，应为路径到新文件名的JSON对象", EXIT_USAGE)
+    return [(os.path.abspath(path), new_name) for path, new_name in data.items()]
+
+def save_map(map_file, rename_pairs):
+    """
+    保存有变化的重命名对
+
+    扩展名为COLUMNAR_MAP_SUFFIX时保存为列式文件：文件夹和文件名去重后只存一份，
+    各列按原始数据写入，读取时不需要解析每个条目；其他扩展名保存为JSON对象。
+
+    Args:
+        map_file (str): 映射文件路径
+        rename_pairs (list): 重命名对列表 [(源路径, 新文件名)]
+    """
+    changed = [(path, new_name) for path, new_name in rename_pairs if os.path.basename(path) != new_name]
+    if map_file.endswith(COLUMNAR_MAP_SUFFIX):
+        from utils.columnar_store import ColumnarFileStore
+
+        store = ColumnarFileStore()
+        for path, new_name in changed:
+            store.set_new_name(store.add_path(path, check_duplicates=False), new_name)
+        store.save(map_file)
+        return
+
+    with open(map_file, 'w', encoding='utf-8') as f:
+        json.dump(dict(changed), f, ensure_ascii=False, indent=2)
+
+def create_controllers(journal_dir=None):
+    """
+    创建无界面的控制器，使用与图形界面相同的配置和重命名日志目录
+
+    Returns:
+        tuple: (SettingsController, RenameController)
+    """
+    from PySide6.QtCore import QCoreApplication
+    from utils.config_manager import ConfigManager
+    from controllers.settings_controller import SettingsController
+    from controllers.rename_controller import RenameController
+
+    # 与图形界面使用相同的QSettings位置
+    QCoreApplication.setApplicationName("GY_Rename")
+    QCoreApplication.setOrganizationName("GY")
+
+    config_manager = ConfigManager()
+    settings_controller = SettingsController(config_manager)
+    rename_controller = RenameController(config_manager)
+    rename_controller.journal_dir = journal_dir or os.path.join(
+        settings_controller.get_config_directory(), "journal")
+    # 无界面模式直接使用分析结果，不为每个批次在重命名模型中生成历史记录
+    rename_controller.ai_client.analysis_completed.disconnect(rename_controller._on_analysis_completed)
+    return settings_controller, rename_controller
+
+def _log(message):
+    print(message, file=sys.stderr)
+
+def _output(args, data, text):
+    if args.json:
+        print(json.dumps(data, ensure_ascii=False))
+    else:
+        print(text)
+
+async def run_in_thread(func, *args):
+    """
+    在线程池中执行阻塞的函数，不阻塞事件循环
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+async def make_plan(analyzer, paths, examples=None, rename_pairs=None, recursive=True, include_patterns=None,
+                    exclude_patterns=None, batch_size=DEFAULT_BATCH_SIZE, jobs=4, progress=None):
+    """
+    扫描文件并生成重命名计划，给出rename_pairs时直接使用保存的映射
+
+    扫描和生成计划在线程中进行，不阻塞事件循环。
+
+    Args:
+        analyzer: 提供analyze_naming_pattern(files, examples)协程的对象，通常是AIClient
+        paths (list): 文件或文件夹路径列表
+        examples (list): 示例列表
+        rename_pairs (list, optional): 保存的重命名对，只保留位于paths下的条目
+        recursive (bool): 是否递归导入文件夹内容
+        include_patterns (list): 包含的通配符列表
+        exclude_patterns (list): 排除的通配符列表
+        batch_size (int): 每次AI请求最多包含的文件数
+        jobs (int): 最多同时进行的AI请求数量
+        progress (callable, optional): 进度回调，参数为一行进度文本
+
+    Returns:
+        tuple: (RenamePlan, 重命名对列表)
+    """
+    from utils.rename_planner import RenamePlanner
+
+    if rename_pairs is not None:
+        # 只处理位于给定路径下的条目
+        roots = [os.path.abspath(path) for path in paths]
+        rename_pairs = [(path, new_name) for path, new_name in rename_pairs
+                        if any(path == root or path.startswith(os.path.join(root, '')) for root in roots)]
+        if not rename_pairs:
+            raise CommandError("映射中没有需要重命名的文件", EXIT_NO_FILES)
+        return await run_in_thread(RenamePlanner.plan, rename_pairs), rename_pairs
+
+    if not examples:
+        raise CommandError("没有命名示例，请使用 -e 或 --examples 提供示例", EXIT_USAGE)
+
+    files = await run_in_thread(collect_files, paths, recursive, include_patterns, exclude_patterns)
+    if not files:
+        raise CommandError("没有找到需要处理的文件", EXIT_NO_FILES)
+
+    batches = group_files(files, batch_size)
+    if progress:
+        progress(f"共 {len(files)} 个文件，分 {len(batches)} 组分析")
+    rename_pairs, errors = await analyze_batches(
+        analyzer, batches, examples, jobs,
+        (lambda done, total: progress(f"已分析 {done}/{total} 组")) if progress else None)
+    if errors:
+        raise CommandError(f"{len(errors)} 组分析失败: {errors[0]}", EXIT_ANALYSIS_FAILED)
+    return await run_in_thread(RenamePlanner.plan, rename_pairs), rename_pairs
+
+def build_plan(args, rename_controller):
+    """
+    按命令行参数生成重命名计划，提供--map时直接使用保存的映射
+
+    Returns:
+        tuple: (RenamePlan, 重命名对列表)
+    """
+    if args.map:
+        rename_pairs, examples = load_map(args.map), None
+    else:
+        rename_pairs, examples = None, load_examples(args.example, args.examples)
+    ai_client = rename_controller.ai_client
+
+    async def run():
+        try:
+            return await make_plan(ai_client, args.paths, examples, rename_pairs, not args.no_recursive,
+                                   args.include, args.exclude, args.batch_size, args.jobs, _log)
+        finally:
+            await ai_client.aclose()
+
+    return asyncio.run(run())
+
+def cmd_plan(args):
+    _, rename_controller = create_controllers()
+    plan, rename_pairs = build_plan(args, rename_controller)
+
+    if args.save_map:
+        save_map(args.save_map, rename_pairs)
+    if args.export:
+        success, message = plan.export(args.export)
+        if not success:
+            raise CommandError(message)
+
+    _output(args, {'summary': plan.summary(), 'operations': [op.to_dict() for op in plan.get_operations()]},
+            plan.format_summary() + "\n\n" + plan.format_details(args.limit))
+    return EXIT_PROBLEMS if plan.get_problems() else EXIT_OK
+
+def cmd_apply(args):
+    settings_controller, rename_controller = create_controllers(args.journal_dir)
+    plan, _ = build_plan(args, rename_controller)
+
+    backup_mode = args.backup or settings_controller.get_setting('rename.backup_mode', 'journal')
+    backup_dir = args.backup_dir or settings_controller.get_setting('rename.backup_directory', 'backup')
+    result = rename_controller.apply_rename(plan, None if backup_mode == 'none' else backup_mode, backup_dir)
+
+    errors = result.get('errors') or []
+    _output(args, {'success': result.get('success', False), 'count': result.get('count', 0),
+                   'errors': [list(error) for error in errors], 'journal': result.get('journal'),
+                   'summary': plan.summary()},
+            result.get('error') or f"已重命名 {result.get('count', 0)} 个文件，失败 {len(errors)} 个")
+    return EXIT_OK if result.get('success') and not errors else EXIT_FAILED
+
+def cmd_undo(args):
+    _, rename_controller = create_controllers(args.journal_dir)
+    result = rename_controller.undo_last_rename()
+
+    errors = result.get('errors') or []
+    _output(args, {'success': result.get('success', False), 'count': result.get('count', 0),
+                   'errors': [list(error) for error in errors], 'journal': result.get('journal')},
+            result.get('error') or f"已撤销 {result.get('count', 0)} 个文件，失败 {len(errors)} 个")
+    return EXIT_OK if result.get('success') and not errors else EXIT_FAILED
+
+def cmd_serve(args):
+    from daemon import RenameDaemon
+
+    daemon = RenameDaemon(args.db, args.workers, args.max_requests, args.journal_dir, token_file=args.token_file)
+    try:
+        asyncio.run(daemon.serve(args.host, args.port, args.socket,
+                                 lambda address: _log(f"守护进程已启动: {address}")))
+    except OSError as e:
+        raise CommandError(f"无法监听: {str(e)}", EXIT_UNAVAILABLE)
+    return EXIT_OK
+
+def _daemon_client(args):
+    from daemon import DaemonClient
+    return DaemonClient(args.host, args.port, args.socket, token_file=args.token_file)
+
+def _format_job(job):
+    line = f"任务 {job['id']}: {job['status']}"
+    if job.get('error'):
+        line += f" ({job['error']})"
+    result = job.get('result') or {}
+    if 'count' in result:
+        line += f"，已重命名 {result['count']} 个文件，失败 {len(result.get('errors') or [])} 个"
+    elif 'summary' in result:
+        line += f"，共 {result['summary']['total']} 个文件，将重命名 {result['summary']['executable']} 个"
+    return line
+
+def cmd_submit(args):
+    # 路径、示例和映射在客户端解析为绝对路径和JSON，守护进程不依赖客户端的工作目录
+    request = {
+        'paths': [os.path.abspath(path) for path in args.paths],
+        'options': {'recursive': not args.no_recursive, 'include': args.include, 'exclude': args.exclude,
+                    'batch_size': args.batch_size, 'jobs': args.jobs, 'apply': args.apply,
+                    'backup': args.backup}
+    }
+    if args.map:
+        request['map'] = dict(load_map(args.map))
+    else:
+        request['examples'] = load_examples(args.example, args.examples)
+
+    client = _daemon_client(args)
+    try:
+        job_id = client.submit(request)
+        if not args.wait:
+            _output(args, {'id': job_id, 'status': 'queued'}, f"已提交任务 {job_id}")
+            return EXIT_OK
+        job = client.wait(job_id)
+    except OSError as e:
+        raise CommandError(f"无法连接守护进程: {str(e)}", EXIT_UNAVAILABLE)
+    if job is None:
+        raise CommandError(f"任务 {job_id} 不存在")
+
+    _output(args, job, _format_job(job))
+    return job['exit_code'] if job.get('exit_code') is not None else EXIT_FAILED
+
+def cmd_status(args):
+    client = _daemon_client(args)
+    try:
+        if args.job_id is None:
+            health = client.health()
+            jobs = client.list_jobs(20)
+        else:
+            job = client.get(args.job_id)
+    except OSError as e:
+        raise CommandError(f"无法连接守护进程: {str(e)}", EXIT_UNAVAILABLE)
+
+    if args.job_id is not None:
+        if job is None:
+            raise CommandError(f"任务 {args.job_id} 不存在", EXIT_USAGE)
+        _output(args, job, _format_job(job))
+        return EXIT_OK
+
+    text = "\n".join([f"任务: {health['jobs']}，缓存命中 {health['cache']['hits']} 次，"
+                      f"请求 {health['cache']['misses']} 次"] + [_format_job(job) for job in jobs])
+    _output(args, {'health': health, 'jobs': jobs}, text)
+    return EXIT_OK
+
+def load_history_pairs(config_dir, history_id=-1):
+    """
+    从图形界面的会话数据库读取一条分析结果
+
+    Args:
+        config_dir (str): 配置目录
+        history_id (int): 历史记录ID，-1表示当前显示的记录
+
+    Returns:
+        list: (原文件名, 新文件名) 列表
+    """
+    from utils.session_store import SessionStore
+
+    db_path = os.path.join(config_dir, "session.sqlite3")
+    if not os.path.exists(db_path):
+        raise CommandError("没有找到会话数据库，请先在图形界面中完成一次分析", EXIT_USAGE)
+
+    store = SessionStore(db_path)
+    try:
+        if history_id == -1:
+            history_ids = [entry[0] for entry in store.list_history()]
+            index = store.get_value('current_index', -1)
+            if not history_ids:
+                raise CommandError("会话中没有分析结果", EXIT_USAGE)
+            history_id = history_ids[index if -len(history_ids) <= index < len(history_ids) else -1]
+        history = store.load_history(history_id)
+    finally:
+        store.close()
+
+    if history is None:
+        raise CommandError(f"历史记录 {history_id} 不存在", EXIT_USAGE)
+    return list(history['rename_map'].items())
+
+def load_rule_source(args, settings_controller):
+    """
+    按--rule、--history或示例参数得到规则和AI分析用的示例
+
+    Returns:
+        tuple: (RenameRule或None, 示例列表)
+    """
+    from utils.rename_rule import RenameRule
+
+    rule = None
+    if getattr(args, 'rule', None):
+        try:
+            with open(args.rule, 'r', encoding='utf-8') as f:
+                rule = RenameRule.from_dict(json.load(f))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"无法读取规则文件: {str(e)}", EXIT_USAGE)
+        pairs = rule.examples
+    elif args.history is not None:
+        pairs = load_history_pairs(settings_controller.get_config_directory(), args.history)
+    else:
+        pairs = [(example['original_name'], example['new_name'])
+                 for example in load_examples(args.example, args.examples)]
+
+    if rule is None and pairs:
+        rule = RenameRule.induce(pairs)
+
+    # AI分析只需要少量有变化的示例
+    changed = [(original, new) for original, new in pairs if original != new]
+    examples = load_examples(changed[:RenameRule.MAX_SAVED_EXAMPLES])
+    return rule, examples
+
+def cmd_learn(args):
+    settings_controller, _ = create_controllers()
+    rule, examples = load_rule_source(args, settings_controller)
+    if not examples:
+        raise CommandError("没有命名示例，请使用 -e、--examples 或 --history 提供示例", EXIT_USAGE)
+    if rule is None:
+        raise CommandError("无法从示例归纳出规则，watch时将调用AI分析", EXIT_NO_RULE)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(rule.to_dict(), f, ensure_ascii=False, indent=2)
+    _output(args, rule.to_dict(), rule.describe())
+    return EXIT_OK
+
+def cmd_watch(args):
+    from watch import WatchRenamer
+
+    if not os.path.isdir(args.inbox):
+        raise CommandError(f"文件夹不存在: {args.inbox}", EXIT_USAGE)
+    settings_controller, rename_controller = create_controllers(args.journal_dir)
+    rule, examples = load_rule_source(args, settings_controller)
+    if rule is None and (args.no_ai or not examples):
+        raise CommandError("没有可用的规则或示例", EXIT_NO_RULE)
+    _log(f"规则: {rule.describe()}" if rule else "无法归纳出规则，所有文件将调用AI分析")
+
+    renamer = WatchRenamer(args.inbox, rename_controller, rule, examples, args.window, args.stable,
+                           not args.no_ai, args.backend)
+
+    def on_batch(count, result):
+        renamed = result.get('count', 0) if result else 0
+        _log(f"处理 {count} 个文件，重命名 {renamed} 个，累计: {renamer.stats}")
+
+    async def run():
+        # 收到SIGTERM时正常退出（Windows不支持）
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except (NotImplementedError, AttributeError):
+            pass
+        try:
+            await renamer.run(args.existing, on_batch)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await rename_controller.ai_client.aclose()
+        _log(f"已停止，累计: {renamer.stats}")
+
+    _log(f"正在监视 {os.path.abspath(args.inbox)}")
+    try:
+        asyncio.run(run())
+    except OSError as e:
+        raise CommandError(str(e))
+    return EXIT_OK
+
+COMMANDS = {
+    'plan': cmd_plan,
+    'apply': cmd_apply,
+    'undo': cmd_undo,
+    'serve': cmd_serve,
+    'submit': cmd_submit,
+    'status': cmd_status,
+    'learn': cmd_learn,
+    'watch': cmd_watch,
+}
+
+def main(argv=None):
+    """
+    命令行主入口
+
+    Args:
+        argv (list, optional): 命令行参数，默认使用sys.argv
+
+    Returns:
+        int: 退出码
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return COMMANDS[args.command](args)
+    except CommandError as e:
+        _log(str(e))
+        return e.exit_code
+    except KeyboardInterrupt:
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,126 @@
 # -*- coding: utf-8 -*-
 
 import os
-from PySide6.QtCore import QObject, Signal, Slot
+import time
+import threading
+from collections import deque
+from PySide6.QtCore import QObject, Signal, Slot, QThread, QTimer
 from PySide6.QtWidgets import QFileDialog
 
 from models.file_model import FileModel, FileItem
+from utils.file_scanner import FileScanner, ScanOptions
+from utils.directory_watcher import (
+    DirectoryWatcher, EVENT_ADDED, EVENT_REMOVED, EVENT_RENAMED, EVENT_OVERFLOW
+)
+
+class FileImportWorker(QObject):
+    """
+    文件导入工作对象，在后台线程中扫描路径并分块发出文件条目
+    """
+    
+    # 定义信号
+    chunk_ready = Signal(list)  # 一块文件条目
+    rejected = Signal(str)      # 导入被拒绝，参数为原因
+    finished = Signal(int)      # 扫描结束，参数为条目总数
+    
+    # 最多允许积压的未处理块数，避免扫描速度远超界面处理速度时占用大量内存
+    MAX_PENDING_CHUNKS = 4
+    
+    def __init__(self, paths, options=None, chunk_size=200, reject_mixed=False):
+        """
+        初始化文件导入工作对象
+        
+        Args:
+            paths (list): 文件或文件夹路径列表
+            options (ScanOptions, optional): 扫描选项
+            chunk_size (int): 每块的条目数量
+            reject_mixed (bool): 路径中同时包含文件和文件夹时是否拒绝导入
+        """
+        super().__init__()
+        self.paths = list(paths)
+        self.chunk_size = chunk_size
+        self.reject_mixed = reject_mixed
+        self.scanner = FileScanner(options)
+        self._pending = threading.Semaphore(self.MAX_PENDING_CHUNKS)
+    
+    @Slot()
+    def run(self):
+        """
+        执行扫描
+        """
+        # 在后台线程中批量判断路径类型，界面线程不做任何文件系统调用
+        stats = self.scanner.stat_paths(self.paths)
+        if self.reject_mixed and len(set(is_folder for _, is_folder in stats)) > 1:
+            self.rejected.emit("请不要在一次重命名中导入一种以上类型的文件")
+            self.finished.emit(0)
+            return
+        
+        count = 0
+        for chunk in self.scanner.scan_chunks(self.paths, self.chunk_size, stats=stats):
+            # 等待界面处理完积压的块，期间仍可响应取消
+            while not self._pending.acquire(timeout=0.1):
+                if self.scanner.is_cancelled():
+                    break
+            if self.scanner.is_cancelled():
+                break
+            
+            count += len(chunk)
+            self.chunk_ready.emit(chunk)
+        
+        self.finished.emit(count)
+    
+    def chunk_processed(self):
+        """
+        界面处理完一块后调用，允许继续发出下一块
+        """
+        self._pending.release()
+    
+    def cancel(self):
+        """
+        取消扫描
+        """
+        self.scanner.cancel()
+
+class FileWatchWorker(QObject):
+    """
+    文件夹监视工作对象，在后台线程中读取文件夹变化事件
+    """
+    
+    # 定义信号
+    changes_detected = Signal(list)  # 变化事件列表
+    finished = Signal()
+    
+    def __init__(self, watcher):
+        """
+        初始化文件夹监视工作对象
+        
+        Args:
+            watcher (DirectoryWatcher): 文件夹监视器
+        """
+        super().__init__()
+        self.watcher = watcher
+        self._stopped = threading.Event()
+    
+    @Slot()
+    def run(self):
+        """
+        循环读取变化事件，直到停止
+        """
+        try:
+            while not self._stopped.is_set():
+                events = self.watcher.read_events(0.5)
+                if events and not self._stopped.is_set():
+                    self.changes_detected.emit(events)
+        finally:
+            # 在读取事件的线程中关闭，避免关闭正在等待的文件描述符
+            self.watcher.close()
+            self.finished.emit()
+    
+    def stop(self):
+        """
+        停止监视
+        """
+        self._stopped.set()
 
 class FileController(QObject):
     """
@@ -14,8 +130,22 @@ class FileController(QObject):
     
     # 定义信号
     files_added = Signal(list)  # 文件添加信号，参数为文件数据列表
-    file_removed = Signal(str)  # 文件移除信号，参数为文件名
+    files_removed = Signal(list)  # 文件移除信号，参数为被移除文件的数据字典列表，按行号从大到小排列
     files_cleared = Signal()    # 文件清空信号
+    import_started = Signal()   # 后台导入开始信号
+    import_progress = Signal(int, int)  # 后台导入进度信号，参数为已添加数量和总数（未知时为0）
+    import_finished = Signal(int)  # 后台导入完成信号，参数为已添加数量
+    import_rejected = Signal(str)  # 后台导入被拒绝信号，参数为原因
+    file_renamed = Signal(str, dict)  # 文件在外部被重命名或移动信号，参数为旧路径和新的文件数据
+    folder_renamed = Signal(str, str)  # 文件夹在外部被重命名信号，其中文件的路径已更新，参数为旧路径和新路径
+    files_stale = Signal(list)  # 分析结果已过期的文件ID列表
+    
+    # 后台扫描每块的条目数量
+    FEED_CHUNK_SIZE = 200
+    # 空闲时第一次添加的条目数量，之后按耗时调整，使首行尽快显示
+    FEED_FIRST_SLICE = 8
+    # 每次空闲时添加条目的时间预算（秒）
+    FEED_TIME_BUDGET = 0.03
     
     def __init__(self, config_manager, parent=None):
         """
@@ -29,10 +159,31 @@ class FileController(QObject):
         self.config_manager = config_manager
         self.file_model = FileModel(parent=self)
         
+        # 后台导入线程和工作对象
+        self._import_thread = None
+        self._import_worker = None
+        self._import_total = 0
+        self._import_fed = 0
+        self._import_scan_done = False
+        self._pending_chunks = deque()
+        self._feed_slice = self.FEED_FIRST_SLICE
+        
+        # 空闲定时器，每次事件循环空闲时向模型添加一块条目
+        self._feed_timer = QTimer(self)
+        self._feed_timer.setInterval(0)
+        self._feed_timer.timeout.connect(self._feed_next_chunk)
+        
+        # 文件夹监视
+        self._watcher = None
+        self._watch_thread = None
+        self._watch_worker = None
+        self._watched_dirs = set()
+        self._watch_roots = {}  # 递归导入的根文件夹 -> 对应的扫描器，用于判断新文件是否应加入
+        
+        self._removed_files = None  # 批量移除期间收集的文件数据
+        
         # 连接模型信号
-        self.file_model.fileAdded.connect(self._on_file_added)
-        self.file_model.fileRemoved.connect(self._on_file_removed)
-        self.file_model.filesChanged.connect(self._on_files_changed)
+        self.file_model.rowsRemoved.connect(self._on_rows_removed)
     
     @Slot(list)
     def add_files(self, paths):
@@ -48,140 +199,630 @@ class FileController(QObject):
         """
         file_dicts = []
         
-        # 处理每个路径
-        for path_item in paths:
-            try:
-                # 初始化变量
-                path = None
-                is_folder = False
-                
-                # 如果是字典，直接获取信息
-                if isinstance(path_item, dict):
-                    path = path_item.get('path', '')
-                    is_folder = path_item.get('is_folder', False)
-                    # 字典可能已经包含所有需要的信息
-                    if 'name' in path_item and 'path' in path_item:
-                        file_dicts.append(path_item)
-                        # 添加到模型
-                        self.file_model.add_file(path_item['path'], path_item['name'], is_folder=is_folder)
-                        continue
-                # 如果是QUrl，转换为本地路径
-                elif hasattr(path_item, 'toLocalFile'):
-                    path = path_item.toLocalFile()
-                else:
-                    path = path_item
-                
-                # 如果路径为空，跳过
-                if not path:
-                    continue
-                
-                # 判断是否是文件夹
-                if is_folder or os.path.isdir(path):
-                    # 添加文件夹本身
-                    folder_name = os.path.basename(path)
-                    file_item = {
-                        'name': folder_name,
-                        'path': path,
-                        'is_folder': True
-                    }
-                    file_dicts.append(file_item)
-                    # 添加到模型
-                    self.file_model.add_file(path, folder_name, is_folder=True)
+        # 批量添加，模型在结束时只发出一次合并后的行插入通知
+        with self.file_model.batch():
+            # 处理每个路径
+            for path_item in paths:
+                try:
+                    # 初始化变量
+                    path = None
+                    is_folder = False
                     
-                # 如果是文件
-                elif os.path.isfile(path):
-                    # 获取文件名和路径
-                    name = os.path.basename(path)
+                    # 如果是字典，直接获取信息
+                    if isinstance(path_item, dict):
+                        path = path_item.get('path', '')
+                        is_folder = path_item.get('is_folder', False)
+                        # 字典可能已经包含所有需要的信息
+                        if 'name' in path_item and 'path' in path_item:
+                            # 添加到模型，相同路径已存在时跳过
+                            file_item = self.file_model.add_file(path_item['path'], path_item['name'], is_folder=is_folder)
+                            if file_item:
+                                file_dicts.append(file_item.to_dict())
+                            continue
+                    # 如果是QUrl，转换为本地路径
+                    elif hasattr(path_item, 'toLocalFile'):
+                        path = path_item.toLocalFile()
+                    else:
+                        path = path_item
                     
-                    # 添加到模型
-                    file_item = self.file_model.add_file(path, name, is_folder=False)
+                    # 如果路径为空，跳过
+                    if not path:
+                        continue
                     
-                    # 如果成功添加，添加到结果列表
-                    if file_item:
-                        file_dicts.append(file_item.to_dict())
-            except Exception as e:
-                print(f"添加文件/文件夹时出错: {str(e)}")
-                continue
+                    # 判断是否是文件夹
+                    if is_folder or os.path.isdir(path):
+                        # 添加文件夹本身
+                        folder_name = os.path.basename(path)
+                        # 添加到模型
+                        file_item = self.file_model.add_file(path, folder_name, is_folder=True)
+                        if file_item:
+                            file_dicts.append(file_item.to_dict())
+                        
+                    # 如果是文件
+                    elif os.path.isfile(path):
+                        # 获取文件名和路径
+                        name = os.path.basename(path)
+                        
+                        # 添加到模型
+                        file_item = self.file_model.add_file(path, name, is_folder=False)
+                        
+                        # 如果成功添加，添加到结果列表
+                        if file_item:
+                            file_dicts.append(file_item.to_dict())
+                except Exception as e:
+                    print(f"添加文件/文件夹时出错: {str(e)}")
+                    continue
         
         # 如果有文件添加，发出信号
         if file_dicts:
+            if self._watcher:
+                for file_dict in file_dicts:
+                    self._watch_directory(os.path.dirname(file_dict.get('path', '')))
             self.files_added.emit(file_dicts)
         
         return file_dicts
     
-    @Slot(str)
-    def remove_file(self, name):
+    def import_folders(self, paths, options=None):
+        """
+        在后台线程中递归导入文件夹内容，扫描结果分块添加到模型
+        
+        Args:
+            paths (list): 文件夹路径列表
+            options (dict or ScanOptions, optional): 扫描选项
+            
+        Returns:
+            bool: 如果成功启动导入返回True，已有导入进行中返回False
+        """
+        if not isinstance(options, ScanOptions):
+            options = ScanOptions.from_dict(options)
+        
+        if not self._start_import(paths, options):
+            return False
+        
+        # 记录根文件夹，监视时新出现的文件按相同条件加入
+        for path in paths:
+            root = os.path.normpath(path)
+            self._watch_roots[root] = FileScanner(options)
+            self._watch_directory(root)
+        
+        return True
+    
+    @Slot(list)
+    def import_dropped_paths(self, paths):
+        """
+        在后台导入拖放的文件或文件夹，文件夹作为单个条目添加
+        
+        Args:
+            paths (list): 本地路径列表
+            
+        Returns:
+            bool: 如果成功启动导入返回True，已有导入进行中返回False
+        """
+        options = ScanOptions(recursive=False)
+        return self._start_import(paths, options, reject_mixed=True, total=len(paths))
+    
+    def _start_import(self, paths, options, reject_mixed=False, total=0):
+        """
+        启动后台导入
+        
+        Args:
+            paths (list): 路径列表
+            options (ScanOptions): 扫描选项
+            reject_mixed (bool): 同时包含文件和文件夹时是否拒绝导入
+            total (int): 预计条目总数，未知时为0
+            
+        Returns:
+            bool: 如果成功启动导入返回True，已有导入进行中返回False
+        """
+        if self.is_importing():
+            return False
+        
+        worker = FileImportWorker(paths, options, self.FEED_CHUNK_SIZE, reject_mixed)
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        
+        # 工作对象在后台线程中运行，信号以队列方式回到主线程
+        thread.started.connect(worker.run)
+        worker.chunk_ready.connect(self._on_import_chunk)
+        worker.rejected.connect(self.import_rejected)
+        worker.finished.connect(self._on_import_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        
+        self._import_thread = thread
+        self._import_worker = worker
+        self._import_total = total
+        self._import_fed = 0
+        self._import_scan_done = False
+        self._pending_chunks.clear()
+        self._feed_slice = self.FEED_FIRST_SLICE
+        
+        self.import_started.emit()
+        thread.start()
+        
+        return True
+    
+    @Slot()
+    def cancel_import(self):
+        """
+        取消正在进行的后台导入，已添加的条目保留
+        """
+        if not self._import_worker:
+            return
+        
+        self._import_worker.cancel()
+        self._pending_chunks.clear()
+        
+        # 扫描已结束时直接完成，否则等待工作对象退出
+        if self._import_scan_done:
+            self._finish_import()
+    
+    def is_importing(self):
+        """
+        检查是否有后台导入正在进行
+        
+        Returns:
+            bool: 正在导入返回True
+        """
+        return self._import_worker is not None
+    
+    def _on_import_chunk(self, chunk):
+        """
+        接收后台导入的一块文件条目，留待空闲时添加
+        
+        Args:
+            chunk (list): 文件条目列表
+        """
+        worker = self._import_worker
+        if not worker or worker.scanner.is_cancelled():
+            return
+        
+        self._pending_chunks.append(chunk)
+        if not self._feed_timer.isActive():
+            self._feed_timer.start()
+    
+    def _feed_next_chunk(self):
+        """
+        向模型添加一小段条目，每次只占用一个时间预算以保持界面响应
+        """
+        if not self._pending_chunks:
+            self._feed_timer.stop()
+            if self._import_scan_done:
+                self._finish_import()
+            return
+        
+        chunk = self._pending_chunks[0]
+        size = self._feed_slice
+        part = chunk[:size]
+        if len(chunk) > size:
+            self._pending_chunks[0] = chunk[size:]
+        else:
+            # 整块处理完后才允许后台继续发出新块
+            self._pending_chunks.popleft()
+            if self._import_worker:
+                self._import_worker.chunk_processed()
+        
+        start_time = time.perf_counter()
+        try:
+            self.add_files(part)
+        finally:
+            self._import_fed += len(part)
+        elapsed = time.perf_counter() - start_time
+        
+        # 根据本次耗时调整下一段的大小，使每次处理时间接近预算
+        if elapsed > 0:
+            self._feed_slice = max(1, min(self.FEED_CHUNK_SIZE,
+                                          int(size * self.FEED_TIME_BUDGET / elapsed)))
+        else:
+            self._feed_slice = self.FEED_CHUNK_SIZE
+        
+        self.import_progress.emit(self._import_fed, self._import_total)
+    
+    def _on_import_finished(self, count):
+        """
+        后台扫描结束处理，剩余的块添加完后完成导入
+        
+        Args:
+            count (int): 扫描的条目总数
+        """
+        self._import_scan_done = True
+        if not self._pending_chunks:
+            self._finish_import()
+    
+    def _finish_import(self):
+        """
+        完成导入并重置导入状态
+        """
+        if not self._import_worker:
+            return
+        
+        self._feed_timer.stop()
+        self._pending_chunks.clear()
+        self._import_worker = None
+        self._import_thread = None
+        self.import_finished.emit(self._import_fed)
+    
+    def start_watching(self, backend='auto', poll_interval=2.0):
+        """
+        开始监视已导入文件所在的文件夹，外部的增删和重命名会增量应用到模型
+        
+        Args:
+            backend (str): 监视后端，auto/inotify/polling
+            poll_interval (float): 轮询后端的检查间隔（秒）
+            
+        Returns:
+            bool: 成功启动返回True
+        """
+        if self._watcher:
+            return True
+        
+        try:
+            self._watcher = DirectoryWatcher.create(backend, poll_interval)
+        except OSError as e:
+            print(f"启动文件夹监视失败: {str(e)}")
+            return False
+        
+        worker = FileWatchWorker(self._watcher)
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        worker.changes_detected.connect(self._apply_watch_events)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        
+        self._watch_thread = thread
+        self._watch_worker = worker
+        
+        # 监视已有文件所在的文件夹和递归导入的根文件夹
+        self._watched_dirs.clear()
+        for file_item in self.file_model.get_files():
+            self._watch_directory(os.path.dirname(file_item.path))
+        for root in self._watch_roots:
+            self._watch_directory(root)
+        
+        thread.start()
+        return True
+    
+    def stop_watching(self):
+        """
+        停止监视文件夹
+        """
+        if not self._watcher:
+            return
+        
+        self._watch_worker.stop()
+        # 等待工作线程退出，最多等待一个读取周期
+        self._watch_thread.quit()
+        self._watch_thread.wait(2000)
+        
+        self._watcher = None
+        self._watch_thread = None
+        self._watch_worker = None
+        self._watched_dirs.clear()
+    
+    def is_watching(self):
+        """
+        检查是否正在监视文件夹
+        
+        Returns:
+            bool: 正在监视返回True
+        """
+        return self._watcher is not None
+    
+    def shutdown(self):
+        """
+        停止所有后台线程，在程序退出前调用
+        """
+        thread = self._import_thread
+        self.cancel_import()
+        if thread:
+            thread.quit()
+            thread.wait(2000)
+        self.stop_watching()
+    
+    def _watch_directory(self, dir_path):
+        """
+        把文件夹加入监视
+        
+        Args:
+            dir_path (str): 文件夹路径
+        """
+        if self._watcher and dir_path and dir_path not in self._watched_dirs:
+            if self._watcher.add_path(dir_path):
+                self._watched_dirs.add(dir_path)
+    
+    def _apply_watch_events(self, events):
+        """
+        把文件夹变化增量应用到模型
+        
+        Args:
+            events (list): WatchEvent列表
+        """
+        stale_ids = []
+        added_entries = []
+        
+        # 一次事件批次内的移除和重命名只通知视图一次
+        self.file_model.begin_batch()
+        try:
+            self._apply_watch_event_batch(events, stale_ids, added_entries)
+        finally:
+            self.file_model.end_batch()
+        
+        # 移除通知发出后再添加，视图不会把新文件和同名的旧文件混淆
+        if added_entries:
+            self.add_files(added_entries)
+        
+        if stale_ids:
+            self.files_stale.emit(stale_ids)
+    
+    def _apply_watch_event_batch(self, events, stale_ids, added_entries):
+        """
+        逐个应用事件，收集过期文件名和待添加的条目
+        
+        Args:
+            events (list): WatchEvent列表
+            stale_ids (list): 用于收集分析结果已过期的文件ID
+            added_entries (list): 用于收集待添加的文件条目
+        """
+        for event in events:
+            if event.kind == EVENT_REMOVED:
+                if event.is_folder:
+                    self._unwatch_tree(event.path)
+                for file_item in self._find_items(event.path, event.is_folder):
+                    self.file_model.remove_file_by_id(file_item.file_id)
+            
+            elif event.kind == EVENT_RENAMED:
+                stale_ids.extend(self._apply_external_rename(event))
+            
+            elif event.kind == EVENT_ADDED:
+                entry = self._accept_watched_entry(event.path, event.is_folder)
+                if entry:
+                    added_entries.append(entry)
+            
+            elif event.kind == EVENT_OVERFLOW:
+                # 事件丢失时只检查模型中的文件是否仍然存在，不重新扫描文件夹
+                for file_item in self.file_model.get_files():
+                    if not os.path.lexists(file_item.path):
+                        self.file_model.remove_file_by_id(file_item.file_id)
+    
+    def _apply_external_rename(self, event):
+        """
+        应用外部重命名
+        
+        Args:
+            event (WatchEvent): 重命名事件
+            
+        Returns:
+            list: 分析结果已过期的文件ID列表
+        """
+        if event.is_folder:
+            # 文件夹被重命名：更新其中文件的路径，并改为监视新位置
+            self._unwatch_tree(event.path)
+            moved = False
+            for file_item in self._find_items(event.path, True):
+                if file_item.path == event.path:
+                    continue
+                new_path = event.dest_path + file_item.path[len(event.path):]
+                self.file_model.set_file_path(file_item.file_id, new_path)
+                self._watch_directory(os.path.dirname(new_path))
+                moved = True
+            if moved:
+                self.folder_renamed.emit(event.path, event.dest_path)
+        
+        file_item = self._find_item(event.path)
+        if file_item is None:
+            # 模型中没有原文件，按新增处理
+            entry = self._accept_watched_entry(event.dest_path, event.is_folder)
+            if entry:
+                self.add_files([entry])
+            return []
+        
+        old_path = file_item.path
+        new_name = os.path.basename(event.dest_path)
+        if not self.file_model.set_file_path(file_item.file_id, event.dest_path) or \
+                not self.file_model.rename_file(file_item.file_id, new_name):
+            # 新路径已被模型中的其他文件占用，无法原位更新，改为移除
+            self.file_model.remove_file_by_id(file_item.file_id)
+            return []
+        
+        self._watch_directory(os.path.dirname(event.dest_path))
+        # 跨文件夹移动时旧路径与新路径不在同一文件夹，必须传递原来的路径
+        self.file_renamed.emit(old_path, file_item.to_dict())
+        
+        # 分析结果是按旧文件名生成的，已经过期
+        return [file_item.file_id]
+    
+    def _accept_watched_entry(self, path, is_folder):
+        """
+        检查外部新增的条目是否属于递归导入的根文件夹并满足导入条件
+        
+        Args:
+            path (str): 新增的路径
+            is_folder (bool): 是否为文件夹
+            
+        Returns:
+            dict: 需要加入模型的文件条目，不需要加入时返回None
+        """
+        # 逐级向上查找所属的根文件夹
+        root = os.path.dirname(path)
+        while root not in self._watch_roots:
+            parent = os.path.dirname(root)
+            if parent == root:
+                return None
+            root = parent
+        
+        scanner = self._watch_roots[root]
+        if not scanner.accepts(path, root, is_folder):
+            return None
+        
+        if is_folder:
+            # 新文件夹只需要监视，其中的文件出现时再加入
+            self._watch_directory(path)
+            return None
+        
+        return {'name': os.path.basename(path), 'path': path, 'is_folder': False}
+    
+    def _find_item(self, path):
+        """
+        按路径查找模型中的文件项
+        
+        Args:
+            path (str): 文件路径
+            
+        Returns:
+            FileItem: 文件项，不存在返回None
+        """
+        return self.file_model.get_file_by_path(path)
+    
+    def _find_items(self, path, include_children=False):
+        """
+        查找路径对应的文件项，可以包括文件夹中的所有文件项
+        
+        Args:
+            path (str): 文件或文件夹路径
+            include_children (bool): 是否包括文件夹中的文件项
+            
+        Returns:
+            list: 文件项列表
+        """
+        if include_children:
+            return self.file_model.get_files_under(path)
+        
+        file_item = self._find_item(path)
+        return [file_item] if file_item else []
+    
+    def _unwatch_tree(self, dir_path):
+        """
+        停止监视文件夹及其子文件夹
+        
+        Args:
+            dir_path (str): 文件夹路径
+        """
+        prefix = dir_path + os.sep
+        for watched in [d for d in self._watched_dirs if d == dir_path or d.startswith(prefix)]:
+            self._watched_dirs.discard(watched)
+            if self._watcher:
+                self._watcher.remove_path(watched)
+    
+    @Slot(int)
+    def remove_file(self, file_id):
         """
         移除文件
         
         Args:
-            name (str): 文件名
+            file_id (int): 文件ID
             
         Returns:
             bool: 如果成功移除返回True，否则返回False
         """
-        return self.file_model.remove_file(name)
+        return self.file_model.remove_file_by_id(file_id)
+    
+    @Slot(list)
+    def remove_files(self, file_ids):
+        """
+        批量移除文件，在一个模型批次中完成，结束时只发出一次files_removed
+        
+        不同文件夹中可以有同名文件，按文件ID移除，不会移除与选中文件同名的其他文件。
+        
+        Args:
+            file_ids (list): 文件ID列表
+            
+        Returns:
+            int: 移除的文件数量
+        """
+        self._removed_files = []
+        try:
+            with self.file_model.batch():
+                for file_id in file_ids:
+                    self.file_model.remove_file_by_id(file_id)
+        finally:
+            removed_files, self._removed_files = self._removed_files, None
+        
+        if removed_files:
+            self.files_removed.emit(removed_files)
+        return len(removed_files)
     
     @Slot()
     def clear_files(self):
         """
         清空所有文件
         """
+        self._watch_roots.clear()
+        for dir_path in list(self._watched_dirs):
+            self._unwatch_tree(dir_path)
         self.file_model.clear()
         self.files_cleared.emit()
     
     def get_files(self):
         """
-        获取所有文件数据
+        获取所有文件数据，文件没有变化时返回同一个列表，调用方不应修改
         
         Returns:
             list: 文件数据字典列表
         """
         return self.file_model.get_file_dicts()
     
-    def get_file(self, name):
+    def get_file_by_id(self, file_id):
         """
-        获取指定文件的数据
+        按文件ID获取文件数据
         
         Args:
-            name (str): 文件名
+            file_id (int): 文件ID
             
         Returns:
             dict: 文件数据字典，如果不存在返回None
         """
-        file_item = self.file_model.get_file(name)
+        file_item = self.file_model.get_file_by_id(file_id)
         if file_item:
             return file_item.to_dict()
         return None
     
-    # 私有方法，处理模型信号
-    def _on_file_added(self, file_item):
+    def get_files_by_name(self, name):
         """
-        文件添加事件处理
+        获取所有同名文件的数据
         
         Args:
-            file_item (FileItem): 添加的文件项
+            name (str): 文件名
+            
+        Returns:
+            list: 文件数据字典列表，按添加顺序排列
         """
-        pass
+        return [file_item.to_dict() for file_item in self.file_model.get_files_by_name(name)]
     
-    def _on_file_removed(self, name):
+    def get_file_by_path(self, path):
         """
-        文件移除事件处理
+        按路径获取文件数据
         
         Args:
-            name (str): 移除的文件名
+            path (str): 文件路径
+            
+        Returns:
+            dict: 文件数据字典，如果不存在返回None
         """
-        # 转发信号
-        self.file_removed.emit(name)
+        file_item = self.file_model.get_file_by_path(path)
+        if file_item:
+            return file_item.to_dict()
+        return None
     
-    def _on_files_changed(self, files):
+    # 私有方法，处理模型信号
+    def _on_rows_removed(self, first, last, items):
         """
-        文件列表变更事件处理
+        模型行区间移除事件处理，每个连续区间只转发一次
         
         Args:
-            files (list): 当前文件项列表
+            first (int): 第一行
+            last (int): 最后一行
+            items (list): 被移除的文件项列表
         """
-        pass
+        # 批量移除时收集起来，批次结束后合并为一次通知
+        file_dicts = [item.to_dict() for item in items]
+        if self._removed_files is not None:
+            self._removed_files.extend(file_dicts)
+        else:
+            self.files_removed.emit(file_dicts)
     
     def browse_files(self):
         """
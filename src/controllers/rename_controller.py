@@ -8,6 +8,9 @@ from PySide6.QtCore import QObject, Signal, Slot, QThreadPool, QRunnable, QObjec
 
 from models.rename_model import RenameModel
 from utils.ai_client import AIClient
+from utils.rename_planner import RenamePlanner
+from utils.rename_journal import RenameJournal
+from utils.file_operations import FileOperations
 
 class RenameController(QObject):
     """
@@ -16,6 +19,7 @@ class RenameController(QObject):
     
     # 定义信号
     example_updated = Signal(str, object)  # 示例更新信号，参数为文件名和新数据
+    example_edited = Signal(str, str)  # 示例文本被编辑信号，参数为原始文件名和新文件名
     analysis_started = Signal()  # 分析开始信号
     analysis_completed = Signal(dict)  # 分析完成信号，参数为分析结果
     analysis_failed = Signal(str)  # 分析失败信号，参数为错误消息
@@ -23,19 +27,26 @@ class RenameController(QObject):
     rename_started = Signal()  # 重命名开始信号
     rename_completed = Signal(dict)  # 重命名完成信号，参数为结果信息
     rename_failed = Signal(str)  # 重命名失败信号，参数为错误消息
+    rename_undone = Signal(dict)  # 撤销完成信号，参数为结果信息
+    examples_cleared = Signal()  # 示例清空信号
+    examples_removed = Signal(list)  # 示例批量移除信号，参数为原始文件名列表
     
-    def __init__(self, config_manager, parent=None):
+    def __init__(self, config_manager, file_index=None, parent=None):
         """
         初始化重命名控制器
         
         Args:
             config_manager: 配置管理器实例
+            file_index: 文件索引（通常是FileModel），需要提供get_files_by_name(name)，
+                        返回带path属性的文件项列表；为None时无法解析文件路径，plan_rename()返回None
             parent: 父对象
         """
         super().__init__(parent)
         self.config_manager = config_manager
+        self.file_index = file_index
         self.rename_model = RenameModel(parent=self)
         self.ai_client = AIClient(config_manager, parent=self)
+        self.journal_dir = None  # 重命名日志目录，为None时不记录日志
         
         # 连接AI客户端信号
         self.ai_client.analysis_started.connect(self._on_analysis_started)
@@ -44,6 +55,7 @@ class RenameController(QObject):
         
         # 连接模型信号
         self.rename_model.exampleUpdated.connect(self._on_example_updated)
+        self.rename_model.examplesRemoved.connect(self.examples_removed)
         self.rename_model.currentHistoryChanged.connect(self._on_current_history_changed)
     
     @Slot(str)
@@ -115,54 +127,90 @@ class RenameController(QObject):
         history = self.rename_model.go_to_next()
         return history is not None
     
-    @Slot()
-    def apply_rename(self):
+    def plan_rename(self):
         """
-        应用重命名
+        生成重命名计划（不修改磁盘）
         
         Returns:
-            dict: 包含success, count和可能的error字段的结果字典
+            RenamePlan: 重命名计划，如果没有可用的重命名映射或没有文件索引返回None
         """
         # 获取当前重命名映射
         rename_map = self.rename_model.get_current_rename_map()
         
-        if not rename_map:
+        # 没有文件索引时无法得到文件路径，不能按裸文件名（相对于当前工作目录）重命名
+        if not rename_map or self.file_index is None:
+            return None
+        
+        # 按文件名从文件索引解析路径，不同文件夹中的同名文件都按映射重命名；
+        # 已从列表中移除的文件不在索引中，不参与重命名
+        rename_pairs = []
+        get_files_by_name = self.file_index.get_files_by_name
+        for original_name, new_name in rename_map.items():
+            for file_item in get_files_by_name(original_name):
+                rename_pairs.append((file_item.path, new_name))
+        
+        if not rename_pairs:
+            return None
+        
+        return RenamePlanner.plan(rename_pairs)
+    
+    @Slot()
+    def apply_rename(self, plan=None, backup_mode='journal', backup_dir='backup'):
+        """
+        应用重命名
+        
+        Args:
+            plan (RenamePlan, optional): 已确认的重命名计划，如果为None则重新生成
+            backup_mode (str): 备份模式。journal只依靠重命名日志（纯重命名时日志即可完整撤销），
+                               auto/hardlink/reflink/copy会在重命名前额外创建文件快照，None不创建快照
+            backup_dir (str): 快照目录，相对路径按文件所在目录解析
+        
+        Returns:
+            dict: 包含success, count, errors和可能的error、snapshot、journal、operations字段的结果字典，
+                  operations为已完成的(源路径, 目标路径)列表
+        """
+        if plan is None:
+            plan = self.plan_rename()
+        
+        if plan is None:
             return {"success": False, "error": "没有可用的重命名映射"}
         
+        journal = None
         try:
             # 发出重命名开始信号
             self.rename_started.emit()
             
-            # 跟踪成功计数
-            success_count = 0
+            # 需要文件快照时，先为所有将被改名的文件创建快照
+            snapshot = {}
+            if backup_mode and backup_mode != 'journal' and plan.has_changes():
+                source_paths = [op.source for op in plan.operations if not op.is_temp]
+                _, snapshot, backup_errors = FileOperations.create_snapshot(source_paths, backup_dir, backup_mode)
+                if backup_errors:
+                    error_message = f"备份失败，已取消重命名: {backup_errors[0][1]}"
+                    self.rename_failed.emit(error_message)
+                    return {"success": False, "error": error_message, "errors": backup_errors}
+            
+            # 每完成一个操作就写入日志，中途失败也可以撤销已完成的部分
+            operations = []
+            if self.journal_dir:
+                journal = RenameJournal.create(self.journal_dir)
+            
+            def on_operation(op):
+                operations.append((op.source, op.target))
+                if journal:
+                    journal.record(op.source, op.target)
             
-            # 执行重命名
-            for original_name, new_name in rename_map.items():
-                # 获取文件路径
-                file_path = self._get_file_path(original_name)
-                
-                if not file_path or not os.path.exists(file_path):
-                    continue
-                
-                # 获取目标路径
-                dir_path = os.path.dirname(file_path)
-                new_path = os.path.join(dir_path, new_name)
-                
-                # 如果目标文件已存在，添加后缀
-                if os.path.exists(new_path) and file_path != new_path:
-                    base, ext = os.path.splitext(new_name)
-                    i = 1
-                    while os.path.exists(new_path):
-                        new_name = f"{base}_{i}{ext}"
-                        new_path = os.path.join(dir_path, new_name)
-                        i += 1
-                
-                # 执行重命名
-                shutil.move(file_path, new_path)
-                success_count += 1
+            # 按计划顺序执行重命名
+            success_count, errors = RenamePlanner.execute(plan, on_operation)
+            
+            if errors and success_count == 0:
+                error_message = f"重命名失败: {errors[0][1]}"
+                self.rename_failed.emit(error_message)
+                return {"success": False, "error": error_message, "errors": errors}
             
             # 发出重命名完成信号
-            result = {"success": True, "count": success_count}
+            result = {"success": True, "count": success_count, "errors": errors, "snapshot": snapshot,
+                      "journal": journal.journal_path if journal else None, "operations": operations}
             self.rename_completed.emit(result)
             
             return result
@@ -173,36 +221,61 @@ class RenameController(QObject):
             self.rename_failed.emit(error_message)
             
             return {"success": False, "error": error_message}
+        
+        finally:
+            if journal:
+                journal.close()
     
-    def _get_file_path(self, file_name):
+    @Slot()
+    def undo_last_rename(self):
         """
-        获取文件路径
+        根据重命名日志撤销最近一次重命名
         
-        Args:
-            file_name (str): 文件名
-            
         Returns:
-            str: 文件路径，如果不存在返回None
+            dict: 包含success, count和可能的error、errors字段的结果字典
         """
-        # 这里需要从文件控制器或其他地方获取文件路径
-        # 示例实现，实际应用中需要根据具体情况修改
-        from PySide6.QtWidgets import QApplication
+        journal = RenameJournal.latest(self.journal_dir)
         
-        # 获取主窗口
-        main_window = QApplication.activeWindow()
+        if journal is None:
+            return {"success": False, "error": "没有可撤销的重命名记录"}
         
-        if main_window:
-            # 尝试获取文件控制器
-            file_controller = getattr(main_window, 'file_controller', None)
-            
-            if file_controller:
-                # 获取文件数据
-                file_data = file_controller.get_file(file_name)
-                
-                if file_data:
-                    return file_data.get('path')
+        success_count, errors = journal.undo()
         
-        return None
+        if errors and success_count == 0:
+            return {"success": False, "error": errors[0][1], "errors": errors}
+        
+        result = {"success": True, "count": success_count, "errors": errors, "journal": journal.journal_path}
+        self.rename_undone.emit(result)
+        return result
+    
+    @Slot(str, str)
+    def update_example(self, original_name, new_name):
+        """
+        用户在表格中编辑示例文本后更新示例，表格已经显示了新文本，不再发出example_updated
+        
+        Args:
+            original_name (str): 原始文件名
+            new_name (str): 新文件名
+        """
+        if self.rename_model.add_example(original_name, new_name, emit_signal=False):
+            self.example_edited.emit(original_name, new_name)
+    
+    @Slot(list)
+    def remove_files(self, file_dicts):
+        """
+        文件从列表中移除后，移除对应的示例
+        
+        当前重命名映射不修改（历史记录之间按差异存储）。文件按ID从文件索引中移除，
+        生成重命名计划时只解析到仍在索引中的文件；其他文件夹中的同名文件仍按映射重命名，
+        这个文件名的示例也保留，只有同名文件全部移除后才移除示例。
+        
+        Args:
+            file_dicts (list): 被移除文件的数据字典列表
+        """
+        names = dict.fromkeys(file_data['name'] for file_data in file_dicts)
+        if self.file_index is not None:
+            names = [name for name in names if not self.file_index.get_files_by_name(name)]
+        self.rename_model.remove_examples(list(names))
     
     @Slot()
     def clear_examples(self):
@@ -210,6 +283,17 @@ class RenameController(QObject):
         清空所有示例
         """
         self.rename_model.clear_examples()
+        self.examples_cleared.emit()
+    
+    @Slot(int)
+    def set_max_history(self, max_history):
+        """
+        设置最多保留的分析结果历史数
+        
+        Args:
+            max_history (int): 最多保留的历史记录数，0表示不限制
+        """
+        self.rename_model.set_max_history(max_history)
     
     @Slot()
     def clear_analysis_results(self):
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from PySide6.QtCore import QObject, Signal, Slot, QTimer
+
+from models.rename_model import RenameHistory
+from utils.session_store import SessionStore
+
+class SessionController(QObject):
+    """
+    会话控制器类，把文件列表、命名示例、分析历史和已执行的重命名自动保存到会话数据库
+
+    监听文件控制器和重命名控制器的信号，每次变化只把变化的部分排入数据库的写队列，
+    写入后等待SAVE_DELAY毫秒再在一个事务中提交，连续的改动合并为一次提交。
+    启动时恢复上次的会话：文件和示例直接加载，历史记录只读取当前显示的一条，
+    其余记录在切换到它们时才从数据库读取。
+    """
+
+    # 定义信号
+    session_restored = Signal(int)  # 会话恢复完成信号，参数为恢复的文件数量
+
+    # 收到变化后等待多久提交（毫秒）
+    SAVE_DELAY = 500
+
+    def __init__(self, db_path, file_controller, rename_controller, parent=None):
+        """
+        初始化会话控制器
+
+        Args:
+            db_path (str): 会话数据库路径
+            file_controller (FileController): 文件控制器
+            rename_controller (RenameController): 重命名控制器
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.store = SessionStore(db_path)
+        self.file_controller = file_controller
+        self.rename_controller = rename_controller
+        self.rename_model = rename_controller.rename_model
+        self._restoring = False
+        self._history_ids = set()  # 已写入数据库的历史记录ID
+
+        # 合并提交的定时器
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY)
+        self._save_timer.timeout.connect(self.flush)
+
+        # 连接信号
+        self.file_controller.files_added.connect(self._on_files_added)
+        self.file_controller.file_model.rowsRemoved.connect(self._on_rows_removed)
+        self.file_controller.files_cleared.connect(self._on_files_cleared)
+        self.file_controller.file_renamed.connect(self._on_file_renamed)
+        self.file_controller.folder_renamed.connect(self._on_folder_renamed)
+        self.rename_controller.example_updated.connect(self._on_example_updated)
+        self.rename_controller.example_edited.connect(self._on_example_edited)
+        self.rename_controller.examples_cleared.connect(self._on_examples_cleared)
+        self.rename_controller.examples_removed.connect(self._on_examples_removed)
+        self.rename_controller.rename_completed.connect(self._on_rename_completed)
+        self.rename_controller.rename_undone.connect(self._on_rename_undone)
+        self.rename_model.historyChanged.connect(self._on_history_changed)
+        self.rename_model.currentHistoryChanged.connect(self._on_current_history_changed)
+
+    def _schedule_save(self):
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
+    @Slot()
+    def flush(self):
+        """
+        立即提交所有排队的写操作
+        """
+        self._save_timer.stop()
+        try:
+            self.store.flush()
+        except Exception as e:
+            print(f"保存会话失败: {str(e)}")
+
+    def close(self):
+        """
+        提交排队的写操作并关闭会话数据库
+        """
+        self._save_timer.stop()
+        try:
+            self.store.close()
+        except Exception as e:
+            print(f"关闭会话数据库失败: {str(e)}")
+
+    def restore(self):
+        """
+        恢复上次的会话
+
+        Returns:
+            int: 恢复的文件数量
+        """
+        self._restoring = True
+        try:
+            files = self.store.load_files()
+            if files:
+                # 数据包含name和path，添加时不访问磁盘
+                self.file_controller.add_files(files)
+
+            for original_name, new_name in self.store.load_examples().items():
+                self.rename_model.add_example(original_name, new_name)
+
+            # 历史记录只创建延迟加载的对象，恢复时只加载当前记录
+            histories = []
+            for history_id, timestamp in self.store.list_history():
+                histories.append(RenameHistory.deferred(
+                    self._make_loader(history_id), timestamp, session_id=history_id,
+                    raw_loader=self._make_raw_loader(history_id)))
+                self._history_ids.add(history_id)
+            if histories:
+                self.rename_model.restore_history(histories, self.store.get_value('current_index', -1))
+        finally:
+            self._restoring = False
+
+        # 恢复时超出数量上限而被删除的记录
+        self._on_history_changed(self.rename_model.get_history())
+        self.session_restored.emit(len(files))
+        return len(files)
+
+    def _make_loader(self, history_id):
+        return lambda: self.store.load_history(history_id)
+
+    def _make_raw_loader(self, history_id):
+        return lambda: self.store.load_raw_response(history_id)
+
+    # 私有方法，处理信号
+    def _on_files_added(self, file_dicts):
+        if self._restoring:
+            return
+        self.store.add_files(file_dicts)
+        self._schedule_save()
+
+    def _on_rows_removed(self, first, last, items):
+        self.store.remove_files([item.path for item in items])
+        self._schedule_save()
+
+    def _on_files_cleared(self):
+        self.store.clear_files()
+        self._schedule_save()
+
+    def _on_file_renamed(self, old_path, file_data):
+        self.store.rename_file(old_path, file_data.get('path', ''), file_data.get('name', ''))
+        self._schedule_save()
+
+    def _on_folder_renamed(self, old_path, new_path):
+        self.store.rename_paths(old_path, new_path)
+        self._schedule_save()
+
+    def _on_example_updated(self, original_name, new_data):
+        if self._restoring:
+            return
+        self.store.set_example(original_name, new_data.get('new_name') if new_data else None)
+        self._schedule_save()
+
+    def _on_example_edited(self, original_name, new_name):
+        self.store.set_example(original_name, new_name)
+        self._schedule_save()
+
+    def _on_examples_removed(self, original_names):
+        self.store.remove_examples(original_names)
+        self._schedule_save()
+
+    def _on_examples_cleared(self):
+        self.store.clear_examples()
+        self._schedule_save()
+
+    def _on_rename_completed(self, result):
+        self.store.record_renames(result.get('journal'), result.get('operations') or [])
+        self._schedule_save()
+
+    def _on_rename_undone(self, result):
+        self.store.mark_undone(result.get('journal'))
+        self._schedule_save()
+
+    def _on_history_changed(self, histories):
+        """
+        同步历史记录：删除不再存在的记录，追加新记录（差异记录只写入差异）
+        """
+        if self._restoring:
+            return
+
+        current_ids = {history.session_id for history in histories if history.session_id is not None}
+        removed_ids = self._history_ids - current_ids
+        if removed_ids:
+            self.store.remove_history(sorted(removed_ids))
+            self._history_ids -= removed_ids
+
+        for history in histories:
+            if history.session_id is not None:
+                continue
+            delta = history.get_delta()
+            if delta is not None and delta[0].session_id is not None:
+                base, changed, removed = delta
+                history.session_id = self.store.add_history(
+                    history.get_timestamp(), raw_response=history.get_compressed_raw_response(),
+                    base_id=base.session_id, changed=changed, removed=removed)
+            else:
+                history.session_id = self.store.add_history(
+                    history.get_timestamp(), rename_map=history.get_rename_map(),
+                    raw_response=history.get_compressed_raw_response())
+            self._history_ids.add(history.session_id)
+            
+            # 原始响应已经交给数据库，内存中只保留读取函数
+            history.spill_raw_response(self._make_raw_loader(history.session_id))
+
+        self._schedule_save()
+
+    def _on_current_history_changed(self, history):
+        if self._restoring:
+            return
+        self.store.set_value('current_index', self.rename_model.get_current_index())
+        self._schedule_save()
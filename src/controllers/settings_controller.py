@@ -64,6 +64,15 @@ class SettingsController(QObject):
         Returns:
             str: 设置文件路径
         """
+        return os.path.join(self.get_config_directory(), 'settings.json')
+    
+    def get_config_directory(self):
+        """
+        获取配置目录，设置文件和重命名日志都保存在这里
+        
+        Returns:
+            str: 配置目录路径
+        """
         # 使用QSettings获取配置目录
         q_settings = QSettings()
         org_name = q_settings.organizationName()
@@ -87,8 +96,7 @@ class SettingsController(QObject):
         # 确保目录存在
         os.makedirs(config_dir, exist_ok=True)
         
-        # 返回设置文件路径
-        return os.path.join(config_dir, 'settings.json')
+        return config_dir
     
     @Slot(dict)
     def update_settings(self, settings):
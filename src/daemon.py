@@ -0,0 +1,568 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import signal
+import socket
+import asyncio
+import hmac
+import hashlib
+import secrets
+import http.client
+import time
+
+# 确保能够引用项目内模块（作为脚本运行或以src.daemon导入时都可以）
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from cli import make_plan, run_in_thread, load_examples, create_controllers, DEFAULT_BATCH_SIZE
+from utils.command_errors import CommandError, EXIT_OK, EXIT_FAILED, EXIT_USAGE, EXIT_UNAVAILABLE, EXIT_PROBLEMS
+from utils.job_queue import JobQueue, JOB_DONE, JOB_FAILED
+
+# 默认监听地址
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8770
+
+# 请求体最大长度（字节）
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+# 访问令牌文件名，保存在配置目录中，只有当前用户可以读取
+TOKEN_FILE_NAME = "daemon.token"
+
+# 请求的Host只能是本机地址（可以带端口），防止DNS重绑定
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "[::1]"}
+
+# HTTP状态码说明
+HTTP_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+                404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+                415: "Unsupported Media Type", 500: "Internal Server Error"}
+
+def default_token_path():
+    """
+    获取默认的访问令牌路径，与SettingsController.get_config_directory()在命令行模式下的目录相同，
+    客户端不需要导入Qt
+
+    Returns:
+        str: 令牌文件路径
+    """
+    if os.name == 'nt':
+        config_dir = os.path.join(os.environ['APPDATA'], "GY", "GY_Rename")
+    else:
+        config_dir = os.path.expanduser("~/.config/GY/GY_Rename")
+    return os.path.join(config_dir, TOKEN_FILE_NAME)
+
+def load_or_create_token(token_path):
+    """
+    读取访问令牌，不存在时生成一个新的，文件权限为0600
+
+    Args:
+        token_path (str): 令牌文件路径
+
+    Returns:
+        str: 访问令牌
+    """
+    try:
+        with open(token_path, 'r', encoding='ascii') as f:
+            token = f.read().strip()
+        if token:
+            os.chmod(token_path, 0o600)
+            return token
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(os.path.dirname(os.path.abspath(token_path)), exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='ascii') as f:
+        f.write(token)
+    os.chmod(token_path, 0o600)
+    return token
+
+class CachedAnalyzer:
+    """
+    带缓存的分析器，包装AIClient供make_plan使用
+
+    相同的API、示例和文件名组合直接返回缓存的结果；同时提交的相同请求只发送一次。
+    所有任务共用一个信号量，同时进行的AI请求总数不超过max_requests。
+    """
+
+    def __init__(self, ai_client, job_queue, identity="", max_requests=8):
+        """
+        初始化分析器
+
+        Args:
+            ai_client (AIClient): AI客户端，所有任务共用它的连接池
+            job_queue (JobQueue): 保存响应缓存的任务队列
+            identity (str): API地址和模型，作为缓存键的一部分
+            max_requests (int): 同时进行的AI请求总数上限
+        """
+        self.ai_client = ai_client
+        self.job_queue = job_queue
+        self.identity = identity
+        self._semaphore = asyncio.Semaphore(max(1, max_requests))
+        self._in_flight = {}  # 缓存键 -> 正在进行的请求
+
+        # 计数器
+        self.hits = 0
+        self.misses = 0
+
+    def cache_key(self, files, examples):
+        names = sorted(entry['name'] for entry in files)
+        example_pairs = sorted((example['original_name'], example['new_name']) for example in examples)
+        data = json.dumps([self.identity, example_pairs, names], ensure_ascii=False)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    async def analyze_naming_pattern(self, files, examples):
+        """
+        分析一组文件，优先使用缓存
+
+        Args:
+            files (list): 文件条目列表
+            examples (list): 示例列表
+
+        Returns:
+            dict: 分析结果，成功时包含rename_map
+        """
+        key = self.cache_key(files, examples)
+        rename_map = self.job_queue.get_response(key)
+        if rename_map is not None:
+            self.hits += 1
+            return {'rename_map': rename_map}
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.hits += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._request(key, files, examples))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _request(self, key, files, examples):
+        async with self._semaphore:
+            result = await self.ai_client.analyze_naming_pattern(files, examples)
+        if 'rename_map' in result:
+            self.job_queue.put_response(key, result['rename_map'])
+        return result
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+class RenameDaemon:
+    """
+    重命名守护进程，在本地HTTP端口或Unix套接字上接收JSON任务
+
+    任务保存在SQLite任务队列中，由固定数量的工作协程依次领取执行。控制器、
+    配置和AI客户端的连接池在启动时创建一次，所有任务共用，单个任务没有启动开销。
+    分析可以并发进行；执行重命名时逐个任务进行，重命名日志的顺序与执行顺序一致。
+
+    每个请求都要在Authorization头中带上配置目录中的访问令牌（Bearer）。Host只能是本机地址，
+    带Origin头的请求（来自浏览器页面）一律拒绝，POST的内容类型必须是application/json。
+
+    接口：
+        GET  /health       运行状态、任务数量和缓存命中情况
+        POST /jobs         提交任务，返回任务ID
+        GET  /jobs         最近的任务列表
+        GET  /jobs/<id>    任务状态和结果
+    """
+
+    def __init__(self, db_path=None, workers=2, max_requests=8, journal_dir=None, cache_ttl=7 * 24 * 3600,
+                 token_file=None):
+        """
+        初始化守护进程
+
+        Args:
+            db_path (str, optional): 任务数据库路径，默认保存在配置目录中
+            workers (int): 同时执行的任务数量
+            max_requests (int): 同时进行的AI请求总数上限
+            journal_dir (str, optional): 重命名日志目录，默认与图形界面相同
+            cache_ttl (int): 响应缓存保留的秒数
+            token_file (str, optional): 访问令牌文件，默认保存在配置目录中
+        """
+        self.settings_controller, self.rename_controller = create_controllers(journal_dir)
+        config_dir = self.settings_controller.get_config_directory()
+        if db_path is None:
+            db_path = os.path.join(config_dir, "daemon.sqlite3")
+        self.token = load_or_create_token(token_file or os.path.join(config_dir, TOKEN_FILE_NAME))
+        self.allowed_hosts = set(LOCAL_HOSTS)
+        self.job_queue = JobQueue(db_path, self.rename_controller.journal_dir)
+        self.job_queue.prune_responses(cache_ttl)
+        self.workers = max(1, workers)
+        self.max_requests = max_requests
+        self.analyzer = None
+        self._wakeup = None
+        self._apply_lock = None
+        self._started = time.time()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, ready=None):
+        """
+        开始监听并处理任务，直到被取消
+
+        Args:
+            host (str): 监听地址
+            port (int): 监听端口，0表示自动选择
+            socket_path (str, optional): Unix套接字路径，提供时不监听TCP端口
+            ready (callable, optional): 开始监听后调用，参数为监听地址文本
+        """
+        config_manager = self.rename_controller.config_manager
+        identity = f"{config_manager.get_config('api_url')}|{config_manager.get_config('api_model')}"
+        self.analyzer = CachedAnalyzer(self.rename_controller.ai_client, self.job_queue, identity,
+                                       self.max_requests)
+        self._wakeup = asyncio.Event()
+        self._apply_lock = asyncio.Lock()
+
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self._handle_connection, path=socket_path)
+            os.chmod(socket_path, 0o600)
+            address = f"unix:{socket_path}"
+        else:
+            # 监听指定地址时也接受以该地址访问的请求
+            if host and host not in ("0.0.0.0", "::"):
+                self.allowed_hosts.add(f"[{host}]" if ":" in host else host)
+            server = await asyncio.start_server(self._handle_connection, host, port)
+            address = "{}:{}".format(*server.sockets[0].getsockname()[:2])
+
+        # 收到SIGTERM时正常退出，清理套接字文件（Windows不支持）
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except (NotImplementedError, AttributeError):
+            pass
+
+        workers = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        if ready:
+            ready(address)
+        try:
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self.rename_controller.ai_client.aclose()
+            self.job_queue.close()
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+    # 任务执行
+    async def _worker(self):
+        while True:
+            job = self.job_queue.claim()
+            if job is None:
+                # 领取和等待之间没有切换点，提交时设置的事件不会丢失
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            job_id, request = job
+            try:
+                result, exit_code = await self._run_job(request)
+                self.job_queue.finish(job_id, result, exit_code)
+            except CommandError as e:
+                self.job_queue.fail(job_id, str(e), e.exit_code)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.job_queue.fail(job_id, f"任务执行失败: {str(e)}", EXIT_FAILED)
+
+    async def _run_job(self, request):
+        """
+        执行一个任务
+
+        Args:
+            request (dict): 任务内容，包含paths、examples或map、options
+
+        Returns:
+            tuple: (结果字典, 退出码)
+        """
+        paths = request.get('paths')
+        if not isinstance(paths, list) or not paths:
+            raise CommandError("任务缺少paths", EXIT_USAGE)
+        options = request.get('options') or {}
+
+        rename_pairs = None
+        examples = None
+        if request.get('map') is not None:
+            rename_pairs = [(os.path.abspath(path), new_name) for path, new_name in request['map'].items()]
+        else:
+            examples = load_examples(_example_pairs(request.get('examples')))
+
+        plan, _ = await make_plan(
+            self.analyzer, paths, examples, rename_pairs, options.get('recursive', True),
+            options.get('include'), options.get('exclude'), options.get('batch_size', DEFAULT_BATCH_SIZE),
+            options.get('jobs', self.max_requests))
+
+        result = {'summary': plan.summary(), 'operations': [op.to_dict() for op in plan.get_operations()]}
+        if not options.get('apply'):
+            return result, EXIT_PROBLEMS if plan.get_problems() else EXIT_OK
+
+        backup_mode = options.get('backup') or self.settings_controller.get_setting('rename.backup_mode', 'journal')
+        backup_dir = options.get('backup_dir') or self.settings_controller.get_setting(
+            'rename.backup_directory', 'backup')
+        async with self._apply_lock:
+            applied = await run_in_thread(
+                self.rename_controller.apply_rename, plan, None if backup_mode == 'none' else backup_mode, backup_dir)
+        if not applied.get('success'):
+            raise CommandError(applied.get('error') or "重命名失败", EXIT_FAILED)
+
+        errors = applied.get('errors') or []
+        result.update({'count': applied.get('count', 0), 'errors': [list(error) for error in errors],
+                       'journal': applied.get('journal')})
+        return result, EXIT_FAILED if errors else EXIT_OK
+
+    # HTTP
+    async def _handle_connection(self, reader, writer):
+        try:
+            status, payload = await self._handle_request(reader)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write((f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                      f"Content-Type: application/json; charset=utf-8\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"Connection: close\r\n\r\n").encode('latin-1') + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader):
+        request_line = (await reader.readline()).decode('latin-1').split()
+        if len(request_line) < 2:
+            raise ValueError("无效的请求")
+        method, target = request_line[0].upper(), request_line[1]
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length') or 0)
+        if length > MAX_BODY_SIZE:
+            return 413, {'error': "请求体过大"}
+        body = await reader.readexactly(length) if length else b""
+
+        # 读完请求体再拒绝，客户端不会在发送时遇到连接已关闭
+        rejected = self._check_headers(method, headers)
+        if rejected:
+            return rejected
+
+        path, _, query = target.partition('?')
+        return self._route(method, path.rstrip('/') or '/', query, body)
+
+    def _check_headers(self, method, headers):
+        """
+        检查Host、Origin、内容类型和访问令牌
+
+        Returns:
+            tuple: 拒绝时返回(HTTP状态码, 响应内容)，通过时返回None
+        """
+        host = headers.get('host', "").lower()
+        if host.rpartition(':')[2].isdigit() and not host.endswith(']'):
+            host = host.rpartition(':')[0]
+        if host not in self.allowed_hosts:
+            return 403, {'error': "不允许的Host"}
+        if 'origin' in headers:
+            return 403, {'error': "不接受来自浏览器页面的请求"}
+        if method == 'POST':
+            content_type = headers.get('content-type', "").partition(';')[0].strip().lower()
+            if content_type != 'application/json':
+                return 415, {'error': "内容类型应为application/json"}
+
+        scheme, _, token = headers.get('authorization', "").partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(token.strip().encode('utf-8'),
+                                                                 self.token.encode('utf-8')):
+            return 401, {'error': "缺少或错误的访问令牌"}
+        return None
+
+    def _route(self, method, path, query, body):
+        if path == '/health':
+            return 200, {'status': 'ok', 'uptime': time.time() - self._started, 'workers': self.workers,
+                         'jobs': self.job_queue.counts(), 'cache': self.analyzer.stats()}
+
+        if path == '/jobs':
+            if method == 'POST':
+                request = json.loads(body.decode('utf-8') or "null")
+                if not isinstance(request, dict):
+                    raise ValueError("任务内容应为JSON对象")
+                job_id = self.job_queue.submit(request)
+                self._wakeup.set()
+                return 202, {'id': job_id, 'status': 'queued'}
+            if method == 'GET':
+                params = dict(item.partition('=')[::2] for item in query.split('&') if item)
+                return 200, {'jobs': self.job_queue.list_jobs(int(params.get('limit') or 50))}
+            return 405, {'error': "不支持的方法"}
+
+        if path.startswith('/jobs/'):
+            if method != 'GET':
+                return 405, {'error': "不支持的方法"}
+            job = self.job_queue.get(int(path[len('/jobs/'):]))
+            if job is None:
+                return 404, {'error': "任务不存在"}
+            return 200, job
+
+        return 404, {'error': "未知的接口"}
+
+def _example_pairs(examples):
+    """
+    把任务中的示例统一为 [原文件名, 新文件名] 列表，支持对象、字典列表和二元组列表
+    """
+    if not examples:
+        return []
+    if isinstance(examples, dict):
+        return list(examples.items())
+    pairs = []
+    for example in examples:
+        if isinstance(example, dict):
+            pairs.append((example.get('original_name'), example.get('new_name')))
+        elif isinstance(example, (list, tuple)) and len(example) == 2:
+            pairs.append(tuple(example))
+    return pairs
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    通过Unix套接字连接的HTTPConnection
+    """
+
+    def __init__(self, socket_path, timeout=30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+class DaemonClient:
+    """
+    守护进程客户端，只使用标准库，不需要导入Qt
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, timeout=30,
+                 token=None, token_file=None):
+        """
+        初始化客户端
+
+        Args:
+            host (str): 守护进程地址
+            port (int): 守护进程端口
+            socket_path (str, optional): Unix套接字路径，提供时不使用TCP端口
+            timeout (float): 超时秒数
+            token (str, optional): 访问令牌，为None时在第一次请求时从令牌文件读取
+            token_file (str, optional): 访问令牌文件，默认使用default_token_path()
+        """
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.token = token
+        self.token_file = token_file or default_token_path()
+
+    def request(self, method, path, payload=None, headers=None):
+        """
+        发送请求
+
+        Args:
+            method (str): HTTP方法
+            path (str): 请求路径
+            payload: 请求JSON，为None时不发送请求体
+            headers (dict, optional): 额外的请求头
+
+        Returns:
+            tuple: (HTTP状态码, 响应JSON)
+
+        Raises:
+            OSError: 无法连接守护进程或读取访问令牌
+        """
+        if self.token is None:
+            with open(self.token_file, 'r', encoding='ascii') as f:
+                self.token = f.read().strip()
+        if self.socket_path:
+            connection = _UnixHTTPConnection(self.socket_path, self.timeout)
+        else:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            body = None if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            request_headers = {'Authorization': f"Bearer {self.token}"}
+            if body is not None:
+                request_headers['Content-Type'] = 'application/json'
+            request_headers.update(headers or {})
+            connection.request(method, path, body=body, headers=request_headers)
+            response = connection.getresponse()
+            return response.status, json.loads(response.read().decode('utf-8') or "null")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _error(status, data):
+        """
+        把错误响应转换为CommandError，令牌错误或被拒绝时的退出码与无法连接相同
+        """
+        message = data.get('error') if isinstance(data, dict) else None
+        exit_code = EXIT_UNAVAILABLE if status in (401, 403) else EXIT_FAILED
+        return CommandError(message or f"守护进程返回错误: {status}", exit_code)
+
+    def submit(self, request):
+        status, data = self.request('POST', '/jobs', request)
+        if status != 202:
+            raise self._error(status, data)
+        return data['id']
+
+    def get(self, job_id):
+        """
+        获取任务状态
+
+        Returns:
+            dict: 任务信息，任务不存在时返回None
+
+        Raises:
+            CommandError: 守护进程返回了其他错误
+        """
+        status, data = self.request('GET', f'/jobs/{job_id}')
+        if status == 404:
+            return None
+        if status != 200:
+            raise self._error(status, data)
+        return data
+
+    def health(self):
+        status, data = self.request('GET', '/health')
+        if status != 200:
+            raise self._error(status, data)
+        return data
+
+    def list_jobs(self, limit=50):
+        status, data = self.request('GET', f'/jobs?limit={limit}')
+        if status != 200:
+            raise self._error(status, data)
+        return data['jobs']
+
+    def wait(self, job_id, interval=0.2, timeout=None):
+        """
+        等待任务结束
+
+        Returns:
+            dict: 任务信息，超时返回最后一次查询的结果
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in (JOB_DONE, JOB_FAILED):
+                return job
+            if deadline is not None and time.time() >= deadline:
+                return job
+            time.sleep(interval)
@@ -2,18 +2,21 @@
 # -*- coding: utf-8 -*-
 
 import os
-from PySide6.QtCore import QObject, Signal, Property, Slot
+from contextlib import contextmanager
+from PySide6.QtCore import QObject, Signal, Slot
 
-class FileItem(QObject):
+class FileItem:
     """
     文件项类，表示单个文件
+    
+    只是一个使用__slots__的轻量记录，不是QObject：导入大量文件时不需要为每个文件
+    创建C++对象和Python包装。字段的修改应通过FileModel进行，由模型按行范围统一发出
+    变更通知。
     """
     
-    # 定义信号
-    nameChanged = Signal(str)
-    pathChanged = Signal(str)
+    __slots__ = ('file_id', 'name', 'path', 'is_folder', '_original_name', '_row')
     
-    def __init__(self, name="", path="", is_folder=False, parent=None):
+    def __init__(self, name="", path="", is_folder=False, file_id=None):
         """
         初始化文件项
         
@@ -21,42 +24,20 @@ class FileItem(QObject):
             name (str): 文件名
             path (str): 文件路径
             is_folder (bool): 是否为文件夹
-            parent: 父对象
+            file_id (int, optional): 文件ID，由文件模型分配
         """
-        super().__init__(parent)
-        self._name = name
-        self._path = path
-        self._original_name = name  # 保存原始文件名，用于恢复
+        self.file_id = file_id
+        self.name = name
+        self.path = path
         self.is_folder = is_folder
-    
-    # 文件名属性
-    def _get_name(self):
-        return self._name
-    
-    def _set_name(self, name):
-        if self._name != name:
-            self._name = name
-            self.nameChanged.emit(name)
-    
-    name = Property(str, _get_name, _set_name, notify=nameChanged)
-    
-    # 文件路径属性
-    def _get_path(self):
-        return self._path
-    
-    def _set_path(self, path):
-        if self._path != path:
-            self._path = path
-            self.pathChanged.emit(path)
-    
-    path = Property(str, _get_path, _set_path, notify=pathChanged)
+        self._original_name = name  # 保存原始文件名，用于恢复
+        self._row = -1              # 在文件模型中的行号，不在模型中时为-1
     
     # 原始文件名属性
     def get_original_name(self):
         return self._original_name
     
     # 重置为原始文件名
-    @Slot()
     def reset_to_original(self):
         self.name = self._original_name
     
@@ -69,21 +50,21 @@ class FileItem(QObject):
             dict: 包含文件信息的字典
         """
         return {
-            'name': self._name,
-            'path': self._path,
+            'id': self.file_id,
+            'name': self.name,
+            'path': self.path,
             'original_name': self._original_name,
             'is_folder': self.is_folder
         }
     
     # 从字典创建
     @classmethod
-    def from_dict(cls, data, parent=None):
+    def from_dict(cls, data):
         """
         从字典创建文件项
         
         Args:
             data (dict): 文件信息字典
-            parent: 父对象
             
         Returns:
             FileItem: 文件项实例
@@ -92,21 +73,36 @@ class FileItem(QObject):
             name=data.get('name', ''),
             path=data.get('path', ''),
             is_folder=data.get('is_folder', False),
-            parent=parent
+            file_id=data.get('id')
         )
-        item._original_name = data.get('original_name', item._name)
+        item._original_name = data.get('original_name', item.name)
         return item
 
 class FileModel(QObject):
     """
     文件模型类，管理文件集合
+    
+    文件以模型分配的ID为主键，并按路径、文件名和父文件夹建立索引。
+    不同文件夹中的同名文件可以同时存在，按名称的查找返回最先添加的一个。
+    
+    变更通知按批次合并：begin_batch()/end_batch()之间的所有修改在批次结束时
+    以行范围信号发出，批量添加n个文件只发出一次rowsInserted，而不是n次完整列表。
+    不在批次中的单个修改视为只含一个修改的批次。
+    
+    内存预算：文件项是__slots__记录，ID连续分配，按ID查找用列表而不是字典；
+    索引中只对应一个ID的键直接存整数，路径已规范化时直接复用传入的路径字符串；
+    文件夹索引只在第一次按文件夹查找（例如开启文件夹监视）时建立。不计调用方传入的
+    路径字符串和按需建立的文件夹索引，每个文件的开销应低于MEMORY_BUDGET_PER_FILE字节，
+    即100万个文件约300MB以内。
     """
     
+    MEMORY_BUDGET_PER_FILE = 300
+    
     # 定义信号
-    filesChanged = Signal(list)
-    fileAdded = Signal(object)
-    fileRemoved = Signal(str)
-    fileUpdated = Signal(str, object)
+    rowsInserted = Signal(int, int)       # 插入的行范围 (first, last)，包含两端
+    rowsRemoved = Signal(int, int, list)  # 移除的行范围和文件项，按从后往前的顺序发出
+    rowsChanged = Signal(int, int)        # 数据变化的行范围
+    modelReset = Signal()                 # 模型被整体重置
     
     def __init__(self, parent=None):
         """
@@ -116,7 +112,194 @@ class FileModel(QObject):
             parent: 父对象
         """
         super().__init__(parent)
-        self._files = {}  # 存储文件，键为文件名
+        self._files = {}       # 文件ID -> 文件项，移除的文件直接删除，长时间增删不会累积空位
+        self._next_id = 1      # 下一个文件ID，清空后继续递增，旧ID不会被复用
+        self._count = 0
+        self._path_index = {}  # 规范化路径 -> 文件ID
+        self._name_index = {}  # 文件名 -> 文件ID，有多个同名文件时为 {文件ID: None}，保持添加顺序
+        self._dir_index = None  # 父文件夹 -> 文件ID 或 {文件ID: None}，第一次按文件夹查找时才建立
+        
+        # 行顺序，移除文件后延迟到批次结束时压缩
+        self._rows = []        # 行号 -> 文件项，文件项的_row记录自己的行号
+        self._rows_dirty = False
+        
+        # 批次状态
+        self._batch_depth = 0
+        self._pending_inserted = {}  # 本批次新增的文件ID
+        self._pending_removed = []   # 本批次移除的 (行号, 文件项)
+        self._pending_changed = {}   # 本批次数据变化的文件ID
+        self._pending_reset = False
+        
+        self._dicts_cache = None  # get_file_dicts()的结果，任何修改后失效
+    
+    def begin_batch(self):
+        """
+        开始批量修改，批次可以嵌套，最外层结束时才发出通知
+        """
+        self._batch_depth += 1
+    
+    def end_batch(self):
+        """
+        结束批量修改，发出合并后的变更通知
+        """
+        if self._batch_depth == 0:
+            return
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._flush_notifications()
+    
+    @contextmanager
+    def batch(self):
+        """
+        批量修改的上下文管理器
+        """
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
+    
+    def _notify(self):
+        """
+        不在批次中时立即发出通知
+        """
+        self._dicts_cache = None
+        if self._batch_depth == 0:
+            self._flush_notifications()
+    
+    def _flush_notifications(self):
+        """
+        发出本批次合并后的变更通知
+        """
+        inserted = self._pending_inserted
+        removed = self._pending_removed
+        changed = self._pending_changed
+        reset = self._pending_reset
+        self._pending_inserted = {}
+        self._pending_removed = []
+        self._pending_changed = {}
+        self._pending_reset = False
+        
+        if reset:
+            self._compact_rows()
+            self.modelReset.emit()
+            return
+            
+        # 先按批次开始时的行号从后往前发出移除范围，逐个应用时行号始终有效
+        if removed:
+            removed.sort(key=lambda entry: entry[0])
+            end = len(removed)
+            while end > 0:
+                start = end - 1
+                while start > 0 and removed[start - 1][0] == removed[start][0] - 1:
+                    start -= 1
+                items = [file_item for _, file_item in removed[start:end]]
+                self.rowsRemoved.emit(removed[start][0], removed[end - 1][0], items)
+                end = start
+                
+        self._compact_rows()
+        
+        # 新增的文件总在末尾，压缩后仍是连续的一段
+        if inserted:
+            count = len(self._rows)
+            self.rowsInserted.emit(count - len(inserted), count - 1)
+            
+        # 只有已存在的文件的变化需要通知，合并为一个范围
+        rows = []
+        for file_id in changed:
+            file_item = self.get_file_by_id(file_id)
+            if file_item is not None and file_id not in inserted:
+                rows.append(file_item._row)
+        if rows:
+            self.rowsChanged.emit(min(rows), max(rows))
+    
+    def _compact_rows(self):
+        """
+        移除已删除文件留下的行并重建行号索引
+        """
+        if not self._rows_dirty:
+            return
+        self._rows = [file_item for file_item in self._rows if file_item._row >= 0]
+        for row, file_item in enumerate(self._rows):
+            file_item._row = row
+        self._rows_dirty = False
+    
+    def _current_rows(self):
+        """
+        获取当前的行顺序
+        
+        批次进行中不能压缩行号（待发出的移除通知使用批次开始时的行号），
+        此时返回过滤后的副本。
+        
+        Returns:
+            list: 行号 -> 文件项
+        """
+        if self._rows_dirty:
+            if self._batch_depth == 0:
+                self._compact_rows()
+            else:
+                return [file_item for file_item in self._rows if file_item._row >= 0]
+        return self._rows
+    
+    @staticmethod
+    def _normalize_path(path):
+        """
+        规范化路径，作为路径索引的键
+        
+        Args:
+            path (str): 路径
+            
+        Returns:
+            str: 规范化的路径
+        """
+        if not path:
+            return path
+        # 已规范化时复用原字符串，索引不再保存一份副本
+        normalized = os.path.normpath(path)
+        return path if normalized == path else normalized
+    
+    @staticmethod
+    def _index_add(index, key, file_id):
+        ids = index.get(key)
+        if ids is None:
+            index[key] = file_id
+        elif isinstance(ids, dict):
+            ids[file_id] = None
+        else:
+            index[key] = {ids: None, file_id: None}
+    
+    @staticmethod
+    def _index_remove(index, key, file_id):
+        ids = index.get(key)
+        if ids is None:
+            return
+        if isinstance(ids, dict):
+            ids.pop(file_id, None)
+            if len(ids) == 1:
+                index[key] = next(iter(ids))
+        elif ids == file_id:
+            del index[key]
+    
+    @staticmethod
+    def _index_ids(index, key):
+        ids = index.get(key)
+        if ids is None:
+            return ()
+        return ids if isinstance(ids, dict) else (ids,)
+    
+    def _get_dir_index(self):
+        """
+        获取文件夹索引，第一次使用时从现有文件建立，之后随修改增量维护
+        
+        Returns:
+            dict: 父文件夹 -> 文件ID 或 {文件ID: None}
+        """
+        if self._dir_index is None:
+            self._dir_index = {}
+            for file_item in self._current_rows():
+                key = os.path.dirname(self._normalize_path(file_item.path))
+                self._index_add(self._dir_index, key, file_item.file_id)
+        return self._dir_index
     
     @Slot(str, str)
     def add_file(self, path, name=None, is_folder=False):
@@ -129,25 +312,35 @@ class FileModel(QObject):
             is_folder (bool): 是否为文件夹
             
         Returns:
-            FileItem: 添加的文件项，如果文件已存在则返回None
+            FileItem: 添加的文件项，如果相同路径的文件已存在则返回None
         """
         # 如果未指定文件名，使用路径中的文件名
         if name is None:
             name = os.path.basename(path)
         
         # 检查文件是否已存在
-        if name in self._files:
+        key = self._normalize_path(path)
+        if key in self._path_index:
             return None
         
         # 创建新文件项
-        file_item = FileItem(name=name, path=path, is_folder=is_folder, parent=self)
+        file_id = self._next_id
+        self._next_id += 1
+        file_item = FileItem(name=name, path=path, is_folder=is_folder, file_id=file_id)
         
-        # 添加到文件集合
-        self._files[name] = file_item
+        # 添加到文件集合和索引
+        self._files[file_id] = file_item
+        self._count += 1
+        self._path_index[key] = file_id
+        self._index_add(self._name_index, name, file_id)
+        if self._dir_index is not None:
+            self._index_add(self._dir_index, os.path.dirname(key), file_id)
+        file_item._row = len(self._rows)
+        self._rows.append(file_item)
         
         # 发出信号
-        self.fileAdded.emit(file_item)
-        self.filesChanged.emit(list(self._files.values()))
+        self._pending_inserted[file_id] = None
+        self._notify()
         
         return file_item
     
@@ -164,11 +357,12 @@ class FileModel(QObject):
         """
         added_files = []
         
-        for path in paths:
-            if os.path.isfile(path):
-                file_item = self.add_file(path)
-                if file_item:
-                    added_files.append(file_item)
+        with self.batch():
+            for path in paths:
+                if os.path.isfile(path):
+                    file_item = self.add_file(path)
+                    if file_item:
+                        added_files.append(file_item)
         
         return added_files
     
@@ -178,30 +372,72 @@ class FileModel(QObject):
         移除文件
         
         Args:
-            name (str): 文件名
+            name (str): 文件名，有多个同名文件时移除最先添加的一个
             
         Returns:
             bool: 如果成功移除返回True，否则返回False
         """
-        if name in self._files:
-            # 移除文件项
-            file_item = self._files.pop(name)
-            
-            # 发出信号
-            self.fileRemoved.emit(name)
-            self.filesChanged.emit(list(self._files.values()))
+        file_item = self.get_file(name)
+        if file_item is None:
+            return False
+        return self.remove_file_by_id(file_item.file_id)
+    
+    def remove_file_by_id(self, file_id):
+        """
+        按文件ID移除文件
+        
+        Args:
+            file_id (int): 文件ID
             
-            return True
+        Returns:
+            bool: 如果成功移除返回True，否则返回False
+        """
+        file_item = self.get_file_by_id(file_id)
+        if file_item is None:
+            return False
+        del self._files[file_id]
+        self._count -= 1
+        
+        # 从索引中移除
+        key = self._normalize_path(file_item.path)
+        self._path_index.pop(key, None)
+        self._index_remove(self._name_index, file_item.name, file_id)
+        if self._dir_index is not None:
+            self._index_remove(self._dir_index, os.path.dirname(key), file_id)
+        self._pending_changed.pop(file_id, None)
+        
+        # 行号在批次结束时压缩，本批次中新增又移除的文件不需要通知
+        row = file_item._row
+        file_item._row = -1
+        self._rows_dirty = True
+        if file_id in self._pending_inserted:
+            del self._pending_inserted[file_id]
+        else:
+            self._pending_removed.append((row, file_item))
+        
+        # 发出信号
+        self._notify()
         
-        return False
+        return True
     
     @Slot()
     def clear(self):
         """
         清空所有文件
         """
-        self._files.clear()
-        self.filesChanged.emit([])
+        for file_item in self._rows:
+            file_item._row = -1
+        self._files = {}
+        self._count = 0
+        self._path_index.clear()
+        self._name_index.clear()
+        self._dir_index = None
+        self._rows = []
+        self._rows_dirty = False
+        
+        # 发出信号
+        self._pending_reset = True
+        self._notify()
     
     @Slot(str, str)
     def update_file_name(self, old_name, new_name):
@@ -209,34 +445,83 @@ class FileModel(QObject):
         更新文件名
         
         Args:
-            old_name (str): 旧文件名
+            old_name (str): 旧文件名，有多个同名文件时更新最先添加的一个
             new_name (str): 新文件名
             
         Returns:
             bool: 如果成功更新返回True，否则返回False
         """
-        # 检查旧文件名是否存在
-        if old_name not in self._files:
+        file_item = self.get_file(old_name)
+        if file_item is None:
             return False
+        return self.rename_file(file_item.file_id, new_name)
+    
+    def rename_file(self, file_id, new_name):
+        """
+        按文件ID更新文件名
         
-        # 检查新文件名是否已存在
-        if new_name in self._files and old_name != new_name:
+        Args:
+            file_id (int): 文件ID
+            new_name (str): 新文件名
+            
+        Returns:
+            bool: 如果成功更新返回True，同一文件夹中已有同名文件时返回False
+        """
+        file_item = self.get_file_by_id(file_id)
+        if file_item is None:
             return False
         
-        # 获取文件项
-        file_item = self._files[old_name]
+        old_name = file_item.name
+        if old_name != new_name:
+            # 同一文件夹中不能有两个同名文件
+            dir_path = os.path.dirname(self._normalize_path(file_item.path))
+            for other_id in self._index_ids(self._name_index, new_name):
+                other = self.get_file_by_id(other_id)
+                if os.path.dirname(self._normalize_path(other.path)) == dir_path:
+                    return False
+            
+            # 更新文件名和名称索引
+            file_item.name = new_name
+            self._index_remove(self._name_index, old_name, file_id)
+            self._index_add(self._name_index, new_name, file_id)
         
-        # 更新文件名
-        file_item.name = new_name
+        # 发出信号
+        self._pending_changed[file_id] = None
+        self._notify()
         
-        # 更新字典键
-        if old_name != new_name:
-            self._files[new_name] = file_item
-            del self._files[old_name]
+        return True
+    
+    def set_file_path(self, file_id, path):
+        """
+        更新文件路径（例如文件在外部被移动），同时更新路径和文件夹索引
+        
+        Args:
+            file_id (int): 文件ID
+            path (str): 新路径
+            
+        Returns:
+            bool: 如果成功更新返回True，新路径已被其他文件占用时返回False
+        """
+        file_item = self.get_file_by_id(file_id)
+        if file_item is None:
+            return False
+        
+        old_key = self._normalize_path(file_item.path)
+        new_key = self._normalize_path(path)
+        if new_key != old_key:
+            if new_key in self._path_index:
+                return False
+            del self._path_index[old_key]
+            self._path_index[new_key] = file_id
+            if self._dir_index is not None:
+                self._index_remove(self._dir_index, os.path.dirname(old_key), file_id)
+                self._index_add(self._dir_index, os.path.dirname(new_key), file_id)
+        
+        file_item.path = path
         
         # 发出信号
-        self.fileUpdated.emit(old_name, file_item)
-        self.filesChanged.emit(list(self._files.values()))
+        self._pending_changed[file_id] = None
+        self._notify()
         
         return True
     
@@ -247,10 +532,138 @@ class FileModel(QObject):
         Args:
             name (str): 文件名
             
+        Returns:
+            FileItem: 文件项，有多个同名文件时返回最先添加的一个，如果不存在返回None
+        """
+        ids = self._index_ids(self._name_index, name)
+        if not ids:
+            return None
+        return self.get_file_by_id(next(iter(ids)))
+    
+    def get_file_by_id(self, file_id):
+        """
+        按文件ID获取文件项
+        
+        Args:
+            file_id (int): 文件ID
+            
         Returns:
             FileItem: 文件项，如果不存在返回None
         """
-        return self._files.get(name)
+        return self._files.get(file_id)
+    
+    def get_file_by_path(self, path):
+        """
+        按路径获取文件项
+        
+        Args:
+            path (str): 文件路径
+            
+        Returns:
+            FileItem: 文件项，如果不存在返回None
+        """
+        file_id = self._path_index.get(self._normalize_path(path))
+        return self.get_file_by_id(file_id) if file_id is not None else None
+    
+    def get_files_by_name(self, name):
+        """
+        获取所有同名文件项
+        
+        Args:
+            name (str): 文件名
+            
+        Returns:
+            list: 文件项列表，按添加顺序排列
+        """
+        return [self.get_file_by_id(file_id) for file_id in self._index_ids(self._name_index, name)]
+    
+    def get_files_in_dir(self, dir_path):
+        """
+        获取文件夹中直接包含的文件项
+        
+        Args:
+            dir_path (str): 文件夹路径
+            
+        Returns:
+            list: 文件项列表
+        """
+        ids = self._index_ids(self._get_dir_index(), self._normalize_path(dir_path))
+        return [self.get_file_by_id(file_id) for file_id in ids]
+    
+    def get_files_under(self, dir_path):
+        """
+        获取文件夹本身（如果在模型中）以及其中所有层级的文件项
+        
+        Args:
+            dir_path (str): 文件夹路径
+            
+        Returns:
+            list: 文件项列表
+        """
+        key = self._normalize_path(dir_path)
+        prefix = key.rstrip(os.sep) + os.sep
+        
+        files = []
+        file_id = self._path_index.get(key)
+        if file_id is not None:
+            files.append(self.get_file_by_id(file_id))
+        
+        # 只遍历文件夹索引，不遍历全部文件
+        for parent, ids in self._get_dir_index().items():
+            if parent == key or parent.startswith(prefix):
+                if isinstance(ids, dict):
+                    files.extend(self.get_file_by_id(file_id) for file_id in ids)
+                else:
+                    files.append(self.get_file_by_id(ids))
+        
+        return files
+    
+    def get_row(self, file_id):
+        """
+        获取文件所在的行号
+        
+        Args:
+            file_id (int): 文件ID
+            
+        Returns:
+            int: 行号，如果不存在返回-1
+        """
+        file_item = self.get_file_by_id(file_id)
+        if file_item is None:
+            return -1
+        if self._rows_dirty and self._batch_depth:
+            return self._current_rows().index(file_item)
+        self._compact_rows()
+        return file_item._row
+    
+    def get_file_at(self, row):
+        """
+        获取指定行的文件项
+        
+        Args:
+            row (int): 行号
+            
+        Returns:
+            FileItem: 文件项，行号无效时返回None
+        """
+        rows = self._current_rows()
+        if 0 <= row < len(rows):
+            return rows[row]
+        return None
+    
+    def get_files_in_rows(self, first, last):
+        """
+        获取行范围内的文件项
+        
+        Args:
+            first (int): 起始行，包含
+            last (int): 结束行，包含
+            
+        Returns:
+            list: 文件项列表
+        """
+        rows = self._current_rows()
+        return rows[first:last + 1]
     
     def get_files(self):
         """
@@ -259,16 +672,18 @@ class FileModel(QObject):
         Returns:
             list: 文件项列表
         """
-        return list(self._files.values())
+        return list(self._current_rows())
     
     def get_file_dicts(self):
         """
-        获取所有文件的字典表示
+        获取所有文件的字典表示，模型未修改时返回同一个列表，调用方不应修改
         
         Returns:
             list: 文件字典列表
         """
-        return [file_item.to_dict() for file_item in self._files.values()]
+        if self._dicts_cache is None:
+            self._dicts_cache = [file_item.to_dict() for file_item in self._current_rows()]
+        return self._dicts_cache
     
     def get_file_count(self):
         """
@@ -277,7 +692,7 @@ class FileModel(QObject):
         Returns:
             int: 文件数量
         """
-        return len(self._files)
+        return self._count
     
     def has_file(self, name):
         """
@@ -289,4 +704,16 @@ class FileModel(QObject):
         Returns:
             bool: 如果文件存在返回True，否则返回False
         """
-        return name in self._files
\ No newline at end of file
+        return name in self._name_index
+    
+    def has_path(self, path):
+        """
+        检查路径是否已在模型中
+        
+        Args:
+            path (str): 文件路径
+            
+        Returns:
+            bool: 如果存在返回True，否则返回False
+        """
+        return self._normalize_path(path) in self._path_index
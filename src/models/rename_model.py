@@ -3,12 +3,53 @@
 
 import os
 import json
+import zlib
 import datetime
 from PySide6.QtCore import QObject, Signal, Slot, Property
 
+def compress_text(text):
+    """
+    压缩文本，用于只在调试和导出时才需要的原始AI响应
+    
+    Args:
+        text (str): 文本
+        
+    Returns:
+        bytes: zlib压缩后的数据，空文本返回空字节串
+    """
+    if not text:
+        return b""
+    return zlib.compress(text.encode('utf-8', 'surrogatepass'))
+
+def decompress_text(data):
+    """
+    解压compress_text()压缩的文本
+    
+    Args:
+        data (bytes): 压缩数据，旧版本保存的未压缩字符串原样返回
+        
+    Returns:
+        str: 文本
+    """
+    if not data:
+        return ""
+    if isinstance(data, str):
+        return data
+    return zlib.decompress(data).decode('utf-8', 'surrogatepass')
+
 class RenameHistory(QObject):
     """
     重命名历史记录类，用于记录重命名操作和结果
+    
+    重命名映射有两种存储方式：完整映射（检查点），或相对于上一条历史记录（基准）
+    的差异。差异只保存变化和新增的条目以及被移除的文件名，需要时沿基准链
+    回到最近的检查点再逐条应用差异得到完整映射。
+    
+    从会话数据库恢复的记录可以延迟加载：只保存时间戳和加载函数，第一次
+    访问映射时才读取。
+    
+    原始AI响应只在调试和导出时使用，收到时就压缩保存，读取时才解压；
+    写入会话数据库后可以只保留读取函数，不在内存中保存。
     """
     
     def __init__(self, rename_map=None, timestamp=None, parent=None):
@@ -23,25 +64,161 @@ class RenameHistory(QObject):
         super().__init__(parent)
         self._rename_map = rename_map or {}
         self._timestamp = timestamp or datetime.datetime.now()
-        self._raw_response = ""  # 原始AI响应
+        self._raw_response = b""  # 压缩后的原始AI响应
+        self._raw_loader = None   # 原始响应保存在会话数据库中时的读取函数，返回压缩数据
+        
+        # 差异存储，_base为None时_rename_map是完整映射
+        self._base = None      # 基准历史记录
+        self._changed = None   # 相对于基准变化或新增的条目
+        self._removed = None   # 相对于基准被移除的文件名
+        self._depth = 0        # 到最近检查点的差异层数
+        
+        self._loader = None      # 延迟加载函数，返回包含rename_map的字典
+        self.session_id = None   # 在会话数据库中的记录ID，未保存时为None
+    
+    @classmethod
+    def deferred(cls, loader, timestamp=None, session_id=None, raw_loader=None, parent=None):
+        """
+        创建延迟加载的历史记录
+        
+        Args:
+            loader (callable): 加载函数，返回包含rename_map的字典，失败时返回None
+            timestamp (datetime): 时间戳
+            session_id (int, optional): 在会话数据库中的记录ID
+            raw_loader (callable, optional): 读取压缩后原始响应的函数
+            parent: 父对象
+            
+        Returns:
+            RenameHistory: 重命名历史对象
+        """
+        history = cls(timestamp=timestamp, parent=parent)
+        history._loader = loader
+        history._raw_loader = raw_loader
+        history.session_id = session_id
+        return history
+    
+    def is_loaded(self):
+        return self._loader is None
+    
+    def _ensure_loaded(self):
+        if self._loader is None:
+            return
+        loader = self._loader
+        self._loader = None
+        data = loader() or {}
+        self._rename_map = data.get('rename_map', {})
     
     def get_rename_map(self):
         """
         获取重命名映射
         
         Returns:
-            dict: 重命名映射
-        """
-        return self._rename_map
+            dict: 重命名映射，差异存储时每次调用都重新构建
+        """
+        self._ensure_loaded()
+        if self._base is None:
+            return self._rename_map
+        
+        # 沿基准链回到检查点，再按从旧到新的顺序应用差异
+        chain = []
+        history = self
+        while history._base is not None:
+            chain.append(history)
+            history = history._base
+        
+        history._ensure_loaded()
+        rename_map = dict(history._rename_map)
+        for history in reversed(chain):
+            for name in history._removed:
+                rename_map.pop(name, None)
+            rename_map.update(history._changed)
+        return rename_map
     
     def set_rename_map(self, rename_map):
         """
-        设置重命名映射
+        设置重命名映射，之后按完整映射存储
         
         Args:
             rename_map (dict): 重命名映射
         """
+        self._ensure_loaded()
         self._rename_map = rename_map
+        self._base = None
+        self._changed = None
+        self._removed = None
+        self._depth = 0
+    
+    def is_checkpoint(self):
+        """
+        是否按完整映射存储
+        
+        Returns:
+            bool: 完整映射返回True，差异返回False
+        """
+        return self._base is None
+    
+    def entry_count(self):
+        """
+        获取实际存储的条目数量
+        
+        Returns:
+            int: 完整映射的条目数，或差异中变化、新增和移除的条目数之和
+        """
+        self._ensure_loaded()
+        if self._base is None:
+            return len(self._rename_map)
+        return len(self._changed) + len(self._removed)
+    
+    def get_delta(self):
+        """
+        获取差异存储的内容
+        
+        Returns:
+            tuple: (基准历史记录, 变化或新增的条目, 被移除的文件名)，完整映射存储时返回None
+        """
+        if self._base is None:
+            return None
+        return self._base, self._changed, self._removed
+    
+    def encode_against(self, base, base_map, max_depth):
+        """
+        改为存储相对于基准的差异；差异不比完整映射小或差异链已经达到最大层数时保持完整映射
+        
+        Args:
+            base (RenameHistory): 基准历史记录
+            base_map (dict): 基准的完整重命名映射
+            max_depth (int): 两个检查点之间最多的差异层数
+            
+        Returns:
+            bool: 改为差异存储返回True
+        """
+        if base is None or base._depth + 1 >= max_depth:
+            return False
+        
+        rename_map = self.get_rename_map()
+        changed = {
+            name: new_name for name, new_name in rename_map.items()
+            if name not in base_map or base_map[name] != new_name
+        }
+        removed = tuple(name for name in base_map if name not in rename_map)
+        
+        # 变化超过一半时差异没有意义
+        if (len(changed) + len(removed)) * 2 > len(rename_map):
+            return False
+        
+        self._base = base
+        self._changed = changed
+        self._removed = removed
+        self._depth = base._depth + 1
+        self._rename_map = None
+        return True
+    
+    def rebase_to_checkpoint(self):
+        """
+        基准将被删除时，改为完整映射存储
+        """
+        if self._base is not None:
+            self.set_rename_map(self.get_rename_map())
     
     def get_timestamp(self):
         """
@@ -54,21 +231,43 @@ class RenameHistory(QObject):
     
     def get_raw_response(self):
         """
-        获取原始AI响应
+        获取原始AI响应，每次调用都重新解压
         
         Returns:
             str: 原始AI响应
         """
+        return decompress_text(self.get_compressed_raw_response())
+    
+    def get_compressed_raw_response(self):
+        """
+        获取压缩后的原始AI响应，保存在会话数据库中时从数据库读取
+        
+        Returns:
+            bytes: 压缩数据
+        """
+        if self._raw_loader is not None:
+            return self._raw_loader() or b""
         return self._raw_response
     
     def set_raw_response(self, raw_response):
         """
-        设置原始AI响应
+        设置原始AI响应，立即压缩
         
         Args:
             raw_response (str): 原始AI响应
         """
-        self._raw_response = raw_response
+        self._raw_loader = None
+        self._raw_response = compress_text(raw_response)
+    
+    def spill_raw_response(self, raw_loader):
+        """
+        原始响应已经写入会话数据库后释放内存中的数据，之后通过读取函数获取
+        
+        Args:
+            raw_loader (callable): 读取压缩后原始响应的函数
+        """
+        self._raw_loader = raw_loader
+        self._raw_response = b""
     
     def to_dict(self):
         """
@@ -78,9 +277,9 @@ class RenameHistory(QObject):
             dict: 字典表示
         """
         return {
-            'rename_map': self._rename_map,
+            'rename_map': self.get_rename_map(),
             'timestamp': self._timestamp.isoformat(),
-            'raw_response': self._raw_response
+            'raw_response': self.get_raw_response()
         }
     
     @classmethod
@@ -124,18 +323,86 @@ class RenameModel(QObject):
     historyChanged = Signal(list)
     currentHistoryChanged = Signal(object)
     exampleUpdated = Signal(str, object)
+    examplesRemoved = Signal(list)
+    
+    # 默认最多保留的历史记录数，与SettingsModel中app.max_history的默认值一致
+    DEFAULT_MAX_HISTORY = 10
+    
+    # 两个完整映射检查点之间最多的差异层数，限制随机访问时需要应用的差异数量
+    CHECKPOINT_INTERVAL = 4
     
-    def __init__(self, parent=None):
+    def __init__(self, max_history=DEFAULT_MAX_HISTORY, parent=None):
         """
         初始化重命名模型
         
         Args:
+            max_history (int): 最多保留的历史记录数，超过时删除最早的记录，0表示不限制
             parent: 父对象
         """
         super().__init__(parent)
         self._history = []  # 历史记录列表
         self._current_index = -1  # 当前历史记录索引
         self._examples = {}  # 示例映射，键为原始文件名，值为新文件名
+        self._max_history = max_history
+        self._map_cache = (None, None)  # 最近构建的（历史记录, 完整映射）
+    
+    def set_max_history(self, max_history):
+        """
+        设置最多保留的历史记录数，立即删除超出的最早记录
+        
+        Args:
+            max_history (int): 最多保留的历史记录数，0表示不限制
+        """
+        self._max_history = max(0, int(max_history or 0))
+        if self._evict():
+            self.historyChanged.emit(self._history)
+    
+    def get_max_history(self):
+        return self._max_history
+    
+    def _evict(self):
+        """
+        删除超出数量上限的最早历史记录
+        
+        Returns:
+            bool: 有记录被删除时返回True
+        """
+        if not self._max_history or len(self._history) <= self._max_history:
+            return False
+        
+        count = len(self._history) - self._max_history
+        evicted = self._history[:count]
+        self._history = self._history[count:]
+        
+        # 以被删除的记录为基准的记录改为完整映射
+        evicted_ids = {id(history) for history in evicted}
+        for history in self._history:
+            if history._base is not None and id(history._base) in evicted_ids:
+                history.rebase_to_checkpoint()
+        for history in evicted:
+            history.deleteLater()
+        
+        self._current_index = max(0, self._current_index - count)
+        return True
+    
+    def _rename_map_of(self, history):
+        """
+        获取历史记录的完整映射，连续访问同一条记录时不重复构建
+        """
+        cached_history, cached_map = self._map_cache
+        if cached_history is not history:
+            cached_map = history.get_rename_map()
+            self._map_cache = (history, cached_map)
+        return cached_map
+    
+    def _append_history(self, history):
+        """
+        以当前最后一条记录为基准压缩后追加历史记录
+        """
+        if self._history:
+            base = self._history[-1]
+            history.encode_against(base, self._rename_map_of(base), self.CHECKPOINT_INTERVAL)
+        self._history.append(history)
     
     @Slot(dict)
     def add_history(self, result):
@@ -161,8 +428,9 @@ class RenameModel(QObject):
         if self._current_index >= 0 and self._current_index < len(self._history) - 1:
             self._history = self._history[:self._current_index + 1]
         
-        # 添加历史记录
-        self._history.append(history)
+        # 添加历史记录，存储为相对于上一条记录的差异，超过数量上限时删除最早的记录
+        self._append_history(history)
+        self._evict()
         self._current_index = len(self._history) - 1
         
         # 发出信号
@@ -178,6 +446,7 @@ class RenameModel(QObject):
         """
         self._history.clear()
         self._current_index = -1
+        self._map_cache = (None, None)
         
         # 发出信号
         self.historyChanged.emit([])
@@ -221,6 +490,41 @@ class RenameModel(QObject):
         
         return None
     
+    def restore_history(self, histories, current_index):
+        """
+        恢复历史记录，记录按原样使用，不重新压缩（可以是延迟加载的记录）
+        
+        Args:
+            histories (list): 历史记录列表，按添加顺序排列
+            current_index (int): 当前历史记录索引
+        """
+        for history in self._history:
+            history.deleteLater()
+        self._history = list(histories)
+        for history in self._history:
+            history.setParent(self)
+        self._map_cache = (None, None)
+        self._current_index = min(max(current_index, -1), len(self._history) - 1)
+        if self._current_index < 0 and self._history:
+            self._current_index = len(self._history) - 1
+        self._evict()
+        
+        # 发出信号，只有当前记录会被加载
+        self.historyChanged.emit(self._history)
+        self.currentHistoryChanged.emit(self.get_current_history())
+    
+    def get_history(self):
+        """
+        获取所有历史记录
+        
+        Returns:
+            list: 历史记录列表，按添加顺序排列
+        """
+        return self._history
+    
+    def get_current_index(self):
+        return self._current_index
+    
     def get_current_history(self):
         """
         获取当前历史记录
@@ -242,7 +546,7 @@ class RenameModel(QObject):
         """
         history = self.get_current_history()
         if history:
-            return history.get_rename_map()
+            return self._rename_map_of(history)
         
         return {}
     
@@ -293,6 +597,23 @@ class RenameModel(QObject):
         
         return False
     
+    @Slot(list)
+    def remove_examples(self, original_names):
+        """
+        批量移除示例（例如文件已从列表中移除），只发出一次examplesRemoved信号
+        
+        Args:
+            original_names (list): 原始文件名列表
+            
+        Returns:
+            list: 实际移除的文件名
+        """
+        examples = self._examples
+        removed = [name for name in original_names if examples.pop(name, None) is not None]
+        if removed:
+            self.examplesRemoved.emit(removed)
+        return removed
+    
     @Slot()
     def clear_examples(self):
         """
@@ -369,14 +690,17 @@ class RenameModel(QObject):
             # 清空当前数据
             self._history.clear()
             self._examples.clear()
+            self._map_cache = (None, None)
             
-            # 加载历史记录
+            # 加载历史记录，文件中是完整映射，加载时重新压缩为差异
             for h_data in data.get('history', []):
                 history = RenameHistory.from_dict(h_data, parent=self)
-                self._history.append(history)
+                self._append_history(history)
             
             # 设置当前索引
             self._current_index = data.get('current_index', -1)
+            if self._evict() and self._current_index >= len(self._history):
+                self._current_index = len(self._history) - 1
             
             # 加载示例
             self._examples.update(data.get('examples', {}))
@@ -32,12 +32,29 @@ class SettingsModel(QObject):
             'app': {
                 'first_run': True,
                 'theme': 'system',
-                'max_history': 10
+                'max_history': 10,
+                'restore_session': True  # 启动时恢复上次的文件列表、示例和分析历史
             },
             'rename': {
                 'preview_before_apply': True,
                 'backup_original_files': True,
+                'backup_mode': 'journal',  # journal/auto/hardlink/reflink/copy
                 'backup_directory': 'backup'
+            },
+            'import': {
+                'include_patterns': [],      # 包含的通配符，例如 ["*.jpg"]
+                'exclude_patterns': ['backup'],  # 排除的通配符，匹配的文件夹不会被进入
+                'extensions': [],            # 允许的扩展名，为空时不限制
+                'include_hidden': False,
+                'max_depth': -1,             # 最大递归深度，-1表示不限制
+                'max_count': 0,              # 最多导入的文件数量，0表示不限制
+                'watch_changes': False,      # 是否监视已导入的文件夹并同步外部更改
+                'watch_backend': 'auto',     # 监视后端：auto/inotify/polling
+                'watch_poll_interval': 2.0   # 轮询后端的检查间隔（秒）
+            },
+            'display': {
+                'show_thumbnails': False,         # 是否在原始文件名前显示图片缩略图
+                'thumbnail_cache_directory': ''   # 缩略图磁盘缓存目录，为空时使用系统缓存目录
             }
         }
     
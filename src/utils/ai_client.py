@@ -224,4 +224,10 @@ class AIClient(QObject):
         """
         关闭客户端
         """
-        asyncio.create_task(self.client.aclose())
\ No newline at end of file
+        asyncio.create_task(self.client.aclose())
+    
+    async def aclose(self):
+        """
+        关闭客户端并等待连接池释放（在事件循环结束前调用）
+        """
+        await self.client.aclose()
\ No newline at end of file
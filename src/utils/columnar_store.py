@@ -0,0 +1,622 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import mmap
+import struct
+import fnmatch
+from array import array
+
+from .file_operations import FileOperations
+
+class StringPool:
+    """
+    字符串池，把重复的字符串保存为一份，列中只存整数ID
+
+    同一文件夹的路径、相同的文件名在百万级文件中重复很多，
+    按ID比较和查找也比逐个比较字符串快。
+    """
+
+    def __init__(self, strings=None):
+        """
+        初始化字符串池
+
+        Args:
+            strings (list, optional): 已有的字符串列表，下标即ID
+        """
+        self._strings = list(strings) if strings else []
+        self._ids = None  # 字符串 -> ID，第一次查找时才建立（从文件加载时不需要）
+
+    def __len__(self):
+        return len(self._strings)
+
+    def _get_ids(self):
+        if self._ids is None:
+            self._ids = {value: index for index, value in enumerate(self._strings)}
+        return self._ids
+
+    def intern(self, value):
+        """
+        获取字符串的ID，不存在时加入池中
+
+        Args:
+            value (str): 字符串
+
+        Returns:
+            int: 字符串ID
+        """
+        ids = self._get_ids()
+        string_id = ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            ids[value] = string_id
+        return string_id
+
+    def find(self, value):
+        """
+        查找字符串的ID
+
+        Args:
+            value (str): 字符串
+
+        Returns:
+            int: 字符串ID，不存在返回-1
+        """
+        return self._get_ids().get(value, -1)
+
+    def get(self, string_id):
+        """
+        按ID获取字符串
+
+        Args:
+            string_id (int): 字符串ID
+
+        Returns:
+            str: 字符串
+        """
+        return self._strings[string_id]
+
+    def strings(self):
+        """
+        获取全部字符串，下标即ID
+
+        Returns:
+            list: 字符串列表
+        """
+        return self._strings
+
+class ColumnarFileStore:
+    """
+    列式文件存储，用于百万级文件的批量任务
+
+    每个文件只占一行，各字段分别存放在连续的列中：
+    - 文件名和所在文件夹保存在字符串池中，列中只存ID（array('I')）
+    - 文件夹、已移除等标记保存在bytearray中
+    - 新文件名是一个并列的列（array('i')，-1表示没有新文件名）
+
+    每行约13字节，加上去重后的字符串。过滤、校验和应用重命名映射都按列扫描，
+    对文件名的判断按字符串池中的每个不同值只做一次。会话文件可以用mmap直接映射各列，
+    第一次修改时才复制到内存。
+
+    与FileModel的关系：FileModel面向界面，为每个文件保留一条记录；
+    本存储面向无界面的批量任务，通过from_file_dicts()/to_file_dicts()与其交换数据。
+    命令行模式用它保存和读取扩展名为.cols的映射文件（plan --save-map / apply --map）。
+    """
+
+    # 标记位
+    FLAG_FOLDER = 0x01
+    FLAG_REMOVED = 0x02
+
+    # 没有新文件名
+    NO_NAME = -1
+
+    # 会话文件格式
+    MAGIC = b"GYCOLS1\n"
+    COLUMNS = (('dir_ids', 'I'), ('name_ids', 'I'), ('new_name_ids', 'i'), ('flags', 'B'))
+
+    def __init__(self):
+        """
+        初始化列式文件存储
+        """
+        self._names = StringPool()
+        self._dirs = StringPool()
+        self._dir_ids = array('I')       # 行 -> 文件夹ID
+        self._name_ids = array('I')      # 行 -> 文件名ID
+        self._new_name_ids = array('i')  # 行 -> 新文件名ID，没有时为NO_NAME
+        self._flags = bytearray()        # 行 -> 标记位
+        self._removed_count = 0
+        self._path_index = None          # (文件夹ID << 32 | 文件名ID) -> 行，按需建立
+        self._mmap = None                # 从会话文件映射时的mmap对象
+
+    # 构建与转换
+    @classmethod
+    def from_paths(cls, paths, check_duplicates=True):
+        """
+        从路径列表创建存储
+
+        Args:
+            paths (iterable): 文件路径，或 (路径, 是否为文件夹) 元组
+            check_duplicates (bool): 是否跳过重复路径，来源已保证不重复时可关闭以节省内存
+
+        Returns:
+            ColumnarFileStore: 存储实例
+        """
+        store = cls()
+        store.add_paths(paths, check_duplicates)
+        return store
+
+    @classmethod
+    def from_file_dicts(cls, file_dicts):
+        """
+        从文件数据字典列表（例如FileModel.get_file_dicts()）创建存储
+
+        Args:
+            file_dicts (list): 包含path和is_folder的字典列表
+
+        Returns:
+            ColumnarFileStore: 存储实例
+        """
+        return cls.from_paths((data['path'], data.get('is_folder', False)) for data in file_dicts)
+
+    def to_file_dicts(self, rows=None):
+        """
+        转换为文件数据字典列表，可直接交给FileController.add_files()
+
+        Args:
+            rows (iterable, optional): 行号，默认为全部未移除的行
+
+        Returns:
+            list: 文件数据字典列表
+        """
+        if rows is None:
+            rows = self.iter_rows()
+        file_dicts = []
+        for row in rows:
+            name = self._names.get(self._name_ids[row])
+            file_dicts.append({
+                'path': os.path.join(self._dirs.get(self._dir_ids[row]), name),
+                'name': name,
+                'is_folder': bool(self._flags[row] & self.FLAG_FOLDER)
+            })
+        return file_dicts
+
+    # 添加和移除
+    def add_path(self, path, is_folder=False, check_duplicates=True):
+        """
+        添加一个文件
+
+        Args:
+            path (str): 文件路径
+            is_folder (bool): 是否为文件夹
+            check_duplicates (bool): 是否跳过已存在的路径
+
+        Returns:
+            int: 行号，路径已存在时返回-1
+        """
+        self._ensure_writable()
+        dir_path, name = os.path.split(os.path.normpath(path))
+        dir_id = self._dirs.intern(dir_path)
+        name_id = self._names.intern(name)
+
+        if check_duplicates or self._path_index is not None:
+            index = self._get_path_index()
+            key = dir_id << 32 | name_id
+            if key in index:
+                return -1
+            index[key] = len(self._flags)
+
+        self._dir_ids.append(dir_id)
+        self._name_ids.append(name_id)
+        self._new_name_ids.append(self.NO_NAME)
+        self._flags.append(self.FLAG_FOLDER if is_folder else 0)
+        return len(self._flags) - 1
+
+    def add_paths(self, paths, check_duplicates=True):
+        """
+        批量添加文件
+
+        Args:
+            paths (iterable): 文件路径，或 (路径, 是否为文件夹) 元组
+            check_duplicates (bool): 是否跳过已存在的路径
+
+        Returns:
+            int: 实际添加的数量
+        """
+        self._ensure_writable()
+        index = self._get_path_index() if check_duplicates or self._path_index is not None else None
+        intern_dir = self._dirs.intern
+        intern_name = self._names.intern
+        split = os.path.split
+        normpath = os.path.normpath
+        folder_flag = self.FLAG_FOLDER
+        dir_ids, name_ids, new_name_ids, flags = self._dir_ids, self._name_ids, self._new_name_ids, self._flags
+
+        added = 0
+        for item in paths:
+            if isinstance(item, tuple):
+                path, is_folder = item
+            else:
+                path, is_folder = item, False
+            dir_path, name = split(normpath(path))
+            dir_id = intern_dir(dir_path)
+            name_id = intern_name(name)
+
+            if index is not None:
+                key = dir_id << 32 | name_id
+                if key in index:
+                    continue
+                index[key] = len(flags)
+
+            dir_ids.append(dir_id)
+            name_ids.append(name_id)
+            new_name_ids.append(self.NO_NAME)
+            flags.append(folder_flag if is_folder else 0)
+            added += 1
+        return added
+
+    def remove_row(self, row):
+        """
+        移除一行，行号保持不变，只设置已移除标记
+
+        Args:
+            row (int): 行号
+
+        Returns:
+            bool: 如果成功移除返回True，已移除时返回False
+        """
+        if self._flags[row] & self.FLAG_REMOVED:
+            return False
+        self._ensure_writable()
+        self._flags[row] |= self.FLAG_REMOVED
+        self._removed_count += 1
+        if self._path_index is not None:
+            self._path_index.pop(self._dir_ids[row] << 32 | self._name_ids[row], None)
+        return True
+
+    # 查询
+    def __len__(self):
+        return len(self._flags) - self._removed_count
+
+    def row_count(self):
+        """
+        获取总行数，包含已移除的行
+
+        Returns:
+            int: 行数
+        """
+        return len(self._flags)
+
+    def iter_rows(self):
+        """
+        遍历未移除的行号
+
+        Returns:
+            iterator: 行号
+        """
+        if not self._removed_count:
+            return iter(range(len(self._flags)))
+        removed = self.FLAG_REMOVED
+        return (row for row, flags in enumerate(self._flags) if not flags & removed)
+
+    def find_row(self, path):
+        """
+        按路径查找行号
+
+        Args:
+            path (str): 文件路径
+
+        Returns:
+            int: 行号，不存在返回-1
+        """
+        dir_path, name = os.path.split(os.path.normpath(path))
+        dir_id = self._dirs.find(dir_path)
+        name_id = self._names.find(name)
+        if dir_id < 0 or name_id < 0:
+            return -1
+        return self._get_path_index().get(dir_id << 32 | name_id, -1)
+
+    def get_path(self, row):
+        return os.path.join(self._dirs.get(self._dir_ids[row]), self._names.get(self._name_ids[row]))
+
+    def get_name(self, row):
+        return self._names.get(self._name_ids[row])
+
+    def get_dir(self, row):
+        return self._dirs.get(self._dir_ids[row])
+
+    def get_new_name(self, row):
+        new_name_id = self._new_name_ids[row]
+        return self._names.get(new_name_id) if new_name_id != self.NO_NAME else None
+
+    def is_folder(self, row):
+        return bool(self._flags[row] & self.FLAG_FOLDER)
+
+    def is_removed(self, row):
+        return bool(self._flags[row] & self.FLAG_REMOVED)
+
+    def _get_path_index(self):
+        """
+        获取路径索引，第一次使用时从列中建立
+        """
+        if self._path_index is None:
+            removed = self.FLAG_REMOVED
+            self._path_index = {
+                dir_id << 32 | name_id: row
+                for row, (dir_id, name_id, flags) in enumerate(zip(self._dir_ids, self._name_ids, self._flags))
+                if not flags & removed
+            }
+        return self._path_index
+
+    # 按列的批量操作
+    def filter_rows(self, patterns=None, extensions=None, include_folders=True, predicate=None):
+        """
+        按文件名过滤行，每个不同的文件名只判断一次
+
+        Args:
+            patterns (list, optional): 文件名通配符，匹配任意一个即可
+            extensions (list, optional): 扩展名列表，不区分大小写
+            include_folders (bool): 是否包含文件夹
+            predicate (callable, optional): 额外的判断函数，参数为文件名
+
+        Returns:
+            array: 匹配的行号
+        """
+        if extensions:
+            extensions = tuple(
+                ext.lower() if ext.startswith('.') else '.' + ext.lower() for ext in extensions
+            )
+
+        # 先在字符串池上求出每个文件名是否匹配
+        matched = bytearray(len(self._names))
+        for name_id, name in enumerate(self._names.strings()):
+            if extensions and not name.lower().endswith(extensions):
+                continue
+            if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                continue
+            if predicate and not predicate(name):
+                continue
+            matched[name_id] = 1
+
+        # 再扫描列
+        skip = self.FLAG_REMOVED if include_folders else self.FLAG_REMOVED | self.FLAG_FOLDER
+        return array('I', (
+            row for row, (name_id, flags) in enumerate(zip(self._name_ids, self._flags))
+            if matched[name_id] and not flags & skip
+        ))
+
+    def set_new_name(self, row, new_name):
+        """
+        设置一行的新文件名
+
+        Args:
+            row (int): 行号
+            new_name (str): 新文件名，None表示清除
+        """
+        self._ensure_writable()
+        self._new_name_ids[row] = self._names.intern(new_name) if new_name else self.NO_NAME
+
+    def clear_new_names(self):
+        """
+        清除所有新文件名
+        """
+        self._ensure_writable()
+        self._new_name_ids = array('i', [self.NO_NAME]) * len(self._flags)
+
+    def apply_rename_map(self, rename_map, by='path'):
+        """
+        应用重命名映射
+
+        Args:
+            rename_map (dict): 路径或文件名 -> 新文件名
+            by (str): 'path' 按完整路径匹配，'name' 按文件名匹配（同名文件都会应用）
+
+        Returns:
+            int: 设置了新文件名的行数
+        """
+        self._ensure_writable()
+        new_name_ids = self._new_name_ids
+        applied = 0
+
+        if by == 'name':
+            # 把映射换成文件名ID -> 新文件名ID，然后扫描一遍文件名列
+            id_map = {}
+            for name, new_name in rename_map.items():
+                name_id = self._names.find(name)
+                if name_id >= 0 and new_name:
+                    id_map[name_id] = self._names.intern(new_name)
+            if not id_map:
+                return 0
+            removed = self.FLAG_REMOVED
+            for row, (name_id, flags) in enumerate(zip(self._name_ids, self._flags)):
+                new_name_id = id_map.get(name_id)
+                if new_name_id is not None and not flags & removed:
+                    new_name_ids[row] = new_name_id
+                    applied += 1
+            return applied
+
+        for path, new_name in rename_map.items():
+            row = self.find_row(path)
+            if row >= 0 and new_name:
+                new_name_ids[row] = self._names.intern(new_name)
+                applied += 1
+        return applied
+
+    def validate(self):
+        """
+        校验新文件名：无效的文件名，以及同一文件夹中重复的目标
+
+        每个不同的新文件名只校验一次。
+
+        Returns:
+            list: (行号, 原因) 元组列表
+        """
+        problems = []
+        valid = {}
+        targets = {}
+        removed = self.FLAG_REMOVED
+
+        for row, (dir_id, new_name_id, flags) in enumerate(zip(self._dir_ids, self._new_name_ids, self._flags)):
+            if new_name_id == self.NO_NAME or flags & removed:
+                continue
+
+            is_valid = valid.get(new_name_id)
+            if is_valid is None:
+                new_name = self._names.get(new_name_id)
+                is_valid = valid[new_name_id] = FileOperations.is_valid_filename(os.path.basename(new_name))
+            if not is_valid:
+                problems.append((row, "新文件名无效"))
+                continue
+
+            key = dir_id << 32 | new_name_id
+            first_row = targets.setdefault(key, row)
+            if first_row != row:
+                problems.append((row, f"与 {self.get_path(first_row)} 的新文件名重复"))
+
+        return problems
+
+    def iter_rename_pairs(self):
+        """
+        遍历有新文件名且与原名不同的行，可直接交给RenamePlanner.plan()
+
+        Returns:
+            iterator: (源文件路径, 新文件名) 元组
+        """
+        removed = self.FLAG_REMOVED
+        for row, (name_id, new_name_id, flags) in enumerate(zip(self._name_ids, self._new_name_ids, self._flags)):
+            if new_name_id != self.NO_NAME and new_name_id != name_id and not flags & removed:
+                yield self.get_path(row), self._names.get(new_name_id)
+
+    # 会话文件
+    def save(self, file_path):
+        """
+        保存到会话文件
+
+        文件由魔数、头部长度、JSON头部（字符串池和各列位置）和按8字节对齐的各列原始数据组成，
+        加载时可以直接映射各列。
+
+        Args:
+            file_path (str): 文件路径
+        """
+        columns = {}
+        blobs = []
+        offset = 0
+        for name, _ in self.COLUMNS:
+            data = getattr(self, '_' + name)
+            nbytes = len(data) * (data.itemsize if isinstance(data, (array, memoryview)) else 1)
+            columns[name] = [offset, nbytes]
+            blobs.append((data, nbytes))
+            offset += nbytes + (-nbytes % 8)
+
+        header = json.dumps({
+            'version': 1,
+            'rows': len(self._flags),
+            'removed': self._removed_count,
+            'itemsize': array('I').itemsize,
+            'byteorder': sys.byteorder,
+            'names': self._names.strings(),
+            'dirs': self._dirs.strings(),
+            'columns': columns,
+        }, ensure_ascii=False).encode('utf-8')
+
+        temp_path = file_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            f.write(b'\0' * (-f.tell() % 8))
+            for data, nbytes in blobs:
+                f.write(data)
+                f.write(b'\0' * (-nbytes % 8))
+        os.replace(temp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path, use_mmap=True):
+        """
+        从会话文件加载
+
+        Args:
+            file_path (str): 文件路径
+            use_mmap (bool): 是否映射各列，而不是读入内存
+
+        Returns:
+            ColumnarFileStore: 存储实例
+
+        Raises:
+            ValueError: 文件格式无效
+        """
+        with open(file_path, 'rb') as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"不是有效的会话文件: {file_path}")
+            header_size, = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_size).decode('utf-8'))
+            data_offset = f.tell() + (-f.tell() % 8)
+
+            # 字节序或整数宽度不同时不能直接映射
+            native = header['byteorder'] == sys.byteorder and header['itemsize'] == array('I').itemsize
+            if use_mmap and native and header['rows']:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                f.seek(0)
+                buffer = f.read()
+
+        store = cls()
+        store._names = StringPool(header['names'])
+        store._dirs = StringPool(header['dirs'])
+        store._removed_count = header['removed']
+
+        view = memoryview(buffer)
+        mapped = isinstance(buffer, mmap.mmap)
+        for name, typecode in cls.COLUMNS:
+            offset, nbytes = header['columns'][name]
+            start = data_offset + offset
+            column = view[start:start + nbytes]
+            if mapped:
+                column = column.cast(typecode) if typecode != 'B' else column
+            elif typecode == 'B':
+                column = bytearray(column)
+            else:
+                column = array(typecode, column.tobytes())
+                if not native:
+                    column.byteswap()
+            setattr(store, '_' + name, column)
+        view.release()
+
+        if mapped:
+            store._mmap = buffer
+        return store
+
+    def is_mapped(self):
+        """
+        检查各列是否仍映射在会话文件上
+
+        Returns:
+            bool: 是否为映射状态
+        """
+        return self._mmap is not None
+
+    def _ensure_writable(self):
+        """
+        修改前把映射的列复制到内存并释放映射
+        """
+        if self._mmap is None:
+            return
+        for name, typecode in self.COLUMNS:
+            column = getattr(self, '_' + name)
+            if typecode == 'B':
+                copied = bytearray(column)
+            else:
+                copied = array(typecode)
+                copied.frombytes(column.cast('B'))
+            column.release()
+            setattr(self, '_' + name, copied)
+        self._mmap.close()
+        self._mmap = None
+
+    def close(self):
+        """
+        释放会话文件映射，之后仍可继续使用（各列已复制到内存）
+        """
+        self._ensure_writable()
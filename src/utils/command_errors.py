@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# 命令行模式、守护进程和守护进程客户端共用的退出码和错误类型。
+# cli.py作为脚本运行时模块名是__main__，daemon.py导入的是另一个cli模块，
+# 错误类型放在这里，两边捕获的才是同一个类。
+
+# 退出码
+EXIT_OK = 0                # 成功
+EXIT_FAILED = 1            # 重命名或撤销失败（包括部分失败）
+EXIT_USAGE = 2             # 参数错误，与argparse一致
+EXIT_NO_FILES = 3          # 没有找到需要处理的文件
+EXIT_ANALYSIS_FAILED = 4   # AI分析失败
+EXIT_PROBLEMS = 5          # 计划中有无法执行的操作（源文件缺失、权限不足、文件名无效）
+EXIT_UNAVAILABLE = 6       # 无法连接守护进程
+EXIT_NO_RULE = 7           # 无法从示例归纳出重命名规则
+
+class CommandError(Exception):
+    """
+    命令执行失败，携带退出码
+    """
+
+    def __init__(self, message, exit_code=EXIT_FAILED):
+        super().__init__(message)
+        self.exit_code = exit_code
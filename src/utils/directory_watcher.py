@@ -0,0 +1,507 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import threading
+
+# 事件类型
+EVENT_ADDED = "added"
+EVENT_REMOVED = "removed"
+EVENT_RENAMED = "renamed"
+EVENT_OVERFLOW = "overflow"  # 事件队列溢出，部分变化已丢失
+
+# 后端类型
+BACKEND_AUTO = "auto"
+BACKEND_INOTIFY = "inotify"
+BACKEND_POLLING = "polling"
+
+
+class WatchEvent:
+    """
+    文件夹变化事件
+    """
+
+    __slots__ = ('kind', 'path', 'dest_path', 'is_folder')
+
+    def __init__(self, kind, path, dest_path=None, is_folder=False):
+        """
+        初始化文件夹变化事件
+
+        Args:
+            kind (str): 事件类型
+            path (str): 发生变化的路径，重命名时为原路径
+            dest_path (str, optional): 重命名后的路径
+            is_folder (bool): 是否为文件夹
+        """
+        self.kind = kind
+        self.path = path
+        self.dest_path = dest_path
+        self.is_folder = is_folder
+
+    def __eq__(self, other):
+        if not isinstance(other, WatchEvent):
+            return NotImplemented
+        return (self.kind, self.path, self.dest_path, self.is_folder) == \
+               (other.kind, other.path, other.dest_path, other.is_folder)
+
+    def __repr__(self):
+        if self.dest_path:
+            return f"WatchEvent({self.kind}, {self.path} -> {self.dest_path})"
+        return f"WatchEvent({self.kind}, {self.path})"
+
+
+class DirectoryWatcher:
+    """
+    文件夹监视器基类
+
+    只监视文件夹的直接子项（不递归），需要监视的每个文件夹都要单独添加。
+    read_events()在后台线程中调用，add_path()/remove_path()可以在其他线程中调用。
+    """
+
+    def __init__(self):
+        """
+        初始化文件夹监视器
+        """
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create(backend=BACKEND_AUTO, poll_interval=2.0):
+        """
+        创建文件夹监视器
+
+        Args:
+            backend (str): 后端类型，auto时在Linux上优先使用inotify，否则使用轮询
+            poll_interval (float): 轮询后端的检查间隔（秒）
+
+        Returns:
+            DirectoryWatcher: 文件夹监视器
+        """
+        if backend in (BACKEND_AUTO, BACKEND_INOTIFY) and InotifyWatcher.is_supported():
+            try:
+                return InotifyWatcher()
+            except OSError:
+                if backend == BACKEND_INOTIFY:
+                    raise
+        elif backend == BACKEND_INOTIFY:
+            raise OSError("当前系统不支持inotify")
+
+        return PollingWatcher(poll_interval)
+
+    def add_path(self, dir_path):
+        """
+        开始监视文件夹
+
+        Args:
+            dir_path (str): 文件夹路径
+
+        Returns:
+            bool: 成功返回True
+        """
+        raise NotImplementedError
+
+    def remove_path(self, dir_path):
+        """
+        停止监视文件夹
+
+        Args:
+            dir_path (str): 文件夹路径
+        """
+        raise NotImplementedError
+
+    def watched_paths(self):
+        """
+        获取正在监视的文件夹
+
+        Returns:
+            list: 文件夹路径列表
+        """
+        raise NotImplementedError
+
+    def read_events(self, timeout=1.0):
+        """
+        读取变化事件，没有事件时最多等待timeout秒
+
+        Args:
+            timeout (float): 最长等待时间（秒）
+
+        Returns:
+            list: WatchEvent列表
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        关闭监视器，释放资源
+        """
+        pass
+
+
+class InotifyWatcher(DirectoryWatcher):
+    """
+    基于Linux inotify的文件夹监视器，通过ctypes调用libc
+    """
+
+    # inotify常量
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+                  IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+    # struct inotify_event头部：wd, mask, cookie, len
+    EVENT_HEADER = struct.Struct('iIII')
+
+    # 等待与IN_MOVED_FROM配对的IN_MOVED_TO的时间（秒）
+    MOVE_PAIR_TIMEOUT = 0.02
+
+    _libc = None
+
+    @classmethod
+    def _load_libc(cls):
+        """
+        加载libc并声明inotify函数
+
+        Returns:
+            libc对象，不可用时返回None
+        """
+        if cls._libc is None:
+            try:
+                import ctypes
+                import ctypes.util
+                libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+                cls._libc = libc
+            except (OSError, AttributeError, ImportError):
+                cls._libc = False
+        return cls._libc or None
+
+    @classmethod
+    def is_supported(cls):
+        """
+        检查当前系统是否支持inotify
+
+        Returns:
+            bool: 支持返回True
+        """
+        return sys.platform.startswith('linux') and cls._load_libc() is not None
+
+    def __init__(self):
+        """
+        初始化inotify监视器
+        """
+        super().__init__()
+        import ctypes
+        self._libc = self._load_libc()
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._paths = {}  # 监视描述符 -> 文件夹路径
+        self._wds = {}    # 文件夹路径 -> 监视描述符
+
+    def add_path(self, dir_path):
+        with self._lock:
+            if dir_path in self._wds or self._fd < 0:
+                return True
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), self.WATCH_MASK)
+            if wd < 0:
+                return False
+            self._wds[dir_path] = wd
+            self._paths[wd] = dir_path
+            return True
+
+    def remove_path(self, dir_path):
+        with self._lock:
+            wd = self._wds.pop(dir_path, None)
+            if wd is None:
+                return
+            self._paths.pop(wd, None)
+            if self._fd >= 0:
+                self._libc.inotify_rm_watch(self._fd, wd)
+
+    def watched_paths(self):
+        with self._lock:
+            return list(self._wds)
+
+    def read_events(self, timeout=1.0):
+        if self._fd < 0:
+            time.sleep(timeout)
+            return []
+
+        raw_events = self._read_raw(timeout)
+        if not raw_events:
+            return []
+
+        # 有未配对的移出事件时稍等片刻，同一次重命名的移入事件通常紧随其后
+        cookies_from = {cookie for mask, cookie, _, _ in raw_events if mask & self.IN_MOVED_FROM}
+        cookies_to = {cookie for mask, cookie, _, _ in raw_events if mask & self.IN_MOVED_TO}
+        if cookies_from - cookies_to:
+            raw_events.extend(self._read_raw(self.MOVE_PAIR_TIMEOUT))
+
+        return self._translate(raw_events)
+
+    def close(self):
+        with self._lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+            self._paths.clear()
+            self._wds.clear()
+
+    def _read_raw(self, timeout):
+        """
+        读取并解析inotify事件
+
+        Args:
+            timeout (float): 最长等待时间（秒）
+
+        Returns:
+            list: (mask, cookie, 文件夹路径, 名称) 元组列表
+        """
+        try:
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+        except (OSError, ValueError):
+            return []
+        if not readable:
+            return []
+
+        events = []
+        header_size = self.EVENT_HEADER.size
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EBADF):
+                    break
+                raise
+            if not data:
+                break
+
+            offset = 0
+            with self._lock:
+                while offset + header_size <= len(data):
+                    wd, mask, cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+                    offset += header_size
+                    name = data[offset:offset + length].rstrip(b'\0')
+                    offset += length
+
+                    dir_path = self._paths.get(wd)
+                    if mask & self.IN_IGNORED:
+                        # 文件夹已被删除或停止监视
+                        if dir_path is not None:
+                            self._paths.pop(wd, None)
+                            self._wds.pop(dir_path, None)
+                        continue
+                    if dir_path is None and not mask & self.IN_Q_OVERFLOW:
+                        continue
+                    events.append((mask, cookie, dir_path, os.fsdecode(name)))
+
+        return events
+
+    def _translate(self, raw_events):
+        """
+        把原始事件转换为WatchEvent，按cookie配对重命名
+
+        Args:
+            raw_events (list): (mask, cookie, 文件夹路径, 名称) 元组列表
+
+        Returns:
+            list: WatchEvent列表
+        """
+        moved_to = {}
+        for mask, cookie, dir_path, name in raw_events:
+            if mask & self.IN_MOVED_TO:
+                moved_to[cookie] = os.path.join(dir_path, name)
+
+        with self._lock:
+            watched = set(self._wds)
+
+        events = []
+        paired = set()
+        for mask, cookie, dir_path, name in raw_events:
+            is_folder = bool(mask & self.IN_ISDIR)
+
+            if mask & self.IN_Q_OVERFLOW:
+                events.append(WatchEvent(EVENT_OVERFLOW, None))
+            elif mask & self.IN_MOVED_FROM:
+                path = os.path.join(dir_path, name)
+                if cookie in moved_to:
+                    paired.add(cookie)
+                    events.append(WatchEvent(EVENT_RENAMED, path, moved_to[cookie], is_folder))
+                else:
+                    # 移动到未监视的位置，视为删除
+                    events.append(WatchEvent(EVENT_REMOVED, path, is_folder=is_folder))
+            elif mask & self.IN_MOVED_TO:
+                if cookie not in paired:
+                    events.append(WatchEvent(EVENT_ADDED, os.path.join(dir_path, name), is_folder=is_folder))
+            elif mask & self.IN_CREATE:
+                events.append(WatchEvent(EVENT_ADDED, os.path.join(dir_path, name), is_folder=is_folder))
+            elif mask & self.IN_DELETE:
+                events.append(WatchEvent(EVENT_REMOVED, os.path.join(dir_path, name), is_folder=is_folder))
+            elif mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                # 被监视的文件夹本身被删除或移走，父文件夹被监视时已由父文件夹的事件报告
+                if mask & self.IN_MOVE_SELF:
+                    self.remove_path(dir_path)
+                if os.path.dirname(dir_path) not in watched:
+                    events.append(WatchEvent(EVENT_REMOVED, dir_path, is_folder=True))
+
+        return events
+
+
+class PollingWatcher(DirectoryWatcher):
+    """
+    基于轮询的文件夹监视器
+
+    每次检查只读取各文件夹自身的修改时间，只有修改时间变化的文件夹才会重新读取目录，
+    再与上次的快照比较得出增删和重命名（通过inode匹配）。
+    """
+
+    # 文件夹修改时间距现在不足该值（纳秒）时，下次仍重新读取，避免同一时间粒度内的变化被漏掉
+    RACY_WINDOW_NS = 2 * 10 ** 9
+
+    def __init__(self, poll_interval=2.0):
+        """
+        初始化轮询监视器
+
+        Args:
+            poll_interval (float): 检查间隔（秒）
+        """
+        super().__init__()
+        self.poll_interval = poll_interval
+        self._snapshots = {}  # 文件夹路径 -> (修改时间, {名称: (inode, 是否为文件夹)})
+        self._closed = threading.Event()
+        self._last_check = 0.0
+
+    def add_path(self, dir_path):
+        snapshot = self._take_snapshot(dir_path)
+        if snapshot is None:
+            return False
+        with self._lock:
+            self._snapshots.setdefault(dir_path, snapshot)
+        return True
+
+    def remove_path(self, dir_path):
+        with self._lock:
+            self._snapshots.pop(dir_path, None)
+
+    def watched_paths(self):
+        with self._lock:
+            return list(self._snapshots)
+
+    def read_events(self, timeout=1.0):
+        # 未到检查时间时等待，close()可以提前唤醒
+        wait = self._last_check + self.poll_interval - time.monotonic()
+        if wait > 0:
+            if self._closed.wait(min(wait, timeout)) or wait > timeout:
+                return []
+        self._last_check = time.monotonic()
+        return self.check()
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            self._snapshots.clear()
+
+    def check(self):
+        """
+        立即检查一次所有文件夹
+
+        Returns:
+            list: WatchEvent列表
+        """
+        with self._lock:
+            dir_paths = list(self._snapshots.items())
+
+        removed = {}  # (设备, inode) -> (路径, 是否为文件夹)
+        added = {}
+        events = []
+
+        for dir_path, (old_mtime, old_entries) in dir_paths:
+            try:
+                mtime = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                # 文件夹本身已不存在
+                with self._lock:
+                    self._snapshots.pop(dir_path, None)
+                events.append(WatchEvent(EVENT_REMOVED, dir_path, is_folder=True))
+                continue
+
+            if mtime == old_mtime:
+                continue
+
+            snapshot = self._take_snapshot(dir_path)
+            if snapshot is None:
+                continue
+            new_entries = snapshot[1]
+
+            with self._lock:
+                if dir_path in self._snapshots:
+                    self._snapshots[dir_path] = snapshot
+
+            for name in old_entries.keys() - new_entries.keys():
+                key, is_folder = old_entries[name]
+                removed[key] = (os.path.join(dir_path, name), is_folder)
+            for name in new_entries.keys() - old_entries.keys():
+                key, is_folder = new_entries[name]
+                added[key] = (os.path.join(dir_path, name), is_folder)
+
+        # inode相同的删除和新增即为重命名，可以跨文件夹匹配
+        for key, (path, is_folder) in removed.items():
+            if key in added:
+                dest_path, _ = added.pop(key)
+                events.append(WatchEvent(EVENT_RENAMED, path, dest_path, is_folder))
+            else:
+                events.append(WatchEvent(EVENT_REMOVED, path, is_folder=is_folder))
+        for path, is_folder in added.values():
+            events.append(WatchEvent(EVENT_ADDED, path, is_folder=is_folder))
+
+        return events
+
+    def _take_snapshot(self, dir_path):
+        """
+        读取文件夹快照
+
+        Args:
+            dir_path (str): 文件夹路径
+
+        Returns:
+            tuple: (修改时间, {名称: ((设备, inode), 是否为文件夹)})，失败时返回None
+        """
+        try:
+            dir_stat = os.stat(dir_path)
+            mtime = dir_stat.st_mtime_ns
+            entries = {}
+            with os.scandir(dir_path) as iterator:
+                for entry in iterator:
+                    try:
+                        # inode直接来自目录项，不需要对每个文件调用stat
+                        entries[entry.name] = ((dir_stat.st_dev, entry.inode()), entry.is_dir())
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        # 刚修改过的文件夹不记录修改时间，下次检查时重新读取
+        if time.time_ns() - mtime < self.RACY_WINDOW_NS:
+            mtime = None
+
+        return mtime, entries
@@ -2,10 +2,26 @@
 # -*- coding: utf-8 -*-
 
 import os
+import sys
 import shutil
 import datetime
 import tempfile
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux FICLONE ioctl请求号，用于在支持的文件系统（btrfs、xfs等）上创建写时复制副本
+FICLONE = 0x40049409
+
+# 备份模式
+BACKUP_MODE_AUTO = 'auto'          # 依次尝试硬链接、reflink，最后复制
+BACKUP_MODE_HARDLINK = 'hardlink'  # 仅硬链接
+BACKUP_MODE_REFLINK = 'reflink'    # 仅reflink（写时复制）
+BACKUP_MODE_COPY = 'copy'          # 完整复制
 
 class FileOperations:
     """
@@ -70,13 +86,14 @@ class FileOperations:
         return success_count > 0, success_count, errors
     
     @staticmethod
-    def create_backup(file_path, backup_dir=None):
+    def create_backup(file_path, backup_dir=None, mode=BACKUP_MODE_AUTO):
         """
         创建文件备份
         
         Args:
             file_path (str): 文件路径
             backup_dir (str, optional): 备份目录，如果为None则使用临时目录
+            mode (str): 备份模式，auto会优先使用硬链接或reflink，只在都不可用时复制
             
         Returns:
             tuple: (成功标志, 备份路径或错误消息)
@@ -99,13 +116,210 @@ class FileOperations:
             backup_name = f"{file_name}.{timestamp}.bak"
             backup_path = os.path.join(backup_dir, backup_name)
             
+            # 同一秒内多次备份同名文件时避免互相覆盖
+            i = 1
+            while os.path.lexists(backup_path):
+                backup_path = os.path.join(backup_dir, f"{file_name}.{timestamp}_{i}.bak")
+                i += 1
+            
             # 执行备份
-            shutil.copy2(file_path, backup_path)
+            FileOperations.clone_file(file_path, backup_path, mode)
             
             return True, backup_path
         except Exception as e:
             return False, f"备份失败: {str(e)}"
     
+    @staticmethod
+    def clone_file(source_path, target_path, mode=BACKUP_MODE_AUTO):
+        """
+        以尽量低的代价创建文件副本
+        
+        硬链接和reflink都不复制数据，只有两者都不可用（跨文件系统、
+        文件系统不支持）时才回退为完整复制。注意硬链接与原文件共享数据，
+        只适合原文件内容不会被原地修改的场景，例如重命名前的快照。
+        
+        Args:
+            source_path (str): 源文件路径
+            target_path (str): 目标文件路径
+            mode (str): 备份模式
+            
+        Returns:
+            str: 实际使用的备份模式
+        """
+        if os.path.lexists(target_path):
+            raise FileExistsError(f"备份目标已存在: {target_path}")
+        
+        if mode in (BACKUP_MODE_AUTO, BACKUP_MODE_HARDLINK):
+            try:
+                os.link(source_path, target_path)
+                return BACKUP_MODE_HARDLINK
+            except FileExistsError:
+                raise
+            except (OSError, AttributeError, NotImplementedError):
+                if mode == BACKUP_MODE_HARDLINK:
+                    raise
+        
+        if mode in (BACKUP_MODE_AUTO, BACKUP_MODE_REFLINK):
+            try:
+                FileOperations._reflink(source_path, target_path)
+                return BACKUP_MODE_REFLINK
+            except FileExistsError:
+                raise
+            except OSError:
+                if mode == BACKUP_MODE_REFLINK:
+                    raise
+        
+        shutil.copy2(source_path, target_path)
+        return BACKUP_MODE_COPY
+    
+    @staticmethod
+    def _reflink(source_path, target_path):
+        """
+        通过FICLONE ioctl创建写时复制副本
+        
+        Args:
+            source_path (str): 源文件路径
+            target_path (str): 目标文件路径
+        """
+        if fcntl is None or not sys.platform.startswith('linux'):
+            raise OSError("当前平台不支持reflink")
+        
+        with open(source_path, 'rb') as source_file:
+            with open(target_path, 'xb') as target_file:
+                try:
+                    fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+                except OSError:
+                    # 清理创建失败留下的空文件
+                    target_file.close()
+                    os.remove(target_path)
+                    raise
+        shutil.copystat(source_path, target_path)
+    
+    @staticmethod
+    def create_snapshot(file_paths, snapshot_root="backup", mode=BACKUP_MODE_AUTO, max_workers=None):
+        """
+        为一批文件创建带时间戳的快照
+        
+        相对的snapshot_root按每个文件所在目录解析，使快照与原文件位于同一
+        文件系统，从而可以使用硬链接或reflink；同一目录的文件放在同一个
+        时间戳目录下，保留原文件名。绝对的snapshot_root下为本次调用创建一个
+        时间戳目录，在其中按原文件的完整路径建立子目录，不同文件夹的同名文件
+        不会冲突。每次调用使用新的时间戳目录，同一时刻的两次调用也不会冲突。
+        
+        Args:
+            file_paths (list): 文件路径列表
+            snapshot_root (str): 快照根目录，相对路径按文件所在目录解析
+            mode (str): 备份模式
+            max_workers (int, optional): 并行线程数
+            
+        Returns:
+            tuple: (成功标志, 备份路径字典, 错误列表)
+        """
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        snapshot_root = snapshot_root or "backup"
+        shared_dir = None
+        snapshot_dirs = {}
+        targets = []
+        errors = []
+        
+        for file_path in file_paths:
+            dir_path, file_name = os.path.split(os.path.abspath(file_path))
+            snapshot_dir = snapshot_dirs.get(dir_path)
+            if snapshot_dir is None:
+                try:
+                    if os.path.isabs(snapshot_root):
+                        if shared_dir is None:
+                            shared_dir = FileOperations._make_unique_dir(snapshot_root, timestamp)
+                        drive, rest = os.path.splitdrive(dir_path)
+                        snapshot_dir = os.path.join(shared_dir, drive.replace(':', ''), rest.lstrip(os.sep + '/'))
+                        os.makedirs(snapshot_dir, exist_ok=True)
+                    else:
+                        snapshot_dir = FileOperations._make_unique_dir(
+                            os.path.join(dir_path, snapshot_root), timestamp)
+                except OSError as e:
+                    snapshot_dir = ""
+                    errors.append((file_path, f"备份失败: {str(e)}"))
+                snapshot_dirs[dir_path] = snapshot_dir
+            
+            if snapshot_dir:
+                targets.append((file_path, os.path.join(snapshot_dir, file_name)))
+        
+        def backup_one(pair):
+            source_path, target_path = pair
+            try:
+                FileOperations.clone_file(source_path, target_path, mode)
+                return source_path, True, target_path
+            except Exception as e:
+                return source_path, False, f"备份失败: {str(e)}"
+        
+        backup_paths = FileOperations._run_parallel(backup_one, targets, max_workers, errors)
+        
+        return not errors and len(backup_paths) > 0, backup_paths, errors
+    
+    @staticmethod
+    def _make_unique_dir(parent, name):
+        """
+        在parent中创建名为name的新目录，已存在时依次尝试 name_1、name_2……
+        
+        Args:
+            parent (str): 上级目录，不存在时创建
+            name (str): 目录名
+            
+        Returns:
+            str: 新创建的目录路径
+        """
+        os.makedirs(parent, exist_ok=True)
+        counter = 0
+        while True:
+            path = os.path.join(parent, name if counter == 0 else f"{name}_{counter}")
+            try:
+                os.mkdir(path)
+                return path
+            except FileExistsError:
+                counter += 1
+    
+    @staticmethod
+    def _run_parallel(worker, items, max_workers, errors):
+        """
+        在线程池中并行执行备份任务
+        
+        Args:
+            worker (callable): 任务函数，返回(源路径, 成功标志, 结果)
+            items (list): 任务参数列表
+            max_workers (int, optional): 并行线程数
+            errors (list): 错误列表，失败的任务会追加到这里
+            
+        Returns:
+            dict: 源路径到备份路径的映射
+        """
+        results = {}
+        
+        if not items:
+            return results
+        
+        # 备份以元数据操作和I/O为主，线程数可以高于CPU核数
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+        max_workers = max(1, min(max_workers, len(items)))
+        
+        if max_workers == 1:
+            outcomes = map(worker, items)
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            outcomes = executor.map(worker, items)
+        
+        try:
+            for source_path, success, result in outcomes:
+                if success:
+                    results[source_path] = result
+                else:
+                    errors.append((source_path, result))
+        finally:
+            if max_workers > 1:
+                executor.shutdown()
+        
+        return results
+    
     @staticmethod
     def restore_from_backup(backup_path, original_path=None):
         """
@@ -130,6 +344,10 @@ class FileOperations:
                 original_name = file_name.split('.', 1)[0]
                 original_path = os.path.join(os.path.dirname(backup_path), original_name)
             
+            # 硬链接备份与原文件是同一文件时无需恢复
+            if os.path.exists(original_path) and os.path.samefile(backup_path, original_path):
+                return True, original_path
+            
             # 执行恢复
             shutil.copy2(backup_path, original_path)
             
@@ -138,28 +356,27 @@ class FileOperations:
             return False, f"恢复失败: {str(e)}"
     
     @staticmethod
-    def batch_backup(file_paths, backup_dir=None):
+    def batch_backup(file_paths, backup_dir=None, mode=BACKUP_MODE_AUTO, max_workers=None):
         """
         批量备份文件
         
         Args:
             file_paths (list): 文件路径列表
             backup_dir (str, optional): 备份目录，如果为None则使用临时目录
+            mode (str): 备份模式
+            max_workers (int, optional): 并行线程数
             
         Returns:
             tuple: (成功标志, 备份路径字典, 错误列表)
         """
-        backup_paths = {}
         errors = []
         
-        # 执行备份
-        for file_path in file_paths:
-            success, result = FileOperations.create_backup(file_path, backup_dir)
-            
-            if success:
-                backup_paths[file_path] = result
-            else:
-                errors.append((file_path, result))
+        def backup_one(file_path):
+            success, result = FileOperations.create_backup(file_path, backup_dir, mode)
+            return file_path, success, result
+        
+        # 并行执行备份
+        backup_paths = FileOperations._run_parallel(backup_one, list(file_paths), max_workers, errors)
         
         return len(backup_paths) > 0, backup_paths, errors
     
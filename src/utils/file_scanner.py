@@ -0,0 +1,422 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import stat
+import fnmatch
+import threading
+
+# Windows隐藏文件属性
+FILE_ATTRIBUTE_HIDDEN = getattr(stat, 'FILE_ATTRIBUTE_HIDDEN', 0x2)
+
+
+class ScanOptions:
+    """
+    文件扫描选项
+    """
+
+    def __init__(self, recursive=True, include_patterns=None, exclude_patterns=None,
+                 extensions=None, include_hidden=False, max_depth=None, max_count=None,
+                 include_folders=False, follow_symlinks=False):
+        """
+        初始化扫描选项
+
+        Args:
+            recursive (bool): 是否递归导入文件夹内容，为False时文件夹作为单个条目导入
+            include_patterns (list): 包含的通配符列表，为空时包含全部文件
+            exclude_patterns (list): 排除的通配符列表，匹配的文件夹不会被进入
+            extensions (list): 允许的扩展名列表，例如 ['jpg', '.png']，为空时不限制
+            include_hidden (bool): 是否包含隐藏文件和文件夹
+            max_depth (int): 最大递归深度，0表示只导入文件夹的直接子项，None表示不限制
+            max_count (int): 最多导入的条目数量，None表示不限制
+            include_folders (bool): 递归时是否同时导入子文件夹本身
+            follow_symlinks (bool): 是否进入符号链接指向的文件夹
+        """
+        self.recursive = recursive
+        self.include_patterns = list(include_patterns or [])
+        self.exclude_patterns = list(exclude_patterns or [])
+        self.extensions = set(
+            ext.lower() if ext.startswith('.') else '.' + ext.lower()
+            for ext in (extensions or []) if ext
+        )
+        self.include_hidden = include_hidden
+        self.max_depth = max_depth
+        self.max_count = max_count
+        self.include_folders = include_folders
+        self.follow_symlinks = follow_symlinks
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从设置字典创建
+
+        Args:
+            data (dict): 设置字典，键与构造参数相同
+
+        Returns:
+            ScanOptions: 扫描选项
+        """
+        data = data or {}
+        max_depth = data.get('max_depth')
+        max_count = data.get('max_count')
+        return cls(
+            recursive=data.get('recursive', True),
+            include_patterns=data.get('include_patterns'),
+            exclude_patterns=data.get('exclude_patterns'),
+            extensions=data.get('extensions'),
+            include_hidden=data.get('include_hidden', False),
+            # 设置中使用负数或0以下表示不限制
+            max_depth=max_depth if isinstance(max_depth, int) and max_depth >= 0 else None,
+            max_count=max_count if isinstance(max_count, int) and max_count > 0 else None,
+            include_folders=data.get('include_folders', False),
+            follow_symlinks=data.get('follow_symlinks', False)
+        )
+
+
+class FileScanner:
+    """
+    文件扫描器，基于os.scandir以生成器方式流式产出文件条目
+
+    条目格式与文件控制器使用的字典一致：{'name', 'path', 'is_folder'}。
+    扫描可以在后台线程中运行，并通过cancel()随时中止。
+    """
+
+    # 同一文件夹下的路径数量达到该值时，改为读取一次父文件夹批量获取类型
+    BATCH_STAT_THRESHOLD = 32
+
+    def __init__(self, options=None):
+        """
+        初始化文件扫描器
+
+        Args:
+            options (ScanOptions, optional): 扫描选项
+        """
+        self.options = options or ScanOptions()
+        self._cancelled = threading.Event()
+        self._include_regex = self._compile_patterns(self.options.include_patterns)
+        self._exclude_regex = self._compile_patterns(self.options.exclude_patterns)
+
+    def cancel(self):
+        """
+        取消扫描
+        """
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        """
+        检查扫描是否已取消
+
+        Returns:
+            bool: 已取消返回True
+        """
+        return self._cancelled.is_set()
+
+    def scan(self, paths, stats=None):
+        """
+        扫描路径，逐个产出文件条目
+
+        直接给出的文件总会被产出（不受过滤条件影响）；给出的文件夹在递归模式下
+        展开为其内容，否则作为单个文件夹条目产出。
+
+        Args:
+            paths (list): 文件或文件夹路径列表
+            stats (list, optional): stat_paths()的结果，提供时不再重复判断路径类型
+
+        Yields:
+            dict: 文件条目
+        """
+        count = 0
+        max_count = self.options.max_count
+
+        if stats is None:
+            stats = self.stat_paths(paths)
+
+        for path, is_folder in stats:
+            if self.is_cancelled() or (max_count is not None and count >= max_count):
+                return
+
+            if not is_folder or not self.options.recursive:
+                count += 1
+                yield self._make_entry(path, is_folder)
+                continue
+
+            for entry in self._walk(path):
+                count += 1
+                yield entry
+                if max_count is not None and count >= max_count:
+                    return
+
+    def stat_paths(self, paths):
+        """
+        批量判断路径类型，忽略不存在的路径
+
+        同一文件夹下的大量路径（例如一次拖放的数万个文件）通过读取一次父文件夹
+        获得类型，避免逐个调用os.stat。
+
+        Args:
+            paths (list): 文件或文件夹路径列表
+
+        Returns:
+            list: (路径, 是否为文件夹) 元组列表，顺序与输入一致
+        """
+        # 按父文件夹分组
+        groups = {}
+        for path in paths:
+            parent, name = os.path.split(path.rstrip('/\\') or path)
+            groups.setdefault(parent, set()).add(name)
+
+        # 对路径较多的父文件夹读取一次目录，得到名称到类型的映射
+        dir_types = {}
+        for parent, names in groups.items():
+            if len(names) < self.BATCH_STAT_THRESHOLD or self.is_cancelled():
+                continue
+            types = {}
+            try:
+                with os.scandir(parent) as iterator:
+                    for entry in iterator:
+                        if entry.name in names:
+                            try:
+                                types[entry.name] = entry.is_dir()
+                            except OSError:
+                                continue
+            except OSError:
+                continue
+            dir_types[parent] = types
+
+        results = []
+        for path in paths:
+            if self.is_cancelled():
+                break
+            parent, name = os.path.split(path.rstrip('/\\') or path)
+            types = dir_types.get(parent)
+            if types is not None and name in types:
+                results.append((path, types[name]))
+                continue
+            try:
+                results.append((path, stat.S_ISDIR(os.stat(path).st_mode)))
+            except OSError:
+                continue
+
+        return results
+
+    def scan_chunks(self, paths, chunk_size=500, stats=None):
+        """
+        扫描路径，按固定大小分块产出
+
+        Args:
+            paths (list): 文件或文件夹路径列表
+            chunk_size (int): 每块的条目数量
+            stats (list, optional): stat_paths()的结果
+
+        Yields:
+            list: 文件条目列表
+        """
+        chunk = []
+        for entry in self.scan(paths, stats):
+            chunk.append(entry)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk and not self.is_cancelled():
+            yield chunk
+
+    def _walk(self, root):
+        """
+        遍历文件夹，使用显式栈避免深层目录导致递归过深
+
+        跟随符号链接时记录已进入文件夹的(设备号, inode)，指向祖先文件夹的链接不会
+        造成循环，同一文件夹通过多个链接也只遍历一次。
+
+        Args:
+            root (str): 根文件夹
+
+        Yields:
+            dict: 文件条目
+        """
+        options = self.options
+        stack = [(root, 0)]
+        visited = set()
+
+        while stack:
+            if self.is_cancelled():
+                return
+
+            dir_path, depth = stack.pop()
+            sub_dirs = []
+
+            if options.follow_symlinks:
+                try:
+                    dir_stat = os.stat(dir_path)
+                except OSError:
+                    continue
+                key = (dir_stat.st_dev, dir_stat.st_ino)
+                if key in visited:
+                    continue
+                visited.add(key)
+
+            try:
+                iterator = os.scandir(dir_path)
+            except OSError:
+                continue
+
+            # 边读取目录边产出条目，超大目录也无需等待完整清单
+            with iterator:
+                for entry in iterator:
+                    if self.is_cancelled():
+                        return
+
+                    if not options.include_hidden and self._is_hidden(entry):
+                        continue
+
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=options.follow_symlinks)
+                    except OSError:
+                        continue
+
+                    if self._exclude_regex and self._matches(self._exclude_regex, entry.path, root):
+                        continue
+
+                    if is_dir:
+                        if options.max_depth is None or depth < options.max_depth:
+                            sub_dirs.append(entry.path)
+                        if options.include_folders and self._accept(entry.path, root, True):
+                            yield self._make_entry(entry.path, True, entry.name)
+                        continue
+
+                    if self._accept(entry.path, root, False):
+                        yield self._make_entry(entry.path, False, entry.name)
+
+            # 逆序压栈，使子文件夹按名称顺序遍历
+            for sub_dir in sorted(sub_dirs, reverse=True):
+                stack.append((sub_dir, depth + 1))
+
+    def accepts(self, path, root, is_folder=False):
+        """
+        检查扫描根目录下的单个路径是否满足扫描条件，用于增量更新而无需重新扫描
+
+        Args:
+            path (str): 条目路径
+            root (str): 扫描根目录
+            is_folder (bool): 是否为文件夹
+
+        Returns:
+            bool: 文件返回是否会被扫描产出，文件夹返回是否会被进入
+        """
+        relative_path = path[len(root):].strip('/\\').replace(os.sep, '/')
+        if not relative_path or not path.startswith(root):
+            return False
+        parts = relative_path.split('/')
+        depth = len(parts) - 1
+
+        if self.options.max_depth is not None:
+            if depth > self.options.max_depth or (is_folder and depth >= self.options.max_depth):
+                return False
+
+        if not self.options.include_hidden and any(part.startswith('.') for part in parts):
+            return False
+
+        # 任意一级父文件夹被排除时，其中的条目也不会被扫描到
+        if self._exclude_regex:
+            for i in range(1, len(parts) + 1):
+                if self._matches(self._exclude_regex, root + '/' + '/'.join(parts[:i]), root):
+                    return False
+
+        return is_folder or self._accept(path, root, False)
+
+    def _accept(self, path, root, is_folder):
+        """
+        检查条目是否满足包含条件和扩展名过滤
+
+        Args:
+            path (str): 条目路径
+            root (str): 扫描根目录
+            is_folder (bool): 是否为文件夹
+
+        Returns:
+            bool: 满足条件返回True
+        """
+        if self.options.extensions and not is_folder:
+            ext = os.path.splitext(path)[1].lower()
+            if ext not in self.options.extensions:
+                return False
+
+        if self._include_regex and not self._matches(self._include_regex, path, root):
+            return False
+
+        return True
+
+    @staticmethod
+    def _matches(regex, path, root):
+        """
+        使用文件名或相对路径匹配通配符
+
+        Args:
+            regex: 编译后的通配符正则
+            path (str): 条目路径
+            root (str): 扫描根目录
+
+        Returns:
+            bool: 匹配返回True
+        """
+        if regex.match(os.path.basename(path)):
+            return True
+        # 条目路径总是以根目录开头，直接截取比os.path.relpath快得多
+        relative_path = path[len(root):].lstrip('/\\').replace(os.sep, '/')
+        return regex.match(relative_path) is not None
+
+    @staticmethod
+    def _compile_patterns(patterns):
+        """
+        把多个通配符编译为一个正则表达式
+
+        Args:
+            patterns (list): 通配符列表
+
+        Returns:
+            正则表达式对象，列表为空时返回None
+        """
+        if not patterns:
+            return None
+        regex = '|'.join(fnmatch.translate(pattern) for pattern in patterns)
+        return re.compile(regex, re.IGNORECASE if os.name == 'nt' else 0)
+
+    @staticmethod
+    def _is_hidden(entry):
+        """
+        检查目录项是否为隐藏文件
+
+        Args:
+            entry (os.DirEntry): 目录项
+
+        Returns:
+            bool: 隐藏文件返回True
+        """
+        if entry.name.startswith('.'):
+            return True
+        if os.name == 'nt':
+            try:
+                return bool(entry.stat(follow_symlinks=False).st_file_attributes & FILE_ATTRIBUTE_HIDDEN)
+            except (OSError, AttributeError):
+                return False
+        return False
+
+    @staticmethod
+    def _make_entry(path, is_folder, name=None):
+        """
+        创建文件条目
+
+        Args:
+            path (str): 路径
+            is_folder (bool): 是否为文件夹
+            name (str, optional): 文件名
+
+        Returns:
+            dict: 文件条目
+        """
+        return {
+            'name': name if name is not None else os.path.basename(path.rstrip('/\\')),
+            'path': path,
+            'is_folder': is_folder
+        }
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import sqlite3
+
+# 任务状态
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+class JobQueue:
+    """
+    重命名任务队列，用SQLite保存提交的任务、执行结果和AI响应缓存
+
+    任务按提交顺序领取，领取时在一个UPDATE中把状态改为running，多个工作协程
+    不会领取同一个任务。进程重启时只生成计划的任务重新排队；执行重命名的任务
+    可能已经改了一部分文件，再执行一次会对结果重复改名，所以标记为失败，
+    由用户根据重命名日志撤销或重新提交。所有方法都应在同一个线程（守护进程的
+    事件循环）中调用。
+    """
+
+    # 数据库结构版本
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path, journal_dir=None):
+        """
+        打开任务数据库，不存在时创建
+
+        Args:
+            db_path (str): 数据库文件路径，":memory:"表示内存数据库
+            journal_dir (str, optional): 重命名日志目录，写入中断任务的错误信息
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+        self._recover_interrupted(journal_dir)
+
+    def _create_tables(self):
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    exit_code INTEGER,
+                    created REAL NOT NULL,
+                    started REAL,
+                    finished REAL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    rename_map TEXT NOT NULL,
+                    created REAL NOT NULL
+                );
+            """)
+            self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                               (str(self.SCHEMA_VERSION),))
+
+    def _recover_interrupted(self, journal_dir):
+        """
+        处理上次运行中断的任务：只生成计划的任务重新排队，执行重命名的任务标记为失败
+        """
+        location = f"重命名日志目录 {journal_dir}" if journal_dir else "重命名日志"
+        error = (f"守护进程在执行重命名时中断，部分文件可能已经重命名。请查看{location}，"
+                 f"可以使用 undo 命令撤销后重新提交")
+        with self._conn:
+            rows = self._conn.execute("SELECT id, request FROM jobs WHERE status = ?", (JOB_RUNNING,)).fetchall()
+            for job_id, request in rows:
+                if (json.loads(request).get('options') or {}).get('apply'):
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, error = ?, exit_code = ?, finished = ? WHERE id = ?",
+                        (JOB_FAILED, error, 1, time.time(), job_id))
+                else:
+                    self._conn.execute("UPDATE jobs SET status = ? WHERE id = ?", (JOB_QUEUED, job_id))
+
+    def close(self):
+        if self._conn is None:
+            return
+        self._conn.close()
+        self._conn = None
+
+    # 任务
+    def submit(self, request):
+        """
+        提交任务
+
+        Args:
+            request (dict): 任务内容
+
+        Returns:
+            int: 任务ID
+        """
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (status, request, created) VALUES (?, ?, ?)",
+                (JOB_QUEUED, json.dumps(request, ensure_ascii=False), time.time()))
+        return cursor.lastrowid
+
+    def claim(self):
+        """
+        领取最早提交的排队任务
+
+        Returns:
+            tuple: (任务ID, 任务内容)，没有排队的任务时返回None
+        """
+        with self._conn:
+            row = self._conn.execute(
+                "SELECT id, request FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (JOB_QUEUED,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE jobs SET status = ?, started = ? WHERE id = ?",
+                               (JOB_RUNNING, time.time(), row[0]))
+        return row[0], json.loads(row[1])
+
+    def finish(self, job_id, result, exit_code=0):
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, exit_code = ?, finished = ? WHERE id = ?",
+                (JOB_DONE, json.dumps(result, ensure_ascii=False), exit_code, time.time(), job_id))
+
+    def fail(self, job_id, error, exit_code=1):
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, exit_code = ?, finished = ? WHERE id = ?",
+                (JOB_FAILED, error, exit_code, time.time(), job_id))
+
+    def get(self, job_id, include_result=True):
+        """
+        获取任务状态
+
+        Args:
+            job_id (int): 任务ID
+            include_result (bool): 是否包含执行结果
+
+        Returns:
+            dict: 任务信息，任务不存在时返回None
+        """
+        row = self._conn.execute(
+            "SELECT id, status, error, exit_code, created, started, finished, result FROM jobs WHERE id = ?",
+            (job_id,)).fetchone()
+        return self._job_from_row(row, include_result) if row else None
+
+    def list_jobs(self, limit=50):
+        """
+        获取最近提交的任务，不包含执行结果
+
+        Args:
+            limit (int): 最多返回的任务数量
+
+        Returns:
+            list: 任务信息列表，最新的在前
+        """
+        return [self._job_from_row(row, False) for row in self._conn.execute(
+            "SELECT id, status, error, exit_code, created, started, finished, NULL FROM jobs "
+            "ORDER BY id DESC LIMIT ?", (limit,))]
+
+    def counts(self):
+        """
+        获取各状态的任务数量
+
+        Returns:
+            dict: 状态 -> 数量
+        """
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+    @staticmethod
+    def _job_from_row(row, include_result):
+        job_id, status, error, exit_code, created, started, finished, result = row
+        job = {'id': job_id, 'status': status, 'error': error, 'exit_code': exit_code,
+               'created': created, 'started': started, 'finished': finished}
+        if include_result:
+            job['result'] = json.loads(result) if result else None
+        return job
+
+    # AI响应缓存
+    def get_response(self, key):
+        """
+        读取缓存的分析结果
+
+        Args:
+            key (str): 缓存键
+
+        Returns:
+            dict: 重命名映射，没有缓存时返回None
+        """
+        row = self._conn.execute("SELECT rename_map FROM responses WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_response(self, key, rename_map):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, rename_map, created) VALUES (?, ?, ?)",
+                (key, json.dumps(rename_map, ensure_ascii=False), time.time()))
+
+    def prune_responses(self, max_age):
+        """
+        删除超过max_age秒的缓存
+
+        Returns:
+            int: 删除的条目数
+        """
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - max_age,))
+        return cursor.rowcount
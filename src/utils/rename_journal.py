@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import errno
+import shutil
+import datetime
+
+class RenameJournal:
+    """
+    重命名日志类，以JSONL格式逐条记录已执行的重命名操作
+
+    纯重命名不修改文件内容，记录“源路径 -> 目标路径”就足以完整撤销，
+    因此日志本身就是重命名前的快照，不需要复制文件数据。
+    """
+
+    # 日志文件扩展名
+    EXTENSION = ".jsonl"
+
+    def __init__(self, journal_path):
+        """
+        初始化重命名日志
+
+        Args:
+            journal_path (str): 日志文件路径
+        """
+        self.journal_path = journal_path
+        self._file = None
+
+    @classmethod
+    def create(cls, journal_dir):
+        """
+        在日志目录中创建新的日志文件
+
+        Args:
+            journal_dir (str): 日志目录
+
+        Returns:
+            RenameJournal: 日志对象
+        """
+        os.makedirs(journal_dir, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        journal = cls(os.path.join(journal_dir, f"rename_{timestamp}{cls.EXTENSION}"))
+        journal._write({'type': 'begin', 'timestamp': datetime.datetime.now().isoformat()})
+        return journal
+
+    @classmethod
+    def latest(cls, journal_dir):
+        """
+        获取最近一次尚未撤销的日志
+
+        Args:
+            journal_dir (str): 日志目录
+
+        Returns:
+            RenameJournal: 日志对象，如果没有返回None
+        """
+        if not journal_dir or not os.path.isdir(journal_dir):
+            return None
+
+        names = sorted(
+            (name for name in os.listdir(journal_dir) if name.endswith(cls.EXTENSION)),
+            reverse=True
+        )
+        for name in names:
+            journal = cls(os.path.join(journal_dir, name))
+            if not journal.is_undone() and journal.get_operations():
+                return journal
+
+        return None
+
+    @classmethod
+    def recent(cls, journal_dir, limit=None):
+        """
+        获取尚未撤销的日志，最近的在前
+
+        Args:
+            journal_dir (str): 日志目录
+            limit (int, optional): 最多返回的日志数量
+
+        Returns:
+            list: 日志对象列表
+        """
+        if not journal_dir or not os.path.isdir(journal_dir):
+            return []
+
+        names = sorted(
+            (name for name in os.listdir(journal_dir) if name.endswith(cls.EXTENSION)),
+            reverse=True
+        )
+        journals = []
+        for name in names:
+            journal = cls(os.path.join(journal_dir, name))
+            if not journal.is_undone():
+                journals.append(journal)
+                if limit is not None and len(journals) >= limit:
+                    break
+        return journals
+
+    def record(self, source_path, target_path):
+        """
+        记录一次已完成的重命名
+
+        Args:
+            source_path (str): 源路径
+            target_path (str): 目标路径
+        """
+        self._write({'type': 'rename', 'source': source_path, 'target': target_path})
+
+    def close(self):
+        """
+        结束日志，写入结束标记并同步到磁盘
+        """
+        if self._file is None:
+            return
+
+        self._write({'type': 'end', 'timestamp': datetime.datetime.now().isoformat()})
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+    def get_operations(self):
+        """
+        读取日志中的重命名操作
+
+        Returns:
+            list: (源路径, 目标路径) 元组列表，按执行顺序排列
+        """
+        operations = []
+        for entry in self._read_entries():
+            if entry.get('type') == 'rename':
+                operations.append((entry['source'], entry['target']))
+        return operations
+
+    def is_undone(self):
+        """
+        检查日志是否已被撤销
+
+        Returns:
+            bool: 已撤销返回True
+        """
+        return any(entry.get('type') == 'undo' for entry in self._read_entries())
+
+    def undo(self):
+        """
+        按相反顺序撤销日志中的重命名
+
+        Returns:
+            tuple: (成功计数, 错误列表)，错误列表元素为(路径, 错误消息)
+        """
+        success_count = 0
+        errors = []
+
+        for source_path, target_path in reversed(self.get_operations()):
+            try:
+                if not os.path.lexists(target_path):
+                    raise FileNotFoundError(f"文件不存在: {target_path}")
+                if os.path.lexists(source_path) and not os.path.samefile(source_path, target_path):
+                    raise FileExistsError(f"原文件名已被占用: {source_path}")
+                try:
+                    os.rename(target_path, source_path)
+                except OSError as e:
+                    # 跨文件系统的移动（计划中的STATUS_CROSS_DEVICE）只能复制后删除
+                    if e.errno != errno.EXDEV:
+                        raise
+                    shutil.move(target_path, source_path)
+                success_count += 1
+            except Exception as e:
+                errors.append((target_path, f"撤销失败: {str(e)}"))
+
+        self._write({'type': 'undo', 'timestamp': datetime.datetime.now().isoformat(),
+                     'restored': success_count, 'failed': len(errors)})
+        self.close()
+
+        return success_count, errors
+
+    def _write(self, entry):
+        """
+        追加一条日志
+
+        Args:
+            entry (dict): 日志内容
+        """
+        if self._file is None:
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+
+        self._file.write(json.dumps(entry, ensure_ascii=False))
+        self._file.write('\n')
+        # 每条记录都刷新到操作系统，进程崩溃时不会丢失已完成的操作
+        self._file.flush()
+
+    def _read_entries(self):
+        """
+        读取全部日志条目，忽略写入中断导致的不完整行
+
+        Returns:
+            list: 日志条目列表
+        """
+        entries = []
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return entries
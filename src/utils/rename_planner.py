@@ -0,0 +1,671 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import csv
+import json
+import time
+import shutil
+
+from .file_operations import FileOperations
+
+# 操作状态
+STATUS_RENAME = 'rename'              # 正常重命名
+STATUS_CONFLICT = 'conflict'          # 目标已被占用，使用带后缀的名称重命名
+STATUS_CROSS_DEVICE = 'cross_device'  # 跨设备移动，需要复制数据
+STATUS_NOOP = 'noop'                  # 新旧名称相同，无需操作
+STATUS_MISSING = 'missing'            # 源文件不存在
+STATUS_PERMISSION = 'permission'      # 没有目录写权限
+STATUS_INVALID = 'invalid'            # 新文件名无效
+
+# 会实际执行的状态
+EXECUTABLE_STATUSES = (STATUS_RENAME, STATUS_CONFLICT, STATUS_CROSS_DEVICE)
+
+# Windows和macOS默认文件系统不区分大小写
+CASE_INSENSITIVE_FS = os.name == 'nt' or sys.platform == 'darwin'
+
+
+class RenameOperation:
+    """
+    重命名计划中的单个操作
+    """
+
+    __slots__ = ('source', 'target', 'new_name', 'status', 'reason', 'size', 'is_temp')
+
+    def __init__(self, source, target, new_name, status, reason="", size=0, is_temp=False):
+        """
+        初始化重命名操作
+
+        Args:
+            source (str): 源文件路径
+            target (str): 目标文件路径
+            new_name (str): 请求的新文件名
+            status (str): 操作状态
+            reason (str): 状态说明
+            size (int): 文件大小（字节），仅跨设备移动时用于估算耗时
+            is_temp (bool): 是否为打破循环依赖而插入的临时改名
+        """
+        self.source = source
+        self.target = target
+        self.new_name = new_name
+        self.status = status
+        self.reason = reason
+        self.size = size
+        self.is_temp = is_temp
+
+    def is_executable(self):
+        """
+        是否会在执行阶段实际操作磁盘
+
+        Returns:
+            bool: 需要执行返回True
+        """
+        return self.status in EXECUTABLE_STATUSES
+
+    def to_dict(self):
+        """
+        转换为字典
+
+        Returns:
+            dict: 操作信息
+        """
+        return {
+            'status': self.status,
+            'source': self.source,
+            'target': self.target,
+            'new_name': self.new_name,
+            'reason': self.reason,
+            'size': self.size,
+            'is_temp': self.is_temp
+        }
+
+
+class RenamePlan:
+    """
+    重命名计划，描述执行重命名时磁盘上将要发生的全部变化
+    """
+
+    # CSV导出的列
+    EXPORT_FIELDS = ['order', 'status', 'source', 'target', 'new_name', 'reason', 'size', 'is_temp']
+
+    def __init__(self, operations, skipped, ops_per_second, bytes_per_second):
+        """
+        初始化重命名计划
+
+        Args:
+            operations (list): 按执行顺序排列的可执行操作
+            skipped (list): 不会执行的操作（无变化、缺失、无权限、无效）
+            ops_per_second (float): 估算使用的重命名吞吐量
+            bytes_per_second (float): 估算使用的跨设备复制吞吐量
+        """
+        self.operations = operations
+        self.skipped = skipped
+        self.ops_per_second = ops_per_second
+        self.bytes_per_second = bytes_per_second
+
+    def get_operations(self, status=None):
+        """
+        获取操作列表
+
+        Args:
+            status (str, optional): 只返回指定状态的操作
+
+        Returns:
+            list: 操作列表，可执行操作在前并保持执行顺序
+        """
+        all_operations = self.operations + self.skipped
+        if status is None:
+            return all_operations
+        return [op for op in all_operations if op.status == status]
+
+    def get_conflicts(self):
+        """
+        获取冲突操作
+
+        Returns:
+            list: 冲突操作列表
+        """
+        return self.get_operations(STATUS_CONFLICT)
+
+    def get_noops(self):
+        """
+        获取无需操作的项
+
+        Returns:
+            list: 无变化操作列表
+        """
+        return self.get_operations(STATUS_NOOP)
+
+    def get_cross_device(self):
+        """
+        获取跨设备操作
+
+        Returns:
+            list: 跨设备操作列表
+        """
+        return self.get_operations(STATUS_CROSS_DEVICE)
+
+    def get_problems(self):
+        """
+        获取无法执行的操作（缺失、无权限、无效）
+
+        Returns:
+            list: 问题操作列表
+        """
+        return [op for op in self.skipped if op.status != STATUS_NOOP]
+
+    def has_changes(self):
+        """
+        检查计划是否包含需要执行的操作
+
+        Returns:
+            bool: 有需要执行的操作返回True
+        """
+        return bool(self.operations)
+
+    def estimate_seconds(self):
+        """
+        根据吞吐量估算执行耗时
+
+        Returns:
+            float: 估算耗时（秒）
+        """
+        rename_count = 0
+        copy_bytes = 0
+        for op in self.operations:
+            if op.status == STATUS_CROSS_DEVICE:
+                copy_bytes += op.size
+            else:
+                rename_count += 1
+
+        seconds = rename_count / self.ops_per_second if self.ops_per_second > 0 else 0.0
+        if self.bytes_per_second > 0:
+            seconds += copy_bytes / self.bytes_per_second
+        return seconds
+
+    def summary(self):
+        """
+        获取计划摘要
+
+        Returns:
+            dict: 各状态计数、总数和估算耗时
+        """
+        counts = {}
+        for op in self.get_operations():
+            if op.is_temp:
+                continue
+            counts[op.status] = counts.get(op.status, 0) + 1
+
+        return {
+            'total': sum(counts.values()),
+            'executable': len([op for op in self.operations if not op.is_temp]),
+            'counts': counts,
+            'eta_seconds': self.estimate_seconds()
+        }
+
+    def format_summary(self):
+        """
+        生成用于界面展示的摘要文本
+
+        Returns:
+            str: 摘要文本
+        """
+        summary = self.summary()
+        counts = summary['counts']
+        lines = [
+            f"共 {summary['total']} 个文件，将重命名 {summary['executable']} 个",
+            f"无变化: {counts.get(STATUS_NOOP, 0)}",
+            f"名称冲突（将自动添加后缀）: {counts.get(STATUS_CONFLICT, 0)}",
+            f"跨设备移动: {counts.get(STATUS_CROSS_DEVICE, 0)}",
+            f"源文件缺失: {counts.get(STATUS_MISSING, 0)}",
+            f"权限不足: {counts.get(STATUS_PERMISSION, 0)}",
+            f"文件名无效: {counts.get(STATUS_INVALID, 0)}",
+            f"预计耗时: {self._format_duration(summary['eta_seconds'])}"
+        ]
+        return "\n".join(lines)
+
+    def format_details(self, limit=500):
+        """
+        生成操作明细文本
+
+        Args:
+            limit (int): 最多列出的操作数量
+
+        Returns:
+            str: 明细文本，每行一个操作
+        """
+        lines = []
+        operations = self.get_operations()
+        for op in operations[:limit]:
+            source_name = os.path.basename(op.source)
+            target_name = os.path.basename(op.target) if op.target else ''
+            line = f"[{op.status}] {source_name} -> {target_name}"
+            if op.reason:
+                line += f" ({op.reason})"
+            lines.append(line)
+
+        if len(operations) > limit:
+            lines.append(f"... 其余 {len(operations) - limit} 项请导出查看")
+
+        return "\n".join(lines)
+
+    def to_rows(self):
+        """
+        转换为导出用的行列表
+
+        Returns:
+            list: 每个元素是一个字典，字段见EXPORT_FIELDS
+        """
+        rows = []
+        for order, op in enumerate(self.get_operations(), start=1):
+            row = op.to_dict()
+            row['order'] = order if op.is_executable() else ''
+            rows.append(row)
+        return rows
+
+    def export_csv(self, file_path):
+        """
+        导出为CSV文件
+
+        Args:
+            file_path (str): 文件路径
+
+        Returns:
+            tuple: (成功标志, 文件路径或错误消息)
+        """
+        try:
+            with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=self.EXPORT_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.to_rows())
+            return True, file_path
+        except Exception as e:
+            return False, f"导出失败: {str(e)}"
+
+    def export_jsonl(self, file_path):
+        """
+        导出为JSONL文件，每行一个操作
+
+        Args:
+            file_path (str): 文件路径
+
+        Returns:
+            tuple: (成功标志, 文件路径或错误消息)
+        """
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                for row in self.to_rows():
+                    f.write(json.dumps(row, ensure_ascii=False))
+                    f.write('\n')
+            return True, file_path
+        except Exception as e:
+            return False, f"导出失败: {str(e)}"
+
+    def export(self, file_path):
+        """
+        按扩展名导出，.jsonl导出为JSONL，其余导出为CSV
+
+        Args:
+            file_path (str): 文件路径
+
+        Returns:
+            tuple: (成功标志, 文件路径或错误消息)
+        """
+        if file_path.lower().endswith(('.jsonl', '.json')):
+            return self.export_jsonl(file_path)
+        return self.export_csv(file_path)
+
+    @staticmethod
+    def _format_duration(seconds):
+        """
+        格式化耗时
+
+        Args:
+            seconds (float): 秒数
+
+        Returns:
+            str: 格式化后的耗时
+        """
+        if seconds < 1:
+            return "少于1秒"
+        if seconds < 60:
+            return f"{seconds:.0f}秒"
+        minutes, seconds = divmod(int(seconds), 60)
+        if minutes < 60:
+            return f"{minutes}分{seconds}秒"
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}小时{minutes}分"
+
+
+class RenamePlanner:
+    """
+    重命名计划器，在不修改磁盘的前提下生成重命名计划，并按计划执行
+    """
+
+    # 默认吞吐量，执行后会根据实际耗时更新
+    DEFAULT_OPS_PER_SECOND = 2000.0
+    DEFAULT_BYTES_PER_SECOND = 100 * 1024 * 1024
+
+    _ops_per_second = DEFAULT_OPS_PER_SECOND
+    _bytes_per_second = DEFAULT_BYTES_PER_SECOND
+
+    @classmethod
+    def plan(cls, rename_pairs):
+        """
+        生成重命名计划
+
+        每个涉及的目录只做一次stat、一次os.access和一次os.scandir，
+        源文件是否存在和目标是否被占用都通过目录清单判断。
+
+        Args:
+            rename_pairs (list): (源文件路径, 新文件名) 元组列表
+
+        Returns:
+            RenamePlan: 重命名计划
+        """
+        dir_cache = {}
+        candidates = []
+        skipped = []
+
+        # 第一遍：分类每个请求
+        for source_path, new_name in rename_pairs:
+            source_path = os.path.abspath(source_path)
+            source_dir, source_name = os.path.split(source_path)
+            source_info = cls._get_dir_info(dir_cache, source_dir)
+
+            if source_name not in source_info['entries']:
+                skipped.append(RenameOperation(source_path, '', new_name, STATUS_MISSING, "源文件不存在"))
+                continue
+
+            if not new_name or not FileOperations.is_valid_filename(os.path.basename(new_name)):
+                skipped.append(RenameOperation(source_path, '', new_name, STATUS_INVALID, "新文件名无效"))
+                continue
+
+            target_path = os.path.normpath(os.path.join(source_dir, new_name))
+            if target_path == source_path:
+                skipped.append(RenameOperation(source_path, target_path, new_name, STATUS_NOOP))
+                continue
+
+            target_dir = os.path.dirname(target_path)
+            target_info = cls._get_dir_info(dir_cache, target_dir)
+
+            if not target_info['exists']:
+                skipped.append(RenameOperation(source_path, target_path, new_name, STATUS_INVALID, "目标目录不存在"))
+                continue
+
+            if not source_info['writable'] or not target_info['writable']:
+                skipped.append(RenameOperation(source_path, target_path, new_name, STATUS_PERMISSION, "没有目录写权限"))
+                continue
+
+            status = STATUS_RENAME
+            size = 0
+            if source_info['device'] != target_info['device']:
+                status = STATUS_CROSS_DEVICE
+                size = cls._get_entry_size(source_info, source_name)
+
+            candidates.append(RenameOperation(source_path, target_path, new_name, status, size=size))
+
+        # 第二遍：解决目标冲突
+        moving_sources = set(op.source for op in candidates)
+        claimed_targets = set()
+        for op in candidates:
+            target_info = dir_cache[os.path.dirname(op.target)]
+            occupied_on_disk = cls._is_occupied(target_info, op.target, op.source, moving_sources)
+
+            if occupied_on_disk or op.target in claimed_targets:
+                op.target = cls._resolve_conflict(op.target, target_info, claimed_targets, moving_sources)
+                op.reason = f"目标已存在，改为 {os.path.basename(op.target)}"
+                if op.status == STATUS_RENAME:
+                    op.status = STATUS_CONFLICT
+
+            claimed_targets.add(op.target)
+
+        # 第三遍：按依赖关系排序
+        operations = cls._order_operations(candidates, dir_cache)
+
+        return RenamePlan(operations, skipped, cls._ops_per_second, cls._bytes_per_second)
+
+    @classmethod
+    def execute(cls, plan, on_operation=None):
+        """
+        按计划顺序执行重命名
+
+        Args:
+            plan (RenamePlan): 重命名计划
+            on_operation (callable, optional): 每个操作成功后的回调，参数为RenameOperation
+
+        Returns:
+            tuple: (成功计数, 错误列表)，错误列表元素为(源路径, 错误消息)
+        """
+        success_count = 0
+        errors = []
+        copy_bytes = 0
+        start_time = time.perf_counter()
+
+        for op in plan.operations:
+            try:
+                # 计划生成后目标可能被其他程序占用，不覆盖已有文件
+                if os.path.lexists(op.target) and not cls._is_same_file(op.source, op.target):
+                    raise FileExistsError(f"目标文件已存在: {op.target}")
+
+                if op.status == STATUS_CROSS_DEVICE:
+                    shutil.move(op.source, op.target)
+                    copy_bytes += op.size
+                else:
+                    os.rename(op.source, op.target)
+            except Exception as e:
+                errors.append((op.source, f"重命名失败: {str(e)}"))
+                continue
+
+            if not op.is_temp:
+                success_count += 1
+            if on_operation:
+                on_operation(op)
+
+        cls.record_throughput(len(plan.operations) - len(errors), copy_bytes, time.perf_counter() - start_time)
+
+        return success_count, errors
+
+    @classmethod
+    def record_throughput(cls, op_count, copy_bytes, elapsed):
+        """
+        记录一次执行的实际吞吐量，用于后续计划的耗时估算
+
+        Args:
+            op_count (int): 完成的操作数量
+            copy_bytes (int): 跨设备复制的字节数
+            elapsed (float): 耗时（秒）
+        """
+        # 样本太小时计时误差过大，不更新
+        if op_count < 20 or elapsed <= 0:
+            return
+
+        # 指数滑动平均，避免单次波动影响过大
+        cls._ops_per_second = 0.7 * cls._ops_per_second + 0.3 * (op_count / elapsed)
+        if copy_bytes > 0:
+            cls._bytes_per_second = 0.7 * cls._bytes_per_second + 0.3 * (copy_bytes / elapsed)
+
+    @staticmethod
+    def _get_dir_info(dir_cache, dir_path):
+        """
+        获取目录信息，每个目录只扫描一次
+
+        Args:
+            dir_cache (dict): 目录信息缓存
+            dir_path (str): 目录路径
+
+        Returns:
+            dict: 包含exists、device、writable和entries（文件名到DirEntry的映射）
+        """
+        info = dir_cache.get(dir_path)
+        if info is not None:
+            return info
+
+        info = {'exists': False, 'device': None, 'writable': False, 'entries': {}, 'folded': {}}
+        try:
+            info['device'] = os.stat(dir_path).st_dev
+            info['exists'] = True
+            info['writable'] = os.access(dir_path, os.W_OK | os.X_OK)
+            with os.scandir(dir_path) as it:
+                info['entries'] = {entry.name: entry for entry in it}
+            if CASE_INSENSITIVE_FS:
+                info['folded'] = {name.lower(): name for name in info['entries']}
+        except OSError:
+            pass
+
+        dir_cache[dir_path] = info
+        return info
+
+    @staticmethod
+    def _is_occupied(dir_info, target_path, source_path, moving_sources):
+        """
+        检查目标路径是否被磁盘上的其他文件占用
+
+        Args:
+            dir_info (dict): 目标目录信息
+            target_path (str): 目标路径
+            source_path (str): 源路径，仅大小写不同的改名不算占用
+            moving_sources (set): 本计划中会被移走的源路径
+
+        Returns:
+            bool: 被占用返回True
+        """
+        target_dir, target_name = os.path.split(target_path)
+        existing_name = target_name if target_name in dir_info['entries'] else None
+        if existing_name is None and CASE_INSENSITIVE_FS:
+            existing_name = dir_info['folded'].get(target_name.lower())
+        if existing_name is None:
+            return False
+
+        existing_path = os.path.join(target_dir, existing_name)
+        return existing_path != source_path and existing_path not in moving_sources
+
+    @staticmethod
+    def _is_same_file(source_path, target_path):
+        """
+        检查两个路径是否指向同一文件（大小写不敏感文件系统上的大小写改名）
+
+        Args:
+            source_path (str): 源路径
+            target_path (str): 目标路径
+
+        Returns:
+            bool: 指向同一文件返回True
+        """
+        try:
+            return os.path.samefile(source_path, target_path)
+        except OSError:
+            return False
+
+    @staticmethod
+    def _get_entry_size(dir_info, name):
+        """
+        获取目录项大小
+
+        Args:
+            dir_info (dict): 目录信息
+            name (str): 文件名
+
+        Returns:
+            int: 文件大小（字节），无法获取返回0
+        """
+        try:
+            return dir_info['entries'][name].stat().st_size
+        except (KeyError, OSError):
+            return 0
+
+    @classmethod
+    def _resolve_conflict(cls, target_path, dir_info, claimed_targets, moving_sources):
+        """
+        为冲突的目标生成带后缀的可用路径，与原先重命名时的后缀规则一致
+
+        Args:
+            target_path (str): 冲突的目标路径
+            dir_info (dict): 目标目录信息
+            claimed_targets (set): 已被本计划占用的目标路径
+            moving_sources (set): 本计划中会被移走的源路径
+
+        Returns:
+            str: 可用的目标路径
+        """
+        target_dir, target_name = os.path.split(target_path)
+        base, ext = os.path.splitext(target_name)
+        i = 1
+        while True:
+            candidate = os.path.join(target_dir, f"{base}_{i}{ext}")
+            on_disk = cls._is_occupied(dir_info, candidate, None, moving_sources)
+            if not on_disk and candidate not in claimed_targets:
+                return candidate
+            i += 1
+
+    @staticmethod
+    def _order_operations(candidates, dir_cache):
+        """
+        按依赖关系排序操作：目标被另一个源占用时，先移走占用者；
+        循环依赖（如A、B互换）通过临时名称打破
+
+        Args:
+            candidates (list): 待执行的操作
+            dir_cache (dict): 目录信息缓存
+
+        Returns:
+            list: 排好序的操作列表，可能包含临时改名操作
+        """
+        by_source = {op.source: op for op in candidates}
+        ordered = []
+        done = set()
+
+        for op in candidates:
+            if op.source in done:
+                continue
+
+            # 沿着“目标被谁占用”的链条找到链尾
+            chain = [op]
+            in_chain = {op.source}
+            current = op
+            while True:
+                blocker = by_source.get(current.target)
+                if blocker is None or blocker.source in done:
+                    break
+                if blocker.source in in_chain:
+                    # 形成循环，把blocker先改为临时名称
+                    entries = dir_cache[os.path.dirname(blocker.source)]['entries']
+                    temp_path = RenamePlanner._make_temp_path(blocker.source, entries, by_source)
+                    ordered.append(RenameOperation(blocker.source, temp_path, '', STATUS_RENAME,
+                                                   "临时改名以打破循环依赖", is_temp=True))
+                    blocker.source = temp_path
+                    break
+                chain.append(blocker)
+                in_chain.add(blocker.source)
+                current = blocker
+
+            # 链尾的目标是空闲的，从链尾往前执行
+            for chained in reversed(chain):
+                ordered.append(chained)
+                done.add(chained.source)
+            done.update(in_chain)
+
+        return ordered
+
+    @staticmethod
+    def _make_temp_path(source_path, entries, by_source):
+        """
+        生成不与现有文件冲突的临时路径
+
+        Args:
+            source_path (str): 源文件路径
+            entries (dict): 源目录的文件清单
+            by_source (dict): 源路径到操作的映射
+
+        Returns:
+            str: 临时路径
+        """
+        dir_path, name = os.path.split(source_path)
+        i = 0
+        while True:
+            temp_name = f".{name}.gy_rename_tmp{i}"
+            temp_path = os.path.join(dir_path, temp_name)
+            if temp_name not in entries and temp_path not in by_source:
+                return temp_path
+            i += 1
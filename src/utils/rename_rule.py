@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import re
+
+# 文件名主干按数字串、字母串（包括汉字）和单个其他字符切分
+TOKEN_PATTERN = re.compile(r'\d+|[^\W\d_]+|.', re.S)
+
+# 引用的类型
+REF_STEM = 'stem'        # 整个文件名主干
+REF_EXT = 'ext'          # 扩展名（包含点）
+REF_DIGITS = 'digits'    # 第index个数字串
+REF_ALPHA = 'alpha'      # 第index个字母串
+
+# 各类引用可用的变换，pad表示按数值补零到指定宽度
+TRANSFORMS = {
+    REF_STEM: ('same', 'lower', 'upper'),
+    REF_EXT: ('same', 'lower'),
+    REF_DIGITS: ('same', 'pad'),
+    REF_ALPHA: ('same', 'lower', 'upper', 'title'),
+}
+
+
+def parse_name(name):
+    """
+    解析文件名
+
+    Args:
+        name (str): 文件名
+
+    Returns:
+        tuple: (主干, 扩展名, {类型: 字符串列表})
+    """
+    stem, ext = os.path.splitext(name)
+    tokens = {REF_DIGITS: [], REF_ALPHA: []}
+    for token in TOKEN_PATTERN.findall(stem):
+        if token.isdigit():
+            tokens[REF_DIGITS].append(token)
+        elif token.isalpha():
+            tokens[REF_ALPHA].append(token)
+    return stem, ext, tokens
+
+
+def _transform(value, transform, width):
+    if transform == 'same':
+        return value
+    if transform == 'lower':
+        return value.lower()
+    if transform == 'upper':
+        return value.upper()
+    if transform == 'title':
+        return value.title()
+    if transform == 'pad':
+        return str(int(value)).zfill(width)
+    return None
+
+
+def evaluate_segment(segment, parsed):
+    """
+    计算一个片段在某个文件名上的结果
+
+    Args:
+        segment (dict): 片段，{'const': 文本} 或 {'ref', 'index', 'transform', 'width'}
+        parsed (tuple): parse_name()的结果
+
+    Returns:
+        str: 片段的文本，引用的部分不存在时返回None
+    """
+    if 'const' in segment:
+        return segment['const']
+
+    stem, ext, tokens = parsed
+    ref = segment['ref']
+    if ref == REF_STEM:
+        value = stem
+    elif ref == REF_EXT:
+        value = ext
+    else:
+        values = tokens.get(ref, [])
+        index = segment.get('index', 0)
+        if not -len(values) <= index < len(values):
+            return None
+        value = values[index]
+    return _transform(value, segment.get('transform', 'same'), segment.get('width', 0))
+
+
+class RenameRule:
+    """
+    从示例归纳出的本地重命名规则
+
+    规则是一串片段：常量文本，或对原文件名中某个部分（主干、扩展名、第几个数字串
+    或字母串，可以从前或从后数）的引用，引用可以附带大小写变换或数字补零。
+    新文件按规则在本地计算新名称，不需要调用AI；规则引用的部分不存在时无法应用。
+
+    归纳时在第一个示例上搜索所有能生成目标名称的片段序列，同时要求在其他参与搜索
+    的示例上生成目标名称的前缀，选出常量最少的规则，再用全部示例验证。
+    """
+
+    # 参与搜索的示例数量，其余示例只用于验证
+    MAX_SEARCH_EXAMPLES = 6
+
+    # 搜索的最大节点数
+    MAX_SEARCH_NODES = 50000
+
+    # 保存规则时附带的示例数量，规则无法应用时作为AI分析的示例
+    MAX_SAVED_EXAMPLES = 20
+
+    def __init__(self, segments, examples=None):
+        """
+        初始化规则
+
+        Args:
+            segments (list): 片段列表
+            examples (list, optional): 归纳规则所用的 (原文件名, 新文件名) 示例
+        """
+        self.segments = segments
+        self.examples = list(examples or [])
+        self._output_pattern = None
+
+    @classmethod
+    def induce(cls, pairs):
+        """
+        从示例归纳规则
+
+        Args:
+            pairs (iterable): (原文件名, 新文件名) 示例，名称相同的示例会被忽略
+
+        Returns:
+            RenameRule: 能重现所有示例的规则，找不到时返回None
+        """
+        pairs = [(original, new) for original, new in pairs if original and new and original != new]
+        if not pairs:
+            return None
+
+        # 从全部示例中均匀选取参与搜索的示例
+        step = max(1, len(pairs) // cls.MAX_SEARCH_EXAMPLES)
+        search_pairs = pairs[::step][:cls.MAX_SEARCH_EXAMPLES]
+        segments = cls._search([parse_name(original) for original, _ in search_pairs],
+                               [new for _, new in search_pairs])
+        if segments is None:
+            return None
+
+        rule = cls(segments, pairs[:cls.MAX_SAVED_EXAMPLES])
+        if rule.count_matches(pairs) != len(pairs):
+            return None
+        return rule
+
+    @classmethod
+    def _candidate_refs(cls, parsed_list, targets):
+        """
+        列出在所有示例上都有结果、且结果出现在第一个目标名称中的引用
+
+        Returns:
+            list: (片段, 各示例上的结果) 列表，结果较长的在前
+        """
+        stem, ext, tokens = parsed_list[0]
+        selectors = [{'ref': REF_STEM}, {'ref': REF_EXT}]
+        for ref in (REF_DIGITS, REF_ALPHA):
+            count = len(tokens[ref])
+            for index in range(count):
+                selectors.append({'ref': ref, 'index': index})
+                selectors.append({'ref': ref, 'index': index - count})
+
+        candidates = []
+        seen = set()
+        for selector in selectors:
+            for transform in TRANSFORMS[selector['ref']]:
+                widths = [0]
+                if transform == 'pad':
+                    # 补零宽度从第一个目标名称中出现的数字串长度中选取
+                    widths = sorted({len(token) for token in re.findall(r'\d+', targets[0])})
+                for width in widths:
+                    segment = dict(selector, transform=transform)
+                    if transform == 'pad':
+                        segment['width'] = width
+                    outputs = tuple(evaluate_segment(segment, parsed) for parsed in parsed_list)
+                    if any(not output for output in outputs) or outputs[0] not in targets[0]:
+                        continue
+                    # 结果完全相同的引用只保留第一个（较简单的）
+                    if outputs in seen:
+                        continue
+                    seen.add(outputs)
+                    candidates.append((segment, outputs))
+
+        candidates.sort(key=lambda item: -len(item[1][0]))
+        return candidates
+
+    @classmethod
+    def _search(cls, parsed_list, targets):
+        """
+        搜索能在所有示例上生成目标名称、常量字符最少的片段序列
+
+        Returns:
+            list: 片段列表，找不到时返回None
+        """
+        candidates = cls._candidate_refs(parsed_list, targets)
+        lengths = [len(target) for target in targets]
+        best = [None, None]  # [得分, 片段列表]
+        visited = {}  # (各示例位置, 上一个片段是否为常量) -> 到达时的最小得分
+        nodes = [0]
+
+        def search(positions, segments, const_chars, last_const):
+            nodes[0] += 1
+            if nodes[0] > cls.MAX_SEARCH_NODES:
+                return
+            score = (const_chars, len(segments))
+            if best[0] is not None and score >= best[0]:
+                return
+            state = (positions, last_const)
+            if state in visited and visited[state] <= score:
+                return
+            visited[state] = score
+
+            if all(position == length for position, length in zip(positions, lengths)):
+                best[0], best[1] = score, [dict(segment) for segment in segments]
+                return
+
+            # 引用
+            for segment, outputs in candidates:
+                if all(target.startswith(output, position)
+                       for target, output, position in zip(targets, outputs, positions)):
+                    segments.append(segment)
+                    search(tuple(position + len(output) for position, output in zip(positions, outputs)),
+                           segments, const_chars, False)
+                    segments.pop()
+
+            # 常量，每个示例在当前位置必须是同一个字符
+            if positions[0] < lengths[0]:
+                char = targets[0][positions[0]]
+                if all(position < length and target[position] == char
+                       for target, position, length in zip(targets, positions, lengths)):
+                    if last_const:
+                        previous = segments[-1]
+                        segments[-1] = {'const': previous['const'] + char}
+                        search(tuple(position + 1 for position in positions), segments, const_chars + 1, True)
+                        segments[-1] = previous
+                    else:
+                        segments.append({'const': char})
+                        search(tuple(position + 1 for position in positions), segments, const_chars + 1, True)
+                        segments.pop()
+
+        search(tuple(0 for _ in targets), [], 0, False)
+        return best[1]
+
+    def apply(self, name):
+        """
+        按规则计算新文件名
+
+        Args:
+            name (str): 原文件名
+
+        Returns:
+            str: 新文件名，规则无法应用时返回None
+        """
+        parsed = parse_name(name)
+        parts = []
+        for segment in self.segments:
+            part = evaluate_segment(segment, parsed)
+            if part is None:
+                return None
+            parts.append(part)
+        new_name = "".join(parts)
+        return new_name or None
+
+    def matches_output(self, name):
+        """
+        判断文件名是否已经是规则的输出格式：常量按顺序出现，引用的位置是对应类型的文本
+
+        规则中没有常量时几乎任何文件名都符合格式，无法区分，总是返回False。
+
+        Args:
+            name (str): 文件名
+
+        Returns:
+            bool: 文件名可能由本规则生成时返回True
+        """
+        if self._output_pattern is None:
+            if not any('const' in segment for segment in self.segments):
+                return False
+            parts = []
+            for segment in self.segments:
+                if 'const' in segment:
+                    parts.append(re.escape(segment['const']))
+                elif segment['ref'] == REF_STEM:
+                    parts.append(r'.+')
+                elif segment['ref'] == REF_EXT:
+                    parts.append(r'(?:\.[^.]*)?')
+                elif segment['ref'] == REF_DIGITS:
+                    width = segment.get('width', 0) if segment.get('transform') == 'pad' else 0
+                    parts.append(rf'\d{{{width},}}' if width else r'\d+')
+                else:
+                    parts.append(r'[^\W\d_]+')
+            self._output_pattern = re.compile("".join(parts), re.S)
+        return self._output_pattern.fullmatch(name) is not None
+
+    def count_matches(self, pairs):
+        """
+        统计规则能重现的示例数量
+
+        Args:
+            pairs (iterable): (原文件名, 新文件名) 示例
+
+        Returns:
+            int: 规则计算结果与新文件名相同的示例数量
+        """
+        return sum(1 for original, new in pairs if self.apply(original) == new)
+
+    def describe(self):
+        """
+        生成规则的文字描述，例如 "2024-旅行-" + 数字串1(补零到3位) + 扩展名
+
+        Returns:
+            str: 规则描述
+        """
+        names = {REF_STEM: "主干", REF_EXT: "扩展名", REF_DIGITS: "数字串", REF_ALPHA: "字母串"}
+        transforms = {'lower': "小写", 'upper': "大写", 'title': "首字母大写"}
+        parts = []
+        for segment in self.segments:
+            if 'const' in segment:
+                parts.append(f'"{segment["const"]}"')
+                continue
+            part = names[segment['ref']]
+            if 'index' in segment:
+                index = segment['index']
+                part += f"{index + 1}" if index >= 0 else f"倒数{-index}"
+            if segment.get('transform') == 'pad':
+                part += f"(补零到{segment['width']}位)"
+            elif segment.get('transform') in transforms:
+                part += f"({transforms[segment['transform']]})"
+            parts.append(part)
+        return " + ".join(parts)
+
+    def to_dict(self):
+        """
+        转换为字典
+
+        Returns:
+            dict: 包含segments和examples
+        """
+        return {'segments': self.segments, 'examples': [list(pair) for pair in self.examples]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从字典创建规则
+
+        Args:
+            data (dict): to_dict()的结果
+
+        Returns:
+            RenameRule: 规则
+        """
+        segments = data.get('segments')
+        if not isinstance(segments, list) or not segments:
+            raise ValueError("规则缺少segments")
+        return cls(segments, [tuple(pair) for pair in data.get('examples', [])])
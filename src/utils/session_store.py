@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import sqlite3
+import datetime
+
+class SessionStore:
+    """
+    会话数据库，用SQLite保存文件列表、命名示例、分析历史和已执行的重命名
+
+    每次变化只追加或修改对应的行，写操作先放进队列，flush()时在一个事务中
+    一起提交，连续的小改动不会每次都同步磁盘。数据库使用WAL模式，写入时
+    只追加到日志文件。
+
+    历史记录与RenameHistory的存储方式相同：检查点保存完整映射，其他记录只
+    保存相对于基准记录的差异，所以每次分析只写入变化的条目。
+    """
+
+    # 数据库结构版本
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path):
+        """
+        打开会话数据库，不存在时创建
+
+        Args:
+            db_path (str): 数据库文件路径，":memory:"表示内存数据库
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+        self._pending = []  # 等待提交的写操作 (函数, 参数)
+        row = self._conn.execute("SELECT MAX(id) FROM history").fetchone()
+        self._next_history_id = (row[0] or 0) + 1
+
+    def _create_tables(self):
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS files (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT UNIQUE NOT NULL,
+                    name TEXT NOT NULL,
+                    is_folder INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS examples (
+                    original_name TEXT PRIMARY KEY,
+                    new_name TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    base_id INTEGER,
+                    changed TEXT NOT NULL,
+                    removed TEXT NOT NULL DEFAULT '[]',
+                    raw_response BLOB NOT NULL DEFAULT x''
+                );
+                CREATE TABLE IF NOT EXISTS renames (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    journal TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    undone INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS renames_journal ON renames (journal);
+            """)
+            self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                               (str(self.SCHEMA_VERSION),))
+
+    # 写队列
+    def _queue(self, func, *args):
+        self._pending.append((func, args))
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def flush(self):
+        """
+        在一个事务中提交所有排队的写操作
+
+        Returns:
+            int: 提交的写操作数量
+        """
+        if not self._pending:
+            return 0
+        pending = self._pending
+        self._pending = []
+        with self._conn:
+            for func, args in pending:
+                func(*args)
+        return len(pending)
+
+    def close(self):
+        """
+        提交排队的写操作并关闭数据库
+        """
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    # 元数据
+    def set_value(self, key, value):
+        self._queue(self._conn.execute,
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def get_value(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return default
+
+    # 文件
+    def add_files(self, file_dicts):
+        """
+        追加文件，路径已存在时忽略
+
+        Args:
+            file_dicts (list): 包含path、name和is_folder的文件数据列表
+        """
+        rows = [(data['path'], data['name'], int(bool(data.get('is_folder', False))))
+                for data in file_dicts if data.get('path')]
+        if rows:
+            self._queue(self._conn.executemany,
+                        "INSERT OR IGNORE INTO files (path, name, is_folder) VALUES (?, ?, ?)", rows)
+
+    def remove_files(self, paths):
+        rows = [(path,) for path in paths]
+        if rows:
+            self._queue(self._conn.executemany, "DELETE FROM files WHERE path = ?", rows)
+
+    def rename_file(self, old_path, new_path, new_name):
+        self._queue(self._conn.execute,
+                    "UPDATE OR REPLACE files SET path = ?, name = ? WHERE path = ?", (new_path, new_name, old_path))
+
+    def rename_paths(self, old_prefix, new_prefix):
+        """
+        文件夹被重命名后，把其中所有文件的路径前缀替换为新路径，文件名不变
+
+        Args:
+            old_prefix (str): 文件夹原路径
+            new_prefix (str): 文件夹新路径
+        """
+        old_dir = os.path.join(old_prefix, "")
+        self._queue(self._conn.execute,
+                    "UPDATE OR REPLACE files SET path = ? || substr(path, ?) WHERE substr(path, 1, ?) = ?",
+                    (os.path.join(new_prefix, ""), len(old_dir) + 1, len(old_dir), old_dir))
+
+    def clear_files(self):
+        self._queue(self._conn.execute, "DELETE FROM files")
+
+    def load_files(self):
+        """
+        按添加顺序读取文件
+
+        Returns:
+            list: 包含path、name和is_folder的文件数据列表
+        """
+        return [{'path': path, 'name': sys.intern(name), 'is_folder': bool(is_folder)}
+                for path, name, is_folder in self._conn.execute(
+                    "SELECT path, name, is_folder FROM files ORDER BY seq")]
+
+    # 示例
+    def set_example(self, original_name, new_name):
+        """
+        设置或删除命名示例
+
+        Args:
+            original_name (str): 原始文件名
+            new_name (str): 新文件名，为None时删除示例
+        """
+        if new_name is None:
+            self._queue(self._conn.execute, "DELETE FROM examples WHERE original_name = ?", (original_name,))
+        else:
+            self._queue(self._conn.execute,
+                        "INSERT OR REPLACE INTO examples (original_name, new_name) VALUES (?, ?)",
+                        (original_name, new_name))
+
+    def remove_examples(self, original_names):
+        rows = [(name,) for name in original_names]
+        if rows:
+            self._queue(self._conn.executemany, "DELETE FROM examples WHERE original_name = ?", rows)
+
+    def clear_examples(self):
+        self._queue(self._conn.execute, "DELETE FROM examples")
+
+    def load_examples(self):
+        return {sys.intern(original_name): new_name for original_name, new_name in self._conn.execute(
+            "SELECT original_name, new_name FROM examples ORDER BY rowid")}
+
+    # 历史记录
+    def add_history(self, timestamp, rename_map=None, raw_response=b"", base_id=None, changed=None, removed=()):
+        """
+        追加一条历史记录
+
+        Args:
+            timestamp (datetime): 时间戳
+            rename_map (dict): 完整映射，按检查点存储时使用
+            raw_response (bytes): 压缩后的原始AI响应，按原样保存
+            base_id (int, optional): 基准记录的ID，不为None时按差异存储
+            changed (dict): 相对于基准变化或新增的条目
+            removed (iterable): 相对于基准被移除的文件名
+
+        Returns:
+            int: 新记录的ID，提交前就可以作为后续记录的基准
+        """
+        history_id = self._next_history_id
+        self._next_history_id += 1
+        if base_id is None:
+            changed, removed = rename_map or {}, ()
+        self._queue(self._conn.execute,
+                    "INSERT INTO history (id, timestamp, base_id, changed, removed, raw_response) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (history_id, timestamp.isoformat(), base_id,
+                     json.dumps(changed, ensure_ascii=False), json.dumps(list(removed), ensure_ascii=False),
+                     raw_response or b""))
+        return history_id
+
+    def remove_history(self, history_ids):
+        """
+        删除历史记录，以被删除记录为基准的记录先改为完整映射
+
+        Args:
+            history_ids (iterable): 记录ID
+        """
+        history_ids = list(history_ids)
+        if history_ids:
+            self._queue(self._remove_history, history_ids)
+
+    def _remove_history(self, history_ids):
+        placeholders = ",".join("?" * len(history_ids))
+        dependents = [row[0] for row in self._conn.execute(
+            f"SELECT id FROM history WHERE base_id IN ({placeholders}) AND id NOT IN ({placeholders})",
+            history_ids + history_ids)]
+        for history_id in dependents:
+            self._conn.execute(
+                "UPDATE history SET base_id = NULL, changed = ?, removed = '[]' WHERE id = ?",
+                (json.dumps(self._build_rename_map(history_id), ensure_ascii=False), history_id))
+        self._conn.execute(f"DELETE FROM history WHERE id IN ({placeholders})", history_ids)
+
+    def clear_history(self):
+        self._queue(self._conn.execute, "DELETE FROM history")
+
+    def list_history(self):
+        """
+        读取所有历史记录的ID和时间戳，不读取映射内容
+
+        Returns:
+            list: (记录ID, 时间戳) 元组列表，按添加顺序排列
+        """
+        entries = []
+        for history_id, timestamp in self._conn.execute("SELECT id, timestamp FROM history ORDER BY id"):
+            try:
+                timestamp = datetime.datetime.fromisoformat(timestamp)
+            except ValueError:
+                timestamp = None
+            entries.append((history_id, timestamp))
+        return entries
+
+    def _build_rename_map(self, history_id):
+        # 沿基准链回到检查点，再按从旧到新的顺序应用差异
+        chain = []
+        while history_id is not None:
+            row = self._conn.execute(
+                "SELECT base_id, changed, removed FROM history WHERE id = ?", (history_id,)).fetchone()
+            if row is None:
+                break
+            chain.append(row)
+            history_id = row[0]
+
+        rename_map = {}
+        for _, changed, removed in reversed(chain):
+            for name in json.loads(removed):
+                rename_map.pop(name, None)
+            rename_map.update(json.loads(changed))
+        # 键与文件模型中驻留的文件名共用同一个字符串对象
+        return {sys.intern(name): new_name for name, new_name in rename_map.items()}
+
+    def load_history(self, history_id):
+        """
+        读取一条历史记录的完整映射，不读取原始响应，会先提交排队的写操作
+
+        Args:
+            history_id (int): 记录ID
+
+        Returns:
+            dict: 包含rename_map，记录不存在时返回None
+        """
+        self.flush()
+        row = self._conn.execute("SELECT 1 FROM history WHERE id = ?", (history_id,)).fetchone()
+        if row is None:
+            return None
+        return {'rename_map': self._build_rename_map(history_id)}
+
+    def load_raw_response(self, history_id):
+        """
+        读取一条历史记录的原始响应，会先提交排队的写操作
+
+        Args:
+            history_id (int): 记录ID
+
+        Returns:
+            bytes: 保存时的压缩数据，记录不存在时返回空字节串
+        """
+        self.flush()
+        row = self._conn.execute("SELECT raw_response FROM history WHERE id = ?", (history_id,)).fetchone()
+        return row[0] if row else b""
+
+    # 重命名记录
+    def record_renames(self, journal, operations):
+        """
+        记录一次已执行的重命名
+
+        Args:
+            journal (str): 重命名日志路径，用于对应撤销操作
+            operations (list): (源路径, 目标路径) 元组列表，按执行顺序排列
+        """
+        rows = [(journal or "", source, target) for source, target in operations]
+        if rows:
+            self._queue(self._conn.executemany,
+                        "INSERT INTO renames (journal, source, target) VALUES (?, ?, ?)", rows)
+
+    def mark_undone(self, journal):
+        self._queue(self._conn.execute, "UPDATE renames SET undone = 1 WHERE journal = ?", (journal,))
+
+    def load_renames(self, include_undone=False):
+        """
+        读取已执行的重命名
+
+        Args:
+            include_undone (bool): 是否包含已撤销的重命名
+
+        Returns:
+            list: (日志路径, 源路径, 目标路径) 元组列表，按执行顺序排列
+        """
+        query = "SELECT journal, source, target FROM renames"
+        if not include_undone:
+            query += " WHERE undone = 0"
+        return list(self._conn.execute(query + " ORDER BY seq"))
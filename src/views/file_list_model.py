@@ -0,0 +1,620 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle, QLineEdit
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex, QSize, QRect, QEvent
+from PySide6.QtGui import QFont, QColor, QPen
+
+from .icon_cache import FileIconProvider
+from .thumbnail_service import THUMBNAIL_SIZE
+
+# 表格列
+COLUMN_ORIGINAL = 0  # 原始文件名
+COLUMN_EXAMPLE = 1   # 命名示范，悬停显示Edit按钮，点击后可编辑
+COLUMN_RESULT = 2    # 分析结果
+COLUMN_COUNT = 3
+
+# 表格行高，与旧版列表项的固定高度一致
+ROW_HEIGHT = 48
+
+class FileRow:
+    """
+    表格中一行的只读快照，由FileTableModel.file_at()按需创建
+
+    模型按列存储，不为每行保存对象；绘制和右键菜单只为用到的行创建快照。
+    """
+
+    __slots__ = ('file_id', 'name', 'path', 'is_folder', 'example', 'result', 'stale')
+
+    def __init__(self, file_id, name, path, is_folder, example, result, stale):
+        self.file_id = file_id
+        self.name = name
+        self.path = path
+        self.is_folder = is_folder
+        self.example = example  # 命名示范，为None表示尚未编辑
+        self.result = result    # 分析结果，为None表示没有结果
+        self.stale = stale
+
+    def to_dict(self):
+        """
+        转换为字典，每次调用都创建新字典
+
+        Returns:
+            dict: 文件数据字典
+        """
+        return {'id': self.file_id, 'name': self.name, 'path': self.path, 'is_folder': self.is_folder,
+                'example': self.example, 'result': self.result, 'stale': self.stale}
+
+class FileTableModel(QAbstractTableModel):
+    """
+    文件表格模型，每行一个文件，三列分别为原始文件名、命名示范和分析结果
+
+    数据按列保存在几个并行的列表中，只引用传入的字符串（与FileModel中的文件项共用
+    同一个对象），不复制文件数据字典，也不为每行创建Python对象，百万行时添加和
+    整列替换都只是列表操作。命名示范和分析结果为None表示尚未编辑或没有结果。
+    三列共用同一行，滚动和选择天然一致。视图只为可见单元格调用data()。
+
+    行以文件ID为键：不同文件夹中的同名文件各占一行，按ID更新和移除不会影响同名的其他行。
+    命名示范按原始文件名对应（与RenameModel一致），另建文件名到ID的索引，
+    设置示范时同名的行一起更新。
+    """
+
+    # 自定义数据角色
+    FileDataRole = Qt.UserRole        # 行快照FileRow
+    StaleRole = Qt.UserRole + 1       # 分析结果是否已过期
+    EditedRole = Qt.UserRole + 2      # 命名示范是否已开始编辑
+
+    # 定义信号
+    name_edited = Signal(str, str)  # 命名示范被编辑信号，参数为原始文件名和新文件名
+
+    # 文件数据字典的键 -> 列表属性名
+    FIELDS = {'id': '_ids', 'name': '_names', 'path': '_paths', 'is_folder': '_folders',
+              'example': '_examples', 'result': '_results', 'stale': '_stale'}
+
+    def __init__(self, parent=None):
+        """
+        初始化文件表格模型
+
+        Args:
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._reset_columns()
+
+    def _reset_columns(self):
+        # 行号 -> 各字段
+        self._ids = []
+        self._names = []
+        self._paths = []
+        self._folders = []
+        self._examples = []
+        self._results = []
+        self._stale = []
+        self._row_of = {}    # 文件ID -> 行号
+        self._name_ids = {}  # 文件名 -> 文件ID，有多个同名文件时为 {文件ID: None}，保持添加顺序
+
+    def _columns(self):
+        return (self._ids, self._names, self._paths, self._folders, self._examples, self._results, self._stale)
+
+    def _name_add(self, file_name, file_id):
+        ids = self._name_ids.get(file_name)
+        if ids is None:
+            self._name_ids[file_name] = file_id
+        elif isinstance(ids, dict):
+            ids[file_id] = None
+        else:
+            self._name_ids[file_name] = {ids: None, file_id: None}
+
+    def _name_remove(self, file_name, file_id):
+        ids = self._name_ids.get(file_name)
+        if isinstance(ids, dict):
+            ids.pop(file_id, None)
+            if len(ids) == 1:
+                self._name_ids[file_name] = next(iter(ids))
+        elif ids == file_id:
+            del self._name_ids[file_name]
+
+    def rows_of_name(self, file_name):
+        """
+        获取所有同名文件所在的行号
+
+        Args:
+            file_name (str): 文件名
+
+        Returns:
+            list: 行号列表，按添加顺序排列
+        """
+        ids = self._name_ids.get(file_name)
+        if ids is None:
+            return []
+        if not isinstance(ids, dict):
+            return [self._row_of[ids]]
+        return [self._row_of[file_id] for file_id in ids]
+
+    # Qt模型接口
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else COLUMN_COUNT
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == COLUMN_EXAMPLE:
+                return self._examples[row] or ''
+            if column == COLUMN_RESULT:
+                return self._results[row] or ''
+            return self._names[row]
+        if role == self.FileDataRole:
+            return self.file_at(row)
+        if role == self.StaleRole:
+            return self._stale[row]
+        if role == self.EditedRole:
+            return self._examples[row] is not None
+        if role == Qt.ToolTipRole:
+            if self._stale[row] and column != COLUMN_ORIGINAL:
+                return "文件已在外部更改，分析结果可能已过期，请重新分析"
+            return self._paths[row] or None
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == COLUMN_EXAMPLE and self._examples[index.row()] is not None:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole or index.column() != COLUMN_EXAMPLE:
+            return False
+        row = index.row()
+        if self._examples[row] == value:
+            return True
+        # 示范按文件名对应，同名的行显示同一个示范
+        file_name = self._names[row]
+        self._set_example_rows(self.rows_of_name(file_name), value)
+        self.name_edited.emit(file_name, value)
+        return True
+
+    def _set_example_rows(self, rows, new_name):
+        for row in rows:
+            self._examples[row] = new_name
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), COLUMN_EXAMPLE), self.index(max(rows), COLUMN_EXAMPLE))
+
+    # 数据操作
+    def add_files(self, files):
+        """
+        在末尾批量添加文件，整批只通知一次
+
+        Args:
+            files (list): 文件数据字典列表，以id区分文件，ID已存在时跳过；同名文件各占一行
+
+        Returns:
+            int: 实际添加的数量
+        """
+        row_of = self._row_of
+        first = len(self._names)
+        new_rows = {}  # 文件ID -> 文件数据，同时用于跳过本批中重复的ID
+        for file_data in files:
+            file_id = file_data.get('id')
+            if file_id not in row_of and file_id not in new_rows:
+                new_rows[file_id] = file_data
+
+        if not new_rows:
+            return 0
+
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        # 只引用字典中的值，命名示范和分析结果不写回调用方的字典
+        values = new_rows.values()
+        self._ids.extend(new_rows)
+        self._names.extend(file_data.get('name', '') for file_data in values)
+        self._paths.extend(file_data.get('path', '') for file_data in values)
+        self._folders.extend(bool(file_data.get('is_folder', False)) for file_data in values)
+        self._examples.extend(file_data.get('example') for file_data in values)
+        self._results.extend(file_data.get('result') for file_data in values)
+        self._stale.extend(bool(file_data.get('stale', False)) for file_data in values)
+        row_of.update(zip(new_rows, range(first, first + len(new_rows))))
+        for file_id, file_name in zip(new_rows, self._names[first:]):
+            self._name_add(file_name, file_id)
+        self.endInsertRows()
+        return len(new_rows)
+
+    def _update_row(self, row, new_data):
+        for key, value in new_data.items():
+            attribute = self.FIELDS.get(key)
+            if attribute:
+                getattr(self, attribute)[row] = value
+
+    def update_file(self, file_id, new_data):
+        """
+        更新一行的数据
+
+        Args:
+            file_id (int): 文件ID
+            new_data (dict): 要合并的新数据，包含name时同时更新文件名索引
+
+        Returns:
+            bool: 如果文件存在返回True
+        """
+        row = self._row_of.get(file_id)
+        if row is None:
+            return False
+
+        old_name = self._names[row]
+        new_name = new_data.get('name', old_name)
+        if new_name != old_name:
+            self._name_remove(old_name, file_id)
+            self._name_add(new_name, file_id)
+        self._update_row(row, {key: value for key, value in new_data.items() if key != 'id'})
+
+        self.dataChanged.emit(self.index(row, 0), self.index(row, COLUMN_COUNT - 1))
+        return True
+
+    def update_files(self, file_data_map):
+        """
+        批量更新多行的数据，按行号索引直接定位，整批只通知一次
+
+        Args:
+            file_data_map (dict): 文件ID到要合并的新数据的映射，不存在的文件跳过，
+                不支持在这里改名（改名用update_file）
+
+        Returns:
+            int: 实际更新的行数
+        """
+        first = last = None
+        count = 0
+        for file_id, new_data in file_data_map.items():
+            row = self._row_of.get(file_id)
+            if row is None:
+                continue
+            self._update_row(row, new_data)
+            count += 1
+            if first is None or row < first:
+                first = row
+            if last is None or row > last:
+                last = row
+
+        # 只通知覆盖这些行的一个范围，视图只重绘其中可见的部分
+        if count:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, COLUMN_COUNT - 1))
+        return count
+
+    def set_example(self, file_name, new_name):
+        """
+        设置命名示范，所有同名的行一起更新
+
+        Args:
+            file_name (str): 原始文件名
+            new_name (str): 示范文件名，为None时恢复为未编辑状态
+
+        Returns:
+            bool: 如果有这个文件名的行返回True
+        """
+        rows = self.rows_of_name(file_name)
+        self._set_example_rows(rows, new_name)
+        return bool(rows)
+
+    def set_results(self, rename_map):
+        """
+        用一次分析结果替换整列分析结果，只通知一次
+
+        Args:
+            rename_map (dict): 原始文件名到新文件名的映射，值也可以是包含new_name的字典；
+                不在映射中的行清空分析结果
+
+        Returns:
+            int: 设置了分析结果的行数
+        """
+        results = [rename_map.get(file_name) for file_name in self._names]
+        for row, new_name in enumerate(results):
+            if isinstance(new_name, dict):
+                results[row] = new_name.get('new_name')
+        results = [new_name or None for new_name in results]
+        self._results = results
+
+        if results:
+            self.dataChanged.emit(self.index(0, COLUMN_RESULT), self.index(len(results) - 1, COLUMN_RESULT))
+        return len(results) - results.count(None)
+
+    def clear_column(self, column):
+        """
+        清空命名示范列或分析结果列
+
+        Args:
+            column (int): COLUMN_EXAMPLE或COLUMN_RESULT
+        """
+        cleared = [None] * len(self._names)
+        if column == COLUMN_EXAMPLE:
+            self._examples = cleared
+        else:
+            self._results = cleared
+        if cleared:
+            self.dataChanged.emit(self.index(0, column), self.index(len(cleared) - 1, column))
+
+    def remove_rows(self, rows):
+        """
+        移除多行，连续的行合并为一次通知
+
+        Args:
+            rows (iterable): 行号
+
+        Returns:
+            list: 被移除行的文件ID，按行号从大到小排列
+        """
+        rows = sorted(set(row for row in rows if 0 <= row < len(self._names)), reverse=True)
+        removed = []
+        start = 0
+        while start < len(rows):
+            # 从后往前找出一段连续的行
+            end = start
+            while end + 1 < len(rows) and rows[end + 1] == rows[end] - 1:
+                end += 1
+            first, last = rows[end], rows[start]
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for row in range(last, first - 1, -1):
+                removed.append(self._ids[row])
+                self._name_remove(self._names[row], self._ids[row])
+            for column in self._columns():
+                del column[first:last + 1]
+            self.endRemoveRows()
+            start = end + 1
+
+        # 只有最前面被移除的行之后的行号会变，前面的索引保持不变
+        if removed:
+            row_of = self._row_of
+            for file_id in removed:
+                row_of.pop(file_id, None)
+            ids = self._ids
+            row_of.update(zip(ids[rows[-1]:], range(rows[-1], len(ids))))
+        return removed
+
+    def remove_ids(self, file_ids):
+        """
+        按文件ID移除多行
+
+        Args:
+            file_ids (list): 文件ID列表
+
+        Returns:
+            list: 被移除行的文件ID，按行号从大到小排列
+        """
+        return self.remove_rows(self._row_of[file_id] for file_id in file_ids if file_id in self._row_of)
+
+    def clear(self):
+        """
+        清空所有行
+        """
+        self.beginResetModel()
+        self._reset_columns()
+        self.endResetModel()
+
+    def row_of(self, file_id):
+        """
+        获取文件所在的行号
+
+        Args:
+            file_id (int): 文件ID
+
+        Returns:
+            int: 行号，不存在返回-1
+        """
+        return self._row_of.get(file_id, -1)
+
+    def file_at(self, row):
+        """
+        获取指定行的快照
+
+        Args:
+            row (int): 行号
+
+        Returns:
+            FileRow: 行快照，行号无效时返回None
+        """
+        if 0 <= row < len(self._names):
+            return FileRow(self._ids[row], self._names[row], self._paths[row], self._folders[row],
+                           self._examples[row], self._results[row], self._stale[row])
+        return None
+
+    def row_for(self, file_id):
+        """
+        按文件ID获取行快照
+
+        Args:
+            file_id (int): 文件ID
+
+        Returns:
+            FileRow: 行快照，不存在时返回None
+        """
+        row = self._row_of.get(file_id)
+        return self.file_at(row) if row is not None else None
+
+    def path_at(self, row):
+        return self._paths[row]
+
+    def get_file(self, file_id):
+        """
+        获取指定文件的数据
+
+        Args:
+            file_id (int): 文件ID
+
+        Returns:
+            dict: 新建的文件数据字典，不存在时返回None
+        """
+        file_row = self.row_for(file_id)
+        return file_row.to_dict() if file_row is not None else None
+
+    def has_file(self, file_id):
+        return file_id in self._row_of
+
+    def get_files(self):
+        return [self.file_at(row).to_dict() for row in range(len(self._names))]
+
+class FileItemDelegate(QStyledItemDelegate):
+    """
+    文件表格单元格委托，直接绘制图标和文件名
+
+    代替旧版每行一套QWidget、QLabel、QTextEdit和QPushButton：只有可见单元格会被绘制，
+    编辑器只为正在编辑的一格创建。鼠标所在行（hover_row，由FileListWidget维护）中
+    未编辑的命名示范单元格绘制Edit按钮，点击后发出edit_requested信号。
+    """
+
+    # 定义信号
+    edit_requested = Signal(QModelIndex)  # 点击Edit按钮信号
+
+    # 图标尺寸
+    ICON_SIZE = 20
+
+    # 文字颜色
+    TEXT_COLOR = QColor("#f0f0f0")
+    FOLDER_COLOR = QColor("#f0c040")
+    RESULT_COLOR = QColor("#4CAF50")
+    EXAMPLE_COLOR = QColor("#CBA057")
+    BUTTON_COLOR = QColor("#CBA057")
+
+    def __init__(self, parent=None):
+        """
+        初始化委托
+
+        Args:
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._font = QFont("Courier New", 10)  # 使用等宽字体，这种字体对特殊字符显示更好
+        self._font.setStyleStrategy(QFont.PreferAntialias)
+        # 图标从进程共用的缓存中取，按扩展名区分的图标在后台加载
+        self.icon_provider = FileIconProvider(self.ICON_SIZE, parent=self)
+        # 设置后原始文件名列在文件名前显示缩略图
+        self.thumbnail_service = None
+        # 鼠标所在的行，-1表示不在任何行上
+        self.hover_row = -1
+
+    def _button_rect(self, rect):
+        return rect.adjusted(10, 8, -10, -8)
+
+    def _icon_width(self, column):
+        if column == COLUMN_ORIGINAL and self.thumbnail_service is not None:
+            return THUMBNAIL_SIZE
+        return self.ICON_SIZE
+
+    def _text_rect(self, rect, column=COLUMN_EXAMPLE):
+        # 与旧版布局一致：左右边距10，图标20，间距10，文本左边距5
+        return rect.adjusted(10 + self._icon_width(column) + 10 + 5, 0, -10, 0)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        self.initStyleOption(option, index)
+        widget = option.widget
+        style = widget.style() if widget else None
+        file_row = index.data(FileTableModel.FileDataRole)
+        column = index.column()
+        rect = option.rect
+
+        painter.save()
+
+        # 背景（选中、悬停、交替行颜色），遵循样式表中的 ::item 规则
+        if style:
+            style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, widget)
+
+        # 命名示范列中未编辑的单元格只在鼠标位于这一行时显示Edit按钮
+        if column == COLUMN_EXAMPLE and file_row.example is None:
+            if index.row() == self.hover_row:
+                button_rect = self._button_rect(rect)
+                painter.setRenderHint(painter.RenderHint.Antialiasing)
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(self.BUTTON_COLOR)
+                painter.drawRoundedRect(button_rect, 3, 3)
+                painter.setPen(QColor("white"))
+                painter.drawText(button_rect, Qt.AlignCenter, "Edit")
+            painter.restore()
+            return
+
+        # 还没有分析结果的单元格留空
+        if column == COLUMN_RESULT and not file_row.result:
+            painter.restore()
+            return
+
+        # 图标，按屏幕的设备像素比取对应清晰度的版本
+        is_folder = file_row.is_folder
+        device_pixel_ratio = widget.devicePixelRatioF() if widget else 1.0
+        self.icon_provider.set_device_pixel_ratio(device_pixel_ratio)
+        pixmap = None
+        if column == COLUMN_ORIGINAL and self.thumbnail_service is not None and not is_folder:
+            # 缩略图异步生成，尚未生成时先显示普通图标
+            self.thumbnail_service.set_device_pixel_ratio(device_pixel_ratio)
+            pixmap = self.thumbnail_service.thumbnail(file_row.path)
+        if pixmap is None:
+            pixmap = self.icon_provider.icon_for(option.text, is_folder)
+        if not pixmap.isNull():
+            # 在图标区域内居中
+            icon_width = self._icon_width(column)
+            size = pixmap.deviceIndependentSize()
+            icon_left = rect.left() + 10 + (icon_width - round(size.width())) // 2
+            icon_top = rect.top() + (rect.height() - round(size.height())) // 2
+            painter.drawPixmap(icon_left, icon_top, pixmap)
+
+        # 文件名
+        font = QFont(self._font)
+        if column == COLUMN_RESULT:
+            color = self.RESULT_COLOR
+        elif column == COLUMN_EXAMPLE:
+            color = self.EXAMPLE_COLOR
+        elif is_folder:
+            color = self.FOLDER_COLOR
+            font.setBold(True)
+        else:
+            color = self.TEXT_COLOR
+        # 过期只影响命名示范和分析结果
+        if column != COLUMN_ORIGINAL and file_row.stale:
+            font.setStrikeOut(True)
+
+        text_rect = self._text_rect(rect, column)
+        painter.setFont(font)
+        painter.setPen(QPen(color))
+        text = painter.fontMetrics().elidedText(option.text, Qt.ElideMiddle, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, text)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        # 点击Edit按钮区域时请求编辑
+        if (index.column() == COLUMN_EXAMPLE
+                and event.type() == QEvent.MouseButtonRelease
+                and event.button() == Qt.LeftButton
+                and not index.data(FileTableModel.EditedRole)
+                and self._button_rect(option.rect).contains(event.position().toPoint())):
+            self.edit_requested.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setObjectName("fileNameEdit")
+        editor.setFrame(False)
+        editor.setFont(self._font)
+        editor.setStyleSheet("background-color: #1E1E1E; padding: 2px; border: none; color: #CBA057;")
+        # 每次输入都提交，离开编辑状态前的修改也会保存
+        editor.textEdited.connect(lambda text, editor=editor: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        if not editor.isModified():
+            editor.setText(index.data(Qt.EditRole) or "")
+            editor.selectAll()
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.text(), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        text_rect = self._text_rect(option.rect)
+        editor.setGeometry(QRect(text_rect.left(), option.rect.top() + 10,
+                                 text_rect.width(), option.rect.height() - 20))
@@ -2,54 +2,77 @@
 # -*- coding: utf-8 -*-
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem,
-    QPushButton, QHBoxLayout, QAbstractItemView, QMenu, QMessageBox,
-    QTextEdit, QFileDialog, QApplication, QSizePolicy
+    QWidget, QVBoxLayout, QLabel, QTableView, QAbstractItemView, QHeaderView, QMenu,
+    QFileDialog, QApplication
 )
-from PySide6.QtCore import Qt, Signal, QMimeData, QUrl, QSize, QEvent, QPoint
-from PySide6.QtGui import QDrag, QMouseEvent, QContextMenuEvent, QPixmap, QFont, QKeyEvent, QCursor
+from PySide6.QtCore import Qt, Signal, QEvent, QItemSelectionModel, QTimer
+from PySide6.QtGui import QKeyEvent, QCursor
 import os
 import subprocess
 import platform
 
+from views.file_list_model import (
+    FileTableModel, FileItemDelegate, COLUMN_ORIGINAL, COLUMN_EXAMPLE, COLUMN_RESULT, ROW_HEIGHT
+)
+from views.thumbnail_service import ThumbnailService
+
 class FileListWidget(QWidget):
     """
     文件列表控件类，用于显示文件列表和相关操作
+    
+    一个三列表格显示原始文件名、命名示范和分析结果，三列共用同一行，
+    滚动和选择不需要额外同步。数据由FileTableModel提供，FileItemDelegate
+    直接绘制图标和文件名，只有可见单元格会被绘制，编辑器只为正在编辑的一格创建。
     """
     
     # 定义信号
     files_dropped = Signal(list)  # 文件拖放信号，参数为文件路径列表
+    folder_import_requested = Signal(list)  # 递归导入文件夹内容信号，参数为文件夹路径列表
+    paths_dropped = Signal(list)  # 拖放路径信号，参数为本地路径列表，由后台导入处理
     edit_button_clicked = Signal(str)  # 编辑按钮点击信号，参数为文件名
+    example_edited = Signal(str, str)  # 命名示范被编辑信号，参数为原始文件名和新文件名
+    files_deleted = Signal(list)  # 用户删除了选中的行，参数为文件ID列表（按行号从大到小）
     
-    def __init__(self, title="文件列表", accept_drops=False, with_edit_button=False, parent=None):
+    def __init__(self, title="文件列表", accept_drops=False, parent=None):
         """
         初始化文件列表控件
         
         Args:
             title (str): 列表标题
             accept_drops (bool): 是否接受拖放
-            with_edit_button (bool): 是否显示编辑按钮
             parent: 父窗口
         """
         super().__init__(parent)
         
         self.title = title
         self.accept_drops = accept_drops
-        self.with_edit_button = with_edit_button
-        self.is_result_list = False  # 标记是否为结果列表
-        
-        # 存储文件列表的字典 {file_name: file_data}
-        self.files = {}
         
-        # 存储同步的文件列表控件
-        self.synced_lists = []
+        # 缩略图服务，默认关闭；滚动停止后取消视口外的请求
+        self.thumbnail_service = None
+        self._thumbnail_timer = QTimer(self)
+        self._thumbnail_timer.setSingleShot(True)
+        self._thumbnail_timer.setInterval(100)
+        self._thumbnail_timer.timeout.connect(self._retain_visible_thumbnails)
+        
+        # 文件数据模型和绘制委托
+        self.model = FileTableModel(self)
+        self.delegate = FileItemDelegate(self)
+        self.model.name_edited.connect(self._on_text_edited)
+        self.delegate.edit_requested.connect(self._on_edit_requested)
+        # 按扩展名区分的图标加载完成后重绘可见区域
+        self.delegate.icon_provider.icon_ready.connect(lambda extension: self.file_list.viewport().update())
         
         # 创建UI
         self._create_ui()
         
+        # 视口的鼠标事件用于跟踪悬停行
+        self.file_list.viewport().installEventFilter(self)
+        self.file_list.verticalScrollBar().valueChanged.connect(self._update_hover_from_cursor)
+        self.model.rowsRemoved.connect(self._update_hover_from_cursor)
+        self.model.modelReset.connect(self._update_hover_from_cursor)
+        
         # 添加事件过滤器
         if self.accept_drops:
-            self.file_list.viewport().installEventFilter(self)
             self.file_list.installEventFilter(self)
             
             # 允许双击空白区域选择文件
@@ -57,6 +80,8 @@ class FileListWidget(QWidget):
             
             # 显示提示标签
             self._update_placeholder_visibility()
+        else:
+            self.file_list.doubleClicked.connect(self._on_item_double_clicked)
     
     def _create_ui(self):
         """
@@ -67,18 +92,37 @@ class FileListWidget(QWidget):
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(0)
         
-        # 创建文件列表控件
-        self.file_list = QListWidget()
+        # 创建文件表格视图，行高固定，滚动时只绘制可见行
+        self.file_list = QTableView()
+        self.file_list.setModel(self.model)
+        self.file_list.setItemDelegate(self.delegate)
+        self.file_list.setShowGrid(False)
+        self.file_list.setWordWrap(False)
+        
+        # 表头由主窗口绘制，这里隐藏；固定行高时不需要逐行计算高度
+        vertical_header = self.file_list.verticalHeader()
+        vertical_header.hide()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(ROW_HEIGHT)
+        horizontal_header = self.file_list.horizontalHeader()
+        horizontal_header.hide()
+        horizontal_header.setStretchLastSection(True)
+        horizontal_header.sectionResized.connect(lambda *args: self._update_placeholder_visibility())
+        
+        self.file_list.setMouseTracking(True)  # 悬停时显示Edit按钮
+        self.file_list.viewport().setAttribute(Qt.WA_Hover)
+        self.file_list.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
         self.file_list.setDragEnabled(True)
         self.file_list.setAcceptDrops(self.accept_drops)
         self.file_list.setDropIndicatorShown(self.accept_drops)
         self.file_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.file_list.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.file_list.setAlternatingRowColors(True)
         self.file_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         
         # 设置滚动条样式
         self.file_list.setStyleSheet("""
-            QListWidget { 
+            QTableView { 
                 padding: 0px; 
                 background-color: #1E1E1E;
             }
@@ -146,8 +190,6 @@ class FileListWidget(QWidget):
             }
         """)
         
-        self.file_list.setSpacing(2)  # 设置项目间距
-        
         # 设置文件列表的键盘事件处理
         self.file_list.installEventFilter(self)
         
@@ -217,10 +259,26 @@ class FileListWidget(QWidget):
         super().resizeEvent(event)
         # 如果接受拖放且占位标签可见，调整占位标签大小
         if self.accept_drops and self.placeholder_label.isVisible():
-            # 保留边距
-            self.placeholder_label.setGeometry(20, 20, 
-                                              self.width() - 40, 
-                                              self.height() - 40)
+            self._update_placeholder_geometry()
+    
+    def _update_placeholder_geometry(self):
+        """
+        让占位标签覆盖原始文件列，保留边距
+        """
+        column_width = self.file_list.columnWidth(COLUMN_ORIGINAL) or self.width()
+        self.placeholder_label.setGeometry(20, 20, 
+                                          column_width - 40, 
+                                          self.height() - 40)
+    
+    def set_column_widths(self, widths):
+        """
+        设置各列宽度，使三列与主窗口中的表头对齐
+        
+        Args:
+            widths (list): 各列宽度，最后一列自动填满剩余宽度
+        """
+        for column, width in enumerate(widths[:-1]):
+            self.file_list.setColumnWidth(column, width)
     
     def _update_placeholder_visibility(self):
         """
@@ -228,12 +286,9 @@ class FileListWidget(QWidget):
         """
         if self.accept_drops:
             # 如果文件列表为空，显示占位标签
-            if not self.files:
+            if not self.model.rowCount():
                 self.placeholder_label.show()
-                # 确保标签覆盖整个可视区域，但保留边距
-                self.placeholder_label.setGeometry(20, 20, 
-                                                  self.width() - 40, 
-                                                  self.height() - 40)
+                self._update_placeholder_geometry()
             else:
                 self.placeholder_label.hide()
     
@@ -245,14 +300,28 @@ class FileListWidget(QWidget):
             event: 鼠标事件
         """
         # 检查是否在空白区域
-        item = self.file_list.itemAt(event.position().toPoint())
+        index = self.file_list.indexAt(event.position().toPoint())
         
         # 如果双击的是空白区域且是接受拖放的列表
-        if not item and self.accept_drops:
+        if not index.isValid() and self.accept_drops:
             self._browse_files()
         else:
             # 调用默认的双击处理
-            QListWidget.mouseDoubleClickEvent(self.file_list, event)
+            QTableView.mouseDoubleClickEvent(self.file_list, event)
+            self._on_item_double_clicked(index)
+    
+    def _on_item_double_clicked(self, index):
+        """
+        双击原始文件名或分析结果时打开文件，命名示范列双击进入编辑
+        
+        Args:
+            index (QModelIndex): 单元格索引
+        """
+        if not index.isValid() or index.column() == COLUMN_EXAMPLE:
+            return
+        file_row = self.model.file_at(index.row())
+        if file_row:
+            self._open_file(file_row.path)
     
     def _browse_files(self):
         """
@@ -285,9 +354,8 @@ class FileListWidget(QWidget):
                 except Exception as e:
                     print(f"处理文件时出错: {str(e)}")
             
-            # 添加到列表
+            # 由控制器添加到文件模型，分配ID后再显示在列表中
             if files:
-                self.add_files(files)
                 self.files_dropped.emit(files)
                 # 更新占位标签的可见性
                 self._update_placeholder_visibility()
@@ -317,258 +385,153 @@ class FileListWidget(QWidget):
                     'is_folder': True
                 }
                 
-                # 添加到列表
-                self.add_files([folder_data])
+                # 由控制器添加到文件模型，分配ID后再显示在列表中
                 self.files_dropped.emit([folder_data])
             except Exception as e:
                 print(f"处理文件夹时出错: {str(e)}")
     
+    def _browse_import_folder(self):
+        """
+        选择文件夹并请求递归导入其中的文件
+        """
+        folder_path = QFileDialog.getExistingDirectory(
+            self,
+            "选择要导入内容的文件夹",
+            "",
+            options=QFileDialog.ReadOnly | QFileDialog.ShowDirsOnly
+        )
+        
+        if folder_path:
+            # 扫描在控制器的后台线程中进行，这里只发出请求
+            self.folder_import_requested.emit([folder_path])
+    
     def add_files(self, files):
         """
         添加文件到列表
         
         Args:
-            files (list): 文件列表，每个元素是一个字典，包含name和path属性
+            files (list): 文件列表，每个元素是一个字典，包含文件模型分配的id以及name和path属性
         """
-        for file_data in files:
-            try:
-                file_name = file_data.get('name', '')
-                
-                # 如果文件已存在，跳过
-                if file_name in self.files:
-                    continue
-                
-                # 存储文件数据
-                self.files[file_name] = file_data
-                
-                # 创建列表项
-                item = QListWidgetItem()
-                item.setData(Qt.UserRole, file_data)
-                
-                # 创建列表项小部件
-                self._create_item_widget(item, file_data)
-            except Exception as e:
-                print(f"添加文件 '{file_data.get('name', '未知')}' 时出错: {str(e)}")
-                continue
+        # 整批只插入一次，视图只为可见行绘制
+        self.model.add_files([file_data for file_data in files if isinstance(file_data, dict)])
         
         # 更新占位标签的可见性
         if self.accept_drops:
             self._update_placeholder_visibility()
     
-    def _create_item_widget(self, item, file_data):
+    def update_example(self, file_name, new_data):
         """
-        创建列表项小部件
+        更新命名示范
         
         Args:
-            item: 列表项
-            file_data: 文件数据
-        """
-        file_name = file_data.get('name', '')
-        is_folder = file_data.get('is_folder', False)
-        
-        # 创建小部件
-        item_widget = QWidget()
-        # 设置鼠标悬停时显示手型光标 - 应用到整个项目
-        item_widget.setCursor(Qt.PointingHandCursor)
-        layout = QHBoxLayout(item_widget)
-        
-        # 确保各列表项高度一致 - 使用固定高度
-        layout.setContentsMargins(10, 8, 10, 8)  # 统一的内边距
-        layout.setSpacing(10)  # 统一的元素间距
-        layout.setAlignment(Qt.AlignVCenter)  # 垂直居中对齐
-        
-        # 创建文件图标标签
-        file_icon_label = QLabel()
-        # 根据是否是文件夹设置不同的ObjectName
-        file_icon_label.setObjectName("folderIcon" if is_folder else "fileIcon")
-        
-        # 根据文件类型选择不同的图标
-        icon_path = "assets/icons/normal/folder.png" if is_folder else "assets/icons/normal/file.png"
-        
-        # 修改图标设置方式，防止图标拉伸
-        pixmap = QPixmap(icon_path)
-        pixmap = pixmap.scaled(20, 20, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        file_icon_label.setPixmap(pixmap)
-        # 设置固定大小
-        file_icon_label.setFixedSize(20, 20)
-        layout.addWidget(file_icon_label)
-        layout.setAlignment(file_icon_label, Qt.AlignVCenter)  # 图标垂直居中
-        
-        # 如果需要编辑按钮，创建自定义小部件
-        if self.with_edit_button:
-            # 使用QTextEdit代替QLabel
-            text_edit = QTextEdit(file_name)
-            text_edit.setReadOnly(True)
-            text_edit.setFrameStyle(0)  # 无边框
-            text_edit.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-            text_edit.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-            text_edit.setFixedHeight(28)  # 设置固定高度
-            text_edit.setTextInteractionFlags(Qt.NoTextInteraction)  # 禁止文本交互，解决点击问题
-            # 设置鼠标悬停时显示手型光标
-            text_edit.setCursor(Qt.PointingHandCursor)
-            
-            # 根据是否是文件夹设置不同的ObjectName和样式
-            if is_folder:
-                text_edit.setObjectName("folderNameEdit")
-            else:
-                text_edit.setObjectName("fileNameEdit")
-            
-            # 设置字体和样式
-            font = QFont("Courier New", 10)  # 使用等宽字体，这种字体对特殊字符显示更好
-            font.setStyleStrategy(QFont.PreferAntialias)  # 添加抗锯齿
-            text_edit.setFont(font)
-            # 为命名示范列设置#CBA057文字颜色
-            text_edit.setStyleSheet("background-color: transparent; margin-left: 5px; padding: 2px; font-family: 'Courier New', monospace; border: none; color: #CBA057;")
-            
-            # 创建编辑按钮
-            edit_button = QPushButton("Edit")
-            edit_button.setObjectName("editButton")
-            edit_button.setFixedWidth(120)
-            # 设置编辑按钮样式：背景色#CBA057，字体颜色为白色
-            edit_button.setStyleSheet("background-color: #CBA057; color: white; border-radius: 3px;")
-            # 设置鼠标悬停时显示手型光标
-            edit_button.setCursor(Qt.PointingHandCursor)
-            
-            # 连接按钮信号
-            edit_button.clicked.connect(lambda checked, name=file_name: self.edit_button_clicked.emit(name))
-            
-            # 添加到布局
-            layout.addWidget(text_edit, 1)  # 让文本编辑器占据剩余空间
-            layout.addWidget(edit_button)
-            layout.setAlignment(text_edit, Qt.AlignVCenter)  # 文本编辑器垂直居中
-            
-            # 安装事件过滤器，将点击事件传递给列表项
-            text_edit.installEventFilter(self)
-            
-        else:
-            # 使用QTextEdit代替QLabel
-            text_edit = QTextEdit(file_name)
-            text_edit.setReadOnly(True)
-            text_edit.setFrameStyle(0)  # 无边框
-            text_edit.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-            text_edit.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-            text_edit.setFixedHeight(28)  # 设置固定高度
-            text_edit.setTextInteractionFlags(Qt.NoTextInteraction)  # 禁止文本交互，解决点击问题
-            # 设置鼠标悬停时显示手型光标
-            text_edit.setCursor(Qt.PointingHandCursor)
-            
-            # 设置字体和样式
-            font = QFont("Courier New", 10)  # 使用等宽字体，这种字体对特殊字符显示更好
-            font.setStyleStrategy(QFont.PreferAntialias)  # 添加抗锯齿
-            text_edit.setFont(font)
-            text_edit.setStyleSheet("background-color: transparent; margin-left: 5px; padding: 2px; font-family: 'Courier New', monospace; border: none;")
-            
-            # 如果是结果列表，设置特殊样式
-            if self.is_result_list:
-                text_edit.setObjectName("resultFileNameEdit")
-                text_edit.setStyleSheet("background-color: transparent; margin-left: 5px; padding: 2px; font-family: 'Courier New', monospace; border: none; color: #4CAF50;")
-            else:
-                # 根据是否是文件夹设置不同的ObjectName
-                if is_folder:
-                    text_edit.setObjectName("folderNameEdit")
-                    text_edit.setStyleSheet("background-color: transparent; margin-left: 5px; padding: 2px; font-family: 'Courier New', monospace; border: none; color: #f0c040;")
-                else:
-                    text_edit.setObjectName("fileNameEdit")
-            
-            # 添加到布局
-            layout.addWidget(text_edit, 1)  # 让文本编辑器占据剩余空间
-            layout.setAlignment(text_edit, Qt.AlignVCenter)  # 文本编辑器垂直居中
-            
-            # 安装事件过滤器，将点击事件传递给列表项
-            text_edit.installEventFilter(self)
+            file_name (str): 原始文件名
+            new_data (dict): 包含new_name的新数据，为None时恢复为未编辑状态
+        """
+        new_name = new_data.get('new_name') if isinstance(new_data, dict) else new_data
+        self.model.set_example(file_name, new_name or None)
+    
+    def update_results(self, rename_map):
+        """
+        显示一次分析结果，替换整列分析结果
         
-        # 设置列表项和小部件
-        self.file_list.addItem(item)
-        self.file_list.setItemWidget(item, item_widget)
+        Args:
+            rename_map (dict): 原始文件名到新文件名（或包含new_name的字典）的映射
+        """
+        self.model.set_results(rename_map)
+    
+    def clear_examples(self):
+        """
+        清空命名示范列
+        """
+        self.model.clear_column(COLUMN_EXAMPLE)
+    
+    def clear_results(self):
+        """
+        清空分析结果列
+        """
+        self.model.clear_column(COLUMN_RESULT)
+    
+    def remove_files(self, file_ids):
+        """
+        移除指定的文件
+        
+        Args:
+            file_ids (list): 文件ID列表
+        """
+        self.model.remove_ids(file_ids)
         
-        # 调整项高度 - 确保所有列表项高度一致
-        # 使用固定高度，而不是根据内容自适应
-        fixed_height = 48  # 固定高度值
-        item.setSizeHint(QSize(item_widget.width(), fixed_height))
+        # 更新占位标签的可见性
+        if self.accept_drops:
+            self._update_placeholder_visibility()
     
-    def set_as_result_list(self, is_result=True):
+    def rename_file(self, new_data):
         """
-        设置为结果列表
+        文件在外部被重命名后，原位更新行
         
         Args:
-            is_result (bool): 是否为结果列表
+            new_data (dict): 新的文件数据，按其中的id定位行
         """
-        self.is_result_list = is_result
+        self.model.update_file(new_data.get('id'), new_data)
     
-    def update_file(self, file_name, new_data):
+    def mark_stale(self, file_ids):
         """
-        更新文件数据
+        把文件标记为已过期（文件已在外部更改，分析结果可能不再适用）
         
         Args:
-            file_name (str): 文件名
-            new_data (dict): 新的文件数据
+            file_ids (list): 文件ID列表
         """
-        # 防止无限递归
-        static_updating = getattr(self, '_updating_file', False)
-        if static_updating:
-            return
-            
-        self._updating_file = True
+        self.model.update_files({file_id: {'stale': True} for file_id in file_ids})
         
-        try:
-            # 如果文件不存在，添加它
-            if file_name not in self.files:
-                # 检查是否只需要添加Edit按钮
-                if self.with_edit_button:
-                    self.add_edit_button_only([new_data])
-                else:
-                    self.add_files([new_data])
-                return
-            
-            # 更新存储的数据
-            self.files[file_name].update(new_data)
-            
-            # 查找对应的列表项
-            for i in range(self.file_list.count()):
-                item = self.file_list.item(i)
-                item_data = item.data(Qt.UserRole)
-                
-                if item_data and item_data.get('name') == file_name:
-                    # 更新item关联的数据
-                    item.setData(Qt.UserRole, self.files[file_name])
-                    
-                    # 获取小部件
-                    item_widget = self.file_list.itemWidget(item)
-                    
-                    if item_widget:
-                        # 如果是编辑按钮模式且存在name，更新文本
-                        if self.with_edit_button and 'name' in new_data:
-                            # 查找文本编辑器
-                            text_edit = None
-                            for j in range(item_widget.layout().count()):
-                                widget = item_widget.layout().itemAt(j).widget()
-                                if isinstance(widget, QTextEdit):
-                                    text_edit = widget
-                                    break
-                            
-                            # 如果找到文本编辑器，更新文本
-                            if text_edit and text_edit.toPlainText() != new_data.get('name'):
-                                # 暂时断开信号避免循环
-                                text_edit.blockSignals(True)
-                                text_edit.setText(new_data.get('name'))
-                                text_edit.blockSignals(False)
-                    break
-        finally:
-            self._updating_file = False
+        # 文件内容已变化，缩略图需要重新生成
+        if self.thumbnail_service is not None:
+            file_rows = (self.model.row_for(file_id) for file_id in file_ids)
+            self.thumbnail_service.invalidate(file_row.path for file_row in file_rows if file_row)
     
-    def update_files(self, file_data_map):
+    def set_thumbnails_enabled(self, enabled, cache_dir=None):
         """
-        批量更新文件数据
+        开启或关闭原始文件名前的缩略图
         
         Args:
-            file_data_map (dict): 文件数据映射，键为文件名，值为新数据
+            enabled (bool): 是否显示缩略图
+            cache_dir (str, optional): 缩略图磁盘缓存目录，为None时使用默认目录
         """
-        for file_name, new_data in file_data_map.items():
-            # 如果只是字符串，转换为字典
-            if isinstance(new_data, str):
-                new_data = {'new_name': new_data}
-            
-            self.update_file(file_name, new_data)
+        if enabled == (self.thumbnail_service is not None):
+            return
+        
+        if enabled:
+            self.thumbnail_service = ThumbnailService(cache_dir=cache_dir, parent=self)
+            self.thumbnail_service.thumbnail_ready.connect(lambda path: self.file_list.viewport().update())
+            self.file_list.verticalScrollBar().valueChanged.connect(self._schedule_thumbnail_retain)
+        else:
+            self.file_list.verticalScrollBar().valueChanged.disconnect(self._schedule_thumbnail_retain)
+            self._thumbnail_timer.stop()
+            self.thumbnail_service.shutdown()
+            self.thumbnail_service.deleteLater()
+            self.thumbnail_service = None
+        
+        self.delegate.thumbnail_service = self.thumbnail_service
+        self.file_list.viewport().update()
+    
+    def _schedule_thumbnail_retain(self, *args):
+        self._thumbnail_timer.start()
+    
+    def _retain_visible_thumbnails(self):
+        """
+        滚动停止后取消已经滚出视口的行的缩略图请求
+        """
+        if self.thumbnail_service is None:
+            return
+        
+        viewport = self.file_list.viewport()
+        first = self.file_list.rowAt(0)
+        last = self.file_list.rowAt(viewport.height() - 1)
+        if first < 0:
+            self.thumbnail_service.cancel_all()
+            return
+        if last < 0:
+            last = self.model.rowCount() - 1
+        
+        self.thumbnail_service.retain(self.model.path_at(row) for row in range(first, last + 1))
     
     def get_files(self):
         """
@@ -577,41 +540,34 @@ class FileListWidget(QWidget):
         Returns:
             list: 文件数据列表
         """
-        return list(self.files.values())
+        return self.model.get_files()
     
-    def get_file(self, file_name):
+    def get_file(self, file_id):
         """
         获取指定文件的数据
         
         Args:
-            file_name (str): 文件名
+            file_id (int): 文件ID
             
         Returns:
             dict: 文件数据，如果不存在返回None
         """
-        return self.files.get(file_name)
+        return self.model.get_file(file_id)
+    
+    def get_file_count(self):
+        """
+        获取文件数量
+        
+        Returns:
+            int: 文件数量
+        """
+        return self.model.rowCount()
     
     def clear(self):
         """
         清空文件列表
         """
-        # 先清空其他同步列表
-        for widget in self.synced_lists:
-            # 避免循环调用
-            widget.synced_lists = [w for w in widget.synced_lists if w != self]
-            # 清空文件列表
-            widget.files.clear()
-            widget.file_list.clear()
-            # 更新占位标签的可见性
-            if widget.accept_drops:
-                widget._update_placeholder_visibility()
-            # 恢复同步列表引用
-            if self not in widget.synced_lists:
-                widget.synced_lists.append(self)
-        
-        # 清空自己的文件列表
-        self.files.clear()
-        self.file_list.clear()
+        self.model.clear()
         
         # 更新占位标签的可见性
         if self.accept_drops:
@@ -627,56 +583,15 @@ class FileListWidget(QWidget):
     def dropEvent(self, event):
         """
         拖放事件处理
+        
+        只收集本地路径，判断类型和创建列表项由后台导入分块完成，
+        拖放大量文件时界面不会卡住
         """
         if self.accept_drops and event.mimeData().hasUrls():
-            # 获取文件URL
-            files = []
-            is_folder_found = False
-            is_file_found = False
+            paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
             
-            for url in event.mimeData().urls():
-                try:
-                    # 转换为本地路径并处理
-                    file_path = url.toLocalFile()
-                    # 判断是文件还是文件夹
-                    is_folder = os.path.isdir(file_path)
-                    if is_folder:
-                        is_folder_found = True
-                    else:
-                        is_file_found = True
-                    
-                    file_name = os.path.basename(file_path)
-                    
-                    # 添加文件或文件夹到列表
-                    files.append({
-                        'name': file_name,
-                        'path': file_path,
-                        'is_folder': is_folder
-                    })
-                except Exception as e:
-                    print(f"处理文件时出错: {str(e)}")
-                    continue
-            
-            # 如果同时存在文件和文件夹，显示警告
-            if is_folder_found and is_file_found:
-                QMessageBox.warning(
-                    self, 
-                    "类型不一致",
-                    "请不要在一次重命名中导入一种以上类型的文件",
-                    QMessageBox.Ok
-                )
-                event.ignore()
-                return
-            
-            # 如果有文件，添加到列表并发出信号
-            if files:
-                try:
-                    self.add_files(files)
-                    self.files_dropped.emit(files)
-                    # 更新占位标签的可见性
-                    self._update_placeholder_visibility()
-                except Exception as e:
-                    print(f"添加文件到列表时出错: {str(e)}")
+            if paths:
+                self.paths_dropped.emit(paths)
             
             event.acceptProposedAction()
     
@@ -688,38 +603,13 @@ class FileListWidget(QWidget):
             obj: 产生事件的对象
             event: 事件
         """
-        # 处理鼠标进入和离开事件，用于显示和隐藏Edit按钮
-        if event.type() == QEvent.Enter and self.with_edit_button:
-            # 检查是否是列表项小部件
-            for i in range(self.file_list.count()):
-                item = self.file_list.item(i)
-                widget = self.file_list.itemWidget(item)
-                
-                if obj == widget:
-                    # 查找Edit按钮并显示
-                    for button in widget.findChildren(QPushButton, "editButton"):
-                        button.setVisible(True)
-                    return False  # 继续处理事件
-        
-        elif event.type() == QEvent.Leave and self.with_edit_button:
-            # 检查是否是列表项小部件
-            for i in range(self.file_list.count()):
-                item = self.file_list.item(i)
-                widget = self.file_list.itemWidget(item)
-                
-                if obj == widget:
-                    # 查找Edit按钮并隐藏
-                    for button in widget.findChildren(QPushButton, "editButton"):
-                        button.setVisible(False)
-                    return False  # 继续处理事件
-        
-        # 处理文本编辑框的焦点丢失事件
-        if isinstance(obj, QTextEdit) and event.type() == QEvent.FocusOut and obj.property("original_file_name"):
-            original_file_name = obj.property("original_file_name")
-            if original_file_name and original_file_name in self.files:
-                new_text = obj.toPlainText()
-                # 确保更新模型
-                self._on_text_edited(original_file_name, new_text)
+        # 跟踪鼠标所在的行，不拦截事件
+        if obj is self.file_list.viewport():
+            event_type = event.type()
+            if event_type in (QEvent.MouseMove, QEvent.HoverMove):
+                self._set_hover_row(self.file_list.rowAt(round(event.position().y())))
+            elif event_type in (QEvent.Leave, QEvent.HoverLeave):
+                self._set_hover_row(-1)
         
         # 处理Del键删除选中项
         if obj == self.file_list and event.type() == QEvent.KeyPress:
@@ -739,47 +629,42 @@ class FileListWidget(QWidget):
                 self._browse_files()
                 return True  # 事件已处理
         
-        # 过滤QTextEdit上的鼠标点击事件
-        if isinstance(obj, QTextEdit) and event.type() in [QEvent.MouseButtonPress, QEvent.MouseButtonDblClick]:
-            # 找到对应的列表项
-            for i in range(self.file_list.count()):
-                item = self.file_list.item(i)
-                widget = self.file_list.itemWidget(item)
-                
-                # 如果这个QTextEdit在当前小部件中
-                if obj in widget.findChildren(QTextEdit):
-                    # 单击选中项目
-                    if event.type() == QEvent.MouseButtonPress:
-                        # 如果不是右键点击
-                        if event.button() != Qt.RightButton:
-                            # 如果按下Ctrl键，切换选择状态
-                            if event.modifiers() & Qt.ControlModifier:
-                                item.setSelected(not item.isSelected())
-                            # 否则，选择当前项并取消其他项的选择
-                            else:
-                                self.file_list.clearSelection()
-                                item.setSelected(True)
-                    
-                    # 实现双击打开文件功能
-                    if event.type() == QEvent.MouseButtonDblClick:
-                        item_data = item.data(Qt.UserRole)
-                        if item_data:
-                            self._open_file(item_data)
-                    
-                    return False  # 不阻止事件继续传递，以便编辑功能正常工作
-        
         # 其他事件由默认处理器处理
         return super().eventFilter(obj, event)
     
-    def _open_file(self, file_data):
+    def _set_hover_row(self, row):
+        """
+        更新悬停行，只重绘原来和现在所在行的命名示范单元格
+        
+        Args:
+            row (int): 行号，-1表示不在任何行上
+        """
+        previous = self.delegate.hover_row
+        if row == previous:
+            return
+        self.delegate.hover_row = row
+        viewport = self.file_list.viewport()
+        for changed_row in (previous, row):
+            if 0 <= changed_row < self.model.rowCount():
+                viewport.update(self.file_list.visualRect(self.model.index(changed_row, COLUMN_EXAMPLE)))
+    
+    def _update_hover_from_cursor(self, *args):
+        """
+        滚动或行被移除后，鼠标下的行可能已经变了，按当前光标位置重新计算
+        """
+        viewport = self.file_list.viewport()
+        pos = viewport.mapFromGlobal(QCursor.pos())
+        row = self.file_list.rowAt(pos.y()) if viewport.rect().contains(pos) else -1
+        self._set_hover_row(row)
+    
+    def _open_file(self, file_path):
         """
         打开文件
         
         Args:
-            file_data (dict): 文件数据
+            file_path (str): 文件路径
         """
         try:
-            file_path = file_data.get('path', '')
             if not os.path.exists(file_path):
                 print(f"文件不存在: {file_path}")
                 return
@@ -830,16 +715,10 @@ class FileListWidget(QWidget):
         
         显示右键菜单但不更改选择状态
         """
-        # 保存当前的选择状态
-        current_selection = []
-        for i in range(self.file_list.count()):
-            item = self.file_list.item(i)
-            if item.isSelected():
-                current_selection.append(i)
-        
         # 获取鼠标位置下的项
-        pos = self.file_list.mapFromGlobal(event.globalPos())
-        clicked_item = self.file_list.itemAt(pos)
+        pos = self.file_list.viewport().mapFromGlobal(event.globalPos())
+        clicked_index = self.file_list.indexAt(pos)
+        selection_model = self.file_list.selectionModel()
         
         # 创建上下文菜单
         menu = QMenu(self)
@@ -847,10 +726,11 @@ class FileListWidget(QWidget):
         # 如果是第一列且接受拖放
         if self.accept_drops:
             # 如果右键点击的是空白区域或没有项目
-            if not clicked_item or not self.files:
+            if not clicked_index.isValid() or not self.model.rowCount():
                 # 添加选择文件和文件夹的菜单项
                 select_files_action = menu.addAction("选择文件")
                 select_folder_action = menu.addAction("选择文件夹")
+                import_folder_action = menu.addAction("导入文件夹内容")
                 
                 # 显示菜单
                 action = menu.exec(event.globalPos())
@@ -860,25 +740,21 @@ class FileListWidget(QWidget):
                     self._browse_files()
                 elif action == select_folder_action:
                     self._browse_folders()
+                elif action == import_folder_action:
+                    self._browse_import_folder()
                 
                 return
         
         # 如果点击位置没有项，不显示菜单
-        if not clicked_item:
+        if not clicked_index.isValid():
             return
-            
-        # 只有当当前有选择时才显示菜单
-        if not current_selection:
-            # 如果没有选中项，选中当前点击的项
-            clicked_item.setSelected(True)
-        elif clicked_item not in [self.file_list.item(i) for i in current_selection]:
-            # 如果点击的项不在当前选择中，保持当前选择不变
-            # 不进行任何选择操作
-            pass
-        
-        # 获取点击项的数据
-        clicked_item_data = clicked_item.data(Qt.UserRole)
-        file_path = clicked_item_data.get('path', '') if clicked_item_data else ''
+        
+        # 如果没有选中项，选中当前点击的项；点击的项不在当前选择中时保持选择不变
+        if not selection_model.hasSelection():
+            selection_model.select(clicked_index, QItemSelectionModel.Select)
+        
+        # 获取点击的行
+        file_path = self.model.file_at(clicked_index.row()).path
         
         # 添加打开文件动作
         open_action = menu.addAction("打开文件")
@@ -899,8 +775,8 @@ class FileListWidget(QWidget):
             self._delete_selected_items()
         elif action == open_action:
             # 打开选中的文件
-            if clicked_item_data:
-                self._open_file(clicked_item_data)
+            if file_path:
+                self._open_file(file_path)
         elif action == open_dir_action:
             # 打开文件所在目录
             if file_path:
@@ -910,56 +786,25 @@ class FileListWidget(QWidget):
         """
         删除所有选中的列表项（无确认提示）
         """
-        # 获取选中的项
-        selected_items = self.file_list.selectedItems()
+        # 按选择范围取行号，不逐个查询选中项
+        rows = []
+        for selection_range in self.file_list.selectionModel().selection():
+            rows.extend(range(selection_range.top(), selection_range.bottom() + 1))
         
         # 如果没有选中的项，返回
-        if not selected_items:
+        if not rows:
             return
         
-        # 收集要删除的索引
-        indices_to_delete = [self.file_list.row(item) for item in selected_items]
-        
-        # 先在其他列表中删除相同索引的项
-        for widget in self.synced_lists:
-            # 确保其他列表具有足够的项目
-            if widget.file_list.count() >= max(indices_to_delete) + 1:
-                # 从最大索引开始删除，避免索引变化
-                for index in sorted(indices_to_delete, reverse=True):
-                    # 从列表中删除项目
-                    item = widget.file_list.item(index)
-                    if item:
-                        # 获取文件名
-                        file_data = item.data(Qt.UserRole)
-                        if file_data:
-                            file_name = file_data.get('name', '')
-                            # 从存储中删除
-                            if file_name in widget.files:
-                                del widget.files[file_name]
-                        # 从列表中删除
-                        widget.file_list.takeItem(index)
-                
-                # 更新占位标签的可见性
-                if widget.accept_drops:
-                    widget._update_placeholder_visibility()
-        
-        # 删除当前列表中选中的项
-        for item in selected_items:
-            # 获取文件名
-            file_data = item.data(Qt.UserRole)
-            file_name = file_data.get('name', '')
-            
-            # 从存储中删除
-            if file_name in self.files:
-                del self.files[file_name]
-            
-            # 从列表中删除
-            row = self.file_list.row(item)
-            self.file_list.takeItem(row)
+        # 三列共用同一行，连续的行合并为一个范围移除，行号索引只重建一次
+        removed_ids = self.model.remove_rows(rows)
         
         # 更新占位标签的可见性
         if self.accept_drops:
             self._update_placeholder_visibility()
+        
+        # 通知控制器从文件模型和示例中移除
+        if removed_ids:
+            self.files_deleted.emit(removed_ids)
     
     def keyPressEvent(self, event):
         """
@@ -975,163 +820,27 @@ class FileListWidget(QWidget):
             # 其他键由父类处理
             super().keyPressEvent(event)
 
-    def add_edit_button_only(self, files):
-        """
-        仅添加编辑按钮到列表（不显示文件名）
-        
-        Args:
-            files (list): 文件列表，每个元素是一个字典，包含name和path属性
-        """
-        for file_data in files:
-            try:
-                file_name = file_data.get('name', '')
-                
-                # 如果文件已存在，跳过
-                if file_name in self.files:
-                    continue
-                
-                # 存储文件数据（但标记为未编辑状态）
-                file_data['edited'] = False
-                self.files[file_name] = file_data
-                
-                # 创建列表项
-                item = QListWidgetItem()
-                item.setData(Qt.UserRole, file_data)
-                
-                # 创建只包含编辑按钮的小部件
-                self._create_edit_button_item(item, file_data)
-            except Exception as e:
-                print(f"添加编辑按钮 '{file_data.get('name', '未知')}' 时出错: {str(e)}")
-                continue
-        
-        # 更新占位标签的可见性
-        if self.accept_drops:
-            self._update_placeholder_visibility()
-            
-    def _create_edit_button_item(self, item, file_data):
+    def _on_edit_requested(self, index):
         """
-        创建只包含编辑按钮的列表项小部件
+        点击Edit按钮后，把该单元格切换为可编辑并打开编辑器
         
         Args:
-            item: 列表项
-            file_data: 文件数据
-        """
-        file_name = file_data.get('name', '')
-        
-        # 创建小部件
-        item_widget = QWidget()
-        # 设置鼠标悬停时显示手型光标
-        item_widget.setCursor(Qt.PointingHandCursor)
-        # 强制布局更新
-        item_widget.setAttribute(Qt.WA_DontShowOnScreen, False)
-        
-        layout = QHBoxLayout(item_widget)
-        # 保持和其他列表项相同的内边距，确保对齐
-        layout.setContentsMargins(10, 8, 10, 8)
-        # 设置垂直居中
-        layout.setAlignment(Qt.AlignCenter)
-        
-        # 创建编辑按钮
-        edit_button = QPushButton("Edit")
-        edit_button.setObjectName("editButton")
-        # 设置最小宽度，确保按钮不会太小
-        edit_button.setMinimumWidth(100)
-        # 设置按钮策略，允许水平扩展
-        edit_button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        # 设置固定高度
-        edit_button.setFixedHeight(30)
-        # 设置鼠标悬停时显示手型光标
-        edit_button.setCursor(Qt.PointingHandCursor)
-        # 设置编辑按钮样式：背景色#CBA057，字体颜色为白色
-        edit_button.setStyleSheet("background-color: #CBA057; color: white; border-radius: 3px;")
-        
-        # 保存原始文件名到按钮的属性中
-        edit_button.setProperty("file_name", file_name)
-        
-        # 连接按钮信号到自定义槽，使用更安全的连接方式
-        edit_button.clicked.connect(lambda: self._on_edit_button_clicked(file_name, item_widget))
-        
-        # 初始状态下隐藏编辑按钮
-        edit_button.setVisible(False)
-        
-        # 添加到布局并让按钮填满可用空间
-        layout.addWidget(edit_button, 1)
-        
-        # 强制布局刷新
-        layout.invalidate()
-        layout.activate()
-        
-        # 设置列表项和小部件
-        self.file_list.addItem(item)
-        self.file_list.setItemWidget(item, item_widget)
-        
-        # 调整项高度 - 确保所有列表项高度一致
-        # 使用固定高度，与_create_item_widget中保持一致
-        fixed_height = 48  # 固定高度值
-        item.setSizeHint(QSize(item_widget.width(), fixed_height))
-        
-        # 强制更新布局，确保按钮正确显示
-        item_widget.updateGeometry()
-        edit_button.updateGeometry()
-        
-        # 安装事件过滤器，处理鼠标进入和离开事件
-        item_widget.installEventFilter(self)
-    
-    def _on_edit_button_clicked(self, file_name, item_widget):
+            index (QModelIndex): 单元格索引
         """
-        编辑按钮点击处理
+        file_row = self.model.file_at(index.row())
+        if not file_row:
+            return
+        file_name = file_row.name
         
-        Args:
-            file_name (str): 文件名
-            item_widget (QWidget): 列表项小部件
-        """
         # 通知控制器
         self.edit_button_clicked.emit(file_name)
         
-        # 移除旧的布局中所有控件
-        while item_widget.layout().count():
-            item = item_widget.layout().takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # 保持布局边距一致，确保对齐
-        item_widget.layout().setContentsMargins(10, 8, 10, 8)
-        
-        # 创建文本编辑框
-        text_edit = QTextEdit(file_name)
-        text_edit.setObjectName("fileNameEdit")
-        text_edit.setFrameStyle(0)  # 无边框
-        text_edit.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        text_edit.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        text_edit.setFixedHeight(28)  # 设置固定高度
-        
-        # 设置字体和样式
-        font = QFont("Courier New", 10)
-        font.setStyleStrategy(QFont.PreferAntialias)
-        text_edit.setFont(font)
-        text_edit.setStyleSheet("background-color: transparent; margin-left: 5px; padding: 2px; font-family: 'Courier New', monospace; border: none; color: #CBA057;")
-        
-        # 允许文本交互
-        text_edit.setTextInteractionFlags(Qt.TextEditorInteraction)
-        
-        # 保存原始文件名
-        text_edit.setProperty("original_file_name", file_name)
-        
-        # 添加到布局
-        item_widget.layout().addWidget(text_edit)
-        
-        # 设置焦点到文本编辑框
-        text_edit.setFocus()
-        
-        # 选中所有文本
-        text_edit.selectAll()
-        
-        # 文本变更时保存到文件数据
-        text_edit.textChanged.connect(lambda: self._on_text_edited(file_name, text_edit.toPlainText()))
-        
-        # 安装事件过滤器以处理焦点丢失事件
-        text_edit.installEventFilter(self)
-        
+        # 切换为已编辑状态，初始值为原始文件名，然后只为这一行创建编辑器
+        if file_row.example is None:
+            self.model.set_example(file_name, file_name)
+        self.file_list.setCurrentIndex(index)
+        self.file_list.edit(index)
+    
     def _on_text_edited(self, original_file_name, new_text):
         """
         文本编辑处理
@@ -1140,144 +849,5 @@ class FileListWidget(QWidget):
             original_file_name (str): 原始文件名
             new_text (str): 新文本
         """
-        # 防止无限递归
-        static_updating = getattr(self, '_updating_text', False)
-        if static_updating:
-            return
-            
-        self._updating_text = True
-        
-        try:
-            # 更新存储的文件数据
-            if original_file_name in self.files:
-                self.files[original_file_name]['edited'] = True
-                self.files[original_file_name]['new_name'] = new_text
-                
-                # 尝试更新重命名控制器
-                from PySide6.QtWidgets import QApplication
-                main_window = QApplication.activeWindow()
-                
-                if main_window and hasattr(main_window, 'rename_controller'):
-                    # 从UI中获取重命名控制器
-                    rename_controller = main_window.rename_controller
-                    
-                    # 更新重命名模型中的示例 - 不需要发信号
-                    rename_controller.rename_model.add_example(original_file_name, new_text, emit_signal=False)
-        finally:
-            self._updating_text = False
-
-    def sync_with(self, other_list_widgets):
-        """
-        与其他文件列表组件同步滚动和选择
-        
-        Args:
-            other_list_widgets (list): 其他FileListWidget实例列表
-        """
-        self.synced_lists = [widget for widget in other_list_widgets if widget != self]
-        
-        # 断开旧连接，避免多次连接
-        try:
-            self.file_list.verticalScrollBar().valueChanged.disconnect(self._sync_scroll)
-        except:
-            pass  # 如果之前没有连接，会抛出异常，忽略它
-            
-        # 连接滚动信号
-        self.file_list.verticalScrollBar().valueChanged.connect(self._sync_scroll)
-        
-        # 断开旧选择信号连接
-        try:
-            self.file_list.itemSelectionChanged.disconnect(self._sync_selection)
-        except:
-            pass  # 如果之前没有连接，忽略异常
-            
-        # 连接选择信号
-        self.file_list.itemSelectionChanged.connect(self._sync_selection)
-        
-        # 确保初始同步
-        self._sync_selection()
-        scroll_value = self.file_list.verticalScrollBar().value()
-        if scroll_value > 0:
-            self._sync_scroll(scroll_value)
-        
-    def _sync_scroll(self, value):
-        """
-        同步滚动条位置
-        
-        Args:
-            value (int): 滚动条位置值
-        """
-        # 防止无限递归
-        if getattr(self, '_is_syncing_scroll', False):
-            return
-            
-        self._is_syncing_scroll = True
-        
-        try:
-            # 计算可见区域
-            viewport_rect = self.file_list.viewport().rect()
-            
-            # 找到第一个可见项和偏移量
-            first_visible_index = -1
-            offset_percent = 0
-            
-            # 找到第一个完全可见的项
-            for i in range(self.file_list.count()):
-                item_rect = self.file_list.visualItemRect(self.file_list.item(i))
-                # 如果项目在可见区域内
-                if viewport_rect.contains(item_rect.topLeft()):
-                    first_visible_index = i
-                    # 计算第一个可见项相对于滚动条的偏移比例
-                    scrollbar = self.file_list.verticalScrollBar()
-                    total_range = scrollbar.maximum() - scrollbar.minimum()
-                    if total_range > 0:
-                        offset_percent = value / total_range
-                    break
-            
-            # 如果没有找到可见项，使用滚动条的比例值
-            if first_visible_index == -1:
-                scrollbar = self.file_list.verticalScrollBar()
-                total_range = scrollbar.maximum() - scrollbar.minimum()
-                if total_range > 0:
-                    offset_percent = value / total_range
-                # 如果列表为空或者滚动到了底部，同步滚动条值即可
-                for widget in self.synced_lists:
-                    if widget.file_list.count() > 0:
-                        target_value = int(offset_percent * (widget.file_list.verticalScrollBar().maximum() - widget.file_list.verticalScrollBar().minimum()))
-                        widget.file_list.verticalScrollBar().setValue(target_value)
-            else:
-                # 同步到其他列表时，先将滚动条拉到相同比例位置，再滚动到对应项
-                for widget in self.synced_lists:
-                    if widget.file_list.count() > first_visible_index:
-                        # 同步滚动条相对位置
-                        target_scrollbar = widget.file_list.verticalScrollBar()
-                        target_range = target_scrollbar.maximum() - target_scrollbar.minimum()
-                        if target_range > 0:
-                            target_value = int(offset_percent * target_range)
-                            target_scrollbar.setValue(target_value)
-                        
-                        # 然后滚动到相同索引的项
-                        widget.file_list.scrollToItem(
-                            widget.file_list.item(first_visible_index),
-                            QAbstractItemView.PositionAtTop
-                        )
-        
-        finally:
-            self._is_syncing_scroll = False
-            
-    def _sync_selection(self):
-        """
-        同步选择状态
-        """
-        # 获取当前选中项索引
-        selected_indices = [self.file_list.row(item) for item in self.file_list.selectedItems()]
-        
-        # 同步到其他列表
-        for widget in self.synced_lists:
-            # 如果其他列表有相同数量的项，同步选择
-            if widget.file_list.count() == self.file_list.count():
-                widget.file_list.blockSignals(True)
-                widget.file_list.clearSelection()
-                for index in selected_indices:
-                    if 0 <= index < widget.file_list.count():
-                        widget.file_list.item(index).setSelected(True)
-                widget.file_list.blockSignals(False)
\ No newline at end of file
+        # 由主窗口连接到重命名控制器，不依赖当前活动窗口
+        self.example_edited.emit(original_file_name, new_text)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+
+from PySide6.QtCore import Qt, QObject, Signal, Slot, QRunnable, QThreadPool
+from PySide6.QtGui import QPixmap, QPixmapCache, QImage, QImageReader
+
+# 通用图标
+FILE_ICON = "assets/icons/normal/file.png"
+FOLDER_ICON = "assets/icons/normal/folder.png"
+
+# 按扩展名区分的图标目录，文件名为 <扩展名>.png，例如 jpg.png
+TYPE_ICON_DIR = "assets/icons/types"
+
+# 加载失败的图标路径，避免每次绘制都重新读取磁盘；超过上限时整体清空，
+# 调用方传入大量不同路径时也不会一直增长
+_missing = set()
+MISSING_LIMIT = 256
+
+def _cache_key(path, size, device_pixel_ratio):
+    return f"gy_rename:{path}:{size}:{device_pixel_ratio}"
+
+def _to_pixmap(image, device_pixel_ratio):
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    return pixmap
+
+def _read_image(path, size, device_pixel_ratio):
+    """
+    读取并缩放图标，只使用QImage，可以在后台线程中调用
+
+    Args:
+        path (str): 图标路径
+        size (int): 逻辑尺寸
+        device_pixel_ratio (float): 设备像素比
+
+    Returns:
+        QImage: 缩放后的图片，读取失败时返回空图片
+    """
+    reader = QImageReader(path)
+    image = reader.read()
+    if image.isNull():
+        return image
+    pixel_size = round(size * device_pixel_ratio)
+    return image.scaled(pixel_size, pixel_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+def cached_pixmap(path, size, device_pixel_ratio=1.0):
+    """
+    获取缩放后的图标，整个进程共用QPixmapCache，每种（路径, 尺寸, 像素比）只加载和缩放一次
+
+    Args:
+        path (str): 图标路径
+        size (int): 逻辑尺寸
+        device_pixel_ratio (float): 设备像素比
+
+    Returns:
+        QPixmap: 图标，加载失败时返回空QPixmap
+    """
+    key = _cache_key(path, size, device_pixel_ratio)
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None:
+        return pixmap
+    if key in _missing:
+        return QPixmap()
+
+    image = _read_image(path, size, device_pixel_ratio)
+    if image.isNull():
+        if len(_missing) >= MISSING_LIMIT:
+            _missing.clear()
+        _missing.add(key)
+        return QPixmap()
+
+    pixmap = _to_pixmap(image, device_pixel_ratio)
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+class _IconLoadSignals(QObject):
+    """
+    后台加载任务的信号，QRunnable本身不能发信号
+    """
+    loaded = Signal(str, float, QImage)  # 扩展名、设备像素比和加载好的图片（失败时为空图片）
+
+class _IconLoadTask(QRunnable):
+    """
+    在线程池中读取一个扩展名的图标
+    """
+
+    def __init__(self, extension, path, size, device_pixel_ratio, signals):
+        super().__init__()
+        self.extension = extension
+        self.path = path
+        self.size = size
+        self.device_pixel_ratio = device_pixel_ratio
+        self.signals = signals
+
+    def run(self):
+        image = QImage()
+        if os.path.isfile(self.path):
+            image = _read_image(self.path, self.size, self.device_pixel_ratio)
+        self.signals.loaded.emit(self.extension, self.device_pixel_ratio, image)
+
+class FileIconProvider(QObject):
+    """
+    按扩展名提供文件图标
+
+    某个扩展名第一次出现时先返回通用文件图标，同时在线程池中读取TYPE_ICON_DIR下的
+    对应图标，读取完成后发出icon_ready信号，视图重绘即可显示。绘制时不会等待磁盘读取。
+    """
+
+    # 定义信号
+    icon_ready = Signal(str)  # 某个扩展名的图标已加载，参数为扩展名
+
+    def __init__(self, size, device_pixel_ratio=1.0, icon_dir=TYPE_ICON_DIR, thread_pool=None, parent=None):
+        """
+        初始化图标提供器
+
+        Args:
+            size (int): 图标逻辑尺寸
+            device_pixel_ratio (float): 设备像素比
+            icon_dir (str): 按扩展名区分的图标目录，不存在时只使用通用图标
+            thread_pool (QThreadPool, optional): 线程池，默认使用全局线程池
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.size = size
+        self.device_pixel_ratio = device_pixel_ratio
+        self.icon_dir = icon_dir
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self._enabled = bool(icon_dir) and os.path.isdir(icon_dir)
+        self._icons = {}    # 扩展名 -> QPixmap，为None表示正在加载或没有专用图标
+        self._generic = {}  # 通用图标路径 -> QPixmap，绘制每个单元格时不必再查询QPixmapCache
+
+        self._signals = _IconLoadSignals(self)
+        self._signals.loaded.connect(self._on_loaded)
+
+    def set_device_pixel_ratio(self, device_pixel_ratio):
+        """
+        设备像素比变化后丢弃已加载的图标，按新的像素比重新加载
+        """
+        if device_pixel_ratio != self.device_pixel_ratio:
+            self.device_pixel_ratio = device_pixel_ratio
+            self._icons.clear()
+            self._generic.clear()
+
+    def _generic_icon(self, path):
+        pixmap = self._generic.get(path)
+        if pixmap is None:
+            pixmap = self._generic[path] = cached_pixmap(path, self.size, self.device_pixel_ratio)
+        return pixmap
+
+    def icon_for(self, file_name, is_folder=False):
+        """
+        获取文件的图标，不阻塞
+
+        Args:
+            file_name (str): 文件名
+            is_folder (bool): 是否为文件夹
+
+        Returns:
+            QPixmap: 图标，专用图标尚未加载完成时返回通用图标
+        """
+        if is_folder:
+            return self._generic_icon(FOLDER_ICON)
+
+        extension = os.path.splitext(file_name)[1][1:].lower()
+        if self._enabled and extension:
+            if extension in self._icons:
+                pixmap = self._icons[extension]
+                if pixmap is not None:
+                    return pixmap
+            else:
+                self._icons[extension] = None
+                self.thread_pool.start(_IconLoadTask(
+                    extension, os.path.join(self.icon_dir, f"{extension}.png"),
+                    self.size, self.device_pixel_ratio, self._signals))
+
+        return self._generic_icon(FILE_ICON)
+
+    @Slot(str, float, QImage)
+    def _on_loaded(self, extension, device_pixel_ratio, image):
+        # 只有加载期间像素比未变化时才使用结果
+        if image.isNull() or device_pixel_ratio != self.device_pixel_ratio or extension not in self._icons:
+            return
+        self._icons[extension] = _to_pixmap(image, self.device_pixel_ratio)
+        self.icon_ready.emit(extension)
@@ -5,17 +5,20 @@ import os
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QToolBar, QMessageBox,
-    QSplitter, QStatusBar, QApplication, QSizePolicy, QToolButton
+    QSplitter, QStatusBar, QApplication, QSizePolicy, QToolButton,
+    QFileDialog, QProgressBar
 )
-from PySide6.QtCore import Qt, Slot, QSize, QFile, QTextStream, QPoint, QTimer
+from PySide6.QtCore import Qt, Slot, QSize, QFile, QTextStream, QPoint
 from PySide6.QtGui import QIcon, QAction, QPixmap, QMouseEvent
 from PySide6.QtWidgets import QSpacerItem
 
 from views.file_list_widget import FileListWidget
+from views.refresh_scheduler import RefreshScheduler
 from views.settings_dialog import SettingsDialog
 from controllers.file_controller import FileController
 from controllers.rename_controller import RenameController
 from controllers.settings_controller import SettingsController
+from controllers.session_controller import SessionController
 
 class MainWindow(QMainWindow):
     """
@@ -35,9 +38,21 @@ class MainWindow(QMainWindow):
         
         # 初始化控制器
         self.file_controller = FileController(config_manager)
-        self.rename_controller = RenameController(config_manager)
+        self.rename_controller = RenameController(config_manager, file_index=self.file_controller.file_model)
         self.settings_controller = SettingsController(config_manager)
         
+        # 重命名日志保存在配置目录中
+        self.rename_controller.journal_dir = os.path.join(
+            self.settings_controller.get_config_directory(), "journal")
+        
+        # 文件列表、示例和分析历史自动保存到会话数据库
+        self.session_controller = SessionController(
+            os.path.join(self.settings_controller.get_config_directory(), "session.sqlite3"),
+            self.file_controller, self.rename_controller, parent=self)
+        
+        # 窗口缩放、分割器移动等产生的布局刷新请求合并为每帧一次
+        self.layout_refresh = RefreshScheduler(self._refresh_example_list, parent=self)
+        
         # 设置窗口属性
         self.setWindowTitle("GY_Rename - AI批量重命名工具")
         self.resize(1200, 800)
@@ -67,6 +82,12 @@ class MainWindow(QMainWindow):
         self._create_status_bar()
         self._create_connections()
         
+        # 恢复上次的会话
+        if self.settings_controller.get_setting('app.restore_session', True):
+            count = self.session_controller.restore()
+            if count:
+                self.status_bar.showMessage(f"已恢复上次会话的 {count} 个文件")
+        
         # 检查首次运行，显示设置对话框
         if self.config_manager.is_first_run():
             self._show_first_run_dialog()
@@ -171,12 +192,12 @@ class MainWindow(QMainWindow):
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.setSpacing(0)
         
-        # 创建文件列表区域的分割器
+        # 创建表头区域的分割器，拖动分割器时文件表格的列宽随之调整
         self.file_lists_splitter = QSplitter(Qt.Horizontal)
         self.file_lists_splitter.setHandleWidth(1)  # 减小分割器手柄宽度
         self.file_lists_splitter.setStyleSheet("QSplitter::handle { background-color: #121212; }")
         
-        # 创建三个文件列表容器
+        # 创建三个表头容器
         original_container = QWidget()
         original_container.setObjectName("originalFilesContainer")
         example_container = QWidget()
@@ -199,27 +220,14 @@ class MainWindow(QMainWindow):
         example_header = self._create_example_files_header()
         analysis_header = self._create_analysis_files_header()
         
-        # 创建三个文件列表
-        self.original_files_widget = FileListWidget("", accept_drops=True)
-        self.example_files_widget = FileListWidget("", with_edit_button=True)
-        self.analysis_files_widget = FileListWidget("")
-        # 设置分析结果列表为结果列表，使文本显示为绿色
-        self.analysis_files_widget.set_as_result_list(True)
+        # 创建文件表格，原始文件、命名示范和分析结果是同一个表格的三列
+        self.file_list_widget = FileListWidget("", accept_drops=True)
+        self.file_list_widget.setContentsMargins(0, 0, 0, 0)
         
-        # 确保文件列表正确显示所有内容
-        self.original_files_widget.setContentsMargins(0, 0, 0, 0)
-        self.example_files_widget.setContentsMargins(0, 0, 0, 0) 
-        self.analysis_files_widget.setContentsMargins(0, 0, 0, 0)
-        
-        # 添加表头和列表到各自布局
+        # 添加表头到各自布局
         original_layout.addWidget(original_header)
-        original_layout.addWidget(self.original_files_widget, 1)
-        
         example_layout.addWidget(example_header)
-        example_layout.addWidget(self.example_files_widget, 1)
-        
         analysis_layout.addWidget(analysis_header)
-        analysis_layout.addWidget(self.analysis_files_widget, 1)
         
         # 将三个容器添加到分割器
         self.file_lists_splitter.addWidget(original_container)
@@ -232,8 +240,9 @@ class MainWindow(QMainWindow):
         # 创建底部按钮区域
         bottom_container = self._create_bottom_button_area()
         
-        # 将分割器和底部按钮添加到主布局
-        self.main_layout.addWidget(self.file_lists_splitter, 1)
+        # 将表头分割器、文件表格和底部按钮添加到主布局
+        self.main_layout.addWidget(self.file_lists_splitter)
+        self.main_layout.addWidget(self.file_list_widget, 1)
         self.main_layout.addWidget(bottom_container)
     
     def _create_actions(self):
@@ -344,31 +353,62 @@ class MainWindow(QMainWindow):
         
         # 添加永久消息
         self.status_bar.showMessage("就绪")
+        
+        # 后台导入进度和取消按钮，仅在导入时显示
+        self.import_progress_bar = QProgressBar()
+        self.import_progress_bar.setMaximumWidth(200)
+        self.import_progress_bar.setTextVisible(False)
+        self.import_progress_bar.hide()
+        self.status_bar.addPermanentWidget(self.import_progress_bar)
+        
+        self.import_cancel_button = QPushButton("取消")
+        self.import_cancel_button.hide()
+        self.status_bar.addPermanentWidget(self.import_cancel_button)
     
     def _create_connections(self):
         """
         创建信号连接
         """
         # 文件相关连接
-        self.original_files_widget.files_dropped.connect(self.file_controller.add_files)
-        self.file_controller.files_added.connect(self.original_files_widget.add_files)
+        self.file_list_widget.files_dropped.connect(self.file_controller.add_files)
+        # 新增的行在命名示范列显示Edit按钮
+        self.file_controller.files_added.connect(self.file_list_widget.add_files)
         self.file_controller.files_added.connect(self._update_step1_completed)
-        # 当原始文件列表更新时，同步更新示例列表，添加对应的Edit按钮
-        self.file_controller.files_added.connect(self._sync_example_files)
         
-        # 设置三个列表的联动关系
-        self.original_files_widget.sync_with([self.example_files_widget, self.analysis_files_widget])
-        self.example_files_widget.sync_with([self.original_files_widget, self.analysis_files_widget])
-        self.analysis_files_widget.sync_with([self.original_files_widget, self.example_files_widget])
+        # 拖放和递归导入都在后台分块进行
+        self.file_list_widget.paths_dropped.connect(self._on_paths_dropped)
+        self.file_list_widget.folder_import_requested.connect(self._on_folder_import_requested)
+        self.file_controller.import_started.connect(self._on_import_started)
+        self.file_controller.import_progress.connect(self._on_import_progress)
+        self.file_controller.import_finished.connect(self._on_import_finished)
+        self.file_controller.import_rejected.connect(
+            lambda reason: QMessageBox.warning(self, "类型不一致", reason, QMessageBox.Ok))
+        self.import_cancel_button.clicked.connect(self.file_controller.cancel_import)
+        
+        # 外部更改同步
+        self.file_controller.files_removed.connect(self._on_files_removed)
+        self.file_controller.files_removed.connect(self.rename_controller.remove_files)
+        self.file_list_widget.files_deleted.connect(self.file_controller.remove_files)
+        self.file_controller.file_renamed.connect(self._on_file_renamed)
+        self.file_controller.files_stale.connect(self._on_files_stale)
+        self.settings_controller.settings_updated.connect(lambda settings: self._apply_watch_settings())
+        self._apply_watch_settings()
+        self.settings_controller.settings_updated.connect(lambda settings: self._apply_display_settings())
+        self._apply_display_settings()
+        self.settings_controller.settings_updated.connect(
+            lambda settings: self.rename_controller.set_max_history(
+                self.settings_controller.get_setting('app.max_history', 10)))
+        self.rename_controller.set_max_history(self.settings_controller.get_setting('app.max_history', 10))
         
         # 连接分割器信号
         self._connect_splitter_signals()
         
         # 重命名相关连接
-        self.example_files_widget.edit_button_clicked.connect(self.rename_controller.edit_example)
-        self.rename_controller.example_updated.connect(self.example_files_widget.update_file)
+        self.file_list_widget.edit_button_clicked.connect(self.rename_controller.edit_example)
+        self.file_list_widget.example_edited.connect(self.rename_controller.update_example)
+        self.rename_controller.example_updated.connect(self.file_list_widget.update_example)
         self.rename_controller.example_updated.connect(self._update_step2_completed)
-        self.rename_controller.analysis_result_updated.connect(self.analysis_files_widget.update_files)
+        self.rename_controller.analysis_result_updated.connect(self.file_list_widget.update_results)
         self.rename_controller.analysis_result_updated.connect(self._update_step3_completed)
         
         # 状态更新连接
@@ -387,6 +427,122 @@ class MainWindow(QMainWindow):
         # Pin按钮连接
         self.pin_button.clicked.connect(self._on_pin_button_clicked)
     
+    @Slot(list)
+    def _on_paths_dropped(self, paths):
+        """
+        在后台导入拖放的路径
+        
+        Args:
+            paths (list): 本地路径列表
+        """
+        if not self.file_controller.import_dropped_paths(paths):
+            self.status_bar.showMessage("已有导入正在进行，请稍候")
+    
+    @Slot(list)
+    def _on_folder_import_requested(self, folder_paths):
+        """
+        按导入设置在后台递归导入文件夹内容
+        
+        Args:
+            folder_paths (list): 文件夹路径列表
+        """
+        import_settings = self.settings_controller.get_setting('import', {}) or {}
+        if not self.file_controller.import_folders(folder_paths, import_settings):
+            self.status_bar.showMessage("已有导入正在进行，请稍候")
+    
+    def _on_import_started(self):
+        """
+        后台导入开始，显示进度条和取消按钮
+        """
+        # 总数未知时显示为忙碌状态
+        self.import_progress_bar.setRange(0, 0)
+        self.import_progress_bar.show()
+        self.import_cancel_button.show()
+        self.status_bar.showMessage("正在导入...")
+    
+    def _on_import_progress(self, count, total):
+        """
+        更新后台导入进度
+        
+        Args:
+            count (int): 已添加数量
+            total (int): 总数，未知时为0
+        """
+        if total > 0:
+            self.import_progress_bar.setRange(0, total)
+            self.import_progress_bar.setValue(min(count, total))
+            self.status_bar.showMessage(f"正在导入... {count}/{total}")
+        else:
+            self.status_bar.showMessage(f"正在导入... 已添加 {count} 项")
+    
+    def _on_import_finished(self, count):
+        """
+        后台导入结束，隐藏进度条和取消按钮
+        
+        Args:
+            count (int): 已添加数量
+        """
+        self.import_progress_bar.hide()
+        self.import_cancel_button.hide()
+        self.status_bar.showMessage(f"导入完成，共 {count} 项")
+    
+    def _apply_watch_settings(self):
+        """
+        按设置开启或关闭文件夹监视
+        """
+        if self.settings_controller.get_setting('import.watch_changes', False):
+            self.file_controller.start_watching(
+                self.settings_controller.get_setting('import.watch_backend', 'auto'),
+                self.settings_controller.get_setting('import.watch_poll_interval', 2.0))
+        else:
+            self.file_controller.stop_watching()
+    
+    def _apply_display_settings(self):
+        """
+        按设置开启或关闭缩略图
+        """
+        cache_dir = self.settings_controller.get_setting('display.thumbnail_cache_directory', '') or None
+        self.file_list_widget.set_thumbnails_enabled(
+            bool(self.settings_controller.get_setting('display.show_thumbnails', False)), cache_dir)
+    
+    def _on_files_removed(self, file_dicts):
+        """
+        一段连续的行从模型中移除后，从文件表格中移除对应的行
+        
+        Args:
+            file_dicts (list): 被移除文件的数据字典列表
+        """
+        self.file_list_widget.remove_files([file_data['id'] for file_data in file_dicts])
+    
+    def _on_file_renamed(self, old_path, file_data):
+        """
+        文件在外部被重命名后更新文件表格中的原始文件名
+        
+        Args:
+            old_path (str): 旧路径
+            file_data (dict): 新的文件数据
+        """
+        self.file_list_widget.rename_file(file_data)
+    
+    def _on_files_stale(self, file_ids):
+        """
+        标记分析结果已过期的行
+        
+        Args:
+            file_ids (list): 文件ID列表
+        """
+        self.file_list_widget.mark_stale(file_ids)
+        self.status_bar.showMessage(f"{len(file_ids)} 个文件已在外部更改，请重新分析")
+    
+    def closeEvent(self, event):
+        """
+        窗口关闭时停止后台导入、文件夹监视和缩略图生成，提交会话数据库
+        """
+        self.file_controller.shutdown()
+        self.session_controller.close()
+        self.file_list_widget.set_thumbnails_enabled(False)
+        super().closeEvent(event)
+    
     def _show_first_run_dialog(self):
         """
         显示首次运行对话框
@@ -435,23 +591,86 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "没有分析结果可供确认，请先进行命名分析。")
             return
         
-        # 询问用户确认
-        reply = QMessageBox.question(
-            self, 
-            "确认重命名", 
-            "确定要按照当前分析结果重命名全部文件吗？此操作无法撤销。",
-            QMessageBox.Yes | QMessageBox.No, 
-            QMessageBox.No
-        )
+        # 生成重命名计划（不修改磁盘）
+        plan = self.rename_controller.plan_rename()
         
-        if reply == QMessageBox.Yes:
-            # 执行重命名
-            result = self.rename_controller.apply_rename()
+        if plan is None or not plan.has_changes():
+            QMessageBox.information(self, "提示", "当前分析结果不需要重命名任何文件。")
+            return
+        
+        # 显示计划摘要，让用户确认
+        if not self._show_rename_plan_dialog(plan):
+            return
+        
+        # 按已确认的计划执行重命名
+        backup_mode = None
+        if self.settings_controller.get_setting('rename.backup_original_files', True):
+            backup_mode = self.settings_controller.get_setting('rename.backup_mode', 'journal')
+        backup_dir = self.settings_controller.get_setting('rename.backup_directory', 'backup')
+        result = self.rename_controller.apply_rename(plan, backup_mode, backup_dir)
+        
+        if result.get("success"):
+            message = f"成功重命名 {result.get('count', 0)} 个文件。"
+            if result.get("errors"):
+                message += f"\n{len(result['errors'])} 个文件重命名失败。"
+            QMessageBox.information(self, "成功", message)
+        else:
+            QMessageBox.critical(self, "错误", f"重命名过程中发生错误: {result.get('error', '未知错误')}")
+    
+    def _show_rename_plan_dialog(self, plan):
+        """
+        显示重命名计划摘要，支持导出计划
+        
+        Args:
+            plan (RenamePlan): 重命名计划
             
-            if result.get("success"):
-                QMessageBox.information(self, "成功", f"成功重命名 {result.get('count', 0)} 个文件。")
-            else:
-                QMessageBox.critical(self, "错误", f"重命名过程中发生错误: {result.get('error', '未知错误')}")
+        Returns:
+            bool: 用户确认执行返回True，否则返回False
+        """
+        message_box = QMessageBox(self)
+        message_box.setWindowTitle("确认重命名")
+        message_box.setIcon(QMessageBox.Question)
+        message_box.setText("将按以下计划重命名文件：")
+        message_box.setInformativeText(plan.format_summary())
+        message_box.setDetailedText(plan.format_details())
+        
+        confirm_button = message_box.addButton("执行重命名", QMessageBox.AcceptRole)
+        export_button = message_box.addButton("导出计划...", QMessageBox.ActionRole)
+        cancel_button = message_box.addButton("取消", QMessageBox.RejectRole)
+        message_box.setDefaultButton(cancel_button)
+        
+        while True:
+            message_box.exec()
+            clicked = message_box.clickedButton()
+            
+            if clicked == export_button:
+                self._export_rename_plan(plan)
+                continue
+            
+            return clicked == confirm_button
+    
+    def _export_rename_plan(self, plan):
+        """
+        导出重命名计划为CSV或JSONL文件
+        
+        Args:
+            plan (RenamePlan): 重命名计划
+        """
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "导出重命名计划",
+            "rename_plan.csv",
+            "CSV 文件 (*.csv);;JSONL 文件 (*.jsonl)"
+        )
+        
+        if not file_path:
+            return
+        
+        success, result = plan.export(file_path)
+        if success:
+            self.status_bar.showMessage(f"重命名计划已导出到 {result}")
+        else:
+            QMessageBox.critical(self, "错误", result)
     
     @Slot()
     def _on_clear_clicked(self):
@@ -474,9 +693,7 @@ class MainWindow(QMainWindow):
             self.rename_controller.clear_analysis_results()
             
             # 更新UI
-            self.original_files_widget.clear()
-            self.example_files_widget.clear()
-            self.analysis_files_widget.clear()
+            self.file_list_widget.clear()
             
             # 重置箭头状态
             self._reset_arrow_states()
@@ -505,10 +722,10 @@ class MainWindow(QMainWindow):
             return
         
         # 清空文件列表
-        self.original_files_widget.clear()
+        self.file_list_widget.clear()
         
         # 重新添加文件
-        self.original_files_widget.add_files(current_files)
+        self.file_list_widget.add_files(current_files)
         
         # 更新状态栏
         self.status_bar.showMessage("文件列表已刷新")
@@ -533,29 +750,12 @@ class MainWindow(QMainWindow):
             self.showNormal()
             self.max_restore_button.setIcon(QIcon("assets/icons/normal/Maximize.png"))
             self.max_restore_button.setToolTip("最大化")
-            
-            # 窗口还原时添加额外刷新逻辑，确保Edit按钮正确缩放
-            QTimer.singleShot(50, self._refresh_example_list)
-            QTimer.singleShot(150, self._refresh_example_list)
-            QTimer.singleShot(300, self._refresh_example_list)
-            QTimer.singleShot(500, self._refresh_example_list)
         else:
             self.showMaximized()
             self.max_restore_button.setIcon(QIcon("assets/icons/normal/unmaximize.png"))
             self.max_restore_button.setToolTip("还原")
-            
-        # 立即刷新列表项布局
-        QTimer.singleShot(10, self._refresh_example_list)
-        # 添加多个延迟刷新，确保在窗口动画完成后多次刷新界面
-        QTimer.singleShot(100, self._refresh_example_list)
-        QTimer.singleShot(200, self._refresh_example_list)
-        QTimer.singleShot(500, self._refresh_example_list)
-        
-        # 通过模拟分割器移动事件触发更彻底的刷新
-        QTimer.singleShot(150, self._simulate_splitter_move)
-        
-        # 强制刷新整个应用程序
-        QTimer.singleShot(300, lambda: QApplication.processEvents())
+        
+        # 窗口大小变化会触发resizeEvent，由刷新调度器合并为一次刷新，这里不需要额外安排
     
     @Slot()
     def _on_pin_action(self, checked):
@@ -626,21 +826,8 @@ class MainWindow(QMainWindow):
         # 判断是否在标题栏上双击
         title_bar = self.findChild(QWidget, "titleBar")
         if title_bar and title_bar.geometry().contains(event.pos()):
-            # 记录状态变化前是否处于最大化状态
-            was_maximized = self.isMaximized()
-            
-            # 直接调用最大化/还原处理函数，其中已包含完整的刷新逻辑
+            # 直接调用最大化/还原处理函数，刷新由resizeEvent安排
             self._on_max_restore_clicked()
-            
-            # 额外添加刷新逻辑，确保双击特别处理
-            QTimer.singleShot(300, self._simulate_splitter_move)
-            QTimer.singleShot(400, self._refresh_example_list)
-            QTimer.singleShot(600, self._refresh_example_list)
-            
-            # 如果是从最大化状态还原，添加更多刷新以确保Edit按钮正确缩放
-            if was_maximized:
-                QTimer.singleShot(700, self._refresh_example_list)
-                QTimer.singleShot(900, self._refresh_example_list)
         
         # 调用父类方法
         super().mouseDoubleClickEvent(event)
@@ -1008,12 +1195,12 @@ class MainWindow(QMainWindow):
         """处理添加原始文件的操作"""
         files = self.file_controller.browse_files()
         if files:
-            self.original_files_widget.add_files(files)
+            self.file_list_widget.add_files(files)
             self.status_bar.showMessage(f"已添加 {len(files)} 个原始文件")
     
     def _on_clear_original_files(self):
         """清空原始文件列表"""
-        self.original_files_widget.clear()
+        self.file_list_widget.clear()
         self.file_controller.clear_files()
         # 移除箭头状态修改
         self.status_bar.showMessage("已清空原始文件列表")
@@ -1027,12 +1214,12 @@ class MainWindow(QMainWindow):
             return
         
         # 设置示例文件
-        self.example_files_widget.add_files(files)
+        self.file_list_widget.add_files(files)
         self.status_bar.showMessage("已添加示例文件")
     
     def _on_clear_example_files(self):
         """清空示例文件列表"""
-        self.example_files_widget.clear()
+        self.file_list_widget.clear_examples()
         self.rename_controller.clear_examples()
         # 移除箭头状态修改
         self.status_bar.showMessage("已清空示例文件列表")
@@ -1047,7 +1234,7 @@ class MainWindow(QMainWindow):
         result = self.rename_controller.get_previous_analysis_result()
         if result:
             # 更新分析结果列表
-            self.analysis_files_widget.update_files(result)
+            self.file_list_widget.update_results(result)
             self.status_bar.showMessage("已显示上一个分析结果")
         else:
             self.status_bar.showMessage("没有更早的分析结果")
@@ -1058,7 +1245,7 @@ class MainWindow(QMainWindow):
         result = self.rename_controller.get_next_analysis_result()
         if result:
             # 更新分析结果列表
-            self.analysis_files_widget.update_files(result)
+            self.file_list_widget.update_results(result)
             self.status_bar.showMessage("已显示下一个分析结果")
         else:
             self.status_bar.showMessage("没有更新的分析结果")
@@ -1084,13 +1271,6 @@ class MainWindow(QMainWindow):
         # 可以在此处添加额外的视觉效果，表示分析完成
         pass
 
-    def _sync_example_files(self, files):
-        """
-        同步更新示例文件列表，只添加Edit按钮
-        """
-        self.example_files_widget.add_edit_button_only(files)
-        self.status_bar.showMessage("已同步更新示例文件列表")
-
     def resizeEvent(self, event):
         """
         窗口大小变化事件处理
@@ -1098,101 +1278,25 @@ class MainWindow(QMainWindow):
         """
         super().resizeEvent(event)
         
-        # 强制刷新示例文件列表中的Edit按钮
-        # 延迟10毫秒执行，确保布局完成初步调整
-        QTimer.singleShot(10, self._refresh_example_list)
+        # 表头分割器按比例调整大小后，让表格的列宽跟上
+        # 同一帧内的多次缩放只刷新一次，等布局完成后执行
+        self.layout_refresh.request()
         
     def _refresh_example_list(self):
         """
-        刷新示例文件列表，确保Edit按钮大小正确
+        刷新文件表格
+        
+        Edit按钮由委托按当前列宽绘制，没有需要重新布局的行控件，只需让列宽与表头对齐，
+        视图只重绘可见的单元格。不要直接调用，通过self.layout_refresh.request()安排
         """
-        # 获取当前文件列表
-        for i in range(self.example_files_widget.file_list.count()):
-            item = self.example_files_widget.file_list.item(i)
-            widget = self.example_files_widget.file_list.itemWidget(item)
-            
-            # 如果有小部件，强制其更新布局
-            if widget:
-                # 更新布局
-                widget.updateGeometry()
-                widget.layout().invalidate()
-                widget.layout().activate()
-
-                # 获取Edit按钮并更新其大小策略
-                for j in range(widget.layout().count()):
-                    child_widget = widget.layout().itemAt(j).widget()
-                    if isinstance(child_widget, QPushButton) and child_widget.objectName() == "editButton":
-                        # 重新设置其大小策略
-                        child_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-                        # 移除临时显示按钮的代码，始终保持按钮隐藏状态
-                        child_widget.setVisible(False)
-                        # 强制更新
-                        child_widget.updateGeometry()
-                        
-                # 强制重绘小部件
-                widget.repaint()
-                
-        # 强制重绘整个文件列表
-        self.example_files_widget.file_list.repaint()
+        # 分割器手柄也算在左侧一列内，使每列的起点与对应表头对齐
+        handle_width = self.file_lists_splitter.handleWidth()
+        widths = [size + handle_width for size in self.file_lists_splitter.sizes()]
+        self.file_list_widget.set_column_widths(widths)
 
     def _connect_splitter_signals(self):
         """
         连接分割器的信号以处理大小变化
         """
-        # 连接分割器的splitterMoved信号，在分割器移动后刷新列表
-        self.file_lists_splitter.splitterMoved.connect(self._on_splitter_moved)
-        
-        # 添加分割器移动后强制同步列表滚动的连接
-        self.file_lists_splitter.splitterMoved.connect(self._force_sync_list_scrolling)
-    
-    def _force_sync_list_scrolling(self):
-        """
-        强制同步列表滚动
-        当分割器大小变化时调用，确保所有列表显示相同区域
-        """
-        # 获取第一列的当前滚动值
-        if self.original_files_widget and self.original_files_widget.file_list:
-            scroll_value = self.original_files_widget.file_list.verticalScrollBar().value()
-            
-            # 手动触发滚动同步
-            self.original_files_widget._sync_scroll(scroll_value)
-            self.example_files_widget._sync_scroll(scroll_value)
-            self.analysis_files_widget._sync_scroll(scroll_value)
-
-    def _on_splitter_moved(self, pos, index):
-        """
-        分割器移动处理，确保Edit按钮正确调整大小
-        
-        Args:
-            pos: 位置
-            index: 分割器索引
-        """
-        # 分割器移动后，立即刷新例列表布局
-        QTimer.singleShot(10, self._refresh_example_list)
-        # 添加多次延迟刷新以确保界面正确更新
-        QTimer.singleShot(50, self._refresh_example_list)
-        QTimer.singleShot(200, self._refresh_example_list)
-        
-        # 在分割器移动完成后，确保列表滚动同步
-        QTimer.singleShot(100, self._force_sync_list_scrolling)
-        QTimer.singleShot(300, self._force_sync_list_scrolling)
-
-    def _simulate_splitter_move(self):
-        """
-        模拟分割器移动事件，触发更彻底的刷新
-        """
-        # 获取当前分割器大小
-        current_sizes = self.file_lists_splitter.sizes()
-        if len(current_sizes) >= 3:
-            # 临时稍微调整分割器大小
-            temp_sizes = list(current_sizes)
-            # 稍微调整中间列的大小
-            temp_sizes[1] += 1
-            temp_sizes[2] -= 1
-            self.file_lists_splitter.setSizes(temp_sizes)
-            
-            # 然后立即恢复原来的大小
-            QTimer.singleShot(10, lambda: self.file_lists_splitter.setSizes(current_sizes))
-            
-            # 刷新界面
-            QTimer.singleShot(20, self._refresh_example_list)
\ No newline at end of file
+        # 连接分割器的splitterMoved信号，在分割器移动后让表格列宽跟随表头
+        self.file_lists_splitter.splitterMoved.connect(self.layout_refresh.request)
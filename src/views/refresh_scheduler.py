@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from PySide6.QtCore import QObject, QTimer
+
+class RefreshScheduler(QObject):
+    """
+    合并刷新请求的调度器
+
+    一帧内的多次request()只执行一次回调，代替在窗口缩放、分割器移动等事件中
+    用QTimer.singleShot安排多次延迟刷新。计数器记录请求、执行和被合并的次数。
+    """
+
+    # 一帧的时间（毫秒）
+    FRAME_INTERVAL = 16
+
+    def __init__(self, callback, interval=FRAME_INTERVAL, parent=None):
+        """
+        初始化刷新调度器
+
+        Args:
+            callback (callable): 刷新时调用的函数
+            interval (int): 收到第一个请求后等待的时间（毫秒），期间的请求合并为一次
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._callback = callback
+        self._pending = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+
+        # 计数器
+        self.requested = 0  # 收到的请求次数
+        self.executed = 0   # 实际刷新次数
+        self.coalesced = 0  # 被合并掉的请求次数
+
+    def request(self, *args):
+        """
+        请求一次刷新，已有刷新在等待时只计数不重复安排
+
+        可以直接连接到带参数的信号，参数会被忽略
+        """
+        self.requested += 1
+        if self._pending:
+            self.coalesced += 1
+            return
+        self._pending = True
+        self._timer.start()
+
+    def flush(self):
+        """
+        立即执行等待中的刷新，没有等待中的刷新时什么也不做
+        """
+        self._timer.stop()
+        if not self._pending:
+            return
+        self._pending = False
+        self.executed += 1
+        self._callback()
+
+    def is_pending(self):
+        return self._pending
+
+    def stats(self):
+        """
+        获取计数器
+
+        Returns:
+            dict: requested、executed和coalesced
+        """
+        return {'requested': self.requested, 'executed': self.executed, 'coalesced': self.coalesced}
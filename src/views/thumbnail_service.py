@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import hashlib
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QObject, Signal, Slot, QRunnable, QThreadPool, QStandardPaths
+from PySide6.QtGui import QPixmap, QImage, QImageReader
+
+# 缩略图逻辑尺寸，放得进48像素的行高
+THUMBNAIL_SIZE = 40
+
+def default_cache_dir():
+    """
+    获取默认的缩略图磁盘缓存目录
+
+    Returns:
+        str: 缓存目录路径
+    """
+    return os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), "thumbnails")
+
+def thumbnail_cache_path(cache_dir, path, pixel_size, mtime_ns, file_size):
+    """
+    计算缩略图在磁盘缓存中的路径，文件被修改后键会变化，旧的缩略图自然失效
+
+    Args:
+        cache_dir (str): 缓存目录
+        path (str): 原图路径
+        pixel_size (int): 缩略图像素尺寸
+        mtime_ns (int): 原图修改时间（纳秒）
+        file_size (int): 原图大小
+
+    Returns:
+        str: 缓存文件路径
+    """
+    key = f"{os.path.abspath(path)}\0{pixel_size}\0{mtime_ns}\0{file_size}"
+    digest = hashlib.sha1(key.encode('utf-8', 'surrogatepass')).hexdigest()
+    return os.path.join(cache_dir, digest[:2], digest + ".png")
+
+def load_thumbnail(path, pixel_size, cache_dir=None):
+    """
+    读取一张图片的缩略图，只使用QImage，可以在后台线程中调用
+
+    优先读取磁盘缓存；没有缓存时让QImageReader按缩小后的尺寸解码（JPEG等格式解码时
+    就会跳过多余的像素），然后写入磁盘缓存。
+
+    Args:
+        path (str): 图片路径
+        pixel_size (int): 缩略图的最大边长（像素）
+        cache_dir (str, optional): 磁盘缓存目录，为None时不使用磁盘缓存
+
+    Returns:
+        QImage: 缩略图，不是图片或读取失败时返回空图片
+    """
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return QImage()
+
+    cache_path = None
+    if cache_dir:
+        cache_path = thumbnail_cache_path(cache_dir, path, pixel_size, stat_result.st_mtime_ns, stat_result.st_size)
+        if os.path.isfile(cache_path):
+            image = QImage(cache_path)
+            if not image.isNull():
+                return image
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)  # 按EXIF方向旋转
+    size = reader.size()
+    if size.isValid() and (size.width() > pixel_size or size.height() > pixel_size):
+        size.scale(pixel_size, pixel_size, Qt.KeepAspectRatio)
+        reader.setScaledSize(size)
+    image = reader.read()
+    if image.isNull():
+        return image
+
+    # 不支持按尺寸解码的格式读出的是原图，再缩小一次
+    if image.width() > pixel_size or image.height() > pixel_size:
+        image = image.scaled(pixel_size, pixel_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # 先写临时文件再替换，其他线程不会读到写了一半的缓存
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            if image.save(temp_path, "PNG"):
+                os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+    return image
+
+class _ThumbnailSignals(QObject):
+    """
+    后台任务的信号，QRunnable本身不能发信号
+    """
+    loaded = Signal(str, int, QImage)  # 图片路径、像素尺寸和缩略图（失败时为空图片）
+
+class _ThumbnailTask(QRunnable):
+    """
+    在线程池中生成一张缩略图
+    """
+
+    def __init__(self, path, pixel_size, cache_dir, signals):
+        super().__init__()
+        self.setAutoDelete(False)  # 由服务持有引用，取消时可以从队列中取回
+        self.path = path
+        self.pixel_size = pixel_size
+        self.cache_dir = cache_dir
+        self.signals = signals
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            return
+        image = load_thumbnail(self.path, self.pixel_size, self.cache_dir)
+        if not self.cancelled:
+            self.signals.loaded.emit(self.path, self.pixel_size, image)
+
+class ThumbnailService(QObject):
+    """
+    缩略图服务，在后台线程池中生成缩略图并异步交给文件列表
+
+    thumbnail()只查询内存缓存，没有时排队生成并立即返回None，生成完成后发出
+    thumbnail_ready信号。视图只为可见行调用thumbnail()，滚动后用retain()取消已经
+    滚出视口的请求，所以线程池总是先处理当前看得到的行。
+    """
+
+    # 定义信号
+    thumbnail_ready = Signal(str)  # 缩略图已生成，参数为图片路径
+
+    def __init__(self, size=THUMBNAIL_SIZE, cache_dir=None, max_memory_items=1000,
+                 thread_pool=None, parent=None):
+        """
+        初始化缩略图服务
+
+        Args:
+            size (int): 缩略图逻辑尺寸
+            cache_dir (str, optional): 磁盘缓存目录，为None时使用默认目录，为空字符串时不使用磁盘缓存
+            max_memory_items (int): 内存中最多保留的缩略图数量
+            thread_pool (QThreadPool, optional): 线程池，默认创建一个独立的线程池
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.size = size
+        self.device_pixel_ratio = 1.0
+        self.cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+        self.max_memory_items = max_memory_items
+
+        # 使用独立的线程池，不占用全局线程池
+        if thread_pool is None:
+            thread_pool = QThreadPool(self)
+            thread_pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self.thread_pool = thread_pool
+
+        self._pixmaps = OrderedDict()  # 图片路径 -> QPixmap，按最近使用排序
+        self._pending = {}             # 图片路径 -> 排队或正在执行的任务
+        self._failed = set()           # 无法生成缩略图的路径
+        self._supported = {}           # 扩展名 -> 是否为可解码的图片格式
+        self._formats = {bytes(fmt).decode('ascii', 'ignore').lower()
+                         for fmt in QImageReader.supportedImageFormats()}
+
+        self._signals = _ThumbnailSignals(self)
+        self._signals.loaded.connect(self._on_loaded)
+
+    @property
+    def pixel_size(self):
+        return round(self.size * self.device_pixel_ratio)
+
+    def set_device_pixel_ratio(self, device_pixel_ratio):
+        """
+        设备像素比变化后丢弃内存中的缩略图，按新的像素尺寸重新生成
+        """
+        if device_pixel_ratio != self.device_pixel_ratio:
+            self.device_pixel_ratio = device_pixel_ratio
+            self.cancel_all()
+            self._pixmaps.clear()
+            self._failed.clear()
+
+    def is_supported(self, path):
+        """
+        判断文件是否为可以生成缩略图的图片
+
+        Args:
+            path (str): 文件路径
+
+        Returns:
+            bool: 扩展名是Qt可以解码的图片格式时返回True
+        """
+        extension = os.path.splitext(path)[1][1:].lower()
+        supported = self._supported.get(extension)
+        if supported is None:
+            supported = self._supported[extension] = extension in self._formats
+        return supported
+
+    def thumbnail(self, path):
+        """
+        获取缩略图，不阻塞
+
+        Args:
+            path (str): 图片路径
+
+        Returns:
+            QPixmap: 缩略图，尚未生成或无法生成时返回None
+        """
+        pixmap = self._pixmaps.get(path)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(path)
+            return pixmap
+
+        if path and path not in self._pending and path not in self._failed and self.is_supported(path):
+            task = _ThumbnailTask(path, self.pixel_size, self.cache_dir, self._signals)
+            self._pending[path] = task
+            self.thread_pool.start(task)
+        return None
+
+    def retain(self, paths):
+        """
+        只保留指定路径的请求，取消其他排队中的请求（例如已经滚出视口的行）
+
+        Args:
+            paths (iterable): 需要保留的图片路径
+
+        Returns:
+            int: 取消的请求数量
+        """
+        keep = set(paths)
+        cancelled = 0
+        for path in [path for path in self._pending if path not in keep]:
+            self._cancel(path)
+            cancelled += 1
+        return cancelled
+
+    def invalidate(self, paths):
+        """
+        文件在外部被修改后丢弃对应的缩略图，下次绘制时重新生成
+
+        Args:
+            paths (iterable): 图片路径
+        """
+        for path in paths:
+            self._cancel(path)
+            self._pixmaps.pop(path, None)
+            self._failed.discard(path)
+
+    def cancel_all(self):
+        """
+        取消所有排队中的请求
+        """
+        for path in list(self._pending):
+            self._cancel(path)
+
+    def shutdown(self, timeout_ms=1000):
+        """
+        取消所有请求并等待正在执行的任务结束
+        """
+        self.cancel_all()
+        self.thread_pool.waitForDone(timeout_ms)
+
+    def _cancel(self, path):
+        task = self._pending.pop(path, None)
+        if task is not None:
+            # 还在队列中的任务直接取回，已经开始的任务完成后丢弃结果
+            task.cancelled = True
+            self.thread_pool.tryTake(task)
+
+    @Slot(str, int, QImage)
+    def _on_loaded(self, path, pixel_size, image):
+        task = self._pending.get(path)
+        if task is None or task.pixel_size != pixel_size:
+            return
+        del self._pending[path]
+
+        if image.isNull():
+            self._failed.add(path)
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(self.device_pixel_ratio)
+        self._pixmaps[path] = pixmap
+        while len(self._pixmaps) > self.max_memory_items:
+            self._pixmaps.popitem(last=False)
+        self.thumbnail_ready.emit(path)
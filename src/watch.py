@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import stat
+
+# 确保能够引用项目内模块（作为脚本运行或以src.watch导入时都可以）
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from cli import run_in_thread, group_files, analyze_batches
+from utils.directory_watcher import DirectoryWatcher, EVENT_ADDED, EVENT_RENAMED, EVENT_OVERFLOW, BACKEND_AUTO
+from utils.rename_planner import RenamePlanner
+from utils.rename_journal import RenameJournal
+
+class WatchRenamer:
+    """
+    监视收件文件夹，按保存的规则重命名新到达的文件
+
+    新文件先进入等待列表，每隔window秒检查一次：大小和修改时间在stable秒内
+    没有变化的文件视为已写完，和同一轮的其他文件一起处理。能按规则计算新名称的
+    文件在本地重命名，不调用AI；其余文件在提供了示例时交给AI分析。每一批生成
+    一个重命名计划，执行时写入一个重命名日志，可以用undo撤销。
+
+    本监视器重命名产生的文件不会再次处理：刚产生的路径在内存中记录一段时间；
+    读取已有文件时（--existing启动、事件溢出后）跳过重命名日志中记录的目标文件，
+    重启后也不会对自己的结果再次改名；已经符合规则输出格式的文件名也直接跳过。
+    """
+
+    # 自己产生的路径保留多久（秒），期间再次出现（重命名事件、事件溢出后重新读取）时忽略
+    OWN_TARGET_TTL = 600.0
+
+    # 读取已有文件时最多查看的重命名日志数量
+    MAX_JOURNALS_SCANNED = 200
+
+    def __init__(self, inbox, rename_controller, rule=None, examples=None, window=1.0, stable=1.0,
+                 use_ai=True, backend=BACKEND_AUTO, poll_interval=1.0):
+        """
+        初始化监视器
+
+        Args:
+            inbox (str): 收件文件夹
+            rename_controller (RenameController): 重命名控制器，journal_dir决定日志位置
+            rule (RenameRule, optional): 本地重命名规则
+            examples (list, optional): AI分析用的示例列表，每个元素是包含original_name和new_name的字典
+            window (float): 合并新文件的时间窗口（秒）
+            stable (float): 文件大小和修改时间保持不变多久视为已写完（秒）
+            use_ai (bool): 规则无法应用时是否调用AI
+            backend (str): 文件夹监视后端
+            poll_interval (float): 轮询后端的检查间隔（秒）
+        """
+        self.inbox = os.path.abspath(inbox)
+        self.rename_controller = rename_controller
+        self.rule = rule
+        self.examples = examples or []
+        self.window = window
+        self.stable = stable
+        self.use_ai = use_ai
+        self.backend = backend
+        self.poll_interval = poll_interval
+
+        self._pending = {}      # 路径 -> ((大小, 修改时间), 首次看到该状态的时间)，尚未检查时为None
+        self._own_targets = {}  # 本监视器重命名产生的路径 -> 产生时间
+        self._last_check = 0.0
+
+        # 计数器
+        self.stats = {'batches': 0, 'renamed': 0, 'by_rule': 0, 'by_ai': 0, 'unresolved': 0, 'errors': 0,
+                      'skipped': 0}
+
+    def journal_targets(self):
+        """
+        读取最近的重命名日志中落在收件文件夹内的目标路径（已撤销的日志除外）
+
+        Returns:
+            set: 目标路径集合
+        """
+        targets = set()
+        for journal in RenameJournal.recent(self.rename_controller.journal_dir, self.MAX_JOURNALS_SCANNED):
+            for _, target in journal.get_operations():
+                if os.path.dirname(target) == self.inbox:
+                    targets.add(target)
+        return targets
+
+    def add_existing(self):
+        """
+        把收件文件夹中已有的文件加入等待列表，跳过重命名日志中记录的目标文件
+        """
+        renamed = self.journal_targets()
+        try:
+            with os.scandir(self.inbox) as iterator:
+                for entry in iterator:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    if entry.path in renamed:
+                        self.stats['skipped'] += 1
+                        continue
+                    self.note_arrival(entry.path)
+        except OSError:
+            pass
+
+    def note_arrival(self, path):
+        """
+        记录新到达的文件
+
+        Args:
+            path (str): 文件路径
+        """
+        if path in self._own_targets:
+            return
+        if os.path.dirname(path) != self.inbox:
+            return
+        if self.rule and self.rule.matches_output(os.path.basename(path)):
+            # 已经是规则的输出格式，再次应用会重复改名
+            self.stats['skipped'] += 1
+            return
+        if not self._pending:
+            # 时间窗口从第一个新文件到达时开始，之后到达的文件合并到同一批
+            self._last_check = time.time()
+        self._pending[path] = None
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def take_stable(self, now=None):
+        """
+        取出已写完的文件
+
+        Args:
+            now (float, optional): 当前时间（time.time()）
+
+        Returns:
+            list: 文件路径列表
+        """
+        now = time.time() if now is None else now
+        stable_paths = []
+        for path, last in list(self._pending.items()):
+            try:
+                file_stat = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            if not stat.S_ISREG(file_stat.st_mode):
+                del self._pending[path]
+                continue
+
+            signature = (file_stat.st_size, file_stat.st_mtime_ns)
+            if last is None or last[0] != signature:
+                # 移入的文件修改时间较早，不需要再等待
+                if now - file_stat.st_mtime >= self.stable:
+                    stable_paths.append(path)
+                    del self._pending[path]
+                else:
+                    self._pending[path] = (signature, now)
+            elif now - last[1] >= self.stable:
+                stable_paths.append(path)
+                del self._pending[path]
+        return stable_paths
+
+    async def rename_batch(self, paths):
+        """
+        重命名一批文件
+
+        Args:
+            paths (list): 文件路径列表
+
+        Returns:
+            dict: apply_rename()的结果，没有需要重命名的文件时返回None
+        """
+        rename_pairs = []
+        unresolved = []
+        for path in paths:
+            name = os.path.basename(path)
+            new_name = self.rule.apply(name) if self.rule else None
+            if new_name is None:
+                unresolved.append({'name': name, 'path': path, 'is_folder': False})
+            elif new_name != name:
+                rename_pairs.append((path, new_name))
+        self.stats['by_rule'] += len(rename_pairs)
+
+        if unresolved and self.use_ai and self.examples:
+            ai_pairs, errors = await analyze_batches(
+                self.rename_controller.ai_client, group_files(unresolved), self.examples)
+            rename_pairs.extend(pair for pair in ai_pairs if os.path.basename(pair[0]) != pair[1])
+            self.stats['by_ai'] += len(ai_pairs)
+            self.stats['errors'] += len(errors)
+            self.stats['unresolved'] += len(unresolved) - len(ai_pairs)
+        else:
+            self.stats['unresolved'] += len(unresolved)
+
+        if not rename_pairs:
+            return None
+
+        plan = await run_in_thread(RenamePlanner.plan, rename_pairs)
+        result = await run_in_thread(self.rename_controller.apply_rename, plan, 'journal')
+
+        now = time.time()
+        for _, target in result.get('operations') or []:
+            self._own_targets[target] = now
+        self.stats['batches'] += 1
+        self.stats['renamed'] += result.get('count', 0)
+        self.stats['errors'] += len(result.get('errors') or [])
+        return result
+
+    def _prune_own_targets(self, now):
+        expired = [path for path, created in self._own_targets.items() if now - created > self.OWN_TARGET_TTL]
+        for path in expired:
+            del self._own_targets[path]
+
+    async def run(self, process_existing=False, on_batch=None, stop_event=None):
+        """
+        开始监视，直到被取消或stop_event被设置
+
+        Args:
+            process_existing (bool): 是否处理启动时已有的文件
+            on_batch (callable, optional): 每处理一批调用一次，参数为(文件数量, apply_rename()的结果)
+            stop_event (asyncio.Event, optional): 设置后停止监视
+        """
+        watcher = DirectoryWatcher.create(self.backend, self.poll_interval)
+        try:
+            if not watcher.add_path(self.inbox):
+                raise OSError(f"无法监视文件夹: {self.inbox}")
+            if process_existing:
+                self.add_existing()
+
+            while stop_event is None or not stop_event.is_set():
+                events = await run_in_thread(watcher.read_events, self.window)
+                for event in events:
+                    if event.kind == EVENT_OVERFLOW:
+                        # 部分事件已丢失，重新读取收件文件夹
+                        self.add_existing()
+                    elif event.kind == EVENT_ADDED and not event.is_folder:
+                        self.note_arrival(event.path)
+                    elif event.kind == EVENT_RENAMED and not event.is_folder:
+                        self.note_arrival(event.dest_path)
+
+                now = time.time()
+                if not self._pending or now - self._last_check < self.window:
+                    continue
+                self._last_check = now
+                self._prune_own_targets(now)
+
+                stable_paths = self.take_stable(now)
+                if stable_paths:
+                    result = await self.rename_batch(stable_paths)
+                    if on_batch:
+                        on_batch(len(stable_paths), result)
+        finally:
+            watcher.close()
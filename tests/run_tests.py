@@ -11,7 +11,26 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 # 导入测试模块
 from test_config_manager import TestConfigManager
 from test_file_model import TestFileModel
+from test_file_controller import TestFileController
 from test_file_operations import TestFileOperations
+from test_rename_planner import TestRenamePlanner
+from test_rename_journal import TestRenameJournal
+from test_file_scanner import TestFileScanner
+from test_directory_watcher import TestDirectoryWatcher
+from test_columnar_store import TestColumnarStore
+from test_file_list_model import TestFileTableModel
+from test_file_list_widget import TestFileListWidget
+from test_icon_cache import TestIconCache
+from test_thumbnail_service import TestThumbnailService
+from test_refresh_scheduler import TestRefreshScheduler
+from test_rename_model import TestRenameModel
+from test_rename_controller import TestRenameController
+from test_session_store import TestSessionStore
+from test_session_controller import TestSessionController
+from test_cli import TestCli
+from test_job_queue import TestJobQueue
+from test_rename_rule import TestRenameRule
+from test_watch import TestWatchRenamer
 
 if __name__ == '__main__':
     # 创建测试套件
@@ -20,7 +39,26 @@ if __name__ == '__main__':
     # 添加测试用例
     test_suite.addTest(unittest.makeSuite(TestConfigManager))
     test_suite.addTest(unittest.makeSuite(TestFileModel))
+    test_suite.addTest(unittest.makeSuite(TestFileController))
     test_suite.addTest(unittest.makeSuite(TestFileOperations))
+    test_suite.addTest(unittest.makeSuite(TestRenamePlanner))
+    test_suite.addTest(unittest.makeSuite(TestRenameJournal))
+    test_suite.addTest(unittest.makeSuite(TestFileScanner))
+    test_suite.addTest(unittest.makeSuite(TestDirectoryWatcher))
+    test_suite.addTest(unittest.makeSuite(TestColumnarStore))
+    test_suite.addTest(unittest.makeSuite(TestFileTableModel))
+    test_suite.addTest(unittest.makeSuite(TestFileListWidget))
+    test_suite.addTest(unittest.makeSuite(TestIconCache))
+    test_suite.addTest(unittest.makeSuite(TestThumbnailService))
+    test_suite.addTest(unittest.makeSuite(TestRefreshScheduler))
+    test_suite.addTest(unittest.makeSuite(TestRenameModel))
+    test_suite.addTest(unittest.makeSuite(TestRenameController))
+    test_suite.addTest(unittest.makeSuite(TestSessionStore))
+    test_suite.addTest(unittest.makeSuite(TestSessionController))
+    test_suite.addTest(unittest.makeSuite(TestCli))
+    test_suite.addTest(unittest.makeSuite(TestJobQueue))
+    test_suite.addTest(unittest.makeSuite(TestRenameRule))
+    test_suite.addTest(unittest.makeSuite(TestWatchRenamer))
     
     # 运行测试
     runner = unittest.TextTestRunner(verbosity=2)
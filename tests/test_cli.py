@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import time
+import unittest
+import subprocess
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cli import (load_examples, group_files, load_map, save_map, EXIT_OK, EXIT_FAILED, EXIT_USAGE,
+                     EXIT_NO_FILES, EXIT_UNAVAILABLE)
+from src.daemon import DaemonClient
+
+CLI_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'cli.py'))
+
+class TestCli(unittest.TestCase):
+    """
+    命令行模式测试类
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        # 配置和重命名日志写入临时目录
+        self.env = dict(os.environ, HOME=self.test_dir, APPDATA=self.test_dir)
+        for relative_path in ("d1/a.txt", "d1/sub/b.txt", "d2/c.txt"):
+            path = os.path.join(self.test_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'w').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _run(self, *args):
+        return subprocess.run([sys.executable, CLI_PATH] + list(args), cwd=self.test_dir, env=self.env,
+                              capture_output=True, text=True, timeout=60)
+
+    def test_load_examples_and_group_files(self):
+        """
+        测试示例文件与命令行示例合并，文件按文件夹分组
+        """
+        examples_file = os.path.join(self.test_dir, "examples.txt")
+        with open(examples_file, 'w', encoding='utf-8') as f:
+            f.write("a.txt\tA.txt\nno tab here\n")
+        examples = load_examples([["b.txt", "B.txt"]], examples_file)
+        self.assertEqual(examples, [{'original_name': "a.txt", 'new_name': "A.txt"},
+                                    {'original_name': "b.txt", 'new_name': "B.txt"}])
+
+        files = [{'name': f"f{i}", 'path': f"/{i % 2}/f{i}"} for i in range(5)]
+        batches = group_files(files, batch_size=2)
+        self.assertEqual([[entry['name'] for entry in batch] for batch in batches],
+                         [["f0", "f2"], ["f4"], ["f1", "f3"]])
+
+    def test_apply_map_and_undo(self):
+        """
+        测试按保存的映射执行重命名、撤销以及退出码
+        """
+        map_file = os.path.join(self.test_dir, "map.json")
+        with open(map_file, 'w', encoding='utf-8') as f:
+            json.dump({"d1/a.txt": "A.txt", "d1/sub/b.txt": "B.txt", "d2/c.txt": "C.txt"}, f)
+
+        result = self._run("plan", "d1", "--map", map_file, "--json")
+        self.assertEqual(result.returncode, EXIT_OK, result.stderr)
+        self.assertEqual(json.loads(result.stdout)['summary']['executable'], 2)
+
+        # 只处理给定路径下的文件
+        result = self._run("apply", "d1", "--map", map_file)
+        self.assertEqual(result.returncode, EXIT_OK, result.stderr)
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "d1", "sub", "B.txt")))
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "d2", "c.txt")))
+
+        self.assertEqual(self._run("undo").returncode, EXIT_OK)
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "d1", "a.txt")))
+        self.assertEqual(self._run("undo").returncode, EXIT_FAILED)
+
+        # 列式映射文件：保存后按映射列读取，结果与JSON映射相同
+        columnar_file = os.path.join(self.test_dir, "map.cols")
+        save_map(columnar_file, [(os.path.join(self.test_dir, "d2", "c.txt"), "C.txt"),
+                                 (os.path.join(self.test_dir, "d1", "a.txt"), "a.txt")])
+        self.assertEqual(load_map(columnar_file), [(os.path.join(self.test_dir, "d2", "c.txt"), "C.txt")])
+        result = self._run("apply", "d2", "--map", columnar_file)
+        self.assertEqual(result.returncode, EXIT_OK, result.stderr)
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "d2", "C.txt")))
+
+        # 没有示例和没有文件
+        self.assertEqual(self._run("plan", "d1").returncode, EXIT_USAGE)
+        self.assertEqual(self._run("plan", "missing", "-e", "a", "b").returncode, EXIT_NO_FILES)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "需要Unix套接字")
+    def test_headless_analysis_keeps_no_history(self):
+        """
+        测试无界面控制器的分析结果不写入重命名模型的历史记录
+        """
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); from cli import create_controllers; "
+                "_, controller = create_controllers(); "
+                "controller.ai_client.analysis_completed.emit({'rename_map': {'a.txt': 'A.txt'}}); "
+                "print(len(controller.rename_model.get_history()))")
+        result = subprocess.run([sys.executable, "-c", code, os.path.dirname(CLI_PATH)], cwd=self.test_dir,
+                                env=self.env, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "0")
+
+    def test_daemon_jobs(self):
+        """
+        测试守护进程接收任务、执行重命名并返回任务状态
+        """
+        socket_path = os.path.join(self.test_dir, "daemon.sock")
+        token_file = os.path.join(self.test_dir, "daemon.token")
+        server = subprocess.Popen([sys.executable, CLI_PATH, "serve", "--socket", socket_path,
+                                   "--token-file", token_file],
+                                  cwd=self.test_dir, env=self.env, stderr=subprocess.DEVNULL)
+        try:
+            for _ in range(100):
+                if os.path.exists(socket_path):
+                    break
+                time.sleep(0.05)
+
+            # 令牌文件只有当前用户可以读取，缺少令牌、来自浏览器页面或不是JSON的请求被拒绝
+            self.assertEqual(os.stat(token_file).st_mode & 0o777, 0o600)
+            client = DaemonClient(socket_path=socket_path, token_file=token_file)
+            request = {'paths': [self.test_dir], 'examples': []}
+            intruder = DaemonClient(socket_path=socket_path, token="wrong")
+            self.assertEqual(intruder.request('POST', '/jobs', request)[0], 401)
+            self.assertEqual(client.request('POST', '/jobs', request, {'Origin': "http://example.com"})[0], 403)
+            self.assertEqual(client.request('POST', '/jobs', request, {'Content-Type': "text/plain"})[0], 415)
+            self.assertEqual(client.request('GET', '/jobs', headers={'Host': "evil.example:8770"})[0], 403)
+            self.assertEqual(client.request('GET', '/health', headers={'Host': "127.0.0.1:8770"})[0], 200)
+            self.assertEqual(client.request('GET', '/jobs')[1]['jobs'], [])
+
+            # 命令行客户端使用错误的令牌时输出守护进程的错误信息，不打印异常堆栈
+            wrong_token_file = os.path.join(self.test_dir, "wrong.token")
+            with open(wrong_token_file, 'w') as f:
+                f.write("wrong")
+            address = ["--socket", socket_path, "--token-file", wrong_token_file]
+            for args in (["status"], ["status", "1"], ["submit", "d1", "-e", "a.txt", "b.txt", "--wait"]):
+                result = self._run(*(args + address))
+                self.assertEqual(result.returncode, EXIT_UNAVAILABLE, result.stderr)
+                self.assertIn("访问令牌", result.stderr)
+                self.assertNotIn("Traceback", result.stderr)
+
+            d1 = os.path.join(self.test_dir, "d1")
+            job_id = client.submit({'paths': [d1], 'map': {os.path.join(d1, "a.txt"): "A.txt"},
+                                    'options': {'apply': True}})
+            job = client.wait(job_id, interval=0.05, timeout=30)
+            self.assertEqual(job['status'], "done")
+            self.assertEqual(job['result']['count'], 1)
+            self.assertTrue(os.path.exists(os.path.join(d1, "A.txt")))
+
+            # 失败的任务记录错误和退出码
+            job = client.wait(client.submit({'paths': [d1], 'examples': []}), interval=0.05, timeout=30)
+            self.assertEqual((job['status'], job['exit_code']), ("failed", EXIT_USAGE))
+            self.assertEqual(client.request('GET', '/health')[1]['jobs'], {'done': 1, 'failed': 1})
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        self.assertFalse(os.path.exists(socket_path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.columnar_store import ColumnarFileStore
+
+class TestColumnarStore(unittest.TestCase):
+    """
+    列式文件存储测试类
+    """
+
+    def setUp(self):
+        """
+        测试前设置
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.paths = [
+            "/photos/a/IMG_1.jpg", "/photos/a/IMG_2.JPG", "/photos/a/notes.txt",
+            "/photos/b/IMG_1.jpg", "/photos/b/raw",
+        ]
+        self.store = ColumnarFileStore.from_paths(
+            [(path, path.endswith("raw")) for path in self.paths])
+
+    def tearDown(self):
+        """
+        测试后清理
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_add_and_lookup(self):
+        """
+        测试添加、去重、按路径查找和移除
+        """
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(self.store.add_path("/photos/a/../a/IMG_1.jpg"), -1)
+        self.assertEqual(self.store.find_row("/photos/b/IMG_1.jpg"), 3)
+        self.assertEqual(self.store.get_path(3), "/photos/b/IMG_1.jpg")
+        self.assertTrue(self.store.is_folder(4))
+
+        self.assertTrue(self.store.remove_row(0))
+        self.assertEqual(self.store.find_row("/photos/a/IMG_1.jpg"), -1)
+        self.assertEqual(list(self.store.iter_rows()), [1, 2, 3, 4])
+        self.assertEqual(len(self.store), 4)
+
+    def test_filter_validate_and_rename_map(self):
+        """
+        测试按列过滤、应用重命名映射和校验新文件名
+        """
+        self.assertEqual(list(self.store.filter_rows(extensions=["jpg"])), [0, 1, 3])
+        self.assertEqual(list(self.store.filter_rows(patterns=["IMG_1*"])), [0, 3])
+        self.assertEqual(list(self.store.filter_rows(include_folders=False, patterns=["*"])), [0, 1, 2, 3])
+
+        # 按文件名应用时同名文件都会设置新文件名
+        self.assertEqual(self.store.apply_rename_map({"IMG_1.jpg": "first.jpg"}, by='name'), 2)
+        self.assertEqual(self.store.apply_rename_map({"/photos/a/IMG_2.JPG": "first.jpg",
+                                                      "/photos/a/notes.txt": "x" * 300}), 2)
+
+        problems = self.store.validate()
+        self.assertEqual([row for row, _ in problems], [1, 2])
+
+        self.store.set_new_name(1, "second.jpg")
+        self.store.set_new_name(2, None)
+        self.assertEqual(self.store.validate(), [])
+        self.assertEqual(list(self.store.iter_rename_pairs()), [
+            ("/photos/a/IMG_1.jpg", "first.jpg"),
+            ("/photos/a/IMG_2.JPG", "second.jpg"),
+            ("/photos/b/IMG_1.jpg", "first.jpg"),
+        ])
+
+    def test_save_and_load(self):
+        """
+        测试保存会话文件后映射加载，修改时才复制到内存
+        """
+        self.store.set_new_name(0, "new.jpg")
+        self.store.remove_row(2)
+        session_path = os.path.join(self.test_dir, "session.gycols")
+        self.store.save(session_path)
+
+        for use_mmap in (True, False):
+            loaded = ColumnarFileStore.load(session_path, use_mmap=use_mmap)
+            self.assertEqual(loaded.is_mapped(), use_mmap)
+            self.assertEqual(loaded.to_file_dicts(), self.store.to_file_dicts())
+            self.assertEqual(loaded.get_new_name(0), "new.jpg")
+            self.assertTrue(loaded.is_removed(2))
+
+            # 修改后不再映射，文件本身不变
+            self.assertGreaterEqual(loaded.add_path("/photos/c/new.png"), 0)
+            self.assertFalse(loaded.is_mapped())
+            self.assertEqual(len(loaded), 5)
+            loaded.close()
+
+        self.assertEqual(len(ColumnarFileStore.load(session_path, use_mmap=False)), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.directory_watcher import (
+    InotifyWatcher, PollingWatcher, WatchEvent,
+    EVENT_ADDED, EVENT_REMOVED, EVENT_RENAMED
+)
+
+class TestDirectoryWatcher(unittest.TestCase):
+    """
+    文件夹监视器测试类
+    """
+
+    def setUp(self):
+        """
+        测试前设置
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.other_dir = os.path.join(self.test_dir, "other")
+        os.mkdir(self.other_dir)
+        for name in ["a.txt", "b.txt"]:
+            with open(self._path(name), "w") as f:
+                f.write(name)
+
+    def tearDown(self):
+        """
+        测试后清理
+        """
+        shutil.rmtree(self.test_dir)
+
+    def _path(self, name):
+        return os.path.join(self.test_dir, name)
+
+    def _make_changes(self):
+        """
+        在两个被监视的文件夹中增加、删除和重命名文件，返回期望的事件
+        """
+        with open(self._path("c.txt"), "w") as f:
+            f.write("c")
+        os.remove(self._path("a.txt"))
+        os.rename(self._path("b.txt"), os.path.join(self.other_dir, "moved.txt"))
+
+        return [
+            WatchEvent(EVENT_ADDED, self._path("c.txt")),
+            WatchEvent(EVENT_REMOVED, self._path("a.txt")),
+            WatchEvent(EVENT_RENAMED, self._path("b.txt"), os.path.join(self.other_dir, "moved.txt")),
+        ]
+
+    def _collect(self, watcher, expected_count):
+        events = []
+        for _ in range(20):
+            events.extend(watcher.read_events(0.1))
+            if len(events) >= expected_count:
+                break
+        return events
+
+    def test_polling_watcher(self):
+        """
+        测试轮询监视器通过目录快照比较得出增删和重命名
+        """
+        watcher = PollingWatcher(poll_interval=0)
+        self.assertTrue(watcher.add_path(self.test_dir))
+        self.assertTrue(watcher.add_path(self.other_dir))
+        self.assertEqual(watcher.check(), [])
+
+        expected = self._make_changes()
+        events = self._collect(watcher, len(expected))
+
+        self.assertCountEqual(events, expected)
+        self.assertEqual(watcher.check(), [])
+        watcher.close()
+
+    def test_polling_watcher_removed_folder(self):
+        """
+        测试被监视的文件夹本身被删除
+        """
+        watcher = PollingWatcher(poll_interval=0)
+        watcher.add_path(self.other_dir)
+        shutil.rmtree(self.other_dir)
+
+        self.assertEqual(watcher.check(), [WatchEvent(EVENT_REMOVED, self.other_dir, is_folder=True)])
+        self.assertEqual(watcher.watched_paths(), [])
+
+    @unittest.skipUnless(InotifyWatcher.is_supported(), "当前系统不支持inotify")
+    def test_inotify_watcher(self):
+        """
+        测试inotify监视器按cookie配对重命名
+        """
+        watcher = InotifyWatcher()
+        try:
+            self.assertTrue(watcher.add_path(self.test_dir))
+            self.assertTrue(watcher.add_path(self.other_dir))
+
+            expected = self._make_changes()
+            events = self._collect(watcher, len(expected))
+
+            self.assertCountEqual(events, expected)
+        finally:
+            watcher.close()
+
+if __name__ == '__main__':
+    unittest.main()
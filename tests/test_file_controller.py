@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.controllers.file_controller import FileController
+
+class TestFileController(unittest.TestCase):
+    """
+    文件控制器测试类
+    """
+
+    def setUp(self):
+        """
+        测试前设置
+        """
+        self.controller = FileController(config_manager=None)
+        self.controller.add_files([
+            {'name': "report.pdf", 'path': "/a/report.pdf", 'is_folder': False},
+            {'name': "report.pdf", 'path': "/b/report.pdf", 'is_folder': False},
+            {'name': "data.csv", 'path': "/b/data.csv", 'is_folder': False},
+        ])
+
+    def test_remove_files_by_id(self):
+        """
+        测试按ID移除不同文件夹中的同名文件，只移除选中的一个
+        """
+        removed = []
+        self.controller.files_removed.connect(removed.append)
+        first, second = self.controller.get_files_by_name("report.pdf")
+
+        self.assertEqual(self.controller.remove_files([second['id']]), 1)
+        self.assertEqual([[file_data['path'] for file_data in files] for files in removed], [["/b/report.pdf"]])
+        self.assertEqual(self.controller.get_files_by_name("report.pdf"), [first])
+        self.assertIsNone(self.controller.get_file_by_id(second['id']))
+        self.assertEqual(self.controller.get_file_by_path("/a/report.pdf")['id'], first['id'])
+
+        # 已移除的ID不会再移除其他文件
+        self.assertFalse(self.controller.remove_file(second['id']))
+        self.assertEqual(self.controller.remove_files([second['id']]), 0)
+        self.assertEqual(len(removed), 1)
+
+if __name__ == '__main__':
+    unittest.main()
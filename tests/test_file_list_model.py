@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.views.file_list_model import FileTableModel, COLUMN_ORIGINAL, COLUMN_EXAMPLE, COLUMN_RESULT
+
+class TestFileTableModel(unittest.TestCase):
+    """
+    文件表格模型测试类
+    """
+
+    def _files(self, count):
+        return [{'id': i + 1, 'name': f"f{i}.txt", 'path': f"/d/f{i}.txt"} for i in range(count)]
+
+    def test_add_update_and_remove(self):
+        """
+        测试批量添加、更新和按连续范围移除
+        """
+        model = FileTableModel()
+        inserted = []
+        removed = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+
+        # 整批只插入一次，ID已存在的文件跳过
+        self.assertEqual(model.add_files(self._files(6) + self._files(2)), 6)
+        self.assertEqual(inserted, [(0, 5)])
+        self.assertEqual(model.columnCount(), 3)
+        self.assertEqual(model.data(model.index(2, COLUMN_ORIGINAL)), "f2.txt")
+
+        # 改名时同步更新文件名索引
+        self.assertTrue(model.update_file(3, {'name': "g2.txt"}))
+        self.assertEqual(model.row_of(3), 2)
+        self.assertEqual(model.rows_of_name("g2.txt"), [2])
+        self.assertEqual(model.rows_of_name("f2.txt"), [])
+        self.assertFalse(model.update_file(99, {'name': "g2.txt"}))
+
+        # 连续的行合并为一次移除，从后往前
+        self.assertEqual(model.remove_ids([2, 3, 5]), [5, 3, 2])
+        self.assertEqual(removed, [(4, 4), (1, 2)])
+        self.assertEqual([f['name'] for f in model.get_files()], ["f0.txt", "f3.txt", "f5.txt"])
+        self.assertEqual(model.row_of(6), 2)
+
+    def test_same_name_in_different_folders(self):
+        """
+        测试不同文件夹中的同名文件各占一行，按ID移除不影响同名的另一行
+        """
+        model = FileTableModel()
+        files = [{'id': 1, 'name': "report.pdf", 'path': "/a/report.pdf"},
+                 {'id': 2, 'name': "report.pdf", 'path': "/b/report.pdf"},
+                 {'id': 3, 'name': "data.csv", 'path': "/b/data.csv"}]
+        self.assertEqual(model.add_files(files), 3)
+        self.assertEqual(model.rowCount(), 3)
+        self.assertEqual(model.rows_of_name("report.pdf"), [0, 1])
+
+        # 命名示范按文件名对应，同名的行一起更新；编辑其中一行时另一行同步
+        self.assertTrue(model.set_example("report.pdf", "r.pdf"))
+        self.assertEqual([model.data(model.index(row, COLUMN_EXAMPLE)) for row in range(3)], ["r.pdf", "r.pdf", ""])
+        model.setData(model.index(1, COLUMN_EXAMPLE), "s.pdf")
+        self.assertEqual(model.get_file(1)['example'], "s.pdf")
+
+        # 按ID更新和移除只影响对应的一行
+        model.update_files({2: {'stale': True}})
+        self.assertFalse(model.get_file(1)['stale'])
+        self.assertEqual(model.remove_ids([1]), [1])
+        self.assertEqual(model.get_file(2)['path'], "/b/report.pdf")
+        self.assertEqual(model.rows_of_name("report.pdf"), [0])
+        self.assertEqual(model.row_of(3), 1)
+
+    def test_example_and_result_columns(self):
+        """
+        测试命名示范只有开始编辑后可编辑，分析结果整列替换
+        """
+        model = FileTableModel()
+        edits = []
+        changes = []
+        model.name_edited.connect(lambda name, new_name: edits.append((name, new_name)))
+        model.dataChanged.connect(lambda top, bottom: changes.append((top.row(), bottom.row(), top.column())))
+        model.add_files(self._files(3))
+
+        index = model.index(0, COLUMN_EXAMPLE)
+        self.assertEqual(model.data(index), "")
+        self.assertFalse(model.flags(index) & model.flags(index).ItemIsEditable)
+        self.assertFalse(model.flags(model.index(0, COLUMN_ORIGINAL)) & model.flags(index).ItemIsEditable)
+
+        self.assertTrue(model.set_example("f0.txt", "f0.txt"))
+        self.assertTrue(model.flags(index) & model.flags(index).ItemIsEditable)
+        self.assertTrue(model.setData(index, "c.txt"))
+        self.assertEqual(model.data(index), "c.txt")
+        self.assertEqual(edits, [("f0.txt", "c.txt")])
+
+        # 一次分析结果只通知一次，不在结果中的行清空
+        changes.clear()
+        self.assertEqual(model.set_results({'f0.txt': "a.txt", 'f1.txt': {'new_name': "b.txt"}}), 2)
+        self.assertEqual(changes, [(0, 2, COLUMN_RESULT)])
+        self.assertEqual(model.data(model.index(1, COLUMN_RESULT)), "b.txt")
+        model.set_results({'f2.txt': "z.txt"})
+        self.assertEqual([model.data(model.index(row, COLUMN_RESULT)) for row in range(3)], ["", "", "z.txt"])
+
+    def test_batch_update_uses_row_index(self):
+        """
+        测试批量更新按行号索引定位并只通知一次，移除后索引保持一致
+        """
+        model = FileTableModel()
+        changes = []
+        model.dataChanged.connect(lambda top, bottom: changes.append((top.row(), bottom.row())))
+        model.add_files(self._files(10))
+
+        self.assertEqual(model.update_files({3: {'stale': True}, 8: {'stale': True}, 99: {}}), 2)
+        self.assertEqual(changes, [(2, 7)])
+        self.assertTrue(model.get_file(8)['stale'])
+        self.assertFalse(model.get_file(4).get('stale'))
+
+        self.assertEqual(model.remove_rows([0, 4, 5]), [6, 5, 1])
+        self.assertEqual([model.row_of(f['id']) for f in model.get_files()], list(range(7)))
+        self.assertEqual(model.row_of(5), -1)
+        self.assertEqual(model.rows_of_name("f4.txt"), [])
+
+    def test_rows_share_file_strings(self):
+        """
+        测试按列存储时只引用传入的字符串，不复制文件数据字典
+        """
+        model = FileTableModel()
+        files = self._files(3)
+        model.add_files(files)
+
+        file_row = model.data(model.index(1, COLUMN_ORIGINAL), FileTableModel.FileDataRole)
+        self.assertIs(file_row.name, files[1]['name'])
+        self.assertIs(file_row.path, files[1]['path'])
+        self.assertIs(model.data(model.index(1, COLUMN_ORIGINAL)), files[1]['name'])
+
+        # 示范和结果不写回调用方的字典
+        model.set_example("f1.txt", "x.txt")
+        self.assertNotIn('example', files[1])
+        self.assertEqual(model.get_file(2)['example'], "x.txt")
+
+if __name__ == '__main__':
+    unittest.main()
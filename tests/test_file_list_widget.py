@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+# 没有显示器时使用离屏平台
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from src.views.file_list_widget import FileListWidget
+from src.views.file_list_model import COLUMN_EXAMPLE
+
+class TestFileListWidget(unittest.TestCase):
+    """
+    文件列表控件测试类
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.widget = FileListWidget()
+        self.widget.resize(600, 800)
+        self.widget.add_files([{'id': i + 1, 'name': f"f{i}.txt", 'path': f"/d/f{i}.txt"} for i in range(20)])
+        self.widget.show()
+        QApplication.processEvents()
+
+        # 记录视口的重绘区域
+        self.updated = []
+        viewport = self.widget.file_list.viewport()
+        viewport.update = self.updated.append
+
+    def tearDown(self):
+        self.widget.close()
+        self.widget.deleteLater()
+
+    def _example_rect(self, row):
+        return self.widget.file_list.visualRect(self.widget.model.index(row, COLUMN_EXAMPLE))
+
+    def test_hover_repaints_changed_rows(self):
+        """
+        测试悬停行变化时只重绘原来和现在所在行的命名示范单元格
+        """
+        self.widget._set_hover_row(3)
+        self.assertEqual(self.widget.delegate.hover_row, 3)
+        self.assertEqual(self.updated, [self._example_rect(3)])
+
+        self.updated.clear()
+        self.widget._set_hover_row(5)
+        self.assertEqual(self.updated, [self._example_rect(3), self._example_rect(5)])
+
+        # 同一行不重绘
+        self.updated.clear()
+        self.widget._set_hover_row(5)
+        self.assertEqual(self.updated, [])
+
+        # 离开列表只重绘原来的行，超出范围的行号被忽略
+        self.widget._set_hover_row(-1)
+        self.assertEqual(self.updated, [self._example_rect(5)])
+        self.updated.clear()
+        self.widget._set_hover_row(100)
+        self.assertEqual(self.updated, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@
 import os
 import sys
 import unittest
+import tracemalloc
 
 # 添加父目录到路径以便导入
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -84,6 +85,11 @@ class TestFileModel(unittest.TestCase):
         file_dicts = self.file_model.get_file_dicts()
         self.assertEqual(len(file_dicts), 1)
         self.assertEqual(file_dicts[0]['name'], "test.txt")
+        
+        # 模型未修改时不重新构建，修改后重新构建
+        self.assertIs(self.file_model.get_file_dicts(), file_dicts)
+        self.file_model.add_file("/path/to/other.txt")
+        self.assertEqual(len(self.file_model.get_file_dicts()), 2)
     
     def test_remove_file(self):
         """
@@ -108,6 +114,16 @@ class TestFileModel(unittest.TestCase):
         
         # 验证结果
         self.assertFalse(result)
+        
+        # 反复添加和移除时不保留已移除文件的位置，ID也不会被复用
+        ids = set()
+        for i in range(1000):
+            file_item = self.file_model.add_file(f"/path/to/churn_{i}.txt")
+            ids.add(file_item.file_id)
+            self.assertTrue(self.file_model.remove_file_by_id(file_item.file_id))
+        self.assertEqual(len(ids), 1000)
+        self.assertEqual(len(self.file_model._files), 0)
+        self.assertIsNone(self.file_model.get_file_by_id(file_item.file_id))
     
     def test_clear(self):
         """
@@ -161,5 +177,96 @@ class TestFileModel(unittest.TestCase):
         # 验证结果
         self.assertFalse(result)
 
+    def test_duplicate_names_and_indexes(self):
+        """
+        测试不同文件夹中的同名文件以及按路径、文件夹查找
+        """
+        first = self.file_model.add_file("/a/report.pdf")
+        second = self.file_model.add_file("/b/report.pdf")
+        self.file_model.add_file("/b/sub/data.csv")
+
+        # 同名文件都被保留，相同路径不会重复添加
+        self.assertIsNotNone(second)
+        self.assertNotEqual(first.file_id, second.file_id)
+        self.assertIsNone(self.file_model.add_file("/a/report.pdf"))
+        self.assertEqual(self.file_model.get_file_count(), 3)
+        self.assertEqual(self.file_model.get_files_by_name("report.pdf"), [first, second])
+        self.assertIs(self.file_model.get_file("report.pdf"), first)
+
+        # 按路径、ID和文件夹查找
+        self.assertIs(self.file_model.get_file_by_path("/b/report.pdf"), second)
+        self.assertIs(self.file_model.get_file_by_id(second.file_id), second)
+        self.assertEqual(self.file_model.get_files_in_dir("/b"), [second])
+        self.assertEqual(len(self.file_model.get_files_under("/b")), 2)
+
+        # 按ID移除和更新路径时索引同步更新
+        self.assertTrue(self.file_model.remove_file_by_id(first.file_id))
+        self.assertIs(self.file_model.get_file("report.pdf"), second)
+        self.assertTrue(self.file_model.set_file_path(second.file_id, "/c/report.pdf"))
+        self.assertIsNone(self.file_model.get_file_by_path("/b/report.pdf"))
+        self.assertEqual(self.file_model.get_files_in_dir("/c"), [second])
+
+    def test_batched_notifications(self):
+        """
+        测试批次内的修改合并为行范围通知
+        """
+        events = []
+        self.file_model.rowsInserted.connect(lambda first, last: events.append(('inserted', first, last)))
+        self.file_model.rowsRemoved.connect(
+            lambda first, last, items: events.append(('removed', first, last, [i.name for i in items])))
+        self.file_model.modelReset.connect(lambda: events.append(('reset',)))
+
+        # 批量添加只发出一次插入通知
+        with self.file_model.batch():
+            for i in range(6):
+                self.file_model.add_file(f"/d/{i}.txt")
+        self.assertEqual(events, [('inserted', 0, 5)])
+
+        # 移除的行按从后往前的连续范围发出，批次中新增又移除的文件不通知
+        events.clear()
+        file_ids = [self.file_model.get_file_at(row).file_id for row in (1, 2, 4)]
+        with self.file_model.batch():
+            for file_id in file_ids:
+                self.file_model.remove_file_by_id(file_id)
+            temp = self.file_model.add_file("/d/temp.txt")
+            self.file_model.remove_file_by_id(temp.file_id)
+            self.file_model.add_file("/d/new.txt")
+            self.assertEqual(events, [])
+        self.assertEqual(events, [('removed', 4, 4, ['4.txt']),
+                                  ('removed', 1, 2, ['1.txt', '2.txt']),
+                                  ('inserted', 3, 3)])
+        self.assertEqual([f.name for f in self.file_model.get_files()],
+                         ['0.txt', '3.txt', '5.txt', 'new.txt'])
+        self.assertEqual(self.file_model.get_row(self.file_model.get_file("new.txt").file_id), 3)
+
+        # 清空时只发出重置通知
+        events.clear()
+        self.file_model.clear()
+        self.assertEqual(events, [('reset',)])
+
+    def test_memory_budget(self):
+        """
+        测试每个文件的内存开销在预算之内（不计传入的路径字符串）
+        """
+        count = 20000
+        paths = [f"/data/album_{i // 500:03d}/IMG_{i:06d}.jpg" for i in range(count)]
+
+        tracemalloc.start()
+        try:
+            with self.file_model.batch():
+                for path in paths:
+                    self.file_model.add_file(path)
+            used, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(self.file_model.get_file_count(), count)
+        self.assertLess(used / count, FileModel.MEMORY_BUDGET_PER_FILE)
+
+        # 清空后ID不会被复用
+        last_id = self.file_model.get_file_at(count - 1).file_id
+        self.file_model.clear()
+        self.assertGreater(self.file_model.add_file("/data/new.jpg").file_id, last_id)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
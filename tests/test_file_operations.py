@@ -83,6 +83,84 @@ class TestFileOperations(unittest.TestCase):
         self.assertFalse(success)
         self.assertIn("不存在", result)
     
+    def test_backup_modes(self):
+        """
+        测试不同备份模式
+        """
+        backup_dir = os.path.join(self.test_dir, "backup")
+        
+        # 硬链接备份不复制数据
+        success, result = FileOperations.create_backup(self.test_file_path, backup_dir, mode="hardlink")
+        self.assertTrue(success)
+        self.assertTrue(os.path.samefile(result, self.test_file_path))
+        
+        # 复制备份
+        success, copy_path = FileOperations.create_backup(self.test_file_path, backup_dir, mode="copy")
+        self.assertTrue(success)
+        self.assertNotEqual(copy_path, result)
+        self.assertFalse(os.path.samefile(copy_path, self.test_file_path))
+        with open(copy_path, "r") as f:
+            self.assertEqual(f.read(), "Test content")
+        
+        # 自动模式总能成功
+        success, result = FileOperations.create_backup(self.test_file_path, backup_dir, mode="auto")
+        self.assertTrue(success)
+        with open(result, "r") as f:
+            self.assertEqual(f.read(), "Test content")
+    
+    def test_create_snapshot(self):
+        """
+        测试批量创建快照
+        """
+        file_paths = []
+        for i in range(10):
+            file_path = os.path.join(self.test_dir, f"file_{i}.txt")
+            with open(file_path, "w") as f:
+                f.write(str(i))
+            file_paths.append(file_path)
+        
+        success, backup_paths, errors = FileOperations.create_snapshot(file_paths, "backup", max_workers=4)
+        
+        # 验证结果
+        self.assertTrue(success)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(backup_paths), 10)
+        for i, file_path in enumerate(file_paths):
+            backup_path = backup_paths[file_path]
+            self.assertEqual(os.path.basename(backup_path), f"file_{i}.txt")
+            self.assertTrue(backup_path.startswith(os.path.join(self.test_dir, "backup")))
+            with open(backup_path, "r") as f:
+                self.assertEqual(f.read(), str(i))
+        
+        # 同一时刻的第二次快照使用新的目录
+        success, second_paths, errors = FileOperations.create_snapshot(file_paths[:1], "backup", mode="copy")
+        self.assertTrue(success, errors)
+        self.assertNotEqual(os.path.dirname(second_paths[file_paths[0]]),
+                            os.path.dirname(backup_paths[file_paths[0]]))
+    
+    def test_create_snapshot_absolute_root(self):
+        """
+        测试绝对快照根目录下按原路径区分不同文件夹中的同名文件
+        """
+        file_paths = []
+        for folder in ("a", "b"):
+            os.makedirs(os.path.join(self.test_dir, folder))
+            file_path = os.path.join(self.test_dir, folder, "report.txt")
+            with open(file_path, "w") as f:
+                f.write(folder)
+            file_paths.append(file_path)
+        
+        snapshot_root = os.path.join(self.test_dir, "snapshots")
+        for _ in range(2):
+            success, backup_paths, errors = FileOperations.create_snapshot(file_paths, snapshot_root, mode="copy")
+            self.assertTrue(success, errors)
+            for file_path in file_paths:
+                backup_path = backup_paths[file_path]
+                self.assertTrue(backup_path.startswith(snapshot_root + os.sep))
+                self.assertTrue(backup_path.endswith(file_path.lstrip(os.sep)))
+                with open(backup_path, "r") as f:
+                    self.assertEqual(f.read(), os.path.basename(os.path.dirname(file_path)))
+    
     def test_get_file_size(self):
         """
         测试获取文件大小
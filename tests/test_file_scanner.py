@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.file_scanner import FileScanner, ScanOptions
+
+class TestFileScanner(unittest.TestCase):
+    """
+    文件扫描器测试类
+    """
+
+    def setUp(self):
+        """
+        测试前设置
+        """
+        self.test_dir = tempfile.mkdtemp()
+        for rel_path in [
+            "a.jpg", "b.txt", ".hidden.jpg",
+            "sub/c.jpg", "sub/d.png",
+            "sub/deep/e.jpg",
+            "backup/old.jpg",
+            ".git/config",
+        ]:
+            path = os.path.join(self.test_dir, *rel_path.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(rel_path)
+
+    def tearDown(self):
+        """
+        测试后清理
+        """
+        shutil.rmtree(self.test_dir)
+
+    def _scan_names(self, **kwargs):
+        scanner = FileScanner(ScanOptions(**kwargs))
+        return sorted(entry['name'] for entry in scanner.scan([self.test_dir]))
+
+    def test_recursive_scan(self):
+        """
+        测试递归扫描，默认跳过隐藏文件和隐藏文件夹
+        """
+        self.assertEqual(self._scan_names(),
+                         ["a.jpg", "b.txt", "c.jpg", "d.png", "e.jpg", "old.jpg"])
+        self.assertIn(".hidden.jpg", self._scan_names(include_hidden=True))
+        self.assertIn("config", self._scan_names(include_hidden=True))
+
+    def test_filters(self):
+        """
+        测试包含、排除通配符和扩展名过滤
+        """
+        self.assertEqual(self._scan_names(extensions=["JPG"], exclude_patterns=["backup"]),
+                         ["a.jpg", "c.jpg", "e.jpg"])
+        self.assertEqual(self._scan_names(include_patterns=["sub/*.png"]), ["d.png"])
+        self.assertEqual(self._scan_names(exclude_patterns=["sub"]), ["a.jpg", "b.txt", "old.jpg"])
+
+    def test_depth_and_count_limits(self):
+        """
+        测试最大深度和最大数量
+        """
+        self.assertEqual(self._scan_names(max_depth=0), ["a.jpg", "b.txt"])
+        self.assertNotIn("e.jpg", self._scan_names(max_depth=1))
+        self.assertEqual(len(self._scan_names(max_count=3)), 3)
+
+    @unittest.skipUnless(hasattr(os, 'symlink') and os.name != 'nt', "需要符号链接")
+    def test_symlink_loops(self):
+        """
+        测试跟随符号链接时指向祖先文件夹的链接不会重复导入文件
+        """
+        os.symlink(self.test_dir, os.path.join(self.test_dir, "sub", "loop"))
+        os.symlink(os.path.join(self.test_dir, "sub"), os.path.join(self.test_dir, "sub", "deep", "up"))
+        self.assertEqual(self._scan_names(follow_symlinks=True),
+                         ["a.jpg", "b.txt", "c.jpg", "d.png", "e.jpg", "old.jpg"])
+
+    def test_non_recursive_and_options_from_dict(self):
+        """
+        测试非递归模式和从设置创建选项
+        """
+        scanner = FileScanner(ScanOptions(recursive=False))
+        entries = list(scanner.scan([self.test_dir, os.path.join(self.test_dir, "a.jpg")]))
+        self.assertEqual([entry['is_folder'] for entry in entries], [True, False])
+
+        options = ScanOptions.from_dict({'max_depth': -1, 'max_count': 0, 'extensions': ['png']})
+        self.assertIsNone(options.max_depth)
+        self.assertIsNone(options.max_count)
+        self.assertEqual(options.extensions, {'.png'})
+
+    def test_stat_paths(self):
+        """
+        测试批量判断路径类型，保持输入顺序并忽略不存在的路径
+        """
+        paths = [os.path.join(self.test_dir, name) for name in ["sub", "missing", "a.jpg", "b.txt"]]
+        expected = [(paths[0], True), (paths[2], False), (paths[3], False)]
+
+        scanner = FileScanner()
+        self.assertEqual(scanner.stat_paths(paths), expected)
+
+        # 低于阈值时逐个判断，达到阈值时读取一次父文件夹
+        scanner.BATCH_STAT_THRESHOLD = 1
+        self.assertEqual(scanner.stat_paths(paths), expected)
+
+    def test_accepts(self):
+        """
+        测试单个路径的增量判断与完整扫描的条件一致
+        """
+        scanner = FileScanner(ScanOptions(max_depth=1, exclude_patterns=["backup"], extensions=["jpg"]))
+        root = self.test_dir
+
+        self.assertTrue(scanner.accepts(os.path.join(root, "sub", "c.jpg"), root))
+        self.assertFalse(scanner.accepts(os.path.join(root, "sub", "d.png"), root))
+        self.assertFalse(scanner.accepts(os.path.join(root, "sub", "deep", "e.jpg"), root))
+        self.assertFalse(scanner.accepts(os.path.join(root, "backup", "old.jpg"), root))
+        self.assertFalse(scanner.accepts(os.path.join(root, ".hidden.jpg"), root))
+        self.assertTrue(scanner.accepts(os.path.join(root, "sub"), root, is_folder=True))
+        self.assertFalse(scanner.accepts(os.path.join(root, "sub", "deep"), root, is_folder=True))
+
+    def test_chunks_and_cancel(self):
+        """
+        测试分块产出和取消扫描
+        """
+        scanner = FileScanner()
+        chunks = list(scanner.scan_chunks([self.test_dir], chunk_size=4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 2])
+
+        scanner = FileScanner()
+        iterator = scanner.scan_chunks([self.test_dir], chunk_size=1)
+        next(iterator)
+        scanner.cancel()
+        self.assertEqual(list(iterator), [])
+
+if __name__ == '__main__':
+    unittest.main()
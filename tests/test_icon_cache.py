@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 没有显示器时使用离屏平台
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QThreadPool, QCoreApplication
+from PySide6.QtGui import QImage, QColor, QPixmapCache
+from PySide6.QtWidgets import QApplication
+from src.views import icon_cache
+from src.views.icon_cache import cached_pixmap, FileIconProvider, MISSING_LIMIT
+
+class TestIconCache(unittest.TestCase):
+    """
+    图标缓存和按扩展名图标提供器测试类
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.icon_dir = os.path.join(self.temp_dir, "types")
+        os.makedirs(self.icon_dir)
+        self.icon_path = os.path.join(self.temp_dir, "file.png")
+        self._save_icon(self.icon_path, "blue")
+        self._save_icon(os.path.join(self.icon_dir, "jpg.png"), "red")
+        QPixmapCache.clear()
+        icon_cache._missing.clear()
+
+        # 记录实际读取磁盘的次数
+        self.reads = []
+        self._read_image = icon_cache._read_image
+        def counting_read(path, size, device_pixel_ratio):
+            self.reads.append(path)
+            return self._read_image(path, size, device_pixel_ratio)
+        icon_cache._read_image = counting_read
+
+    def tearDown(self):
+        icon_cache._read_image = self._read_image
+        icon_cache._missing.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def _save_icon(self, path, color):
+        image = QImage(64, 64, QImage.Format_ARGB32)
+        image.fill(QColor(color))
+        image.save(path)
+
+    def test_cache_hit(self):
+        """
+        测试同一(路径, 尺寸, 像素比)只读取一次，像素比不同时分别缓存
+        """
+        pixmap = cached_pixmap(self.icon_path, 16)
+        self.assertEqual((pixmap.width(), pixmap.height()), (16, 16))
+        self.assertEqual(cached_pixmap(self.icon_path, 16).cacheKey(), pixmap.cacheKey())
+        self.assertEqual(self.reads, [self.icon_path])
+
+        hidpi = cached_pixmap(self.icon_path, 16, 2.0)
+        self.assertEqual((hidpi.width(), hidpi.devicePixelRatio()), (32, 2.0))
+        self.assertEqual(len(self.reads), 2)
+
+    def test_missing_is_bounded(self):
+        """
+        测试加载失败的路径不会重复读取，且失败记录的数量有上限
+        """
+        missing_path = os.path.join(self.temp_dir, "missing.png")
+        self.assertTrue(cached_pixmap(missing_path, 16).isNull())
+        self.assertTrue(cached_pixmap(missing_path, 16).isNull())
+        self.assertEqual(self.reads, [missing_path])
+
+        for i in range(MISSING_LIMIT * 2):
+            cached_pixmap(os.path.join(self.temp_dir, f"missing{i}.png"), 16)
+        self.assertLessEqual(len(icon_cache._missing), MISSING_LIMIT)
+
+    def test_provider_device_pixel_ratio(self):
+        """
+        测试专用图标在后台加载完成前返回通用图标，像素比变化后丢弃旧图标和过期的加载结果
+        """
+        thread_pool = QThreadPool()
+        provider = FileIconProvider(16, icon_dir=self.icon_dir, thread_pool=thread_pool)
+        ready = []
+        provider.icon_ready.connect(ready.append)
+
+        # 通用图标路径是相对于程序目录的，这里只比较专用图标
+        generic = provider.icon_for("photo.jpg")
+        thread_pool.waitForDone()
+        QCoreApplication.processEvents()
+        self.assertEqual(ready, ["jpg"])
+        icon = provider.icon_for("photo.JPG")
+        self.assertNotEqual(icon.cacheKey(), generic.cacheKey())
+        self.assertEqual((icon.width(), icon.devicePixelRatio()), (16, 1.0))
+
+        # 像素比变化后按新的像素比重新加载
+        provider.set_device_pixel_ratio(2.0)
+        self.assertNotEqual(provider.icon_for("photo.jpg").cacheKey(), icon.cacheKey())
+        # 旧像素比下的加载结果被忽略
+        provider._on_loaded("jpg", 1.0, QImage(16, 16, QImage.Format_ARGB32))
+        self.assertIsNone(provider._icons["jpg"])
+        thread_pool.waitForDone()
+        QCoreApplication.processEvents()
+        icon = provider.icon_for("photo.jpg")
+        self.assertEqual((icon.width(), icon.devicePixelRatio()), (32, 2.0))
+        self.assertEqual(ready, ["jpg", "jpg"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import asyncio
+import tempfile
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.job_queue import JobQueue, JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED
+from src.daemon import CachedAnalyzer
+
+class _CountingClient:
+    """
+    记录请求次数的分析客户端，把每个文件名加上前缀
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze_naming_pattern(self, files, examples):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {'rename_map': {entry['name']: "X_" + entry['name'] for entry in files}}
+
+class TestJobQueue(unittest.TestCase):
+    """
+    任务队列测试类
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "daemon.sqlite3")
+        self.queue = JobQueue(self.db_path)
+
+    def tearDown(self):
+        self.queue.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_claim_order_and_restart(self):
+        """
+        测试按提交顺序领取，重新打开时中断的任务重新排队
+        """
+        first = self.queue.submit({'paths': ["/a"]})
+        second = self.queue.submit({'paths': ["/b"]})
+        self.assertEqual(self.queue.claim(), (first, {'paths': ["/a"]}))
+        self.assertEqual(self.queue.get(first)['status'], JOB_RUNNING)
+
+        self.queue.close()
+        self.queue = JobQueue(self.db_path)
+        self.assertEqual(self.queue.counts(), {JOB_QUEUED: 2})
+
+        self.assertEqual(self.queue.claim()[0], first)
+        self.queue.finish(first, {'count': 3})
+        self.assertEqual(self.queue.claim()[0], second)
+        self.queue.fail(second, "失败", 4)
+        self.assertIsNone(self.queue.claim())
+
+        self.assertEqual(self.queue.get(first)['result'], {'count': 3})
+        self.assertEqual(self.queue.get(second)['status'], JOB_FAILED)
+        self.assertEqual(self.queue.get(second)['exit_code'], 4)
+        self.assertEqual([job['id'] for job in self.queue.list_jobs()], [second, first])
+        self.assertEqual(self.queue.counts(), {JOB_DONE: 1, JOB_FAILED: 1})
+
+    def test_interrupted_apply_not_requeued(self):
+        """
+        测试重新打开时中断的重命名任务标记为失败并指向重命名日志，只生成计划的任务重新排队
+        """
+        apply_job = self.queue.submit({'paths': ["/a"], 'options': {'apply': True}})
+        plan_job = self.queue.submit({'paths': ["/b"], 'options': {'apply': False}})
+        self.queue.claim()
+        self.queue.claim()
+
+        self.queue.close()
+        self.queue = JobQueue(self.db_path, "/config/journal")
+        self.assertEqual(self.queue.counts(), {JOB_QUEUED: 1, JOB_FAILED: 1})
+        job = self.queue.get(apply_job)
+        self.assertEqual((job['status'], job['exit_code']), (JOB_FAILED, 1))
+        self.assertIn("/config/journal", job['error'])
+        self.assertIsNotNone(job['finished'])
+        self.assertEqual(self.queue.claim()[0], plan_job)
+
+    def test_cached_analyzer(self):
+        """
+        测试相同的请求只发送一次，结果保存在数据库中
+        """
+        client = _CountingClient()
+        files = [{'name': f"f{i}.txt", 'path': f"/d/f{i}.txt"} for i in range(3)]
+        examples = [{'original_name': "f0.txt", 'new_name': "X_f0.txt"}]
+
+        async def run():
+            analyzer = CachedAnalyzer(client, self.queue, "api", max_requests=2)
+            # 同时提交的相同请求合并，文件顺序不影响缓存键
+            results = await asyncio.gather(analyzer.analyze_naming_pattern(files, examples),
+                                           analyzer.analyze_naming_pattern(files[::-1], examples))
+            cached = await analyzer.analyze_naming_pattern(files, examples)
+            return analyzer, results, cached
+
+        analyzer, results, cached = asyncio.run(run())
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(cached['rename_map']["f2.txt"], "X_f2.txt")
+        self.assertEqual(analyzer.stats(), {'hits': 2, 'misses': 1})
+
+        # 换一组示例需要重新请求
+        asyncio.run(CachedAnalyzer(client, self.queue, "api").analyze_naming_pattern(files, []))
+        self.assertEqual(client.calls, 2)
+
+if __name__ == '__main__':
+    unittest.main()
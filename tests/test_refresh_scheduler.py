@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+from src.views.refresh_scheduler import RefreshScheduler
+
+class TestRefreshScheduler(unittest.TestCase):
+    """
+    刷新调度器测试类
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # 定时器需要事件循环
+        cls.app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    def _wait(self, ms):
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        loop.exec()
+
+    def test_requests_coalesce_into_one_refresh(self):
+        """
+        测试一帧内的多次请求只刷新一次，并记录被合并的次数
+        """
+        calls = []
+        scheduler = RefreshScheduler(lambda: calls.append(1), interval=10)
+
+        for _ in range(5):
+            scheduler.request()
+        self.assertTrue(scheduler.is_pending())
+        self.assertEqual(calls, [])
+
+        self._wait(50)
+        self.assertEqual(calls, [1])
+        self.assertEqual(scheduler.stats(), {'requested': 5, 'executed': 1, 'coalesced': 4})
+
+        # 刷新之后的新请求会再安排一次
+        scheduler.request(0, 1)
+        self._wait(50)
+        self.assertEqual(len(calls), 2)
+
+    def test_flush(self):
+        """
+        测试立即执行等待中的刷新，没有等待中的刷新时不调用回调
+        """
+        calls = []
+        scheduler = RefreshScheduler(lambda: calls.append(1), interval=1000)
+        scheduler.flush()
+        self.assertEqual(calls, [])
+
+        scheduler.request()
+        scheduler.request()
+        scheduler.flush()
+        self.assertEqual(calls, [1])
+        self.assertFalse(scheduler.is_pending())
+
+if __name__ == '__main__':
+    unittest.main()
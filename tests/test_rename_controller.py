@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.models.file_model import FileModel
+from src.controllers.rename_controller import RenameController
+
+class TestRenameController(unittest.TestCase):
+    """
+    重命名控制器测试类
+    """
+
+    def setUp(self):
+        """
+        测试前设置：两个文件夹中各有一个同名文件
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.paths = []
+        for folder in ("a", "b"):
+            os.makedirs(os.path.join(self.test_dir, folder))
+            path = os.path.join(self.test_dir, folder, "report.pdf")
+            with open(path, 'w') as f:
+                f.write(folder)
+            self.paths.append(path)
+
+        self.file_model = FileModel()
+        self.file_items = [self.file_model.add_file(path) for path in self.paths]
+        self.controller = RenameController(None, file_index=self.file_model)
+        self.controller.rename_model.add_history({'rename_map': {"report.pdf": "r.pdf"}})
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _sources(self, plan):
+        return sorted(op.source for op in plan.operations if not op.is_temp)
+
+    def test_plan_renames_all_files_with_name(self):
+        """
+        测试映射中的文件名对应到所有同名文件，没有文件索引时不生成计划
+        """
+        plan = self.controller.plan_rename()
+        self.assertEqual(self._sources(plan), sorted(self.paths))
+
+        # 没有文件索引时不按相对于当前工作目录的裸文件名重命名
+        self.controller.file_index = None
+        self.assertIsNone(self.controller.plan_rename())
+
+    def test_remove_one_of_same_named_files(self):
+        """
+        测试移除两个同名文件中的一个：计划只包含剩下的文件，示例在同名文件全部移除后才移除
+        """
+        removed_examples = []
+        self.controller.examples_removed.connect(removed_examples.append)
+        self.controller.rename_model.add_example("report.pdf", "r.pdf")
+
+        first, second = self.file_items
+        self.file_model.remove_file_by_id(second.file_id)
+        self.controller.remove_files([second.to_dict()])
+        self.assertEqual(self._sources(self.controller.plan_rename()), [first.path])
+        self.assertEqual(self.controller.rename_model.get_example_list()[0]['original_name'], "report.pdf")
+        self.assertEqual(removed_examples, [])
+
+        self.file_model.remove_file_by_id(first.file_id)
+        self.controller.remove_files([first.to_dict()])
+        self.assertIsNone(self.controller.plan_rename())
+        self.assertEqual(self.controller.get_example_files(), [])
+        self.assertEqual(removed_examples, [["report.pdf"]])
+
+if __name__ == '__main__':
+    unittest.main()
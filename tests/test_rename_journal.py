@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import errno
+import unittest
+from unittest import mock
+import tempfile
+import shutil
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.rename_journal import RenameJournal
+from src.utils.rename_planner import RenamePlanner
+
+class TestRenameJournal(unittest.TestCase):
+    """
+    重命名日志测试类
+    """
+    
+    def setUp(self):
+        """
+        测试前设置
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.journal_dir = os.path.join(self.test_dir, "journal")
+        self.files_dir = os.path.join(self.test_dir, "files")
+        os.makedirs(self.files_dir)
+        for name in ["a.txt", "b.txt", "c.txt"]:
+            with open(os.path.join(self.files_dir, name), "w") as f:
+                f.write(name)
+    
+    def tearDown(self):
+        """
+        测试后清理
+        """
+        shutil.rmtree(self.test_dir)
+    
+    def _path(self, name):
+        return os.path.join(self.files_dir, name)
+    
+    def test_record_and_undo(self):
+        """
+        测试记录重命名并撤销
+        """
+        # 执行包含互换的重命名并记录日志
+        plan = RenamePlanner.plan([
+            (self._path("a.txt"), "b.txt"),
+            (self._path("b.txt"), "a.txt"),
+            (self._path("c.txt"), "d.txt"),
+        ])
+        journal = RenameJournal.create(self.journal_dir)
+        RenamePlanner.execute(plan, lambda op: journal.record(op.source, op.target))
+        journal.close()
+        
+        self.assertEqual(sorted(os.listdir(self.files_dir)), ["a.txt", "b.txt", "d.txt"])
+        
+        # 撤销最近一次重命名
+        latest = RenameJournal.latest(self.journal_dir)
+        self.assertIsNotNone(latest)
+        success_count, errors = latest.undo()
+        
+        # 验证恢复
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(os.listdir(self.files_dir)), ["a.txt", "b.txt", "c.txt"])
+        for name in ["a.txt", "b.txt", "c.txt"]:
+            with open(self._path(name)) as f:
+                self.assertEqual(f.read(), name)
+        
+        # 已撤销的日志不会再次撤销
+        self.assertIsNone(RenameJournal.latest(self.journal_dir))
+    
+    def test_undo_does_not_overwrite(self):
+        """
+        测试撤销时不覆盖已占用的原文件名
+        """
+        journal = RenameJournal.create(self.journal_dir)
+        os.rename(self._path("a.txt"), self._path("x.txt"))
+        journal.record(self._path("a.txt"), self._path("x.txt"))
+        journal.close()
+        
+        # 其他程序占用了原文件名
+        with open(self._path("a.txt"), "w") as f:
+            f.write("other")
+        
+        success_count, errors = RenameJournal.latest(self.journal_dir).undo()
+        
+        self.assertEqual(success_count, 0)
+        self.assertEqual(len(errors), 1)
+        with open(self._path("a.txt")) as f:
+            self.assertEqual(f.read(), "other")
+
+    def test_undo_cross_device(self):
+        """
+        测试跨文件系统移动的文件可以撤销（os.rename返回EXDEV时复制后删除）
+        """
+        other_dir = os.path.join(self.test_dir, "other")
+        os.makedirs(other_dir)
+        target = os.path.join(other_dir, "moved.txt")
+        journal = RenameJournal.create(self.journal_dir)
+        os.rename(self._path("a.txt"), target)
+        journal.record(self._path("a.txt"), target)
+        journal.close()
+        
+        def cross_device_rename(source, destination):
+            raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+        
+        with mock.patch("os.rename", side_effect=cross_device_rename):
+            success_count, errors = RenameJournal.latest(self.journal_dir).undo()
+        
+        self.assertEqual((success_count, errors), (1, []))
+        self.assertFalse(os.path.exists(target))
+        with open(self._path("a.txt")) as f:
+            self.assertEqual(f.read(), "a.txt")
+
+if __name__ == '__main__':
+    unittest.main()
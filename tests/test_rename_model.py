@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.rename_model import RenameModel
+
+class TestRenameModel(unittest.TestCase):
+    """
+    重命名模型测试类
+    """
+
+    def _maps(self, count, size=100):
+        # 每次分析只改变一小部分文件名
+        maps = []
+        rename_map = {f"f{i}.jpg": f"a{i}.jpg" for i in range(size)}
+        for version in range(count):
+            rename_map = dict(rename_map)
+            for i in range(version, size, 25):
+                rename_map[f"f{i}.jpg"] = f"v{version}_{i}.jpg"
+            maps.append(rename_map)
+        return maps
+
+    def test_delta_history_navigation(self):
+        """
+        测试历史记录按差异存储，前后切换时得到与原来相同的完整映射
+        """
+        model = RenameModel(max_history=0)
+        maps = self._maps(10)
+        for rename_map in maps:
+            model.add_history({'rename_map': dict(rename_map), 'raw_response': ''})
+
+        histories = model._history
+        self.assertTrue(histories[0].is_checkpoint())
+        self.assertFalse(histories[1].is_checkpoint())
+        self.assertLess(histories[1].entry_count(), len(maps[1]))
+        # 差异链长度受检查点间隔限制
+        self.assertTrue(any(h.is_checkpoint() for h in histories[1:RenameModel.CHECKPOINT_INTERVAL + 1]))
+
+        self.assertEqual(model.get_current_rename_map(), maps[-1])
+        for index in range(len(maps) - 2, -1, -1):
+            self.assertIsNotNone(model.go_to_previous())
+            self.assertEqual(model.get_current_rename_map(), maps[index])
+        self.assertIsNone(model.go_to_previous())
+
+        # 删除文件名和新增分支也能正确还原
+        model.go_to_next()
+        branch = dict(maps[1])
+        del branch["f3.jpg"]
+        branch["new.jpg"] = "n.jpg"
+        model.add_history({'rename_map': dict(branch)})
+        self.assertEqual(len(model._history), 3)
+        self.assertEqual(model.get_current_rename_map(), branch)
+
+    def test_max_history_eviction(self):
+        """
+        测试超过max_history时删除最早的记录，剩余记录仍能还原
+        """
+        model = RenameModel(max_history=3)
+        maps = self._maps(6)
+        for rename_map in maps:
+            model.add_history({'rename_map': dict(rename_map)})
+
+        self.assertEqual(len(model._history), 3)
+        self.assertTrue(model._history[0].is_checkpoint())
+        self.assertEqual(model.get_current_rename_map(), maps[-1])
+        model.go_to_previous()
+        model.go_to_previous()
+        self.assertEqual(model.get_current_rename_map(), maps[3])
+
+        model.set_max_history(1)
+        self.assertEqual(len(model._history), 1)
+        self.assertEqual(model.get_current_rename_map(), maps[-1])
+
+    def test_save_and_load(self):
+        """
+        测试保存时写出完整映射，加载后重新压缩
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            model = RenameModel()
+            maps = self._maps(4)
+            for rename_map in maps:
+                model.add_history({'rename_map': dict(rename_map)})
+            file_path = os.path.join(temp_dir, "history.json")
+            self.assertTrue(model.save_to_file(file_path))
+
+            loaded = RenameModel()
+            self.assertTrue(loaded.load_from_file(file_path))
+            self.assertFalse(loaded._history[1].is_checkpoint())
+            self.assertEqual(loaded.get_current_rename_map(), maps[-1])
+            loaded.go_to_previous()
+            self.assertEqual(loaded.get_current_rename_map(), maps[-2])
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_raw_response_compressed(self):
+        """
+        测试原始响应压缩保存，读取时解压，释放后通过读取函数获取
+        """
+        model = RenameModel()
+        raw_response = '{"rename_map": [' + ",".join(
+            f'{{"original_name": "f{i}.jpg", "new_name": "a{i}.jpg"}}' for i in range(1000)) + ']}'
+        history = model.add_history({'rename_map': {}, 'raw_response': raw_response})
+
+        compressed = history.get_compressed_raw_response()
+        self.assertLess(len(compressed), len(raw_response) // 5)
+        self.assertEqual(history.get_raw_response(), raw_response)
+
+        history.spill_raw_response(lambda: compressed)
+        self.assertEqual(history._raw_response, b"")
+        self.assertEqual(history.to_dict()['raw_response'], raw_response)
+
+    def test_remove_examples(self):
+        """
+        测试批量移除示例只发出一次通知
+        """
+        model = RenameModel()
+        for i in range(5):
+            model.add_example(f"f{i}.jpg", f"a{i}.jpg")
+        removed = []
+        model.examplesRemoved.connect(removed.append)
+
+        self.assertEqual(model.remove_examples(["f1.jpg", "x.jpg", "f3.jpg"]), ["f1.jpg", "f3.jpg"])
+        self.assertEqual(removed, [["f1.jpg", "f3.jpg"]])
+        self.assertEqual(sorted(model.get_examples()), ["f0.jpg", "f2.jpg", "f4.jpg"])
+
+        # 没有可移除的示例时不通知
+        model.remove_examples(["x.jpg"])
+        self.assertEqual(len(removed), 1)
+
+if __name__ == '__main__':
+    unittest.main()
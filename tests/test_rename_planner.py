@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import unittest
+import tempfile
+import shutil
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.rename_planner import RenamePlanner
+
+class TestRenamePlanner(unittest.TestCase):
+    """
+    重命名计划测试类
+    """
+
+    def setUp(self):
+        """
+        测试前设置
+        """
+        self.test_dir = tempfile.mkdtemp()
+        for name in ["a.txt", "b.txt", "c.txt", "taken.txt"]:
+            with open(os.path.join(self.test_dir, name), "w") as f:
+                f.write(name)
+
+    def tearDown(self):
+        """
+        测试后清理
+        """
+        shutil.rmtree(self.test_dir)
+
+    def _path(self, name):
+        return os.path.join(self.test_dir, name)
+
+    def test_plan_does_not_touch_disk(self):
+        """
+        测试生成计划不修改磁盘
+        """
+        before = sorted(os.listdir(self.test_dir))
+        plan = RenamePlanner.plan([(self._path("a.txt"), "new_a.txt")])
+
+        self.assertEqual(sorted(os.listdir(self.test_dir)), before)
+        self.assertEqual(len(plan.operations), 1)
+        self.assertEqual(plan.operations[0].target, self._path("new_a.txt"))
+
+    def test_plan_classification(self):
+        """
+        测试计划分类：无变化、缺失、无效、冲突
+        """
+        plan = RenamePlanner.plan([
+            (self._path("a.txt"), "a.txt"),
+            (self._path("missing.txt"), "x.txt"),
+            (self._path("b.txt"), "bad/name.txt/"),
+            (self._path("c.txt"), "taken.txt"),
+        ])
+
+        counts = plan.summary()['counts']
+        self.assertEqual(counts.get('noop'), 1)
+        self.assertEqual(counts.get('missing'), 1)
+        self.assertEqual(counts.get('invalid'), 1)
+        self.assertEqual(counts.get('conflict'), 1)
+        self.assertEqual(plan.get_conflicts()[0].target, self._path("taken_1.txt"))
+
+    def test_duplicate_targets(self):
+        """
+        测试多个文件映射到同一目标
+        """
+        plan = RenamePlanner.plan([
+            (self._path("a.txt"), "same.txt"),
+            (self._path("b.txt"), "same.txt"),
+        ])
+
+        targets = sorted(os.path.basename(op.target) for op in plan.operations)
+        self.assertEqual(targets, ["same.txt", "same_1.txt"])
+
+    def test_chain_and_swap_execute(self):
+        """
+        测试链式改名和互换改名按正确顺序执行
+        """
+        plan = RenamePlanner.plan([
+            (self._path("a.txt"), "b.txt"),
+            (self._path("b.txt"), "a.txt"),
+            (self._path("c.txt"), "taken.txt"),
+            (self._path("taken.txt"), "d.txt"),
+        ])
+
+        # 占用者会被移走，不应视为冲突
+        self.assertEqual(plan.get_conflicts(), [])
+        self.assertEqual(plan.summary()['executable'], 4)
+
+        success_count, errors = RenamePlanner.execute(plan)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(success_count, 4)
+        with open(self._path("a.txt")) as f:
+            self.assertEqual(f.read(), "b.txt")
+        with open(self._path("b.txt")) as f:
+            self.assertEqual(f.read(), "a.txt")
+        with open(self._path("taken.txt")) as f:
+            self.assertEqual(f.read(), "c.txt")
+        with open(self._path("d.txt")) as f:
+            self.assertEqual(f.read(), "taken.txt")
+        self.assertEqual(sorted(os.listdir(self.test_dir)), ["a.txt", "b.txt", "d.txt", "taken.txt"])
+
+    def test_execute_does_not_overwrite(self):
+        """
+        测试执行时不覆盖计划生成后出现的文件
+        """
+        plan = RenamePlanner.plan([(self._path("a.txt"), "late.txt")])
+        with open(self._path("late.txt"), "w") as f:
+            f.write("late")
+
+        success_count, errors = RenamePlanner.execute(plan)
+
+        self.assertEqual(success_count, 0)
+        self.assertEqual(len(errors), 1)
+        with open(self._path("late.txt")) as f:
+            self.assertEqual(f.read(), "late")
+
+    def test_export(self):
+        """
+        测试导出CSV和JSONL
+        """
+        plan = RenamePlanner.plan([
+            (self._path("a.txt"), "new_a.txt"),
+            (self._path("b.txt"), "b.txt"),
+        ])
+        export_dir = tempfile.mkdtemp()
+        try:
+            success, csv_path = plan.export(os.path.join(export_dir, "plan.csv"))
+            self.assertTrue(success)
+            with open(csv_path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), 3)
+            self.assertTrue(lines[0].startswith("order,status,source"))
+
+            success, jsonl_path = plan.export(os.path.join(export_dir, "plan.jsonl"))
+            self.assertTrue(success)
+            with open(jsonl_path, encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f]
+            self.assertEqual([row['status'] for row in rows], ["rename", "noop"])
+        finally:
+            shutil.rmtree(export_dir)
+
+    def test_estimate(self):
+        """
+        测试耗时估算
+        """
+        paths = [(self._path(name), "x_" + name) for name in ["a.txt", "b.txt", "c.txt"]]
+        plan = RenamePlanner.plan(paths)
+        plan.ops_per_second = 3.0
+
+        self.assertAlmostEqual(plan.estimate_seconds(), 1.0)
+        self.assertIn("预计耗时", plan.format_summary())
+
+if __name__ == '__main__':
+    unittest.main()
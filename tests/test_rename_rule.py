@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.rename_rule import RenameRule
+
+class TestRenameRule(unittest.TestCase):
+    """
+    重命名规则测试类
+    """
+
+    def test_induce_and_apply(self):
+        """
+        测试从示例归纳规则，并应用到新文件名
+        """
+        rule = RenameRule.induce([("IMG_0001.jpg", "2024-旅行-001.jpg"), ("IMG_0012.jpg", "2024-旅行-012.jpg")])
+        self.assertEqual(rule.apply("IMG_0456.png"), "2024-旅行-456.png")
+        self.assertIsNone(rule.apply("notes.txt"))
+
+        # 调换顺序、大小写变换和数字补零
+        rule = RenameRule.induce([("Song - Artist.mp3", "Artist - Song.mp3"), ("Hello - Adele.mp3", "Adele - Hello.mp3")])
+        self.assertEqual(rule.apply("Yesterday - Beatles.mp3"), "Beatles - Yesterday.mp3")
+        rule = RenameRule.induce([("DSC01234.JPG", "photo_1234.jpg"), ("DSC00007.JPG", "photo_0007.jpg")])
+        self.assertEqual(rule.apply("DSC00815.JPG"), "photo_0815.jpg")
+
+        # 只用部分示例搜索，其余示例验证
+        pairs = [(f"scan {i}.pdf", f"Invoice-{i:04d}.pdf") for i in range(1, 500)]
+        rule = RenameRule.induce(pairs + [("scan 9.pdf", "scan 9.pdf")])
+        self.assertEqual(rule.count_matches(pairs), len(pairs))
+
+        restored = RenameRule.from_dict(rule.to_dict())
+        self.assertEqual(restored.apply("scan 77.pdf"), "Invoice-0077.pdf")
+        self.assertEqual(len(restored.examples), RenameRule.MAX_SAVED_EXAMPLES)
+
+    def test_no_rule(self):
+        """
+        测试示例之间没有共同规则时返回None
+        """
+        self.assertIsNone(RenameRule.induce([("a.txt", "b.txt"), ("c.txt", "z.txt")]))
+        self.assertIsNone(RenameRule.induce([("a.txt", "a.txt")]))
+        # 多数示例符合规则但有一个例外
+        pairs = [(f"f{i}.txt", f"g{i}.txt") for i in range(20)] + [("f99.txt", "other.txt")]
+        self.assertIsNone(RenameRule.induce(pairs))
+
+    def test_matches_output(self):
+        """
+        测试识别已经是规则输出格式的文件名，再次应用规则不会重复改名
+        """
+        rule = RenameRule.induce([("IMG_0001.jpg", "2024-旅行-001.jpg"), ("IMG_0012.jpg", "2024-旅行-012.jpg")])
+        self.assertTrue(rule.matches_output(rule.apply("IMG_0007.jpg")))
+        self.assertTrue(rule.matches_output("2024-旅行-1234.png"))
+        self.assertFalse(rule.matches_output("IMG_0007.jpg"))
+        self.assertFalse(rule.matches_output("2024-旅行-07.jpg"))
+
+        rule = RenameRule.induce([("a.txt", "old_a.txt"), ("bb.txt", "old_bb.txt")])
+        self.assertTrue(rule.matches_output("old_c.txt"))
+        self.assertFalse(rule.matches_output("c.txt"))
+
+        # 没有常量的规则无法区分
+        rule = RenameRule.induce([("abc.txt", "ABC.txt")])
+        self.assertFalse(rule.matches_output("ABC.txt"))
+
+if __name__ == '__main__':
+    unittest.main()
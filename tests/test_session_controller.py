@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.controllers.file_controller import FileController
+from src.controllers.rename_controller import RenameController
+from src.controllers.session_controller import SessionController
+from src.utils.directory_watcher import WatchEvent, EVENT_RENAMED
+
+class TestSessionController(unittest.TestCase):
+    """
+    会话控制器测试类
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "session.sqlite3")
+        self.a = os.path.join(self.test_dir, "a")
+        self.b = os.path.join(self.test_dir, "b")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _open(self):
+        file_controller = FileController(config_manager=None)
+        session = SessionController(self.db_path, file_controller, RenameController(None))
+        return file_controller, session
+
+    def test_external_moves_are_saved(self):
+        """
+        测试文件在外部跨文件夹移动、文件夹被重命名后，恢复的会话使用新的路径
+        """
+        file_controller, session = self._open()
+        file_controller.add_files([
+            {'name': "x.txt", 'path': os.path.join(self.a, "x.txt"), 'is_folder': False},
+            {'name': "y.txt", 'path': os.path.join(self.a, "sub", "y.txt"), 'is_folder': False},
+            {'name': "z.txt", 'path': os.path.join(self.a, "sub", "deep", "z.txt"), 'is_folder': False},
+            {'name': "w.txt", 'path': os.path.join(self.a, "subway", "w.txt"), 'is_folder': False},
+        ])
+        session.flush()
+
+        file_controller._apply_watch_events([
+            WatchEvent(EVENT_RENAMED, os.path.join(self.a, "x.txt"), os.path.join(self.b, "x2.txt")),
+            WatchEvent(EVENT_RENAMED, os.path.join(self.a, "sub"), os.path.join(self.a, "renamed"), True),
+        ])
+        session.close()
+
+        file_controller, session = self._open()
+        self.assertEqual(session.restore(), 4)
+        self.assertEqual(sorted(file_data['path'] for file_data in file_controller.get_files()), sorted([
+            os.path.join(self.b, "x2.txt"),
+            os.path.join(self.a, "renamed", "y.txt"),
+            os.path.join(self.a, "renamed", "deep", "z.txt"),
+            os.path.join(self.a, "subway", "w.txt"),
+        ]))
+        self.assertEqual(file_controller.get_file_by_path(os.path.join(self.b, "x2.txt"))['name'], "x2.txt")
+        session.close()
+
+if __name__ == '__main__':
+    unittest.main()
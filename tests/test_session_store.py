@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import datetime
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.session_store import SessionStore
+from src.models.rename_model import RenameModel, RenameHistory
+
+class TestSessionStore(unittest.TestCase):
+    """
+    会话数据库测试类
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "session.sqlite3")
+        self.store = SessionStore(self.db_path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.test_dir)
+
+    def _reopen(self):
+        self.store.close()
+        self.store = SessionStore(self.db_path)
+
+    def test_writes_are_batched_until_flush(self):
+        """
+        测试写操作在flush()时一起提交，重新打开后数据完整
+        """
+        self.store.add_files([{'path': f"/photos/img{i}.jpg", 'name': f"img{i}.jpg"} for i in range(100)])
+        self.store.remove_files(["/photos/img5.jpg"])
+        self.store.rename_file("/photos/img6.jpg", "/photos/six.jpg", "six.jpg")
+        self.store.set_example("img1.jpg", "one.jpg")
+        self.store.set_example("img2.jpg", "two.jpg")
+        self.store.set_example("img2.jpg", None)
+
+        # 另一个连接在提交前看不到任何变化
+        other = SessionStore(self.db_path)
+        self.assertEqual(other.load_files(), [])
+        other.close()
+
+        self.assertEqual(self.store.flush(), 6)
+        self._reopen()
+
+        files = self.store.load_files()
+        self.assertEqual(len(files), 99)
+        self.assertEqual(files[0]['path'], "/photos/img0.jpg")
+        self.assertEqual(files[5]['name'], "six.jpg")
+        self.assertEqual(self.store.load_examples(), {"img1.jpg": "one.jpg"})
+
+    def test_history_deltas(self):
+        """
+        测试差异历史记录可以还原完整映射，删除基准时依赖它的记录改为完整映射
+        """
+        now = datetime.datetime.now()
+        first = self.store.add_history(now, rename_map={"a.jpg": "1.jpg", "b.jpg": "2.jpg"}, raw_response=b"r1")
+        second = self.store.add_history(now, base_id=first, changed={"b.jpg": "B.jpg"}, removed=["a.jpg"])
+        third = self.store.add_history(now, base_id=second, changed={"c.jpg": "3.jpg"})
+
+        self.assertEqual(self.store.load_history(third)['rename_map'], {"b.jpg": "B.jpg", "c.jpg": "3.jpg"})
+        self.assertEqual(self.store.load_raw_response(first), b"r1")
+
+        self.store.remove_history([first])
+        self._reopen()
+        self.assertEqual([entry[0] for entry in self.store.list_history()], [second, third])
+        self.assertEqual(self.store.load_history(second)['rename_map'], {"b.jpg": "B.jpg"})
+        self.assertEqual(self.store.load_history(third)['rename_map'], {"b.jpg": "B.jpg", "c.jpg": "3.jpg"})
+
+        # 新记录的ID在重新打开后继续递增
+        self.assertGreater(self.store.add_history(now, rename_map={}), third)
+
+    def test_deferred_history_loads_on_access(self):
+        """
+        测试恢复的历史记录只在访问时从数据库读取
+        """
+        now = datetime.datetime.now()
+        ids = [self.store.add_history(now, rename_map={"a.jpg": f"{i}.jpg"}) for i in range(5)]
+        self.store.flush()
+
+        loaded = []
+        def make_loader(history_id):
+            def loader():
+                loaded.append(history_id)
+                return self.store.load_history(history_id)
+            return loader
+
+        model = RenameModel()
+        model.restore_history(
+            [RenameHistory.deferred(make_loader(history_id), now, history_id) for history_id in ids], 2)
+        self.assertEqual(model.get_current_rename_map(), {"a.jpg": "2.jpg"})
+        self.assertEqual(loaded, [ids[2]])
+
+        model.go_to_next()
+        self.assertEqual(model.get_current_rename_map(), {"a.jpg": "3.jpg"})
+        self.assertEqual(loaded, [ids[2], ids[3]])
+
+    def test_renames(self):
+        """
+        测试记录已执行的重命名和撤销状态
+        """
+        self.store.record_renames("j1", [("/a/1.jpg", "/a/x.jpg")])
+        self.store.record_renames("j2", [("/a/2.jpg", "/a/y.jpg")])
+        self.store.mark_undone("j1")
+        self.store.flush()
+        self.assertEqual(self.store.load_renames(), [("j2", "/a/2.jpg", "/a/y.jpg")])
+        self.assertEqual(len(self.store.load_renames(include_undone=True)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# 没有显示器时使用离屏平台
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QRunnable, QThreadPool
+from PySide6.QtGui import QImage, QColor
+from PySide6.QtWidgets import QApplication
+from src.views.thumbnail_service import load_thumbnail, thumbnail_cache_path, ThumbnailService
+
+class _BlockingTask(QRunnable):
+    """
+    占住线程池唯一的线程，让后面的请求留在队列中
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def run(self):
+        self.release.wait(5)
+
+class TestThumbnailService(unittest.TestCase):
+    """
+    缩略图生成和磁盘缓存测试类
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.image_path = os.path.join(self.temp_dir, "photo.png")
+        image = QImage(200, 100, QImage.Format_RGB32)
+        image.fill(QColor("red"))
+        image.save(self.image_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _cache_path(self):
+        stat_result = os.stat(self.image_path)
+        return thumbnail_cache_path(self.cache_dir, self.image_path, 40,
+                                    stat_result.st_mtime_ns, stat_result.st_size)
+
+    def test_scaled_decode_and_disk_cache(self):
+        """
+        测试按比例缩小解码，并写入按(路径, 尺寸, 修改时间)区分的磁盘缓存
+        """
+        image = load_thumbnail(self.image_path, 40, self.cache_dir)
+        self.assertEqual((image.width(), image.height()), (40, 20))
+        cache_path = self._cache_path()
+        self.assertTrue(os.path.isfile(cache_path))
+
+        # 再次读取时直接使用缓存，即使原图已不能解码
+        with open(self.image_path, 'r+b') as f:
+            stat_result = os.fstat(f.fileno())
+            f.write(b'\0' * 16)
+        os.utime(self.image_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+        self.assertFalse(load_thumbnail(self.image_path, 40, self.cache_dir).isNull())
+
+        # 修改时间变化后缓存键随之变化
+        os.utime(self.image_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10 ** 9))
+        self.assertNotEqual(self._cache_path(), cache_path)
+        self.assertTrue(load_thumbnail(self.image_path, 40, self.cache_dir).isNull())
+
+    def test_not_an_image(self):
+        """
+        测试非图片文件和不存在的文件返回空图片
+        """
+        text_path = os.path.join(self.temp_dir, "notes.txt")
+        with open(text_path, 'w') as f:
+            f.write("hello")
+        self.assertTrue(load_thumbnail(text_path, 40, self.cache_dir).isNull())
+        self.assertTrue(load_thumbnail(os.path.join(self.temp_dir, "missing.png"), 40).isNull())
+
+    def _service(self, max_memory_items=1000):
+        thread_pool = QThreadPool()
+        thread_pool.setMaxThreadCount(1)
+        service = ThumbnailService(cache_dir="", max_memory_items=max_memory_items, thread_pool=thread_pool)
+        ready = []
+        service.thumbnail_ready.connect(ready.append)
+        return service, ready
+
+    def _images(self, *names):
+        paths = []
+        for name in names:
+            path = os.path.join(self.temp_dir, name)
+            shutil.copyfile(self.image_path, path)
+            paths.append(path)
+        return paths
+
+    def _wait(self, service):
+        service.thread_pool.waitForDone()
+        QCoreApplication.processEvents()
+
+    def test_retain_and_cancel(self):
+        """
+        测试retain()只保留可见行的请求，cancel_all()后已开始的任务结果被丢弃
+        """
+        service, ready = self._service()
+        a, b, c = self._images("a.png", "b.png", "c.png")
+        blocker = _BlockingTask()
+        service.thread_pool.start(blocker)
+
+        for path in (a, b, c):
+            self.assertIsNone(service.thumbnail(path))
+        self.assertEqual(service.retain([c]), 2)
+        self.assertEqual(list(service._pending), [c])
+        # 不是图片的文件不排队
+        self.assertIsNone(service.thumbnail(os.path.join(self.temp_dir, "notes.txt")))
+        self.assertEqual(list(service._pending), [c])
+
+        blocker.release.set()
+        self._wait(service)
+        self.assertEqual(ready, [c])
+        self.assertEqual(service.thumbnail(c).width(), 40)
+        self.assertIsNone(service.thumbnail(a))
+
+        # 取消后即使任务已经执行，结果也不再使用
+        service.cancel_all()
+        self._wait(service)
+        self.assertEqual(ready, [c])
+        self.assertNotIn(a, service._pixmaps)
+
+    def test_memory_limit(self):
+        """
+        测试内存中的缩略图数量有上限，超出时移除最久没有使用的一个
+        """
+        service, ready = self._service(max_memory_items=2)
+        a, b, c = self._images("a.png", "b.png", "c.png")
+        for path in (a, b):
+            service.thumbnail(path)
+            self._wait(service)
+
+        # 读取a之后b变成最久没有使用的
+        self.assertIsNotNone(service.thumbnail(a))
+        service.thumbnail(c)
+        self._wait(service)
+        self.assertEqual(ready, [a, b, c])
+        self.assertEqual(list(service._pixmaps), [a, c])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import tempfile
+import unittest
+
+# 添加父目录到路径以便导入
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.watch import WatchRenamer
+from src.utils.rename_rule import RenameRule
+from src.utils.rename_journal import RenameJournal
+from src.controllers.rename_controller import RenameController
+
+class TestWatchRenamer(unittest.TestCase):
+    """
+    收件文件夹监视测试类
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.inbox = os.path.join(self.test_dir, "inbox")
+        os.makedirs(self.inbox)
+        self.rename_controller = RenameController(None)
+        self.rename_controller.journal_dir = os.path.join(self.test_dir, "journal")
+        rule = RenameRule.induce([("IMG_0001.jpg", "photo-001.jpg")])
+        self.renamer = WatchRenamer(self.inbox, self.rename_controller, rule, stable=2.0, use_ai=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _create(self, name):
+        path = os.path.join(self.inbox, name)
+        with open(path, 'w') as f:
+            f.write("x")
+        return path
+
+    def test_stable_batch(self):
+        """
+        测试文件保持不变后才处理，按规则重命名并写入日志，产生的文件不再处理
+        """
+        now = time.time()
+        paths = [self._create(f"IMG_{i:04d}.jpg") for i in range(3)] + [self._create("notes.txt")]
+        for path in paths:
+            self.renamer.note_arrival(path)
+
+        # 刚写入的文件需要等待
+        self.assertEqual(self.renamer.take_stable(now), [])
+        self.assertEqual(self.renamer.take_stable(now + 1), [])
+        stable_paths = self.renamer.take_stable(now + 2)
+        self.assertEqual(sorted(stable_paths), sorted(paths))
+
+        result = asyncio.run(self.renamer.rename_batch(stable_paths))
+        self.assertEqual(result['count'], 3)
+        self.assertEqual(sorted(os.listdir(self.inbox)),
+                         ["notes.txt", "photo-000.jpg", "photo-001.jpg", "photo-002.jpg"])
+        self.assertEqual(self.renamer.stats['unresolved'], 1)
+
+        # 重命名事件中的新路径被忽略
+        self.renamer.note_arrival(os.path.join(self.inbox, "photo-001.jpg"))
+        self.assertEqual(self.renamer.pending_count(), 0)
+
+        journal = RenameJournal.latest(self.rename_controller.journal_dir)
+        self.assertEqual(journal.undo()[0], 3)
+        self.assertTrue(os.path.exists(os.path.join(self.inbox, "IMG_0002.jpg")))
+
+    def test_restart_skips_own_output(self):
+        """
+        测试重启后读取已有文件时不会对上次重命名的结果再次改名
+        """
+        paths = [self._create(f"IMG_{i:04d}.jpg") for i in range(3)] + [self._create("notes.txt")]
+        result = asyncio.run(self.renamer.rename_batch(paths))
+        self.assertEqual(result['count'], 3)
+        photo = os.path.join(self.inbox, "photo-001.jpg")
+        notes = os.path.join(self.inbox, "notes.txt")
+
+        # 新的监视器没有内存中的记录，按规则输出格式和重命名日志跳过
+        for rule in (self.renamer.rule, None):
+            renamer = WatchRenamer(self.inbox, self.rename_controller, rule, stable=0, use_ai=False)
+            renamer.add_existing()
+            self.assertEqual(renamer.take_stable(time.time() + 10), [notes])
+            self.assertEqual(renamer.stats['skipped'], 3)
+
+        # 规则输出格式的新文件同样跳过，日志没有记录的其他文件照常处理
+        renamer = WatchRenamer(self.inbox, self.rename_controller, self.renamer.rule, use_ai=False)
+        renamer.note_arrival(os.path.join(self.inbox, "photo-100.jpg"))
+        renamer.note_arrival(os.path.join(self.inbox, "IMG_0100.jpg"))
+        self.assertEqual(list(renamer._pending), [os.path.join(self.inbox, "IMG_0100.jpg")])
+
+        # 撤销后日志不再生效，原文件重新处理
+        RenameJournal.latest(self.rename_controller.journal_dir).undo()
+        renamer = WatchRenamer(self.inbox, self.rename_controller, None, stable=0, use_ai=False)
+        renamer.add_existing()
+        self.assertEqual(renamer.pending_count(), 4)
+        self.assertFalse(os.path.exists(photo))
+
+if __name__ == '__main__':
+    unittest.main()